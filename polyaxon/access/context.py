@@ -0,0 +1,102 @@
+from typing import Any, Optional
+
+from rest_framework import permissions
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+from django.http import HttpRequest
+
+from db.models.owner import Owner
+from scopes.access import (
+    DEFAULT_ACCESS,
+    OWNER_ACCESS,
+    SUPERUSER_ACCESS,
+    UNAUTHENTICATED_ACCESS,
+    Access
+)
+
+
+class AccessContext(object):
+    """The requester's effective access, evaluated once per request.
+
+    The access to each project is resolved once, and the decisions are memoized
+    by project and by safe/unsafe method, so that repeated object checks do not re-resolve
+    the ownership. List endpoints filter their querysets with `filter_queryset_by_access`.
+    """
+
+    def __init__(self, user: Any) -> None:
+        self.user = user
+        self._projects = {}
+        self._project_access = {}
+        self._decisions = {}
+
+    @property
+    def is_authenticated(self) -> bool:
+        return bool(self.user) and not self.user.is_anonymous and self.user.is_active
+
+    @property
+    def is_superuser(self) -> bool:
+        return self.is_authenticated and (self.user.is_superuser or self.user.is_staff)
+
+    def is_owner(self, owner: Any) -> bool:
+        if isinstance(owner, Owner):
+            # Compare the generic relation without loading the owner object
+            content_type = ContentType.objects.get_for_model(self.user)
+            return (owner.content_type_id == content_type.id and
+                    owner.object_id == self.user.id)
+        return owner.owner == self.user
+
+    def get_access(self, owner: Any) -> Access:
+        if not self.is_authenticated:
+            return UNAUTHENTICATED_ACCESS
+        if self.is_superuser:
+            return SUPERUSER_ACCESS
+        if self.is_owner(owner):
+            return OWNER_ACCESS
+        return DEFAULT_ACCESS
+
+    def add_project(self, project: Any) -> None:
+        """Keeps a project loaded by the endpoint, to check its resources without reloading it."""
+        self._projects[project.id] = project
+
+    def get_project(self, project_id: int) -> Optional[Any]:
+        return self._projects.get(project_id)
+
+    def get_project_access(self, project: Any) -> Access:
+        if project.id not in self._project_access:
+            self._project_access[project.id] = self.get_access(project.owner)
+        return self._project_access[project.id]
+
+    def has_project_permission(self, project: Any, method: str) -> bool:
+        key = (project.id, method in permissions.SAFE_METHODS)
+        if key not in self._decisions:
+            access = self.get_project_access(project)
+            self._decisions[key] = access.is_authenticated and (
+                access.is_superuser or access.is_owner or (key[1] and project.is_public))
+        return self._decisions[key]
+
+    def filter_queryset_by_access(self, queryset: Any, project_field: str = None) -> Any:
+        """Filters the queryset to the projects, or the projects' resources, the user can read.
+
+        `project_field` is the lookup to the project, e.g. `project` or `experiment__project`,
+        by default the queryset is a projects queryset.
+        """
+        if self.is_superuser:
+            return queryset
+        if not self.is_authenticated:
+            return queryset.none()
+
+        prefix = '{}__'.format(project_field) if project_field else ''
+        content_type = ContentType.objects.get_for_model(self.user)
+        return queryset.filter(
+            Q(**{'{}is_public'.format(prefix): True}) |
+            Q(**{'{}owner__content_type'.format(prefix): content_type,
+                 '{}owner__object_id'.format(prefix): self.user.id}))
+
+
+def get_access_context(request: HttpRequest) -> AccessContext:
+    context = getattr(request, 'access_context', None)
+    if context is None or context.user != request.user:
+        context = AccessContext(user=request.user)
+        request.access_context = context
+    return context
@@ -2,6 +2,7 @@ from rest_framework import permissions
 
 from django.http import HttpRequest
 
+from access.context import get_access_context
 from scopes.access import DEFAULT_ACCESS
 
 
@@ -9,13 +10,9 @@ def has_object_permission(permission: permissions.BasePermission,
                           request: HttpRequest,
                           view,
                           obj: any) -> bool:
-    # We check if the access type before continuing other checks
-    if request.access.is_superuser or request.access.is_owner:
-        return True
-
-    # Other user
-    if request.method in permissions.SAFE_METHODS and obj.is_public:
+    result = get_access_context(request).has_project_permission(project=obj,
+                                                                method=request.method)
+    # Other users only have a read access to public projects
+    if result and not (request.access.is_superuser or request.access.is_owner):
         request.access = DEFAULT_ACCESS
-        return True
-
-    return False
+    return result
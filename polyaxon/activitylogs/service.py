@@ -2,6 +2,7 @@ from typing import Dict, Optional
 
 from activitylogs.manager import default_manager
 from constants import user_system
+from event_manager import event_subjects
 from event_manager.event import Event
 from event_manager.event_service import EventService
 
@@ -12,6 +13,15 @@ class ActivityLogService(EventService):
     def __init__(self):
         self.activity_log_manager = None
 
+    @staticmethod
+    def get_project_id(event: Event) -> Optional[int]:
+        # Project events have the project's id, the other project resources the `project.id`
+        if event.get_event_subject() == event_subjects.PROJECT:
+            project_id = event.data.get('id')
+        else:
+            project_id = event.data.get('project.id')
+        return int(project_id) if project_id is not None else None
+
     def record_event(self, event: Event) -> Optional[Dict]:
         if not event.ref_id:
             return
@@ -24,7 +34,8 @@ class ActivityLogService(EventService):
             context=event.data,
             created_at=event.datetime,
             object_id=event.instance_id,
-            content_type_id=event.instance_contenttype
+            content_type_id=event.instance_contenttype,
+            project_id=self.get_project_id(event)
         )
 
     def setup(self) -> None:
@@ -1,5 +1,5 @@
 from administration.register.utils import DiffModelAdmin
-from db.models.projects import Project
+from db.models.projects import MetricRetentionPolicy, Project
 
 
 class ProjectAdmin(DiffModelAdmin):
@@ -14,5 +14,11 @@ class ProjectAdmin(DiffModelAdmin):
         return qs
 
 
+class MetricRetentionPolicyAdmin(DiffModelAdmin):
+    list_display = ('project', 'is_enabled', 'full_resolution_days', 'keep_every')
+    raw_id_fields = ('project',)
+
+
 def register(admin_register):
     admin_register(Project, ProjectAdmin)
+    admin_register(MetricRetentionPolicy, MetricRetentionPolicyAdmin)
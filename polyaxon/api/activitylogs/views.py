@@ -8,16 +8,17 @@ import activitylogs
 from api.activitylogs.serializers import ActivityLogsSerializer
 from api.endpoint.activitylogs import ActivityLogEndpoint
 from api.endpoint.base import ListEndpoint
+from api.utils.views.cursor_mixin import CursorPaginationMixinView
 from constants import content_types
 from db.models.projects import Project
 
 
-class HistoryLogsView(ActivityLogEndpoint, ListEndpoint):
+class HistoryLogsView(CursorPaginationMixinView, ActivityLogEndpoint, ListEndpoint):
     """Activity logs list view."""
     # Filter only for user write events
     queryset = ActivityLogEndpoint.queryset.order_by('-created_at').filter(
         event_type__in=activitylogs.default_manager.user_view_events()
-    )
+    ).select_related('actor').prefetch_related('content_object')
     serializer_class = ActivityLogsSerializer
     permission_classes = (IsAuthenticated,)
 
@@ -26,12 +27,12 @@ class HistoryLogsView(ActivityLogEndpoint, ListEndpoint):
         return super().filter_queryset(queryset=queryset)
 
 
-class ActivityLogsView(ActivityLogEndpoint, ListEndpoint):
+class ActivityLogsView(CursorPaginationMixinView, ActivityLogEndpoint, ListEndpoint):
     """Activity logs list view."""
     # Filter only for user write events
     queryset = ActivityLogEndpoint.queryset.order_by('-created_at').filter(
         event_type__in=activitylogs.default_manager.user_write_events()
-    )
+    ).select_related('actor').prefetch_related('content_object')
     serializer_class = ActivityLogsSerializer
     permission_classes = (IsAuthenticated,)
 
@@ -43,10 +44,14 @@ class ProjectActivityLogsView(ActivityLogsView):
         project_name = self.kwargs['name']
         username = self.kwargs['username']
         project = get_object_or_404(Project, user__username=username, name=project_name)
-        project_id = '{}'.format(project.id)
-        # Filter for project/all events
+        context_project_id = '{}'.format(project.id)
+        # Filter for project/all events,
+        # the logs without a `project_id` yet are filtered on their context until backfilled
         queryset = queryset.filter(
-            Q(content_type__model=content_types.PROJECT, context__id=project_id) |
-            Q(**{'context__project.id': project_id})
+            Q(project_id=project.id) |
+            Q(project_id__isnull=True,
+              content_type__model=content_types.PROJECT,
+              context__id=context_project_id) |
+            Q(project_id__isnull=True, **{'context__project.id': context_project_id})
         )
         return super().filter_queryset(queryset=queryset)
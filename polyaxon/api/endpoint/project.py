@@ -1,11 +1,12 @@
-from django.http import HttpRequest
-from django.shortcuts import get_object_or_404
+from django.http import Http404, HttpRequest
 
 import access
 
+from access.context import get_access_context
 from access.resources import Resources
 from api.endpoint.admin import AdminPermission
 from api.endpoint.base import BaseEndpoint
+from db.lookups import get_project
 from db.models.projects import Project
 
 
@@ -36,7 +37,9 @@ class ProjectResourcePermission(ProjectPermission):
     SCOPE_MAPPING = access.get_scope_mapping_for(Resources.PROJECT_RESOURCE)
 
     def has_object_permission(self, request: HttpRequest, view, obj) -> bool:
-        return super().has_object_permission(request, view, obj.project)
+        # Use the project already loaded by the endpoint
+        project = get_access_context(request).get_project(obj.project_id) or obj.project
+        return super().has_object_permission(request, view, project)
 
 
 class ProjectEndpoint(BaseEndpoint):
@@ -71,10 +74,13 @@ class ProjectResourceListEndpoint(BaseEndpoint):
     def _initialize_context(self) -> None:
         #  pylint:disable=attribute-defined-outside-init
         super()._initialize_context()
-        self.project = get_object_or_404(Project,
-                                         owner__name=self.owner_name,
-                                         name=self.project_name)
+        try:
+            self.project = get_project(owner_name=self.owner_name,
+                                       project_name=self.project_name)
+        except Project.DoesNotExist:
+            raise Http404('No Project matches the given query.')
         self.owner = self.project.owner
+        get_access_context(self.request).add_project(self.project)
 
     def _validate_resource_permission(self) -> None:
         permission = ProjectPermission()
@@ -3,6 +3,7 @@ from rest_framework.exceptions import ValidationError
 
 from api.utils.serializers.bookmarks import BookmarkedSerializerMixin
 from api.utils.serializers.tags import TagsSerializerMixin
+from constants.experiments import ExperimentLifeCycle
 from db.models.experiment_groups import (
     ExperimentGroup,
     ExperimentGroupChartView,
@@ -22,6 +23,7 @@ class ExperimentGroupStatusSerializer(serializers.ModelSerializer):
 
 class ExperimentGroupSerializer(serializers.ModelSerializer):
     uuid = fields.UUIDField(format='hex', read_only=True)
+    unique_name = fields.CharField(read_only=True)
     project = fields.SerializerMethodField()
     user = fields.SerializerMethodField()
 
@@ -91,25 +93,31 @@ class ExperimentGroupDetailSerializer(BookmarkedExperimentGroupSerializer, TagsS
         )
 
     def get_num_experiments(self, obj: ExperimentGroup) -> int:
-        return obj.group_experiments.count()
+        return obj.count_experiments(counts=obj.experiments_counts)
 
     def get_num_pending_experiments(self, obj: ExperimentGroup) -> int:
-        return obj.pending_experiments.count()
+        return obj.count_experiments(statuses=ExperimentLifeCycle.PENDING_STATUS,
+                                     counts=obj.experiments_counts)
 
     def get_num_running_experiments(self, obj: ExperimentGroup) -> int:
-        return obj.running_experiments.count()
+        return obj.count_experiments(statuses=ExperimentLifeCycle.RUNNING_STATUS,
+                                     counts=obj.experiments_counts)
 
     def get_num_scheduled_experiments(self, obj: ExperimentGroup) -> int:
-        return obj.scheduled_experiments.count()
+        return obj.count_experiments(statuses=[ExperimentLifeCycle.SCHEDULED],
+                                     counts=obj.experiments_counts)
 
     def get_num_succeeded_experiments(self, obj: ExperimentGroup) -> int:
-        return obj.succeeded_experiments.count()
+        return obj.count_experiments(statuses=[ExperimentLifeCycle.SUCCEEDED],
+                                     counts=obj.experiments_counts)
 
     def get_num_failed_experiments(self, obj: ExperimentGroup) -> int:
-        return obj.failed_experiments.count()
+        return obj.count_experiments(statuses=[ExperimentLifeCycle.FAILED],
+                                     counts=obj.experiments_counts)
 
     def get_num_stopped_experiments(self, obj: ExperimentGroup) -> int:
-        return obj.stopped_experiments.count()
+        return obj.count_experiments(statuses=[ExperimentLifeCycle.STOPPED],
+                                     counts=obj.experiments_counts)
 
     def get_current_iteration(self, obj: ExperimentGroup):
         return obj.iterations.count()
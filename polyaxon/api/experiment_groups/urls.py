@@ -32,6 +32,12 @@ groups_urlpatterns = [
     re_path(r'^{}/{}/groups/{}/metrics/?$'.format(
         OWNER_NAME_PATTERN, PROJECT_NAME_PATTERN, GROUP_ID_PATTERN),
         views.ExperimentGroupMetricsListView.as_view()),
+    re_path(r'^{}/{}/groups/{}/metrics/series/?$'.format(
+        OWNER_NAME_PATTERN, PROJECT_NAME_PATTERN, GROUP_ID_PATTERN),
+        views.ExperimentGroupMetricSeriesView.as_view()),
+    re_path(r'^{}/{}/groups/{}/metrics/aggregate/?$'.format(
+        OWNER_NAME_PATTERN, PROJECT_NAME_PATTERN, GROUP_ID_PATTERN),
+        views.ExperimentGroupMetricAggregationView.as_view()),
     re_path(r'^{}/{}/groups/{}/stop/?$'.format(USERNAME_PATTERN, NAME_PATTERN, ID_PATTERN),
             views.ExperimentGroupStopView.as_view()),
     re_path(r'^{}/{}/groups/{}/bookmark/?$'.format(
@@ -32,8 +32,10 @@ from api.experiment_groups.serializers import (
 )
 from api.experiments.serializers import ExperimentMetricSerializer
 from api.filters import OrderingFilter, QueryFilter
-from api.paginator import LargeLimitOffsetPagination
+from api.paginator import LargeLimitOffsetPagination, SmallLimitOffsetPagination
 from api.utils.views.bookmarks_mixin import BookmarkedListMixinView
+from api.utils.views.cursor_mixin import CursorPaginationMixinView
+from api.utils.views.etag_mixin import EtagMixinView
 from db.models.experiment_groups import (
     ExperimentGroup,
     ExperimentGroupChartView,
@@ -52,12 +54,15 @@ from event_manager.events.experiment_group import (
     EXPERIMENT_GROUP_VIEWED
 )
 from event_manager.events.project import PROJECT_EXPERIMENT_GROUPS_VIEWED
+from metrics.aggregations import get_group_bands, get_summaries, parse_aggregation_query
+from metrics.queries import get_series_by_experiment, parse_series_query
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import SchedulerCeleryTasks
 from scopes.permissions.projects import IsItemProjectOwnerOrPublicReadOnly, get_permissible_project
 
 
 class ExperimentGroupListView(BookmarkedListMixinView,
+                              CursorPaginationMixinView,
                               ProjectResourceListEndpoint,
                               ListEndpoint,
                               CreateEndpoint):
@@ -95,7 +100,8 @@ class ExperimentGroupListView(BookmarkedListMixinView,
             instance.selection_experiments.set(experiment_ids)
 
 
-class ExperimentGroupDetailView(ExperimentGroupEndpoint,
+class ExperimentGroupDetailView(EtagMixinView,
+                                ExperimentGroupEndpoint,
                                 RetrieveEndpoint,
                                 DestroyEndpoint,
                                 UpdateEndpoint):
@@ -109,6 +115,7 @@ class ExperimentGroupDetailView(ExperimentGroupEndpoint,
     """
     queryset = queries.groups_details
     serializer_class = ExperimentGroupDetailSerializer
+    etag_object = 'group'
     AUDITOR_EVENT_TYPES = {
         'GET': EXPERIMENT_GROUP_VIEWED,
         'UPDATE': EXPERIMENT_GROUP_UPDATED,
@@ -224,7 +231,8 @@ class ExperimentGroupViewMixin(object):
         return queryset.filter(experiment_group=self.get_experiment_group())
 
 
-class ExperimentGroupStatusListView(ExperimentGroupResourceListEndpoint,
+class ExperimentGroupStatusListView(EtagMixinView,
+                                    ExperimentGroupResourceListEndpoint,
                                     ListEndpoint,
                                     CreateEndpoint):
     """
@@ -235,6 +243,7 @@ class ExperimentGroupStatusListView(ExperimentGroupResourceListEndpoint,
     """
     queryset = ExperimentGroupStatus.objects.order_by('created_at').all()
     serializer_class = ExperimentGroupStatusSerializer
+    etag_object = 'group'
 
     def perform_create(self, serializer):
         serializer.save(experiment_group=self.group)
@@ -275,6 +284,78 @@ class ExperimentGroupMetricsListView(ExperimentGroupResourceListEndpoint, ListEn
         return response
 
 
+class ExperimentGroupMetricSeriesView(ExperimentGroupResourceListEndpoint, ListEndpoint):
+    """
+    get:
+        Get the downsampled series of the metrics of experiments under a group,
+        paginated by experiments.
+    """
+    pagination_class = SmallLimitOffsetPagination
+
+    def get_queryset(self):
+        return self.group.group_experiments.order_by('id').values_list('id', flat=True)
+
+    def filter_queryset(self, queryset):
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        try:
+            query = parse_series_query(request.query_params)
+        except ValueError as e:
+            raise ValidationError(str(e))
+        experiment_ids = self.paginate_queryset(self.get_queryset())
+        results = [{'id': experiment_id, 'series': series}
+                   for experiment_id, series in get_series_by_experiment(experiment_ids,
+                                                                         query).items()]
+        auditor.record(event_type=EXPERIMENT_GROUP_METRICS_VIEWED,
+                       instance=self.group,
+                       actor_id=request.user.id,
+                       actor_name=request.user.username)
+        return self.get_paginated_response(results)
+
+
+class ExperimentGroupMetricAggregationView(ExperimentGroupResourceListEndpoint, ListEndpoint):
+    """
+    get:
+        Get the final, best and mean metric values of the experiments under a group,
+        paginated by experiments, and with `bands=true`, the metrics percentile bands
+        across the group, downsampled to `max_points` steps.
+    """
+    pagination_class = SmallLimitOffsetPagination
+
+    def get_queryset(self):
+        return self.group.group_experiments.order_by('id').values_list('id', flat=True)
+
+    def filter_queryset(self, queryset):
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        try:
+            query = parse_aggregation_query(request.query_params)
+        except ValueError as e:
+            raise ValidationError(str(e))
+        bands = to_bool(request.query_params.get('bands', None),
+                        handle_none=True,
+                        exception=ValidationError)
+        queryset = self.get_queryset()
+        experiment_ids = self.paginate_queryset(queryset)
+        summaries = get_summaries(experiment_ids=experiment_ids,
+                                  names=query.names,
+                                  optimization=query.optimization)
+        response = self.get_paginated_response([
+            {'id': experiment_id, 'metrics': summaries[experiment_id]}
+            for experiment_id in experiment_ids])
+        if bands:
+            response.data['bands'] = get_group_bands(experiment_ids=list(queryset),
+                                                     names=query.names,
+                                                     max_points=query.max_points)
+        auditor.record(event_type=EXPERIMENT_GROUP_METRICS_VIEWED,
+                       instance=self.group,
+                       actor_id=request.user.id,
+                       actor_name=request.user.username)
+        return response
+
+
 class ExperimentGroupChartViewListView(ExperimentGroupResourceListEndpoint,
                                        ListEndpoint,
                                        CreateEndpoint):
@@ -1,4 +1,7 @@
-from django.db.models import Count
+from typing import Any
+
+from django.db.models import Case, CharField, Value, When
+from django.db.models.functions import Cast, Coalesce, Concat
 
 from db.models.experiments import Experiment
 
@@ -21,9 +24,8 @@ experiments = Experiment.objects.select_related(
     'original_experiment__experiment_group__project__user',
     'status')
 
-experiments_details = experiments.annotate(
-    Count('jobs', distinct=True)
-)
+# The jobs are counted by the serializer, without grouping the experiments by a jobs join
+experiments_details = experiments
 
 experiments_auditing = Experiment.objects.select_related(
     'user',
@@ -34,3 +36,73 @@ experiments_auditing = Experiment.objects.select_related(
     'experiment_group__project__user',
     'status'
 )
+
+
+EXPERIMENTS_VALUES_FIELDS = (
+    'id',
+    'uuid',
+    'name',
+    'user__username',
+    'description',
+    'created_at',
+    'updated_at',
+    'started_at',
+    'finished_at',
+    'status_name',
+    'cloning_strategy',
+    'tags',
+    'last_metric',
+    'declarations',
+)
+
+
+def _concat(*expressions) -> Concat:
+    return Concat(*expressions, output_field=CharField())
+
+
+def _get_name_or_none(field: str, name: Any) -> Case:
+    return Case(When(**{'{}__isnull'.format(field): True}, then=Value(None)),
+                default=name,
+                output_field=CharField())
+
+
+def _get_id(field: str) -> Cast:
+    return Cast(field, CharField())
+
+
+def _get_group_name(project_name: Concat, prefix: str = '') -> Coalesce:
+    group = '{}experiment_group'.format(prefix)
+    return Coalesce('{}__unique_name'.format(group),
+                    _concat(project_name, Value('.'), _get_id('{}_id'.format(group))))
+
+
+def _get_experiment_name(project_name: Concat, prefix: str = '') -> Coalesce:
+    group_name = _get_group_name(project_name=project_name, prefix=prefix)
+    parent_name = Coalesce(
+        _get_name_or_none('{}experiment_group'.format(prefix), group_name),
+        project_name)
+    return Coalesce('{}unique_name'.format(prefix),
+                    _concat(parent_name, Value('.'), _get_id('{}id'.format(prefix))))
+
+
+def get_experiments_values(queryset: Any) -> Any:
+    """Returns the rows of the experiments list as dicts, with the names built in sql.
+
+    The experiments, groups and original experiments names are read from their unique name
+    columns, or built like `get_unique_name` while the columns are not set;
+    the groups, builds and original experiments belong to the same project,
+    so their names only need the project.
+    """
+    project_name = _concat('project__user__username', Value('.'), 'project__name')
+    queryset = queryset.annotate(
+        project_name=project_name,
+        experiment_name=_get_experiment_name(project_name=project_name),
+        group_name=_get_name_or_none('experiment_group', _get_group_name(project_name)),
+        build_name=_get_name_or_none(
+            'build_job',
+            _concat(project_name, Value('.builds.'), _get_id('build_job_id'))),
+        original_name=_get_name_or_none(
+            'original_experiment',
+            _get_experiment_name(project_name=project_name, prefix='original_experiment__')))
+    # Keep the annotations added by the filters, e.g. to order by a metric
+    return queryset.values(*EXPERIMENTS_VALUES_FIELDS, *queryset.query.annotation_select)
@@ -71,7 +71,7 @@ class ExperimentMetricSerializer(serializers.ModelSerializer):
     class Meta:
         model = ExperimentMetric
         exclude = []
-        extra_kwargs = {'experiment': {'read_only': True}}
+        extra_kwargs = {'experiment': {'read_only': True}, 'hash': {'read_only': True}}
 
 
 class ExperimentChartViewSerializer(serializers.ModelSerializer):
@@ -85,6 +85,7 @@ class ExperimentChartViewSerializer(serializers.ModelSerializer):
 
 class ExperimentLastMetricSerializer(serializers.ModelSerializer):
     uuid = fields.UUIDField(format='hex', read_only=True)
+    unique_name = fields.CharField(read_only=True)
 
     class Meta:
         model = Experiment
@@ -101,6 +102,7 @@ class ExperimentLastMetricSerializer(serializers.ModelSerializer):
 
 class ExperimentDeclarationsSerializer(serializers.ModelSerializer):
     uuid = fields.UUIDField(format='hex', read_only=True)
+    unique_name = fields.CharField(read_only=True)
 
     class Meta:
         model = Experiment
@@ -115,6 +117,7 @@ class ExperimentDeclarationsSerializer(serializers.ModelSerializer):
 
 class ExperimentSerializer(serializers.ModelSerializer):
     uuid = fields.UUIDField(format='hex', read_only=True)
+    unique_name = fields.CharField(read_only=True)
     original = fields.SerializerMethodField()
     user = fields.SerializerMethodField()
     experiment_group = fields.SerializerMethodField()
@@ -170,6 +173,36 @@ class BookmarkedExperimentSerializer(ExperimentSerializer, BookmarkedSerializerM
         fields = ExperimentSerializer.Meta.fields + ('bookmarked',)
 
 
+class ExperimentValuesSerializer(serializers.Serializer):
+    """Serializes the rows of `queries.get_experiments_values` like the `ExperimentSerializer`.
+
+    The rows are plain dicts with the names already built, no model instance is created.
+    """
+    id = fields.IntegerField(read_only=True)
+    uuid = fields.UUIDField(format='hex', read_only=True)
+    name = fields.CharField(read_only=True)
+    unique_name = fields.CharField(source='experiment_name', read_only=True)
+    user = fields.CharField(source='user__username', read_only=True)
+    description = fields.CharField(read_only=True)
+    created_at = fields.DateTimeField(read_only=True)
+    updated_at = fields.DateTimeField(read_only=True)
+    started_at = fields.DateTimeField(read_only=True)
+    finished_at = fields.DateTimeField(read_only=True)
+    last_status = fields.CharField(source='status_name', read_only=True)
+    original = fields.CharField(source='original_name', read_only=True)
+    cloning_strategy = fields.CharField(read_only=True)
+    project = fields.CharField(source='project_name', read_only=True)
+    experiment_group = fields.CharField(source='group_name', read_only=True)
+    build_job = fields.CharField(source='build_name', read_only=True)
+    tags = fields.ListField(child=fields.CharField(), read_only=True)
+    last_metric = fields.JSONField(read_only=True)
+    declarations = fields.JSONField(read_only=True)
+
+
+class BookmarkedExperimentValuesSerializer(ExperimentValuesSerializer, BookmarkedSerializerMixin):
+    bookmarked_model = 'experiment'
+
+
 class ExperimentDetailSerializer(BookmarkedExperimentSerializer,
                                  InClusterMixin,
                                  TagsSerializerMixin,
@@ -203,7 +236,7 @@ class ExperimentDetailSerializer(BookmarkedExperimentSerializer,
         return resources
 
     def get_num_jobs(self, obj):
-        return obj.jobs__count
+        return obj.jobs.count()
 
     def get_last_metric(self, obj):
         return {k: round(v, 7) for k, v in obj.last_metric.items()} if obj.last_metric else None
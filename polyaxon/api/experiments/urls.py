@@ -20,6 +20,8 @@ experiments_urlpatterns = [
             views.ExperimentStopManyView.as_view()),
     re_path(r'^{}/{}/experiments/delete/?$'.format(OWNER_NAME_PATTERN, PROJECT_NAME_PATTERN),
             views.ExperimentDeleteManyView.as_view()),
+    re_path(r'^{}/{}/experiments/export/?$'.format(OWNER_NAME_PATTERN, PROJECT_NAME_PATTERN),
+            views.ProjectExperimentExportView.as_view()),
     re_path(r'^{}/{}/experiments/{}/?$'.format(
         OWNER_NAME_PATTERN, PROJECT_NAME_PATTERN, EXPERIMENT_ID_PATTERN),
         views.ExperimentDetailView.as_view()),
@@ -50,6 +52,12 @@ experiments_urlpatterns = [
     re_path(r'^{}/{}/experiments/{}/metrics/?$'.format(
         OWNER_NAME_PATTERN, PROJECT_NAME_PATTERN, EXPERIMENT_ID_PATTERN),
         views.ExperimentMetricListView.as_view()),
+    re_path(r'^{}/{}/experiments/{}/metrics/series/?$'.format(
+        OWNER_NAME_PATTERN, PROJECT_NAME_PATTERN, EXPERIMENT_ID_PATTERN),
+        views.ExperimentMetricSeriesView.as_view()),
+    re_path(r'^{}/{}/experiments/{}/metrics/export/?$'.format(
+        OWNER_NAME_PATTERN, PROJECT_NAME_PATTERN, EXPERIMENT_ID_PATTERN),
+        views.ExperimentMetricExportView.as_view()),
     re_path(r'^{}/{}/experiments/{}/chartviews/?$'.format(
         OWNER_NAME_PATTERN, PROJECT_NAME_PATTERN, EXPERIMENT_ID_PATTERN),
         views.ExperimentChartViewListView.as_view()),
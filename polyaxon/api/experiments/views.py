@@ -13,9 +13,11 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.settings import api_settings
 
+from django.db import IntegrityError, transaction
 from django.http import StreamingHttpResponse
 
 import auditor
+import conf
 import stores
 
 from api.code_reference.serializers import CodeReferenceSerializer
@@ -41,6 +43,7 @@ from api.endpoint.project import ProjectResourceListEndpoint
 from api.experiments import queries
 from api.experiments.serializers import (
     BookmarkedExperimentSerializer,
+    BookmarkedExperimentValuesSerializer,
     ExperimentChartViewSerializer,
     ExperimentCreateSerializer,
     ExperimentDeclarationsSerializer,
@@ -55,8 +58,11 @@ from api.experiments.serializers import (
 )
 from api.filters import OrderingFilter, QueryFilter
 from api.paginator import LargeLimitOffsetPagination
+from api.utils.export import CSV, get_export_format, get_export_response
 from api.utils.gzip import gzip
 from api.utils.views.bookmarks_mixin import BookmarkedListMixinView
+from api.utils.views.cursor_mixin import CursorPaginationMixinView
+from api.utils.views.etag_mixin import EtagMixinView
 from api.utils.views.protected import ProtectedView
 from constants.experiments import ExperimentLifeCycle
 from db.models.experiment_groups import ExperimentGroup
@@ -97,6 +103,8 @@ from event_manager.events.project import PROJECT_EXPERIMENTS_VIEWED
 from libs.archive import archive_logs_file, archive_outputs, archive_outputs_file
 from libs.spec_validation import validate_experiment_spec_config
 from logs_handlers.log_queries.experiment import process_logs
+from metrics.buffer import buffer_metrics
+from metrics.queries import get_series, parse_series_query
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import LogsCeleryTasks, SchedulerCeleryTasks
 from scopes.authentication.ephemeral import EphemeralAuthentication
@@ -117,6 +125,7 @@ class ExperimentListView(ListAPIView):
 
 
 class ProjectExperimentListView(BookmarkedListMixinView,
+                                CursorPaginationMixinView,
                                 ProjectResourceListEndpoint,
                                 ListEndpoint,
                                 CreateEndpoint):
@@ -129,6 +138,7 @@ class ProjectExperimentListView(BookmarkedListMixinView,
     """
     queryset = queries.experiments
     serializer_class = BookmarkedExperimentSerializer
+    values_serializer_class = BookmarkedExperimentValuesSerializer
     metrics_serializer_class = ExperimentLastMetricSerializer
     declarations_serializer_class = ExperimentDeclarationsSerializer
     create_serializer_class = ExperimentCreateSerializer
@@ -154,7 +164,7 @@ class ProjectExperimentListView(BookmarkedListMixinView,
         if declarations_only:
             return self.declarations_serializer_class
 
-        return self.serializer_class
+        return self.values_serializer_class
 
     @property
     def paginator(self):
@@ -194,7 +204,10 @@ class ProjectExperimentListView(BookmarkedListMixinView,
                        instance=self.project,
                        actor_id=self.request.user.id,
                        actor_name=self.request.user.username)
-        return super().filter_queryset(queryset=queryset)
+        queryset = super().filter_queryset(queryset=queryset)
+        if self.get_serializer_class() is self.values_serializer_class:
+            queryset = queries.get_experiments_values(queryset)
+        return queryset
 
     def perform_create(self, serializer):
         ttl = self.request.data.get(RedisTTL.TTL_KEY)
@@ -223,7 +236,42 @@ class ProjectExperimentListView(BookmarkedListMixinView,
         return super().get(request, *args, **kwargs)
 
 
-class ExperimentDetailView(ExperimentEndpoint,
+class ProjectExperimentExportView(ProjectResourceListEndpoint, RetrieveEndpoint):
+    """
+    get:
+        Export the experiments of a project as a stream of NDJSON or CSV rows.
+    """
+    queryset = Experiment.objects
+    filter_backends = (QueryFilter, OrderingFilter,)
+    query_manager = 'experiment'
+    ordering = ('-updated_at',)
+    ordering_fields = ('created_at', 'updated_at', 'started_at', 'finished_at')
+    ordering_proxy_fields = {'metric': 'last_metric'}
+    EXPORT_FIELDS = ('id', 'name', 'user__username', 'experiment_group_id', 'status_name',
+                     'created_at', 'updated_at', 'started_at', 'finished_at', 'tags',
+                     'declarations', 'last_metric')
+
+    def get(self, request, *args, **kwargs):
+        try:
+            export_format = get_export_format(request.query_params)
+        except ValueError as e:
+            raise ValidationError(str(e))
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values(*self.EXPORT_FIELDS).iterator(
+            chunk_size=conf.get('EXPORTS_CHUNK_SIZE'))
+        auditor.record(event_type=PROJECT_EXPERIMENTS_VIEWED,
+                       instance=self.project,
+                       actor_id=request.user.id,
+                       actor_name=request.user.username)
+        return get_export_response(request=request,
+                                   rows=rows,
+                                   export_format=export_format,
+                                   fields=list(self.EXPORT_FIELDS),
+                                   filename='{}.experiments'.format(self.project.name))
+
+
+class ExperimentDetailView(EtagMixinView,
+                           ExperimentEndpoint,
                            RetrieveEndpoint,
                            DestroyEndpoint,
                            UpdateEndpoint):
@@ -237,6 +285,7 @@ class ExperimentDetailView(ExperimentEndpoint,
     """
     queryset = queries.experiments_details
     serializer_class = ExperimentDetailSerializer
+    etag_object = 'experiment'
     AUDITOR_EVENT_TYPES = {
         'GET': EXPERIMENT_VIEWED,
         'UPDATE': EXPERIMENT_UPDATED,
@@ -476,7 +525,8 @@ class ExperimentOutputsFilesView(ExperimentEndpoint, RetrieveEndpoint):
                             data='Outputs file not found: log_path={}'.format(download_filepath))
 
 
-class ExperimentStatusListView(ExperimentResourceListEndpoint,
+class ExperimentStatusListView(EtagMixinView,
+                               ExperimentResourceListEndpoint,
                                ListEndpoint,
                                CreateEndpoint):
     """
@@ -487,6 +537,7 @@ class ExperimentStatusListView(ExperimentResourceListEndpoint,
     """
     queryset = ExperimentStatus.objects.order_by('created_at')
     serializer_class = ExperimentStatusSerializer
+    etag_object = 'experiment'
     authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES + [
         InternalAuthentication,
     ]
@@ -503,7 +554,8 @@ class ExperimentStatusListView(ExperimentResourceListEndpoint,
         return response
 
 
-class ExperimentMetricListView(ExperimentResourceEndpoint,
+class ExperimentMetricListView(EtagMixinView,
+                               ExperimentResourceEndpoint,
                                ListEndpoint,
                                CreateEndpoint):
     """
@@ -514,6 +566,7 @@ class ExperimentMetricListView(ExperimentResourceEndpoint,
     """
     queryset = ExperimentMetric.objects
     serializer_class = ExperimentMetricSerializer
+    etag_object = 'experiment'
     authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES + [
         InternalAuthentication,
     ]
@@ -521,7 +574,17 @@ class ExperimentMetricListView(ExperimentResourceEndpoint,
     throttle_scope = 'high'
 
     def perform_create(self, serializer):
-        serializer.save(experiment=self.experiment)
+        try:
+            with transaction.atomic():
+                serializer.save(experiment=self.experiment)
+        except IntegrityError:
+            # A retried report of the same step and values, the stored metric is returned
+            values = serializer.validated_data['values']
+            step = serializer.validated_data.get('step')
+            serializer.instance = ExperimentMetric.objects.get(
+                experiment=self.experiment,
+                step=step if step is not None else ExperimentMetric.get_step(values),
+                hash=ExperimentMetric.get_hash(values))
 
     def get_serializer(self, *args, **kwargs):
         """ if an array is passed, set serializer to many """
@@ -529,7 +592,27 @@ class ExperimentMetricListView(ExperimentResourceEndpoint,
             kwargs['many'] = True
         return super().get_serializer(*args, **kwargs)
 
+    def buffer(self, request):
+        """Validates the metrics and appends them to the experiment's buffer.
+
+        The metrics are written to the database by the periodic flusher,
+        the buffer size is returned in the `X-Metrics-Backlog` header.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        metrics = serializer.validated_data
+        if not isinstance(request.data, list):
+            metrics = [metrics]
+        backlog = buffer_metrics(experiment_id=self.experiment.id, metrics=metrics)
+        headers = {'X-Metrics-Backlog': str(backlog)}
+        if isinstance(request.data, list):
+            return Response(status=status.HTTP_201_CREATED, headers=headers)
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
     def create(self, request, *args, **kwargs):
+        if conf.get('METRICS_BUFFER_ENABLED'):
+            return self.buffer(request)
+
         if isinstance(request.data, list):
             celery_app.send_task(
                 SchedulerCeleryTasks.EXPERIMENTS_SET_METRICS,
@@ -555,6 +638,59 @@ class ExperimentMetricListView(ExperimentResourceEndpoint,
         return response
 
 
+class ExperimentMetricSeriesView(ExperimentResourceListEndpoint, RetrieveEndpoint):
+    """
+    get:
+        Get the downsampled series of an experiment's metrics.
+    """
+
+    @gzip()
+    def get(self, request, *args, **kwargs):
+        try:
+            query = parse_series_query(request.query_params)
+        except ValueError as e:
+            raise ValidationError(str(e))
+        series = get_series(experiment_id=self.experiment.id, query=query)
+        auditor.record(event_type=EXPERIMENT_METRICS_VIEWED,
+                       instance=self.experiment,
+                       actor_id=request.user.id,
+                       actor_name=request.user.username)
+        return Response(series)
+
+
+class ExperimentMetricExportView(ExperimentResourceListEndpoint, RetrieveEndpoint):
+    """
+    get:
+        Export all metrics of an experiment as a stream of NDJSON or CSV rows.
+
+        CSV rows have a column by metric name, NDJSON rows keep the reported values.
+    """
+
+    def get(self, request, *args, **kwargs):
+        try:
+            export_format = get_export_format(request.query_params)
+        except ValueError as e:
+            raise ValidationError(str(e))
+        rows = ExperimentMetric.objects.filter(experiment=self.experiment).values(
+            'id', 'created_at', 'values').order_by('created_at', 'id').iterator(
+            chunk_size=conf.get('EXPORTS_CHUNK_SIZE'))
+        fields = ['id', 'created_at', 'values']
+        if export_format == CSV:
+            # The last metric holds all the reported names, it avoids a scan of the values
+            fields = ['id', 'created_at'] + sorted((self.experiment.last_metric or {}).keys())
+            rows = ({'id': row['id'], 'created_at': row['created_at'], **(row['values'] or {})}
+                    for row in rows)
+        auditor.record(event_type=EXPERIMENT_METRICS_VIEWED,
+                       instance=self.experiment,
+                       actor_id=request.user.id,
+                       actor_name=request.user.username)
+        return get_export_response(request=request,
+                                   rows=rows,
+                                   export_format=export_format,
+                                   fields=fields,
+                                   filename='{}.metrics'.format(self.experiment.id))
+
+
 class ExperimentStatusDetailView(ExperimentResourceEndpoint, RetrieveEndpoint):
     """Get experiment status details."""
     queryset = ExperimentStatus.objects
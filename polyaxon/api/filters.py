@@ -10,6 +10,7 @@ from django.db.models.sql.constants import ORDER_PATTERN
 # pylint:disable=ungrouped-imports
 import query
 
+from metrics.indexes import record_keys
 from query.exceptions import QueryError
 
 
@@ -68,6 +69,7 @@ class OrderingFilter(BaseOrderingFilter):
             if field in proxy_fields:
                 result_fields.append('{}{}'.format(negation, suffix))
                 annotation[suffix] = KeyTransform(suffix, proxy_fields[field])
+                record_keys(field=proxy_fields[field], keys=[suffix])
 
         return result_fields, annotation
 
@@ -0,0 +1,26 @@
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from django.http import Http404, HttpResponse
+
+import stats
+
+from scopes.authentication.internal import InternalAuthentication
+from scopes.permissions.stats import IsStatsScraper
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsView(APIView):
+    """Exposes the process stats in the prometheus text format,
+    only available with the prometheus stats backend."""
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES + [
+        InternalAuthentication,
+    ]
+    permission_classes = (IsStatsScraper,)
+
+    def get(self, request, *args, **kwargs):
+        render = getattr(stats.backend, 'render', None)
+        if render is None:
+            raise Http404
+        return HttpResponse(render(), content_type=PROMETHEUS_CONTENT_TYPE)
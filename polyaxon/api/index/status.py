@@ -2,7 +2,7 @@ from rest_framework.generics import RetrieveAPIView
 from rest_framework.response import Response
 from rest_framework.throttling import AnonRateThrottle
 
-from checks.status import get_status
+from checks.status import get_latencies, get_status
 
 
 class HealthRateThrottle(AnonRateThrottle):
@@ -15,3 +15,19 @@ class StatusView(RetrieveAPIView):
 
     def retrieve(self, request, *args, **kwargs):
         return Response(get_status())
+
+
+class StatusLatencyView(RetrieveAPIView):
+    authentication_classes = ()
+    throttle_classes = (HealthRateThrottle,)
+
+    def retrieve(self, request, *args, **kwargs):
+        latencies = {}
+        for name, values in get_latencies().items():
+            latencies[name] = {
+                'last': values[-1] if values else None,
+                'max': max(values) if values else None,
+                'mean': sum(values) / len(values) if values else None,
+                'history': values,
+            }
+        return Response(latencies)
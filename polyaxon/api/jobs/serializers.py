@@ -19,6 +19,7 @@ class JobStatusSerializer(serializers.ModelSerializer):
 
 class JobSerializer(serializers.ModelSerializer):
     uuid = fields.UUIDField(format='hex', read_only=True)
+    unique_name = fields.CharField(read_only=True)
     user = fields.SerializerMethodField()
     project = fields.SerializerMethodField()
     build_job = fields.SerializerMethodField()
@@ -37,6 +37,7 @@ from api.jobs.serializers import (
     JobStatusSerializer
 )
 from api.utils.views.bookmarks_mixin import BookmarkedListMixinView
+from api.utils.views.cursor_mixin import CursorPaginationMixinView
 from api.utils.views.protected import ProtectedView
 from db.models.jobs import Job, JobStatus
 from db.redis.heartbeat import RedisHeartBeat
@@ -68,6 +69,7 @@ _logger = logging.getLogger("polyaxon.views.jobs")
 
 
 class ProjectJobListView(BookmarkedListMixinView,
+                         CursorPaginationMixinView,
                          ProjectResourceListEndpoint,
                          ListEndpoint,
                          CreateEndpoint):
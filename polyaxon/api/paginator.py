@@ -1,5 +1,187 @@
-from rest_framework.pagination import LimitOffsetPagination
+import base64
+import binascii
+import json
+
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+from hestia.bool_utils import to_bool
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, LimitOffsetPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connection
+from django.db.models import Q
 
 
 class LargeLimitOffsetPagination(LimitOffsetPagination):
     default_limit = 300000
+
+
+class SmallLimitOffsetPagination(LimitOffsetPagination):
+    """For lists with a heavy payload per row, e.g. the metrics of experiments."""
+    default_limit = 20
+    max_limit = 100
+
+
+def get_approximate_count(queryset: Any, cap: int) -> int:
+    """Returns the table's estimated size for an unfiltered queryset, or a count capped to `cap`."""
+    if not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                           [queryset.model._meta.db_table])  # pylint:disable=protected-access
+            row = cursor.fetchone()
+        if row and row[0] > 0:
+            return row[0]
+    return queryset.order_by()[:cap].count()
+
+
+class KeysetPagination(BasePagination):
+    """Paginates a queryset by the position of the last row of the previous page.
+
+    The ordering of the queryset, e.g. set by the `OrderingFilter`, is completed with the id,
+    the opaque cursor encodes the ordering values of the last row,
+    and the next page is filtered on the rows after it;
+    pages are read from the index instead of scanning and discarding all previous rows.
+
+    The count is only computed if requested with `count=true`,
+    it's the table's estimated size for unfiltered lists or a count capped to `count_cap`.
+    """
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    count_query_param = 'count'
+    default_limit = 100
+    max_limit = 1000
+    count_cap = 10000
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.ordering = self.get_ordering(queryset)
+        queryset = queryset.order_by(*self.ordering)
+        self.count = self.get_count(queryset, request)
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(queryset, position))
+
+        results = list(queryset[:self.limit + 1])
+        self.next_position = None
+        if len(results) > self.limit:
+            results = results[:self.limit]
+            self.next_position = self.get_position(results[-1])
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('results', data)
+        ]))
+
+    def get_limit(self, request) -> int:
+        try:
+            return _positive_int(request.query_params[self.limit_query_param],
+                                 strict=True,
+                                 cutoff=self.max_limit)
+        except (KeyError, ValueError):
+            return self.default_limit
+
+    def get_count(self, queryset: Any, request) -> Optional[int]:
+        count = to_bool(request.query_params.get(self.count_query_param),
+                        handle_none=True,
+                        exception=ValidationError)
+        if not count:
+            return None
+        return get_approximate_count(queryset=queryset, cap=self.count_cap)
+
+    @staticmethod
+    def get_ordering(queryset: Any) -> List[str]:
+        """Returns the ordering of the queryset ending with the id as a tie breaker."""
+        ordering = [field for field in
+                    queryset.query.order_by or queryset.query.get_meta().ordering or []
+                    if isinstance(field, str)]
+        fields = []
+        for field in ordering:
+            if field.lstrip('-') in ('id', 'pk'):
+                return fields + [field.replace('pk', 'id')]
+            fields.append(field)
+        descending = fields[0].startswith('-') if fields else True
+        return fields + ['-id' if descending else 'id']
+
+    def get_position(self, instance: Any) -> List:
+        position = []
+        for field in self.ordering:
+            value = instance
+            # Rows can be instances or values dicts
+            if isinstance(value, dict):
+                value = value.get(field.lstrip('-'))
+            else:
+                for attr in field.lstrip('-').split('__'):
+                    value = getattr(value, attr, None)
+            position.append(value)
+        return position
+
+    @staticmethod
+    def is_nullable(queryset: Any, name: str) -> bool:
+        try:
+            return queryset.model._meta.get_field(name).null  # pylint:disable=protected-access
+        except FieldDoesNotExist:
+            # Annotations, e.g. metrics, and related fields
+            return True
+
+    def get_position_filter(self, queryset: Any, position: List) -> Q:
+        """Returns the condition on the rows after the position in the ordering.
+
+        Postgres sorts nulls last in ascending order and first in descending order.
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            descending = field.startswith('-')
+            if value is None:
+                if descending:
+                    condition |= equal & Q(**{'{}__isnull'.format(name): False})
+                equal &= Q(**{'{}__isnull'.format(name): True})
+                continue
+
+            after = Q(**{'{}__{}'.format(name, 'lt' if descending else 'gt'): value})
+            if not descending and self.is_nullable(queryset, name):
+                after |= Q(**{'{}__isnull'.format(name): True})
+            condition |= equal & after
+            equal &= Q(**{name: value})
+        return condition
+
+    @staticmethod
+    def _encode_value(value: Any) -> Any:
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        raise TypeError('Value `{}` is not serializable.'.format(value))
+
+    def encode_cursor(self, position: List) -> str:
+        data = json.dumps(position, default=self._encode_value, separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def decode_cursor(self, request) -> Optional[List]:
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        except (TypeError, ValueError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        # The ordering changed since the cursor was created
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def get_next_link(self) -> Optional[str]:
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param,
+                                   self.encode_cursor(self.next_position))
@@ -8,7 +8,8 @@ import conf
 
 from api.index.errors import Handler50xView, Handler403View, Handler404View  # noqa
 from api.index.health import HealthView
-from api.index.status import StatusView
+from api.index.metrics import MetricsView
+from api.index.status import StatusLatencyView, StatusView
 from api.index.views import IndexView, ReactIndexView
 from api.users.views import LogoutView
 from constants.urls import API_V1
@@ -62,7 +63,9 @@ urlpatterns = [
             name='login'),
 
     re_path(r'^_health/?$', HealthView.as_view(), name='health_check'),
+    re_path(r'^_status/latency/?$', StatusLatencyView.as_view(), name='status_latency'),
     re_path(r'^_status/?$', StatusView.as_view(), name='status_check'),
+    re_path(r'^_metrics/?$', MetricsView.as_view(), name='metrics'),
     re_path(r'^{}/'.format(API_V1), include((api_patterns, 'v1'), namespace='v1')),
     re_path(r'^$', IndexView.as_view(), name='index'),
     re_path(r'^50x.html$', Handler50xView.as_view(), name='50x'),
@@ -2,6 +2,7 @@ from rest_framework import fields, serializers
 
 from api.utils.serializers.bookmarks import BookmarkedSerializerMixin
 from api.utils.serializers.tags import TagsSerializerMixin
+from db.counters import count_experiments, get_experiments_counts
 from db.models.projects import Project
 
 
@@ -63,13 +64,14 @@ class ProjectDetailSerializer(BookmarkedProjectSerializer, TagsSerializerMixin):
         )
 
     def get_num_independent_experiments(self, obj):
-        return obj.experiments.filter(experiment_group__isnull=True).count()
+        return count_experiments(counts=get_experiments_counts(project_id=obj.id,
+                                                               independent=True))
 
     def get_num_experiment_groups(self, obj):
         return obj.experiment_groups.count()
 
     def get_num_experiments(self, obj):
-        return obj.experiments.count()
+        return count_experiments(counts=get_experiments_counts(project_id=obj.id))
 
     def get_num_jobs(self, obj):
         return obj.jobs.count()
@@ -6,6 +6,7 @@ from rest_framework.response import Response
 
 import auditor
 
+from access.context import get_access_context
 from api.endpoint.admin import AdminProjectListPermission, AdminResourceEndpoint
 from api.endpoint.base import (
     CreateEndpoint,
@@ -57,8 +58,7 @@ class ProjectListView(BookmarkedListMixinView, AdminResourceEndpoint, ListEndpoi
     serializer_class = BookmarkedProjectSerializer
 
     def filter_queryset(self, queryset):
-        if self.request.access.public_only:
-            queryset = queryset.filter(is_public=True)
+        queryset = get_access_context(self.request).filter_queryset_by_access(queryset)
         return super().filter_queryset(queryset=queryset)
 
 
@@ -0,0 +1,98 @@
+import csv
+import zlib
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Mapping
+
+from django.http import StreamingHttpResponse
+
+import conf
+
+from libs.json_utils import dumps
+
+NDJSON = 'ndjson'
+CSV = 'csv'
+FORMATS = {NDJSON, CSV}
+
+CONTENT_TYPES = {
+    NDJSON: 'application/x-ndjson',
+    CSV: 'text/csv',
+}
+
+
+class _Echo(object):
+    """A file-like object that returns the written value instead of buffering it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _to_cell(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return dumps(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def get_export_format(params: Mapping) -> str:
+    export_format = params.get('output') or NDJSON
+    if export_format not in FORMATS:
+        raise ValueError('Export output `{}` is not supported, '
+                         'the supported outputs are: {}.'.format(export_format, sorted(FORMATS)))
+    return export_format
+
+
+def iter_ndjson(rows: Iterable[Dict]) -> Iterator[bytes]:
+    for row in rows:
+        yield (dumps(row) + '\n').encode()
+
+
+def iter_csv(rows: Iterable[Dict], fields: List[str]) -> Iterator[bytes]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields).encode()
+    for row in rows:
+        yield writer.writerow([_to_cell(row.get(field)) for field in fields]).encode()
+
+
+def iter_gzip(chunks: Iterable[bytes], level: int = None) -> Iterator[bytes]:
+    """Compresses the chunks incrementally, the compressor only keeps its window in memory."""
+    level = conf.get('EXPORTS_COMPRESSION_LEVEL') if level is None else level
+    # wbits 16 + MAX_WBITS writes a gzip header and trailer instead of a zlib one
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def accepts_gzip(request) -> bool:
+    return 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+
+
+def get_export_response(request,
+                        rows: Iterable[Dict],
+                        export_format: str,
+                        fields: List[str],
+                        filename: str) -> StreamingHttpResponse:
+    """Streams the rows as NDJSON or CSV, gzipped if the client accepts it.
+
+    `rows` should be lazy (e.g. `queryset.iterator()`), nothing is rendered before streaming.
+    """
+    if export_format == CSV:
+        content = iter_csv(rows, fields=fields)
+    else:
+        content = iter_ndjson(rows)
+
+    compress = accepts_gzip(request)
+    if compress:
+        content = iter_gzip(content)
+
+    response = StreamingHttpResponse(content, content_type=CONTENT_TYPES[export_format])
+    response['Content-Disposition'] = 'attachment; filename={}.{}'.format(filename,
+                                                                          export_format)
+    response['Vary'] = 'Accept-Encoding'
+    if compress:
+        response['Content-Encoding'] = 'gzip'
+    return response
@@ -10,10 +10,18 @@ class BookmarkedSerializerMixin(serializers.Serializer):
     bookmarked = serializers.SerializerMethodField()
 
     def get_bookmarked(self, obj):
-        bookmarks = self.context.get('bookmarks', None)
+        # Lean lists serialize values rows
+        if isinstance(obj, dict):
+            bookmarked, object_id = obj.get('bookmarked'), obj['id']
+        else:
+            bookmarked, object_id = getattr(obj, 'bookmarked', None), obj.id
+        # List views annotate the queryset, see `annotate_bookmarked`
+        if bookmarked is not None:
+            return bookmarked
 
+        bookmarks = self.context.get('bookmarks', None)
         if bookmarks is not None:
-            return obj.id in bookmarks
+            return object_id in bookmarks
         else:
             # Get the requesting user if set in the context
             request = self.context.get('request', None)
@@ -21,6 +29,6 @@ class BookmarkedSerializerMixin(serializers.Serializer):
                 return Bookmark.objects.filter(
                     user=request.user,
                     content_type__model=self.bookmarked_model,
-                    object_id=obj.id,
+                    object_id=object_id,
                     enabled=True).exists()
         return False
@@ -1,29 +1,38 @@
+from typing import Any
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Exists, OuterRef
+
 from api.utils.serializers.bookmarks import BookmarkedSerializerMixin
 from db.models.bookmarks import Bookmark
+from scopes.authentication.utils import is_user
 
 
-class BookmarkedListMixinView(object):
-    def get_serializer(self, *args, **kwargs):
-        serializer_class = self.get_serializer_class()
-        if not issubclass(serializer_class, BookmarkedSerializerMixin):
-            return super().get_serializer(*args, **kwargs)
+def annotate_bookmarked(queryset: Any, user: Any, model_name: str) -> Any:
+    """Annotates each object with `bookmarked`, whether the user bookmarked it.
 
-        queryset = args[0]
+    The `EXISTS` subquery uses the bookmarks' object id, so it is only evaluated
+    for the rows returned, i.e. the current page.
+    """
+    content_type = ContentType.objects.get_by_natural_key(app_label='db', model=model_name)
+    bookmarks = Bookmark.objects.filter(
+        user=user,
+        content_type=content_type,
+        object_id=OuterRef('pk'),
+        enabled=True)
+    return queryset.annotate(bookmarked=Exists(bookmarks))
 
-        if not queryset:
-            return super().get_serializer(*args, **kwargs)
 
-        object_ids = [o.id for o in queryset]
+class BookmarkedListMixinView(object):
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, BookmarkedSerializerMixin):
+            return queryset
 
-        # Batch-get all the bookmarks for the objects in the queryset
-        # and pass them on to the serializer
-        bookmarks = Bookmark.objects.filter(
-            user=self.request.user,
-            content_type__model=self.serializer_class.bookmarked_model,
-            object_id__in=object_ids,
-            enabled=True).values_list('object_id', flat=True)
+        if not is_user(self.request.user):
+            return queryset
 
-        context = self.get_serializer_context()
-        context['bookmarks'] = list(bookmarks)
-        kwargs['context'] = context
-        return serializer_class(*args, **kwargs)
+        return annotate_bookmarked(queryset=queryset,
+                                   user=self.request.user,
+                                   model_name=serializer_class.bookmarked_model)
@@ -0,0 +1,13 @@
+from api.paginator import KeysetPagination
+
+
+class CursorPaginationMixinView(object):
+    """Paginates the list with a keyset cursor when the `cursor` param is set, even empty."""
+    cursor_pagination_class = KeysetPagination
+
+    @property
+    def paginator(self):
+        if (not hasattr(self, '_paginator') and
+                self.cursor_pagination_class.cursor_query_param in self.request.query_params):
+            self.pagination_class = self.cursor_pagination_class
+        return super().paginator
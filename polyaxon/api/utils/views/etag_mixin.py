@@ -0,0 +1,72 @@
+import hashlib
+
+from typing import Optional
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from django.http import HttpRequest
+from django.utils.http import parse_etags, quote_etag
+
+from db.etags import get_version
+
+
+class NotModified(Exception):
+    pass
+
+
+class EtagMixinView(object):
+    """Answers the conditional GET requests with a 304 before querying and serializing the data.
+
+    The ETag is built from the `updated_at` and `status_id` of the context's `etag_object`,
+    e.g. the experiment, and its version counter in redis, incremented by the changes
+    that do not update the object's row, e.g. new metrics, jobs or bookmarks.
+    The path, format, requester and project are part of the ETag as well.
+
+    No ETag is set if redis is not available.
+    """
+    etag_object = None  # The name of the context object, e.g. `experiment`
+    _etag = None
+
+    def get_etag(self) -> Optional[str]:
+        instance = getattr(self, self.etag_object)
+        version = get_version(entity=instance._meta.model_name,  # pylint:disable=protected-access
+                              entity_id=instance.id)
+        if version is None:
+            return None
+
+        project = getattr(self, 'project', None)
+        value = ':'.join(str(part) for part in [
+            self.request.get_full_path(),
+            self.request.accepted_media_type,
+            getattr(self.request.user, 'id', None),
+            project.updated_at.isoformat() if project else None,
+            instance.updated_at.isoformat(),
+            getattr(instance, 'status_id', None),
+            version,
+        ])
+        return quote_etag(hashlib.md5(value.encode()).hexdigest())
+
+    def initialize_context(self, request: HttpRequest, *args, **kwargs) -> None:
+        super().initialize_context(request, *args, **kwargs)
+        if request.method not in ('GET', 'HEAD'):
+            return
+        #  pylint:disable=attribute-defined-outside-init
+        self._etag = self.get_etag()
+        if not self._etag:
+            return
+        etags = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+        if self._etag in etags or etags == ['*']:
+            raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self._etag and response.status_code in (status.HTTP_200_OK,
+                                                   status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = self._etag
+        return response
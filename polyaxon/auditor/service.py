@@ -22,13 +22,9 @@ class AuditorService(EventService):
         if self.ref_id:
             return self.ref_id
 
-        from db.models.clusters import Cluster
-        from django.db import InterfaceError, OperationalError, ProgrammingError
-        try:
-            self.ref_id = Cluster.load().uuid
-        except (Cluster.DoesNotExist, InterfaceError, ProgrammingError, OperationalError):
-            pass
-        return self.ref_id
+        from tracker.cache import cluster_cache
+
+        return cluster_cache.get_ref_id()
 
     def record_event(self, event: Event) -> None:
         """
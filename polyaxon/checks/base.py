@@ -1,4 +1,11 @@
 class Check(object):
+    NAME = None
+    TIMEOUT = None
+
+    @classmethod
+    def get_name(cls) -> str:
+        return cls.NAME or cls.__name__
+
     @classmethod
     def run(cls):
         raise NotImplementedError
@@ -0,0 +1,137 @@
+import threading
+import time
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Dict, Iterable, List, Optional
+
+from django.db import connections
+
+from checks.base import Check
+from checks.results import Result
+
+
+class HealthCheckEngine(object):
+    """Runs health checks concurrently, with a timeout per check, and caches the results.
+
+    Each check is run in its own thread, a check that did not finish before its timeout
+    (the check's `TIMEOUT` or the engine's default) is reported as an error without waiting for it.
+    The results are kept for `ttl` seconds, so that frequent probes do not hit the services,
+    and the latency of the last `history_size` runs of each check is kept in memory.
+
+    Only one run happens at a time, concurrent callers wait for it and share its results.
+    The workers are reused across runs, and a check still running from a previous run,
+    e.g. a hung check, is awaited again instead of being started in a new thread.
+    """
+
+    def __init__(self,
+                 checks: Iterable[Check],
+                 timeout: float = None,
+                 ttl: float = None,
+                 history_size: int = 100) -> None:
+        self.checks = list(checks)
+        self._timeout = timeout
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._executor = None
+        self._futures = {}  # type: Dict[str, Future]
+        self._results = None
+        self._results_at = None
+        self._latencies = {}  # type: Dict[str, deque]
+        self._history_size = history_size
+
+    @property
+    def timeout(self) -> float:
+        if self._timeout is not None:
+            return self._timeout
+
+        import conf
+
+        return conf.get('HEALTH_CHECK_TIMEOUT')
+
+    @property
+    def ttl(self) -> float:
+        if self._ttl is not None:
+            return self._ttl
+
+        import conf
+
+        return conf.get('HEALTH_CHECK_CACHE_TTL')
+
+    def _record_latency(self, name: str, latency: float) -> None:
+        if name not in self._latencies:
+            self._latencies[name] = deque(maxlen=self._history_size)
+        self._latencies[name].append(latency)
+
+    def _run_check(self, check: Check) -> Dict:
+        start = time.monotonic()
+        try:
+            return check.run()
+        except Exception as e:
+            return {check.get_name(): Result(
+                message='Service check raised an "{}" error.'.format(e),
+                severity=Result.ERROR)}
+        finally:
+            with self._lock:
+                self._record_latency(check.get_name(), time.monotonic() - start)
+            # Checks run in worker threads, each one opens its own db connection
+            connections.close_all()
+
+    def get_timeout(self, check: Check) -> float:
+        return check.TIMEOUT or self.timeout
+
+    def _submit(self, check: Check) -> Future:
+        if self._executor is None:
+            # Each check has at most one future in flight, so one worker per check is enough
+            self._executor = ThreadPoolExecutor(max_workers=max(len(self.checks), 1))
+        future = self._futures.get(check.get_name())
+        if future is None or future.done():
+            future = self._executor.submit(self._run_check, check)
+            self._futures[check.get_name()] = future
+        return future
+
+    def _run(self) -> Dict[str, Result]:
+        start = time.monotonic()
+        futures = [(check, self._submit(check)) for check in self.checks]
+
+        results = {}
+        for check, future in sorted(futures, key=lambda f: self.get_timeout(f[0])):
+            timeout = self.get_timeout(check)
+            try:
+                results.update(future.result(timeout=max(start + timeout - time.monotonic(), 0)))
+            except FuturesTimeoutError:
+                results[check.get_name()] = Result(
+                    message='Service check timed out after {}s.'.format(timeout),
+                    severity=Result.ERROR)
+        return results
+
+    def _is_fresh(self) -> bool:
+        return self._results_at is not None and time.monotonic() - self._results_at < self.ttl
+
+    def run(self, force: bool = False) -> Dict[str, Result]:
+        if not force and self._is_fresh():
+            return self._results
+
+        with self._run_lock:
+            # The results might have been refreshed by the run we waited for
+            if not force and self._is_fresh():
+                return self._results
+            results = self._run()
+            with self._lock:
+                self._results = results
+                self._results_at = time.monotonic()
+        return results
+
+    def get_latencies(self, name: Optional[str] = None) -> Dict[str, List[float]]:
+        with self._lock:
+            if name:
+                return {name: list(self._latencies.get(name, []))}
+            return {key: list(value) for key, value in self._latencies.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results = None
+            self._results_at = None
+            self._latencies = {}
@@ -7,6 +7,8 @@ from checks.results import Result
 
 
 class PostgresCheck(Check):
+    NAME = 'POSTGRES'
+
     @staticmethod
     def pg_health() -> Result:
         try:
@@ -14,6 +14,7 @@ logger = logging.getLogger(__name__)
 
 
 class RabbitMQCheck(Check):
+    NAME = 'RABBITMQ'
 
     @staticmethod
     def check() -> Result:
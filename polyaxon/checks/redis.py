@@ -12,6 +12,7 @@ from db.redis.to_stream import RedisToStream
 
 
 class RedisCheck(Check):
+    NAME = 'REDIS'
 
     @staticmethod
     def redis_health(connection) -> Result:
@@ -1,6 +1,7 @@
-from typing import Dict
+from typing import Dict, List
 
 from checks.crons import CronsCheck
+from checks.engine import HealthCheckEngine
 from checks.events import EventsCheck
 from checks.hpsearch import HPSearchCheck
 from checks.k8s_events import K8SEventsCheck
@@ -12,18 +13,25 @@ from checks.redis import RedisCheck
 from checks.scheduler import SchedulerCheck
 from checks.streams import StreamsCheck
 
+engine = HealthCheckEngine(checks=[
+    CronsCheck,
+    EventsCheck,
+    LogsCheck,
+    K8SEventsCheck,
+    HPSearchCheck,
+    PipelinesCheck,
+    PostgresCheck,
+    RabbitMQCheck,
+    RedisCheck,
+    SchedulerCheck,
+    StreamsCheck,
+])
 
-def get_status() -> Dict:
-    status = {}
-    status.update(CronsCheck.run())
-    status.update(EventsCheck.run())
-    status.update(LogsCheck.run())
-    status.update(K8SEventsCheck.run())
-    status.update(HPSearchCheck.run())
-    status.update(PipelinesCheck.run())
-    status.update(PostgresCheck.run())
-    status.update(RabbitMQCheck.run())
-    status.update(RedisCheck.run())
-    status.update(SchedulerCheck.run())
-    status.update(StreamsCheck.run())
+
+def get_status(force: bool = False) -> Dict:
+    status = engine.run(force=force)
     return {k: v.to_dict() for k, v in status.items()}
+
+
+def get_latencies() -> Dict[str, List[float]]:
+    return engine.get_latencies()
@@ -8,6 +8,7 @@ from libs.api import get_settings_ws_api_url
 
 
 class StreamsCheck(Check):
+    NAME = 'STREAMS'
 
     @classmethod
     def run(cls) -> Dict:
@@ -14,6 +14,10 @@ class WorkerCheck(Check):
     WORKER_HEALTH_TASK = None
     WORKER_NAME = None
 
+    @classmethod
+    def get_name(cls) -> str:
+        return cls.WORKER_NAME
+
     @classmethod
     def run(cls) -> Dict:
         timeout = conf.get('HEALTH_CHECK_WORKER_TIMEOUT')
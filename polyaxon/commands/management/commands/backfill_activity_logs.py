@@ -0,0 +1,30 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from db.backfills import backfill_activity_log_projects
+from db.models.activitylogs import ActivityLog
+
+_logger = logging.getLogger('polyaxon.commands')
+
+
+class Command(BaseCommand):
+    """Management utility to backfill the project column of the activity logs.
+
+    The update is done in chunks of ids, each chunk in its own transaction.
+    """
+    help = 'Used to backfill the project_id column of the activity logs.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=1000,
+            help='Specifies the number of rows to update per transaction.',
+        )
+
+    def handle(self, *args, **options):
+        updated = backfill_activity_log_projects(model=ActivityLog,
+                                                 chunk_size=options['chunk_size'])
+        _logger.info('Backfilled %s activity logs.', updated)
@@ -0,0 +1,38 @@
+import logging
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from db.backfills import STATUS_MODELS, backfill_status_columns
+
+_logger = logging.getLogger('polyaxon.commands')
+
+
+class Command(BaseCommand):
+    """Management utility to backfill the denormalized last status columns.
+
+    The update is done in chunks of ids, each chunk in its own transaction.
+    """
+    help = 'Used to backfill the status_name/status_at columns from the last statuses.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--model',
+            dest='models',
+            action='append',
+            choices=STATUS_MODELS,
+            help='Specifies a model to backfill, by default all models are backfilled.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=1000,
+            help='Specifies the number of rows to update per transaction.',
+        )
+
+    def handle(self, *args, **options):
+        for model_name in options['models'] or STATUS_MODELS:
+            updated = backfill_status_columns(model=apps.get_model('db', model_name),
+                                              chunk_size=options['chunk_size'])
+            _logger.info('Backfilled %s rows for %s.', updated, model_name)
@@ -0,0 +1,38 @@
+import logging
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from db.backfills import UNIQUE_NAME_MODELS, backfill_unique_names
+
+_logger = logging.getLogger('polyaxon.commands')
+
+
+class Command(BaseCommand):
+    """Management utility to backfill the denormalized unique name columns.
+
+    The update is done in chunks of ids, each chunk in its own transaction.
+    """
+    help = 'Used to backfill the unique_name columns of experiments, groups and jobs.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--model',
+            dest='models',
+            action='append',
+            choices=UNIQUE_NAME_MODELS,
+            help='Specifies a model to backfill, by default all models are backfilled.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=1000,
+            help='Specifies the number of rows to update per transaction.',
+        )
+
+    def handle(self, *args, **options):
+        for model_name in options['models'] or UNIQUE_NAME_MODELS:
+            updated = backfill_unique_names(model=apps.get_model('db', model_name),
+                                            chunk_size=options['chunk_size'])
+            _logger.info('Backfilled %s rows for %s.', updated, model_name)
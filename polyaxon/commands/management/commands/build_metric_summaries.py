@@ -0,0 +1,46 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from db.models.experiments import ExperimentMetric, ExperimentMetricSummary
+from metrics.summaries import rebuild_summaries
+
+_logger = logging.getLogger('polyaxon.commands')
+
+
+class Command(BaseCommand):
+    """Management utility to build the metric summaries from the existing experiment metrics.
+
+    By default only the experiments without summaries are built,
+    each experiment is built in its own transaction.
+    """
+    help = 'Used to build the metric summaries from the existing experiment metrics.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--experiment',
+            dest='experiments',
+            action='append',
+            type=int,
+            help='Specifies an experiment id to build, it will be rebuilt if already built.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            dest='batch_size',
+            type=int,
+            default=1000,
+            help='Specifies the number of metric rows to read per query.',
+        )
+
+    def handle(self, *args, **options):
+        experiment_ids = options['experiments']
+        if not experiment_ids:
+            built = ExperimentMetricSummary.objects.values('experiment_id')
+            experiment_ids = ExperimentMetric.objects.exclude(
+                experiment_id__in=built).values_list(
+                'experiment_id', flat=True).order_by('experiment_id').distinct()
+
+        for experiment_id in experiment_ids:
+            count = rebuild_summaries(experiment_id=experiment_id,
+                                      batch_size=options['batch_size'])
+            _logger.info('Built %s metric summaries for experiment %s.', count, experiment_id)
@@ -0,0 +1,46 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from db.models.experiments import ExperimentMetric
+from metrics.compaction import compact_experiment_metrics
+
+_logger = logging.getLogger('polyaxon.commands')
+
+
+class Command(BaseCommand):
+    """Management utility to remove the duplicate experiment metrics.
+
+    The step and hash of the metrics created before the deduplication are set,
+    and the retried reports of a same step and values are removed,
+    each experiment is compacted in chunks of metrics.
+    """
+    help = 'Used to remove the duplicate metrics of experiments.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--experiment',
+            dest='experiments',
+            action='append',
+            type=int,
+            help='Specifies an experiment id to compact.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=1000,
+            help='Specifies the number of metric rows to process per transaction.',
+        )
+
+    def handle(self, *args, **options):
+        experiment_ids = options['experiments']
+        if not experiment_ids:
+            experiment_ids = ExperimentMetric.objects.filter(hash__isnull=True).values_list(
+                'experiment_id', flat=True).order_by('experiment_id').distinct()
+
+        for experiment_id in experiment_ids:
+            kept, removed = compact_experiment_metrics(experiment_id=experiment_id,
+                                                       chunk_size=options['chunk_size'])
+            _logger.info('Compacted the metrics of experiment %s: %s kept, %s removed.',
+                         experiment_id, kept, removed)
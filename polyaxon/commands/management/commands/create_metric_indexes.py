@@ -0,0 +1,82 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from metrics.indexes import (
+    create_index,
+    get_frequent_keys,
+    get_index_name,
+    get_indexes,
+    is_valid_key
+)
+
+_logger = logging.getLogger('polyaxon.commands')
+
+
+class Command(BaseCommand):
+    """Management utility to create expression indexes on the frequently queried metrics.
+
+    The metric keys are chosen from the query stats, i.e. the number of times
+    a `last_metric` key was used to filter or to sort experiments,
+    or given explicitly with `--key`.
+    """
+    help = 'Used to create indexes on the experiments metrics most used in queries.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--key',
+            dest='keys',
+            action='append',
+            help='Specifies a metric key to index, the query stats are not used if given.',
+        )
+        parser.add_argument(
+            '--top',
+            dest='top',
+            type=int,
+            default=5,
+            help='Specifies the maximum number of metric keys to index from the query stats.',
+        )
+        parser.add_argument(
+            '--min-count',
+            dest='min_count',
+            type=int,
+            default=100,
+            help='Specifies the minimum number of queries for a metric key to be indexed.',
+        )
+        parser.add_argument(
+            '--no-concurrently',
+            action='store_false',
+            dest='concurrently',
+            default=True,
+            help='Creates the indexes in a transaction, the table is locked for writes.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            dest='dry_run',
+            default=False,
+            help='Only lists the indexes that would be created.',
+        )
+
+    def handle(self, *args, **options):
+        keys = options['keys']
+        if keys:
+            invalid_keys = [key for key in keys if not is_valid_key(key)]
+            if invalid_keys:
+                raise CommandError('Metric keys `{}` are not valid.'.format(invalid_keys))
+        else:
+            keys = [key for key, _ in get_frequent_keys(count=options['top'],
+                                                        min_count=options['min_count'])
+                    if is_valid_key(key)]
+
+        existing = get_indexes()
+        for key in keys:
+            name = get_index_name(key)
+            if name in existing:
+                _logger.info('Metric `%s` is already indexed by `%s`.', key, name)
+                continue
+            if options['dry_run']:
+                _logger.info('Metric `%s` would be indexed by `%s`.', key, name)
+                continue
+            create_index(key=key, concurrently=options['concurrently'])
+            _logger.info('Metric `%s` is indexed by `%s`.', key, name)
@@ -0,0 +1,46 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from db.models.experiments import ExperimentMetric, ExperimentMetricChunk
+from metrics.storage import migrate_experiment_metrics
+
+_logger = logging.getLogger('polyaxon.commands')
+
+
+class Command(BaseCommand):
+    """Management utility to migrate the experiment metric rows to the chunked storage.
+
+    By default only the experiments without chunks are migrated,
+    each experiment is migrated in its own transaction.
+    """
+    help = 'Used to build the metric chunks from the existing experiment metrics.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--experiment',
+            dest='experiments',
+            action='append',
+            type=int,
+            help='Specifies an experiment id to migrate, it will be rebuilt if already migrated.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            dest='batch_size',
+            type=int,
+            default=1000,
+            help='Specifies the number of metric rows to read per query.',
+        )
+
+    def handle(self, *args, **options):
+        experiment_ids = options['experiments']
+        if not experiment_ids:
+            migrated = ExperimentMetricChunk.objects.values('experiment_id')
+            experiment_ids = ExperimentMetric.objects.exclude(
+                experiment_id__in=migrated).values_list(
+                'experiment_id', flat=True).order_by('experiment_id').distinct()
+
+        for experiment_id in experiment_ids:
+            written = migrate_experiment_metrics(experiment_id=experiment_id,
+                                                 batch_size=options['batch_size'])
+            _logger.info('Migrated %s points for experiment %s.', written, experiment_id)
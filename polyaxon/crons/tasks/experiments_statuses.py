@@ -1,6 +1,7 @@
 from django.db.models import Count
 
 from constants.experiments import ExperimentLifeCycle
+from db.counters import reconcile_all_experiments_counters
 from db.models.experiments import Experiment
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import CronsCeleryTasks, SchedulerCeleryTasks
@@ -15,3 +16,8 @@ def experiments_sync_jobs_statuses() -> None:
         celery_app.send_task(
             SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUS,
             kwargs={'experiment_id': experiment.id})
+
+
+@celery_app.task(name=CronsCeleryTasks.EXPERIMENTS_RECONCILE_COUNTERS, ignore_result=True)
+def experiments_reconcile_counters() -> None:
+    reconcile_all_experiments_counters()
@@ -0,0 +1,14 @@
+from metrics.buffer import flush_buffers
+from metrics.retention import apply_retention_policies
+from polyaxon.celery_api import celery_app
+from polyaxon.settings import CronsCeleryTasks
+
+
+@celery_app.task(name=CronsCeleryTasks.METRICS_FLUSH_BUFFERS, ignore_result=True)
+def metrics_flush_buffers() -> None:
+    flush_buffers()
+
+
+@celery_app.task(name=CronsCeleryTasks.METRICS_APPLY_RETENTION, ignore_result=True)
+def metrics_apply_retention() -> None:
+    apply_retention_policies()
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class DBConfig(AppConfig):
     name = 'db'
     verbose_name = 'DB'
+
+    def ready(self):
+        import signals.etags  # noqa
+        import signals.lookups  # noqa
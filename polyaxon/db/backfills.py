@@ -0,0 +1,142 @@
+from typing import Any, Iterator, Tuple
+
+from django.apps import apps
+from django.db import connection, transaction
+
+STATUS_MODELS = (
+    'Experiment',
+    'ExperimentGroup',
+    'ExperimentJob',
+    'Job',
+    'BuildJob',
+    'NotebookJob',
+    'TensorboardJob',
+)
+
+
+def get_id_chunks(model: Any, chunk_size: int) -> Iterator[Tuple[int, int]]:
+    """Yields (start, end) id ranges covering the model's table."""
+    table = model._meta.db_table  # pylint:disable=protected-access
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT MIN(id), MAX(id) FROM {}'.format(table))
+        min_id, max_id = cursor.fetchone()
+    if min_id is None:
+        return
+    for start in range(min_id, max_id + 1, chunk_size):
+        yield start, start + chunk_size
+
+
+def backfill_status_columns(model: Any, chunk_size: int = 1000) -> int:
+    """Copies the last status name and date to the denormalized columns, chunk by chunk.
+
+    Each chunk runs in its own transaction to avoid holding long locks on large tables.
+    """
+    # pylint:disable=protected-access
+    table = model._meta.db_table
+    status_table = model._meta.get_field('status').related_model._meta.db_table
+    query = """
+        UPDATE {table} AS t
+        SET status_name = s.status, status_at = s.created_at
+        FROM {status_table} AS s
+        WHERE t.status_id = s.id
+          AND t.id >= %s AND t.id < %s
+          AND (t.status_name IS DISTINCT FROM s.status OR t.status_at IS DISTINCT FROM s.created_at)
+    """.format(table=table, status_table=status_table)
+
+    updated = 0
+    for start, end in get_id_chunks(model=model, chunk_size=chunk_size):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(query, [start, end])
+                updated += cursor.rowcount
+    return updated
+
+
+UNIQUE_NAME_MODELS = (
+    'Experiment',
+    'ExperimentGroup',
+    'Job',
+)
+
+# The suffix added to `{user}.{project}` for each model, see `db.models.unique_names`
+UNIQUE_NAME_SUFFIXES = {
+    'Experiment': "COALESCE('.' || t.experiment_group_id::text, '') || '.' || t.id::text",
+    'ExperimentGroup': "'.' || t.id::text",
+    'Job': "'.jobs.' || t.id::text",
+}
+
+
+def get_unique_names_query(model: Any, condition: str) -> str:
+    # pylint:disable=protected-access
+    project_model = model._meta.get_field('project').related_model
+    user_model = project_model._meta.get_field('user').related_model
+    unique_name = "u.username || '.' || p.name || {}".format(
+        UNIQUE_NAME_SUFFIXES[model._meta.object_name])
+    return """
+        UPDATE {table} AS t
+        SET unique_name = {unique_name}
+        FROM {project_table} AS p, {user_table} AS u
+        WHERE t.project_id = p.id AND p.user_id = u.id
+          AND {condition}
+          AND t.unique_name IS DISTINCT FROM {unique_name}
+    """.format(table=model._meta.db_table,
+               project_table=project_model._meta.db_table,
+               user_table=user_model._meta.db_table,
+               unique_name=unique_name,
+               condition=condition)
+
+
+def backfill_unique_names(model: Any, chunk_size: int = 1000) -> int:
+    """Sets the denormalized unique names, chunk by chunk.
+
+    Each chunk runs in its own transaction to avoid holding long locks on large tables.
+    """
+    query = get_unique_names_query(model=model, condition='t.id >= %s AND t.id < %s')
+    updated = 0
+    for start, end in get_id_chunks(model=model, chunk_size=chunk_size):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(query, [start, end])
+                updated += cursor.rowcount
+    return updated
+
+
+def update_project_unique_names(project_id: int) -> int:
+    """Updates the unique names of the project's entities, e.g. after a project rename."""
+    updated = 0
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            for model_name in UNIQUE_NAME_MODELS:
+                query = get_unique_names_query(model=apps.get_model('db', model_name),
+                                               condition='t.project_id = %s')
+                cursor.execute(query, [project_id])
+                updated += cursor.rowcount
+    return updated
+
+
+def backfill_activity_log_projects(model: Any, chunk_size: int = 1000) -> int:
+    """Copies the project id of the activity logs' context to the indexed column, chunk by chunk.
+
+    Project events have the project's id in the context, the other events the `project.id`.
+    """
+    project_id = """
+        (CASE WHEN split_part(t.event_type, '.', 1) = 'project'
+              THEN t.context ->> 'id'
+              ELSE t.context ->> 'project.id' END)::integer
+    """
+    query = """
+        UPDATE {table} AS t
+        SET project_id = {project_id}
+        WHERE t.id >= %s AND t.id < %s
+          AND t.project_id IS NULL
+          AND {project_id} IS NOT NULL
+    """.format(table=model._meta.db_table,  # pylint:disable=protected-access
+               project_id=project_id)
+
+    updated = 0
+    for start, end in get_id_chunks(model=model, chunk_size=chunk_size):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(query, [start, end])
+                updated += cursor.rowcount
+    return updated
@@ -0,0 +1,154 @@
+import logging
+
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Sum
+
+import stats
+
+from db.models.experiments import Experiment, ExperimentStatusCounter
+from db.models.projects import Project
+
+_logger = logging.getLogger('polyaxon.db.counters')
+
+# The counters are unique by project, group and status, the independent experiments have no group
+UPSERT_COUNTER_QUERY = """
+    INSERT INTO {table} (project_id, experiment_group_id, status, count)
+    VALUES (%s, %s, %s, %s)
+    ON CONFLICT (project_id, (COALESCE(experiment_group_id, 0)), status)
+    DO UPDATE SET count = {table}.count + EXCLUDED.count
+"""
+
+
+def add_experiments_count(project_id: int,
+                          experiment_group_id: Optional[int],
+                          status: str,
+                          value: int) -> None:
+    """Adds the value to the counter of the status, the counter is created if needed."""
+    if not status or not value:
+        return
+    if value < 0:
+        # A decrement never creates a counter, e.g. when the project is being deleted
+        ExperimentStatusCounter.objects.filter(
+            project_id=project_id,
+            experiment_group_id=experiment_group_id,
+            status=status).update(count=F('count') + value)
+        return
+
+    query = UPSERT_COUNTER_QUERY.format(
+        table=ExperimentStatusCounter._meta.db_table)  # pylint:disable=protected-access
+    with connection.cursor() as cursor:
+        cursor.execute(query, [project_id, experiment_group_id, status, value])
+
+
+def lock_experiment_status(experiment_id: int) -> Tuple[Optional[str], bool]:
+    """Locks the experiment's row and returns its current status and deleted flag.
+
+    An instance can be stale, the status changes of an experiment are serialized by the lock.
+    """
+    row = Experiment.all.select_for_update().filter(id=experiment_id).values_list(
+        'status_name', 'deleted').first()
+    return row if row else (None, True)
+
+
+def update_status_counters(experiment: Experiment,
+                           previous_status: Optional[str],
+                           deleted: bool) -> None:
+    """Moves the experiment from its previous status counter to the current one.
+
+    Archived experiments are not counted.
+    """
+    if deleted or previous_status == experiment.status_name:
+        return
+    # The counters' rows are always updated in the order of their status,
+    # two concurrent moves between the same statuses cannot lock them in opposite orders
+    deltas = [(previous_status, -1), (experiment.status_name, 1)]
+    for status, value in sorted(deltas, key=lambda delta: delta[0] or ''):
+        add_experiments_count(project_id=experiment.project_id,
+                              experiment_group_id=experiment.experiment_group_id,
+                              status=status,
+                              value=value)
+
+
+def update_archived_counters(experiment: Experiment,
+                             status: Optional[str],
+                             deleted: bool) -> None:
+    """Removes an archived experiment from its status counter, or adds a restored one back."""
+    if deleted == experiment.deleted:
+        return
+    add_experiments_count(project_id=experiment.project_id,
+                          experiment_group_id=experiment.experiment_group_id,
+                          status=status,
+                          value=-1 if experiment.deleted else 1)
+
+
+def get_experiments_counts(project_id: int,
+                           experiment_group_id: int = None,
+                           independent: bool = False) -> Dict[str, int]:
+    """Returns the number of experiments per status of a project, a group,
+    or the independent experiments of a project."""
+    queryset = ExperimentStatusCounter.objects.filter(project_id=project_id)
+    if experiment_group_id:
+        queryset = queryset.filter(experiment_group_id=experiment_group_id)
+    elif independent:
+        queryset = queryset.filter(experiment_group__isnull=True)
+    counts = queryset.values('status').annotate(total=Sum('count')).values_list('status', 'total')
+    return {status: total for status, total in counts if total}
+
+
+def count_experiments(counts: Dict[str, int], statuses: Iterable[str] = None) -> int:
+    if statuses is None:
+        return sum(counts.values())
+    return sum(counts.get(status, 0) for status in statuses)
+
+
+def reconcile_experiments_counters(project_id: int) -> int:
+    """Recounts the experiments of a project and fixes the counters that drifted.
+
+    Returns the total drift.
+    """
+    drift = 0
+    with transaction.atomic():
+        counters = {
+            (counter.experiment_group_id, counter.status): counter
+            for counter in ExperimentStatusCounter.objects.select_for_update().filter(
+                project_id=project_id).order_by('experiment_group_id', 'status')
+        }
+        counts = Experiment.objects.filter(
+            project_id=project_id,
+            status_name__isnull=False).order_by().values(
+            'experiment_group_id', 'status_name').annotate(
+            total=Count('id')).values_list('experiment_group_id', 'status_name', 'total')
+        for experiment_group_id, status, total in counts:
+            counter = counters.pop((experiment_group_id, status), None)
+            value = total - (counter.count if counter else 0)
+            if value:
+                drift += abs(value)
+                add_experiments_count(project_id=project_id,
+                                      experiment_group_id=experiment_group_id,
+                                      status=status,
+                                      value=value)
+        stale_ids = []
+        for counter in counters.values():
+            drift += abs(counter.count)
+            stale_ids.append(counter.id)
+        if stale_ids:
+            ExperimentStatusCounter.objects.filter(id__in=stale_ids).delete()
+    return drift
+
+
+def reconcile_all_experiments_counters() -> int:
+    """Reconciles the counters of all projects, each project in its own transaction.
+
+    Returns the total drift.
+    """
+    drift = 0
+    for project_id in Project.all.values_list('id', flat=True).iterator():
+        project_drift = reconcile_experiments_counters(project_id=project_id)
+        if project_drift:
+            _logger.warning('Fixed a drift of %s in the experiments counters of project `%s`.',
+                            project_drift, project_id)
+        drift += project_drift
+    stats.incr('experiments.counters.drift', drift)
+    return drift
@@ -0,0 +1,56 @@
+import logging
+
+from typing import Optional
+
+from redis import RedisError
+
+from django.db import connection, transaction
+
+import conf
+
+from constants import content_types
+from db.redis.etags import RedisEtagVersions
+
+_logger = logging.getLogger('polyaxon.db.etags')
+
+
+def get_version(entity: str, entity_id: int) -> Optional[int]:
+    """Returns the entity's version counter, or None if redis is not available."""
+    try:
+        return RedisEtagVersions(entity=entity, entity_id=entity_id).get_version(
+            ttl=conf.get('ETAGS_VERSIONS_TTL'))
+    except RedisError:
+        _logger.warning('Could not read the version of %s `%s`.', entity, entity_id,
+                        exc_info=True)
+        return None
+
+
+def _increment_version(entity: str, entity_id: int) -> None:
+    try:
+        RedisEtagVersions(entity=entity, entity_id=entity_id).increment(
+            ttl=conf.get('ETAGS_VERSIONS_TTL'))
+    except RedisError:
+        _logger.warning('Could not increment the version of %s `%s`.', entity, entity_id,
+                        exc_info=True)
+
+
+def increment_version(entity: str, entity_id: int) -> None:
+    """Increments the entity's version counter, the etags of the previous version are stale.
+
+    Inside a transaction the version is incremented again on commit,
+    a read between the first increment and the commit must not keep the old data's etag.
+    """
+    _increment_version(entity=entity, entity_id=entity_id)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _increment_version(entity=entity, entity_id=entity_id))
+
+
+def increment_experiment_version(experiment_id: int, experiment_group_id: int = None) -> None:
+    increment_version(entity=content_types.EXPERIMENT, entity_id=experiment_id)
+    if experiment_group_id:
+        # The group shows the statuses of its experiments
+        increment_version(entity=content_types.EXPERIMENT_GROUP, entity_id=experiment_group_id)
+
+
+def increment_experiment_group_version(experiment_group_id: int) -> None:
+    increment_version(entity=content_types.EXPERIMENT_GROUP, entity_id=experiment_group_id)
@@ -0,0 +1,201 @@
+import logging
+import pickle
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+from redis import RedisError
+
+import stats
+
+from db.models.projects import Project
+from db.models.tokens import Token
+from db.models.users import User
+from db.redis.lookups import RedisLookups
+
+_logger = logging.getLogger('polyaxon.db.lookups')
+
+
+class LookupCache(object):
+    """A two-tier cache of model instances: a per process LRU in front of redis.
+
+    The instances are kept pickled, each lookup returns a new copy that can be modified safely.
+    The changes are invalidated by the models signals, in the current process LRU and in redis,
+    the LRUs of the other processes expire after `local_ttl` seconds.
+    Misses are not cached, the loader's `DoesNotExist` is raised on each lookup.
+    """
+
+    def __init__(self,
+                 name: str,
+                 loader: Callable[..., Any],
+                 maxsize: int = None,
+                 local_ttl: int = None,
+                 ttl: int = None) -> None:
+        self.name = name
+        self.loader = loader
+        self._maxsize = maxsize
+        self._local_ttl = local_ttl
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        if self._maxsize is not None:
+            return self._maxsize
+
+        import conf
+
+        return conf.get('LOOKUPS_CACHE_SIZE')
+
+    @property
+    def local_ttl(self) -> int:
+        if self._local_ttl is not None:
+            return self._local_ttl
+
+        import conf
+
+        return conf.get('LOOKUPS_CACHE_LOCAL_TTL')
+
+    @property
+    def ttl(self) -> int:
+        if self._ttl is not None:
+            return self._ttl
+
+        import conf
+
+        return conf.get('LOOKUPS_CACHE_TTL')
+
+    @staticmethod
+    def get_key(key: Hashable) -> str:
+        if isinstance(key, tuple):
+            return ':'.join(str(k) for k in key)
+        return str(key)
+
+    def _get_local(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            loaded_at, value = entry
+            if time.monotonic() - loaded_at >= self.local_ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self.local_hits += 1
+            return value
+
+    def _set_local(self, key: str, value: bytes) -> None:
+        maxsize = self.maxsize
+        if maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+
+    def _get_redis(self, key: str) -> Any:
+        try:
+            value = RedisLookups(name=self.name).get(key)
+        except RedisError:
+            _logger.warning('Could not read the %s lookup from redis.', self.name, exc_info=True)
+            return None
+        if value is not None:
+            with self._lock:
+                self.redis_hits += 1
+        return value
+
+    def _set_redis(self, key: str, value: bytes) -> None:
+        try:
+            RedisLookups(name=self.name).set(key, value=value, ttl=self.ttl)
+        except RedisError:
+            _logger.warning('Could not write the %s lookup to redis.', self.name, exc_info=True)
+
+    def _record(self, tier: str) -> None:
+        stats.incr('db.lookups', tags=['cache:{}'.format(self.name), 'tier:{}'.format(tier)])
+
+    def get(self, key: Hashable) -> Any:
+        cache_key = self.get_key(key)
+        value = self._get_local(cache_key)
+        if value is not None:
+            self._record('local')
+            return pickle.loads(value)
+
+        value = self._get_redis(cache_key)
+        if value is not None:
+            self._record('redis')
+            self._set_local(cache_key, value)
+            return pickle.loads(value)
+
+        with self._lock:
+            self.misses += 1
+        self._record('db')
+        instance = self.loader(*key) if isinstance(key, tuple) else self.loader(key)
+        value = pickle.dumps(instance)
+        self._set_redis(cache_key, value)
+        self._set_local(cache_key, value)
+        return instance
+
+    def invalidate(self, key: Hashable) -> None:
+        cache_key = self.get_key(key)
+        with self._lock:
+            self._entries.pop(cache_key, None)
+        try:
+            RedisLookups(name=self.name).clear(cache_key)
+        except RedisError:
+            _logger.warning('Could not invalidate the %s lookup in redis.', self.name,
+                            exc_info=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.local_hits + self.redis_hits + self.misses
+            hits = self.local_hits + self.redis_hits
+            return {
+                'size': len(self._entries),
+                'local_hits': self.local_hits,
+                'redis_hits': self.redis_hits,
+                'misses': self.misses,
+                'hit_rate': hits / lookups if lookups else None,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.local_hits = 0
+            self.redis_hits = 0
+            self.misses = 0
+
+
+def _load_token(key: str) -> Token:
+    return Token.objects.get(key=key)
+
+
+def _load_user(user_id: int) -> User:
+    return User.objects.get(id=user_id)
+
+
+def _load_project(owner_name: str, project_name: str) -> Project:
+    return Project.objects.select_related('owner', 'user').get(owner__name=owner_name,
+                                                               name=project_name)
+
+
+token_cache = LookupCache(name='token', loader=_load_token)
+user_cache = LookupCache(name='user', loader=_load_user)
+project_cache = LookupCache(name='project', loader=_load_project)
+
+
+def get_token(key: str) -> Token:
+    """Returns the token with its user, both looked up in the caches."""
+    token = token_cache.get(key)
+    token.user = user_cache.get(token.user_id)
+    return token
+
+
+def get_project(owner_name: str, project_name: str) -> Project:
+    return project_cache.get((owner_name, project_name))
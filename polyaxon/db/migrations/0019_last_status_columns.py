@@ -0,0 +1,124 @@
+# Generated by Django 2.1.7 on 2019-03-04 10:12
+
+from django.db import migrations, models, transaction
+
+# A frozen copy of the backfill, `db.backfills` keeps the current version for the commands
+STATUS_TABLES = (
+    ('db_experiment', 'db_experimentstatus'),
+    ('db_experimentgroup', 'db_experimentgroupstatus'),
+    ('db_experimentjob', 'db_experimentjobstatus'),
+    ('db_job', 'db_jobstatus'),
+    ('db_buildjob', 'db_buildjobstatus'),
+    ('db_notebookjob', 'db_notebookjobstatus'),
+    ('db_tensorboardjob', 'db_tensorboardjobstatus'),
+)
+
+BACKFILL_QUERY = """
+    UPDATE {table} AS t
+    SET status_name = s.status, status_at = s.created_at
+    FROM {status_table} AS s
+    WHERE t.status_id = s.id
+      AND t.id >= %s AND t.id < %s
+      AND (t.status_name IS DISTINCT FROM s.status OR t.status_at IS DISTINCT FROM s.created_at)
+"""
+
+CHUNK_SIZE = 1000
+
+
+def backfill_last_status(apps, schema_editor):
+    connection = schema_editor.connection
+    for table, status_table in STATUS_TABLES:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT MIN(id), MAX(id) FROM {}'.format(table))
+            min_id, max_id = cursor.fetchone()
+        if min_id is None:
+            continue
+        query = BACKFILL_QUERY.format(table=table, status_table=status_table)
+        for start in range(min_id, max_id + 1, CHUNK_SIZE):
+            # Each chunk runs in its own transaction, the migration is not atomic
+            with transaction.atomic(using=connection.alias):
+                with connection.cursor() as cursor:
+                    cursor.execute(query, [start, start + CHUNK_SIZE])
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('db', '0018_auto_20190208_1545'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='buildjob',
+            name='status_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='buildjob',
+            name='status_name',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='experiment',
+            name='status_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='experiment',
+            name='status_name',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='experimentgroup',
+            name='status_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='experimentgroup',
+            name='status_name',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='experimentjob',
+            name='status_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='experimentjob',
+            name='status_name',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='status_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='status_name',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='notebookjob',
+            name='status_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='notebookjob',
+            name='status_name',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='tensorboardjob',
+            name='status_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='tensorboardjob',
+            name='status_name',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.RunPython(backfill_last_status, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 2.1.7 on 2019-03-07 11:02
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0019_last_status_columns'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='experimentmetric',
+            options={'ordering': ['created_at', 'id']},
+        ),
+    ]
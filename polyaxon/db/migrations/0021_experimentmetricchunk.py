@@ -0,0 +1,39 @@
+# Generated by Django 2.1.7 on 2019-03-06 09:21
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0020_experimentmetric_ordering'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExperimentMetricChunk',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=256)),
+                ('start_step', models.BigIntegerField()),
+                ('end_step', models.BigIntegerField()),
+                ('start_at', models.DateTimeField()),
+                ('end_at', models.DateTimeField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('steps', django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), default=list, size=None)),
+                ('timestamps', django.contrib.postgres.fields.ArrayField(base_field=models.DateTimeField(), default=list, size=None)),
+                ('values', django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), default=list, size=None)),
+                ('experiment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='metric_chunks', to='db.Experiment')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AlterIndexTogether(
+            name='experimentmetricchunk',
+            index_together={('experiment', 'name', 'start_step', 'end_step')},
+        ),
+    ]
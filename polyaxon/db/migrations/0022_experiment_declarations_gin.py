@@ -0,0 +1,17 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0021_experimentmetricchunk'),
+    ]
+
+    operations = [
+        # `jsonb_path_ops` indexes only support containment (`@>`), but are smaller and faster
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS db_experiment_declarations_gin '
+                'ON db_experiment USING gin (declarations jsonb_path_ops);',
+            reverse_sql='DROP INDEX IF EXISTS db_experiment_declarations_gin;',
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 2.1.7 on 2019-03-08 10:12
+
+import django.db.models.deletion
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0022_experiment_declarations_gin'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExperimentMetricSummary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=256)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('min_value', models.FloatField()),
+                ('min_step', models.BigIntegerField()),
+                ('max_value', models.FloatField()),
+                ('max_step', models.BigIntegerField()),
+                ('last_value', models.FloatField()),
+                ('last_step', models.BigIntegerField()),
+                ('last_at', models.DateTimeField()),
+                ('experiment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='metric_summaries', to='db.Experiment')),
+            ],
+            options={
+                'verbose_name_plural': 'Experiment Metric Summaries',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='experimentmetricsummary',
+            unique_together={('experiment', 'name')},
+        ),
+        migrations.AlterIndexTogether(
+            name='experimentmetricsummary',
+            index_together={('name', 'last_value')},
+        ),
+    ]
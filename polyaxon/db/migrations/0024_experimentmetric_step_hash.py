@@ -0,0 +1,27 @@
+# Generated by Django 2.1.7 on 2019-03-11 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0023_experimentmetricsummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='experimentmetric',
+            name='hash',
+            field=models.CharField(blank=True, max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='experimentmetric',
+            name='step',
+            field=models.BigIntegerField(blank=True, help_text='The step of the report, defaults to the `step` value if reported.', null=True),
+        ),
+        migrations.AlterUniqueTogether(
+            name='experimentmetric',
+            unique_together={('experiment', 'step', 'hash')},
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 2.1.7 on 2019-03-12 09:40
+
+import django.db.models.deletion
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0024_experimentmetric_step_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExperimentMetricCompaction',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('compacted_until', models.DateTimeField()),
+                ('removed', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('experiment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='metric_compaction', to='db.Experiment')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MetricRetentionPolicy',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_enabled', models.BooleanField(default=True, help_text='If the project metrics are compacted.')),
+                ('full_resolution_days', models.PositiveIntegerField(default=30, help_text='The number of days metrics are kept at full resolution.')),
+                ('keep_every', models.PositiveIntegerField(default=10, help_text='The size of the windows older metrics are compacted to one point per.')),
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='metric_retention_policy', to='db.Project')),
+            ],
+            options={
+                'verbose_name_plural': 'Metric Retention Policies',
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 2.1.7 on 2019-03-14 11:05
+
+from django.db import migrations, models, transaction
+
+# A frozen copy of the backfill, `db.backfills` keeps the current version for the commands
+UNIQUE_NAME_SUFFIXES = (
+    ('db_experiment', "COALESCE('.' || t.experiment_group_id::text, '') || '.' || t.id::text"),
+    ('db_experimentgroup', "'.' || t.id::text"),
+    ('db_job', "'.jobs.' || t.id::text"),
+)
+
+BACKFILL_QUERY = """
+    UPDATE {table} AS t
+    SET unique_name = {unique_name}
+    FROM db_project AS p, db_user AS u
+    WHERE t.project_id = p.id AND p.user_id = u.id
+      AND t.id >= %s AND t.id < %s
+      AND t.unique_name IS DISTINCT FROM {unique_name}
+"""
+
+CHUNK_SIZE = 1000
+
+
+def backfill_unique_name(apps, schema_editor):
+    connection = schema_editor.connection
+    for table, suffix in UNIQUE_NAME_SUFFIXES:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT MIN(id), MAX(id) FROM {}'.format(table))
+            min_id, max_id = cursor.fetchone()
+        if min_id is None:
+            continue
+        query = BACKFILL_QUERY.format(table=table,
+                                      unique_name="u.username || '.' || p.name || " + suffix)
+        for start in range(min_id, max_id + 1, CHUNK_SIZE):
+            # Each chunk runs in its own transaction, the migration is not atomic
+            with transaction.atomic(using=connection.alias):
+                with connection.cursor() as cursor:
+                    cursor.execute(query, [start, start + CHUNK_SIZE])
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('db', '0025_metric_retention'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='experiment',
+            name='unique_name',
+            field=models.CharField(blank=True, db_index=True, max_length=512, null=True),
+        ),
+        migrations.AddField(
+            model_name='experimentgroup',
+            name='unique_name',
+            field=models.CharField(blank=True, db_index=True, max_length=512, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='unique_name',
+            field=models.CharField(blank=True, db_index=True, max_length=512, null=True),
+        ),
+        migrations.RunPython(backfill_unique_name, migrations.RunPython.noop),
+    ]
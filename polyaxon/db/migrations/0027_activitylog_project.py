@@ -0,0 +1,49 @@
+# Generated by Django 2.1.7 on 2019-03-15 09:12
+
+from django.db import migrations, models
+
+
+# Schema only, the existing rows are backfilled by the `backfill_activity_logs` command,
+# until then the project activity logs view filters them on their context
+class Migration(migrations.Migration):
+
+    # The indexes are built concurrently, which cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('db', '0026_unique_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activitylog',
+            name='project_id',
+            field=models.PositiveIntegerField(blank=True, help_text='The project of the activity, if any, not a foreign key to keep the history of deleted projects.', null=True),
+        ),
+        # The indexes have the names Django gives to the `index_together` indexes
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql='CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+                        'db_activitylog_project_id_created_at_fb062b5f_idx '
+                        'ON db_activitylog (project_id, created_at);',
+                    reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS '
+                                'db_activitylog_project_id_created_at_fb062b5f_idx;',
+                ),
+                migrations.RunSQL(
+                    sql='CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+                        'db_activitylog_content_type_id_object_id_98d499d3_idx '
+                        'ON db_activitylog (content_type_id, object_id);',
+                    reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS '
+                                'db_activitylog_content_type_id_object_id_98d499d3_idx;',
+                ),
+            ],
+            state_operations=[
+                migrations.AlterIndexTogether(
+                    name='activitylog',
+                    index_together={('project_id', 'created_at'), ('content_type', 'object_id')},
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 2.1.7 on 2019-03-22 10:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0027_activitylog_project'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExperimentStatusCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=64)),
+                ('count', models.IntegerField(default=0)),
+                ('experiment_group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='db.ExperimentGroup')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='db.Project')),
+            ],
+        ),
+        migrations.RunSQL(
+            sql='CREATE UNIQUE INDEX db_experimentstatuscounter_unique '
+                'ON db_experimentstatuscounter '
+                '(project_id, (COALESCE(experiment_group_id, 0)), status);',
+            reverse_sql='DROP INDEX db_experimentstatuscounter_unique;'),
+        migrations.RunSQL(
+            sql='INSERT INTO db_experimentstatuscounter '
+                '(project_id, experiment_group_id, status, count) '
+                'SELECT project_id, experiment_group_id, status_name, COUNT(*) '
+                'FROM db_experiment '
+                'WHERE deleted = false AND status_name IS NOT NULL '
+                'GROUP BY project_id, experiment_group_id, status_name;',
+            reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -10,14 +10,14 @@ from django.db import models
 from django.utils.functional import cached_property
 
 from constants.jobs import JobLifeCycle
-from db.models.statuses import LastStatusMixin, StatusModel
+from db.models.statuses import LastStatusMixin, LastStatusModel, StatusModel
 from db.models.utils import CachedMixin, DiffModel, RunTimeModel
 from schemas.pod_resources import PodResourcesConfig
 
 _logger = logging.getLogger('polyaxon.db.jobs')
 
 
-class AbstractJob(DiffModel, RunTimeModel, LastStatusMixin):
+class AbstractJob(DiffModel, RunTimeModel, LastStatusModel, LastStatusMixin):
     """An abstract base class for job, used both by experiment jobs and other jobs."""
     STATUSES = JobLifeCycle
 
@@ -79,10 +79,6 @@ class JobMixin(object):
     def __str__(self) -> str:
         return self.unique_name
 
-    @cached_property
-    def unique_name(self) -> str:
-        pass
-
     @cached_property
     def image(self) -> str:
         return self.specification.build.image
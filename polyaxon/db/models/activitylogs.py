@@ -25,11 +25,17 @@ class ActivityLog(models.Model):
         related_name='+')
     object_id = models.PositiveIntegerField()
     content_object = GenericForeignKey('content_type', 'object_id')
+    project_id = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text='The project of the activity, if any, '
+                  'not a foreign key to keep the history of deleted projects.')
 
     class Meta:
         app_label = 'db'
         verbose_name = 'activity log'
         verbose_name_plural = 'activities logs'
+        index_together = [['project_id', 'created_at'], ['content_type', 'object_id']]
 
     def __str__(self) -> str:
         return '{} - {}'.format(self.event_type, self.created_at)
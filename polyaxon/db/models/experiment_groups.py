@@ -3,22 +3,23 @@ import logging
 import uuid
 
 from operator import __or__ as OR
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from hestia.datetime_typing import AwareDT
 
 from django.conf import settings
 from django.contrib.postgres.fields import JSONField
-from django.contrib.postgres.fields.jsonb import KeyTransform
+from django.contrib.postgres.fields.jsonb import KeyTextTransform
 from django.db import models
-from django.db.models import Q
+from django.db.models import F, FilteredRelation, Q
+from django.db.models.functions import Cast, Coalesce
 from django.utils.functional import cached_property
 
 from constants.experiment_groups import ExperimentGroupLifeCycle
 from constants.experiments import ExperimentLifeCycle
 from db.models.abstract_jobs import TensorboardJobMixin
 from db.models.charts import ChartViewModel
-from db.models.statuses import LastStatusMixin, StatusModel
+from db.models.statuses import LastStatusMixin, LastStatusModel, StatusModel
 from db.models.unique_names import GROUP_UNIQUE_NAME_FORMAT
 from db.models.utils import (
     DeletedModel,
@@ -29,7 +30,8 @@ from db.models.utils import (
     ReadmeModel,
     RunTimeModel,
     SubPathModel,
-    TagModel
+    TagModel,
+    UniqueNameModel
 )
 from libs.paths.experiment_groups import get_experiment_group_subpath
 from libs.spec_validation import validate_group_hptuning_config, validate_group_spec_content
@@ -59,6 +61,8 @@ class ExperimentGroup(DiffModel,
                       SubPathModel,
                       TagModel,
                       DeletedModel,
+                      UniqueNameModel,
+                      LastStatusModel,
                       LastStatusMixin,
                       TensorboardJobMixin):
     """A model that saves Specification/Polyaxonfiles."""
@@ -118,8 +122,7 @@ class ExperimentGroup(DiffModel,
     def __str__(self) -> str:
         return self.unique_name
 
-    @property
-    def unique_name(self) -> str:
+    def get_unique_name(self) -> str:
         return GROUP_UNIQUE_NAME_FORMAT.format(
             project_name=self.project.unique_name,
             id=self.id)
@@ -175,15 +178,21 @@ class ExperimentGroup(DiffModel,
                                              **params)
 
     def archive(self) -> bool:
+        from db.counters import reconcile_experiments_counters
+
         if not super().archive():
             return False
         self.experiments.update(deleted=True)
+        reconcile_experiments_counters(project_id=self.project_id)
         return True
 
     def unarchive(self) -> bool:
+        from db.counters import reconcile_experiments_counters
+
         if not super().unarchive():
             return False
         self.all_experiments.update(deleted=False)
+        reconcile_experiments_counters(project_id=self.project_id)
         return True
 
     @cached_property
@@ -288,12 +297,45 @@ class ExperimentGroup(DiffModel,
         return self.group_experiments.exclude(
             status__status__in=ExperimentLifeCycle.DONE_STATUS).distinct()
 
+    def get_experiments_counts(self) -> Optional[Dict[str, int]]:
+        """The number of experiments per status, from the status counters.
+
+        Selections do not have counters, their experiments belong to other groups.
+        """
+        from db.counters import get_experiments_counts
+
+        if self.is_selection:
+            return None
+        return get_experiments_counts(project_id=self.project_id, experiment_group_id=self.id)
+
+    @cached_property
+    def experiments_counts(self) -> Optional[Dict[str, int]]:
+        return self.get_experiments_counts()
+
+    def count_experiments(self,
+                          statuses: Iterable[str] = None,
+                          counts: Dict[str, int] = None) -> int:
+        """Counts the experiments with one of the statuses, all the experiments by default.
+
+        Uses the given counts, or the current counters, and queries the experiments of selections.
+        """
+        from db.counters import count_experiments
+
+        if counts is None:
+            counts = self.get_experiments_counts()
+        if counts is not None:
+            return count_experiments(counts=counts, statuses=statuses)
+        if statuses is None:
+            return self.group_experiments.count()
+        return self.group_experiments.filter(status__status__in=statuses).distinct().count()
+
     @property
     def n_experiments_to_start(self) -> int:
         """We need to check if we are allowed to start the experiment
         If the polyaxonfile has concurrency we need to check how many experiments are running.
         """
-        return self.concurrency - self.running_experiments.count()
+        return self.concurrency - self.count_experiments(
+            statuses=ExperimentLifeCycle.RUNNING_STATUS)
 
     @property
     def iteration(self):
@@ -311,26 +353,37 @@ class ExperimentGroup(DiffModel,
     def current_iteration(self) -> int:
         return self.iterations.count()
 
+    @staticmethod
+    def _annotate_last_value(query, metric: str, alias: str):
+        # The last values are read from the metric summaries, with a single join by metric name,
+        # experiments without summaries, e.g. not backfilled yet, fall back to their last metric
+        relation = '{}_summary'.format(alias)
+        query = query.annotate(**{relation: FilteredRelation(
+            'metric_summaries', condition=Q(metric_summaries__name=metric))})
+        return query.annotate(**{alias: Coalesce(
+            F('{}__last_value'.format(relation)),
+            Cast(KeyTextTransform(metric, 'last_metric'), models.FloatField()))})
+
     def should_stop_early(self) -> bool:
+        query = self.experiments
         filters = []
-        for early_stopping_metric in self.early_stopping:
+        for i, early_stopping_metric in enumerate(self.early_stopping):
+            alias = 'early_stopping_{}'.format(i)
+            query = self._annotate_last_value(query,
+                                              metric=early_stopping_metric.metric,
+                                              alias=alias)
             comparison = (
                 'gte' if Optimization.maximize(early_stopping_metric.optimization) else 'lte')
-            metric_filter = 'last_metric__{}__{}'.format(
-                early_stopping_metric.metric, comparison)
-            filters.append({metric_filter: early_stopping_metric.value})
+            filters.append({'{}__{}'.format(alias, comparison): early_stopping_metric.value})
         if filters:
-            return self.experiments.filter(functools.reduce(OR, [Q(**f) for f in filters])).exists()
+            return query.filter(functools.reduce(OR, [Q(**f) for f in filters])).exists()
         return False
 
     def get_annotated_experiments_with_metric(self, metric: str, experiment_ids: List[int] = None):
         query = self.experiments
         if experiment_ids:
             query = query.filter(id__in=experiment_ids)
-        annotation = {
-            metric: KeyTransform(metric, 'last_metric')
-        }
-        return query.annotate(**annotation)
+        return self._annotate_last_value(query, metric=metric, alias=metric)
 
     def get_ordered_experiments_by_metric(self,
                                           experiment_ids: List[int],
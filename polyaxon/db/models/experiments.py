@@ -1,3 +1,5 @@
+import hashlib
+import json
 import uuid
 
 from typing import Dict, List, Optional
@@ -5,8 +7,8 @@ from typing import Dict, List, Optional
 from hestia.datetime_typing import AwareDT
 
 from django.conf import settings
-from django.contrib.postgres.fields import JSONField
-from django.db import models
+from django.contrib.postgres.fields import ArrayField, JSONField
+from django.db import models, transaction
 from django.utils import timezone
 from django.utils.functional import cached_property
 
@@ -17,7 +19,7 @@ from constants.jobs import JobLifeCycle
 from db.models.abstract_jobs import TensorboardJobMixin
 from db.models.charts import ChartViewModel
 from db.models.cloning_strategies import CloningStrategy
-from db.models.statuses import LastStatusMixin, StatusModel
+from db.models.statuses import LastStatusMixin, LastStatusModel, StatusModel
 from db.models.unique_names import EXPERIMENT_UNIQUE_NAME_FORMAT
 from db.models.utils import (
     DataReference,
@@ -31,7 +33,8 @@ from db.models.utils import (
     ReadmeModel,
     RunTimeModel,
     SubPathModel,
-    TagModel
+    TagModel,
+    UniqueNameModel
 )
 from db.redis.heartbeat import RedisHeartBeat
 from event_manager.events.experiment import (
@@ -58,6 +61,8 @@ class Experiment(DiffModel,
                  ReadmeModel,
                  TagModel,
                  DeletedModel,
+                 UniqueNameModel,
+                 LastStatusModel,
                  LastStatusMixin,
                  TensorboardJobMixin):
     """A model that represents experiments."""
@@ -136,10 +141,9 @@ class Experiment(DiffModel,
         app_label = 'db'
         unique_together = (('project', 'name'),)
 
-    @property
-    def unique_name(self) -> str:
+    def get_unique_name(self) -> str:
         if self.experiment_group:
-            parent_name = self.experiment_group.unique_name
+            parent_name = self.experiment_group.get_unique_name()
         else:
             parent_name = self.project.unique_name
         return EXPERIMENT_UNIQUE_NAME_FORMAT.format(parent_name=parent_name, id=self.id)
@@ -223,6 +227,22 @@ class Experiment(DiffModel,
         """If the experiment belongs to a experiment_group or is independently created."""
         return self.experiment_group is None
 
+    def _set_archived(self, archive: bool) -> bool:
+        from db.counters import lock_experiment_status, update_archived_counters
+
+        with transaction.atomic():
+            status, deleted = lock_experiment_status(self.id)
+            archived = super().archive() if archive else super().unarchive()
+            if archived:
+                update_archived_counters(experiment=self, status=status, deleted=deleted)
+        return archived
+
+    def archive(self) -> bool:
+        return self._set_archived(archive=True)
+
+    def unarchive(self) -> bool:
+        return self._set_archived(archive=False)
+
     def update_status(self) -> bool:
         current_status = self.last_status
         calculated_status = self.calculated_status
@@ -384,21 +404,165 @@ class ExperimentStatus(StatusModel):
         return '{} <{}>'.format(self.experiment.unique_name, self.status)
 
 
+class ExperimentStatusCounter(models.Model):
+    """A model that counts the experiments of a group, or the independent experiments
+    of a project, with a given status.
+
+    The counters are updated by the status pipeline in the same transaction as the status,
+    and reconciled periodically, archived experiments are not counted.
+    """
+    project = models.ForeignKey(
+        'db.Project',
+        on_delete=models.CASCADE,
+        related_name='+')
+    experiment_group = models.ForeignKey(
+        'db.ExperimentGroup',
+        on_delete=models.CASCADE,
+        related_name='+',
+        blank=True,
+        null=True)
+    status = models.CharField(max_length=64)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        app_label = 'db'
+
+    def __str__(self) -> str:
+        return '{}.{} <{}: {}>'.format(
+            self.project_id, self.experiment_group_id, self.status, self.count)
+
+
 class ExperimentMetric(models.Model):
-    """A model that represents an experiment metric at certain time."""
+    """A model that represents an experiment metric at certain time.
+
+    Reports with a step are unique by their values' hash,
+    a retried report of the same step and values is not stored twice.
+    """
     experiment = models.ForeignKey(
         'db.Experiment',
         on_delete=models.CASCADE,
         related_name='metrics')
     created_at = models.DateTimeField(default=timezone.now)
     values = JSONField()
+    step = models.BigIntegerField(
+        blank=True,
+        null=True,
+        help_text='The step of the report, defaults to the `step` value if reported.')
+    hash = models.CharField(max_length=32, blank=True, null=True)
 
     def __str__(self) -> str:
         return '{} <{}>'.format(self.experiment.unique_name, self.created_at)
 
     class Meta:
         app_label = 'db'
-        ordering = ['created_at']
+        ordering = ['created_at', 'id']
+        unique_together = (('experiment', 'step', 'hash'),)
+
+    @staticmethod
+    def get_step(values: Dict) -> Optional[int]:
+        step = (values or {}).get('step')
+        if isinstance(step, (int, float)) and not isinstance(step, bool):
+            return int(step)
+        return None
+
+    @staticmethod
+    def get_hash(values: Dict) -> str:
+        return hashlib.md5(
+            json.dumps(values, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+
+    def save(self, *args, **kwargs):  # pylint:disable=arguments-differ
+        if self.step is None:
+            self.step = self.get_step(self.values)
+        if self.hash is None:
+            self.hash = self.get_hash(self.values)
+        super().save(*args, **kwargs)
+
+
+class ExperimentMetricChunk(models.Model):
+    """A model that stores a chunk of a metric series of an experiment.
+
+    Points are kept in parallel arrays (steps, timestamps, values),
+    new points are appended to the last chunk until it is full.
+    """
+    experiment = models.ForeignKey(
+        'db.Experiment',
+        on_delete=models.CASCADE,
+        related_name='metric_chunks')
+    name = models.CharField(max_length=256)
+    start_step = models.BigIntegerField()
+    end_step = models.BigIntegerField()
+    start_at = models.DateTimeField()
+    end_at = models.DateTimeField()
+    count = models.PositiveIntegerField(default=0)
+    steps = ArrayField(models.BigIntegerField(), default=list)
+    timestamps = ArrayField(models.DateTimeField(), default=list)
+    values = ArrayField(models.FloatField(), default=list)
+
+    def __str__(self) -> str:
+        return '{} <{}: {}-{}>'.format(
+            self.experiment_id, self.name, self.start_step, self.end_step)
+
+    class Meta:
+        app_label = 'db'
+        ordering = ['id']
+        index_together = [['experiment', 'name', 'start_step', 'end_step']]
+
+
+class ExperimentMetricSummary(models.Model):
+    """A model that summarizes a metric series of an experiment.
+
+    The summary is updated incrementally on each metric report,
+    the best step is the step of the min or the max value depending on the optimization.
+    """
+    experiment = models.ForeignKey(
+        'db.Experiment',
+        on_delete=models.CASCADE,
+        related_name='metric_summaries')
+    name = models.CharField(max_length=256)
+    count = models.PositiveIntegerField(default=0)
+    min_value = models.FloatField()
+    min_step = models.BigIntegerField()
+    max_value = models.FloatField()
+    max_step = models.BigIntegerField()
+    last_value = models.FloatField()
+    last_step = models.BigIntegerField()
+    last_at = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return '{} <{}: {}>'.format(self.experiment_id, self.name, self.last_value)
+
+    def get_best(self, maximize: bool) -> float:
+        return self.max_value if maximize else self.min_value
+
+    def get_best_step(self, maximize: bool) -> int:
+        return self.max_step if maximize else self.min_step
+
+    class Meta:
+        app_label = 'db'
+        verbose_name_plural = 'Experiment Metric Summaries'
+        unique_together = (('experiment', 'name'),)
+        index_together = [['name', 'last_value']]
+
+
+class ExperimentMetricCompaction(models.Model):
+    """A model that tracks the retention compaction of an experiment's metrics.
+
+    Metrics created before `compacted_until` were already thinned,
+    they are not compacted a second time.
+    """
+    experiment = models.OneToOneField(
+        'db.Experiment',
+        on_delete=models.CASCADE,
+        related_name='metric_compaction')
+    compacted_until = models.DateTimeField()
+    removed = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return '{} <{}>'.format(self.experiment_id, self.compacted_until)
+
+    class Meta:
+        app_label = 'db'
 
 
 class ExperimentChartView(ChartViewModel):
@@ -24,7 +24,8 @@ from db.models.utils import (
     PersistenceModel,
     ReadmeModel,
     SubPathModel,
-    TagModel
+    TagModel,
+    UniqueNameModel
 )
 from db.redis.heartbeat import RedisHeartBeat
 from event_manager.events.job import JOB_RESTARTED
@@ -45,6 +46,7 @@ class Job(AbstractJob,
           ReadmeModel,
           TagModel,
           DeletedModel,
+          UniqueNameModel,
           JobMixin):
     """A model that represents the configuration for run job."""
     user = models.ForeignKey(
@@ -94,8 +96,7 @@ class Job(AbstractJob,
         app_label = 'db'
         unique_together = (('project', 'name'),)
 
-    @cached_property
-    def unique_name(self) -> str:
+    def get_unique_name(self) -> str:
         return JOB_UNIQUE_NAME_FORMAT.format(
             project_name=self.project.unique_name,
             id=self.id)
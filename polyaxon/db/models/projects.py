@@ -166,6 +166,8 @@ class Project(DiffModel,
         return bool(self.owner_id)
 
     def archive(self) -> bool:
+        from db.counters import reconcile_experiments_counters
+
         if not super().archive():
             return False
         self.experiment_groups.update(deleted=True)
@@ -174,9 +176,12 @@ class Project(DiffModel,
         self.build_jobs.update(deleted=True)
         self.notebook_jobs.update(deleted=True)
         self.tensorboard_jobs.update(deleted=True)
+        reconcile_experiments_counters(project_id=self.id)
         return True
 
     def unarchive(self) -> bool:
+        from db.counters import reconcile_experiments_counters
+
         if not super().unarchive():
             return False
         self.all_experiment_groups.update(deleted=False)
@@ -185,4 +190,34 @@ class Project(DiffModel,
         self.all_build_jobs.update(deleted=False)
         self.all_notebook_jobs.update(deleted=False)
         self.all_tensorboard_jobs.update(deleted=False)
+        reconcile_experiments_counters(project_id=self.id)
         return True
+
+
+class MetricRetentionPolicy(DiffModel):
+    """A model that overrides the global metric retention policy of a project.
+
+    Metrics older than `full_resolution_days` are thinned to every `keep_every`th point,
+    with the points holding the min and max values of each window.
+    """
+    project = models.OneToOneField(
+        'db.Project',
+        on_delete=models.CASCADE,
+        related_name='metric_retention_policy')
+    is_enabled = models.BooleanField(
+        default=True,
+        help_text='If the project metrics are compacted.')
+    full_resolution_days = models.PositiveIntegerField(
+        default=30,
+        help_text='The number of days metrics are kept at full resolution.')
+    keep_every = models.PositiveIntegerField(
+        default=10,
+        help_text='The size of the windows older metrics are compacted to one point per.')
+
+    def __str__(self) -> str:
+        return '{} <{}d, 1/{}>'.format(
+            self.project_id, self.full_resolution_days, self.keep_every)
+
+    class Meta:
+        app_label = 'db'
+        verbose_name_plural = 'Metric Retention Policies'
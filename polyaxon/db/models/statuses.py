@@ -44,6 +44,24 @@ class StatusModel(models.Model):
         abstract = True
 
 
+class LastStatusModel(models.Model):
+    """A model that keeps a denormalized copy of the last status.
+
+    The columns are set together with the `status` one-to-one FK,
+    so that filters, orderings and list views can use them without joining the status tables.
+    """
+    status_name = models.CharField(max_length=64, blank=True, null=True, db_index=True)
+    status_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        abstract = True
+
+    def set_last_status(self, status: StatusModel) -> None:
+        self.status = status
+        self.status_name = status.status
+        self.status_at = status.created_at
+
+
 class LastStatusMixin(object):
     """A mixin that extracts the logic of last_status.
 
@@ -64,6 +82,10 @@ class LastStatusMixin(object):
 
     @property
     def last_status(self) -> Optional[str]:
+        # Use the denormalized column when available to avoid fetching the status row
+        status_name = getattr(self, 'status_name', None)
+        if status_name:
+            return status_name
         return self.status.status if self.status else None
 
     @property
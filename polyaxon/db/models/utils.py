@@ -4,6 +4,7 @@ from django.contrib.postgres.fields import ArrayField, JSONField
 from django.core.cache import cache
 from django.core.validators import validate_slug
 from django.db import models
+from django.db.models.query_utils import DeferredAttribute
 from django.utils.functional import cached_property
 
 from db.managers.deleted import ArchivedManager, LiveManager
@@ -105,6 +106,55 @@ class DiffModel(models.Model):
         abstract = True
 
 
+class UniqueNameAttribute(DeferredAttribute):
+    """Falls back to the computed unique name while the column is empty."""
+
+    def __get__(self, instance, cls=None):
+        value = super().__get__(instance, cls)
+        if instance is None or value or instance.id is None:
+            return value
+        return instance.get_unique_name()
+
+    def __set__(self, instance, value):
+        # A data descriptor, so that it's used even after the value is loaded
+        instance.__dict__[self.field_name] = value
+
+
+class UniqueNameField(models.CharField):
+    def contribute_to_class(self, cls, name, private_only=False):
+        super().contribute_to_class(cls, name, private_only=private_only)
+        setattr(cls, self.attname, UniqueNameAttribute(self.attname))
+
+    def deconstruct(self):
+        name, _, args, kwargs = super().deconstruct()
+        # Stored as a plain char field, no migration is needed
+        return name, 'django.db.models.CharField', args, kwargs
+
+
+class UniqueNameModel(models.Model):
+    """A model that keeps a denormalized copy of its unique name.
+
+    The name needs the id, it is set right after the creation,
+    and updated for all the project's entities when the project is renamed.
+
+    Until it's set, e.g. between the insert and the update,
+    for bulk created rows or rows not backfilled yet, the attribute returns the computed name,
+    and the next save of the instance stores it.
+    """
+    unique_name = UniqueNameField(max_length=512, blank=True, null=True, db_index=True)
+
+    class Meta:
+        abstract = True
+
+    def get_unique_name(self) -> str:
+        raise NotImplementedError()
+
+    def set_unique_name(self) -> None:
+        self.unique_name = self.get_unique_name()
+        self.__class__._base_manager.filter(  # pylint:disable=protected-access
+            id=self.id).update(unique_name=self.unique_name)
+
+
 class NodeSchedulingModel(models.Model):
     node_scheduled = models.CharField(max_length=256, blank=True, null=True)
 
@@ -1,6 +1,6 @@
 from typing import Any
 
-from polyaxon.settings import redis
+from instrumentation.redis_client import InstrumentedStrictRedis
 
 
 class BaseRedisDb(object):
@@ -8,7 +8,7 @@ class BaseRedisDb(object):
 
     @classmethod
     def _get_redis(cls) -> Any:
-        return redis.StrictRedis(connection_pool=cls.REDIS_POOL)
+        return InstrumentedStrictRedis(connection_pool=cls.REDIS_POOL)
 
     @classmethod
     def connection(cls) -> Any:
@@ -0,0 +1,40 @@
+import time
+
+from db.redis.base import BaseRedisDb
+from polyaxon.settings import RedisPools
+
+
+class RedisEtagVersions(BaseRedisDb):
+    """
+    RedisEtagVersions provides a db to store a version counter per entity, e.g. experiment,
+    incremented on each change of the entity or of its related objects.
+
+    The counters are seeded with the current time in milliseconds,
+    a counter created again after its key expired does not repeat a previous version.
+    """
+    KEY_VERSION = 'etags:{}:{}'
+
+    REDIS_POOL = RedisPools.ETAGS
+
+    def __init__(self, entity: str, entity_id: int) -> None:
+        self.entity = entity
+        self.entity_id = entity_id
+        self.key = self.KEY_VERSION.format(entity, entity_id)
+        self._red = self._get_redis()
+
+    @staticmethod
+    def get_seed() -> int:
+        return int(time.time() * 1000)
+
+    def get_version(self, ttl: int) -> int:
+        pipe = self._red.pipeline()
+        pipe.set(self.key, self.get_seed(), ex=ttl, nx=True)
+        pipe.get(self.key)
+        return int(pipe.execute()[1])
+
+    def increment(self, ttl: int) -> int:
+        pipe = self._red.pipeline()
+        pipe.set(self.key, self.get_seed(), nx=True)
+        pipe.incr(self.key)
+        pipe.expire(self.key, ttl)
+        return pipe.execute()[1]
@@ -0,0 +1,30 @@
+from typing import Optional
+
+from db.redis.base import BaseRedisDb
+from polyaxon.settings import RedisPools
+
+
+class RedisLookups(BaseRedisDb):
+    """
+    RedisLookups provides a db to share the looked up instances, e.g. tokens and projects,
+    between the api processes.
+    """
+    KEY_LOOKUP = 'lookups:{}:{}'
+
+    REDIS_POOL = RedisPools.LOOKUPS
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._red = self._get_redis()
+
+    def get_key(self, key: str) -> str:
+        return self.KEY_LOOKUP.format(self.name, key)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._red.get(self.get_key(key))
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._red.setex(name=self.get_key(key), value=value, time=ttl)
+
+    def clear(self, key: str) -> None:
+        self._red.delete(self.get_key(key))
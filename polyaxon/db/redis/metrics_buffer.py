@@ -0,0 +1,79 @@
+from typing import Dict, List
+
+from db.redis.base import BaseRedisDb
+from libs.json_utils import dumps, loads
+from polyaxon.settings import RedisPools
+
+
+class RedisMetricsBuffer(BaseRedisDb):
+    """
+    RedisMetricsBuffer provides a db to buffer the reported metrics of experiments
+    before they are written in bulk to the database.
+
+    Producers append to the tail of the experiment's list,
+    the flusher reads from the head and trims what was written.
+    """
+    KEY_BUFFER = 'metrics.buffer:{}'
+    KEY_LOCK = 'metrics.buffer.lock:{}'
+    KEY_EXPERIMENTS = 'metrics.buffer.experiments'
+
+    REDIS_POOL = RedisPools.METRICS
+
+    def __init__(self, experiment: int) -> None:
+        self.experiment = experiment
+        self.key = self.KEY_BUFFER.format(experiment)
+        self.lock_key = self.KEY_LOCK.format(experiment)
+        self._red = self._get_redis()
+
+    def push(self, metrics: List[Dict]) -> int:
+        if not metrics:
+            return self.size()
+        # The pipeline is transactional, the experiment is never registered without its points
+        pipe = self._red.pipeline()
+        pipe.rpush(self.key, *[dumps(metric) for metric in metrics])
+        pipe.sadd(self.KEY_EXPERIMENTS, self.experiment)
+        size, _ = pipe.execute()
+        return size
+
+    def peek(self, count: int) -> List[Dict]:
+        return [loads(value.decode()) for value in self._red.lrange(self.key, 0, count - 1)]
+
+    def trim(self, count: int) -> None:
+        self._red.ltrim(self.key, count, -1)
+
+    def size(self) -> int:
+        return self._red.llen(self.key)
+
+    def clear(self) -> None:
+        pipe = self._red.pipeline()
+        pipe.delete(self.key)
+        pipe.srem(self.KEY_EXPERIMENTS, self.experiment)
+        pipe.execute()
+
+    def acquire_lock(self, ttl: int) -> bool:
+        return bool(self._red.set(self.lock_key, 1, ex=ttl, nx=True))
+
+    def release_lock(self) -> None:
+        self._red.delete(self.lock_key)
+
+    def unregister(self) -> None:
+        """Removes the experiment from the buffered experiments if its buffer is empty."""
+        self._red.srem(self.KEY_EXPERIMENTS, self.experiment)
+        # A push could have happened before the removal
+        if self.size():
+            self._red.sadd(self.KEY_EXPERIMENTS, self.experiment)
+
+    @classmethod
+    def get_experiments(cls) -> List[int]:
+        red = cls._get_redis()
+        return sorted(int(value) for value in red.smembers(cls.KEY_EXPERIMENTS))
+
+    @classmethod
+    def get_backlog(cls) -> Dict[int, int]:
+        experiments = cls.get_experiments()
+        if not experiments:
+            return {}
+        pipe = cls._get_redis().pipeline()
+        for experiment in experiments:
+            pipe.llen(cls.KEY_BUFFER.format(experiment))
+        return dict(zip(experiments, pipe.execute()))
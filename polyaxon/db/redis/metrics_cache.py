@@ -0,0 +1,33 @@
+from typing import Any, Optional
+
+from db.redis.base import BaseRedisDb
+from libs.json_utils import dumps, loads
+from polyaxon.settings import RedisPools
+
+
+class RedisMetricsCache(BaseRedisDb):
+    """
+    RedisMetricsCache provides a db to cache the computed metric series of experiments.
+    """
+    KEY_SERIES = 'metrics.series:{}:{}'
+
+    REDIS_POOL = RedisPools.METRICS
+
+    def __init__(self, experiment: int) -> None:
+        self.experiment = experiment
+        self._red = self._get_redis()
+
+    def get_key(self, resolution: str) -> str:
+        return self.KEY_SERIES.format(self.experiment, resolution)
+
+    def get(self, resolution: str) -> Optional[Any]:
+        value = self._red.get(self.get_key(resolution))
+        if not value:
+            return None
+        return loads(value.decode())
+
+    def set(self, resolution: str, value: Any, ttl: int) -> None:
+        self._red.setex(name=self.get_key(resolution), value=dumps(value), time=ttl)
+
+    def clear(self, resolution: str) -> None:
+        self._red.delete(self.get_key(resolution))
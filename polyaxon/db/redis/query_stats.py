@@ -0,0 +1,37 @@
+from typing import List, Mapping, Tuple
+
+from db.redis.base import BaseRedisDb
+from polyaxon.settings import RedisPools
+
+
+class RedisQueryStats(BaseRedisDb):
+    """
+    RedisQueryStats provides a db to count the keys of a json field used in queries,
+    e.g. the `last_metric` keys used to filter or to sort experiments.
+    """
+    KEY_STATS = 'query.stats:{}'
+
+    REDIS_POOL = RedisPools.METRICS
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self.key = self.KEY_STATS.format(field)
+        self._red = self._get_redis()
+
+    def record(self, counts: Mapping[str, int]) -> None:
+        pipe = self._red.pipeline()
+        for key, count in counts.items():
+            pipe.zincrby(self.key, key, count)
+        pipe.execute()
+
+    def get_top(self, count: int = None, min_count: int = 1) -> List[Tuple[str, int]]:
+        values = self._red.zrevrangebyscore(self.key,
+                                            max='+inf',
+                                            min=min_count,
+                                            start=0 if count else None,
+                                            num=count,
+                                            withscores=True)
+        return [(key.decode(), int(score)) for key, score in values]
+
+    def clear(self) -> None:
+        self._red.delete(self.key)
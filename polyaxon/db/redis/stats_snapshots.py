@@ -0,0 +1,40 @@
+from typing import List
+
+from db.redis.base import BaseRedisDb
+from polyaxon.settings import RedisPools
+
+
+class RedisStatsSnapshots(BaseRedisDb):
+    """
+    RedisStatsSnapshots provides a db to share the stats snapshot of each process,
+    e.g. the api and the celery workers, the snapshots of dead processes expire.
+    """
+    KEY_SNAPSHOT = 'stats.snapshot:{}'
+
+    REDIS_POOL = RedisPools.METRICS
+
+    def __init__(self, process: str) -> None:
+        self.key = self.KEY_SNAPSHOT.format(process)
+        self._red = self._get_redis()
+
+    def set(self, value: str, ttl: int) -> None:
+        self._red.setex(name=self.key, value=value, time=ttl)
+
+    @classmethod
+    def _get_keys(cls, red) -> List[bytes]:
+        return list(red.scan_iter(match=cls.KEY_SNAPSHOT.format('*')))
+
+    @classmethod
+    def get_all(cls) -> List[str]:
+        red = cls._get_redis()
+        keys = cls._get_keys(red)
+        if not keys:
+            return []
+        return [value.decode() for value in red.mget(keys) if value]
+
+    @classmethod
+    def clear_all(cls) -> None:
+        red = cls._get_redis()
+        keys = cls._get_keys(red)
+        if keys:
+            red.delete(*keys)
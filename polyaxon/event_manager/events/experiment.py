@@ -268,7 +268,8 @@ class ExperimentNewMetricEvent(Event):
     attributes = (
         Attribute('id'),
         Attribute('project.id'),
-        Attribute('experiment_group.id', is_required=False)
+        Attribute('experiment_group.id', is_required=False),
+        Attribute('metrics_count', attr_type=int, is_required=False),
     )
 
 
@@ -1,3 +1,5 @@
+import conf
+
 from db.redis.tll import RedisTTL
 from event_manager import event_subjects
 from event_manager.events import experiment
@@ -79,8 +81,9 @@ class ExperimentHandler(BaseHandler):
         if not instance:
             return
 
-        # Check if it's part of an experiment group, and start following tasks
-        if not instance.is_independent:
+        # Check if it's part of an experiment group, and start following tasks,
+        # with deferred recomputation this is scheduled once per group and transaction
+        if not instance.is_independent and not conf.get('STATUSES_DEFERRED_RECOMPUTE'):
             celery_app.send_task(
                 HPCeleryTasks.HP_START,
                 kwargs={'experiment_group_id': instance.experiment_group.id},
@@ -1,3 +1,5 @@
+import conf
+
 from event_manager import event_subjects
 from event_manager.events import experiment_job
 from executor.handlers.base import BaseHandler
@@ -10,6 +12,10 @@ class ExperimentJobHandler(BaseHandler):
 
     @classmethod
     def _handle_experiment_job_new_status(cls, event: 'Event') -> None:
+        if conf.get('STATUSES_DEFERRED_RECOMPUTE'):
+            # The experiment status check was already scheduled once per transaction
+            return
+
         instance = event.instance
         if not instance or instance.experiment.is_done:
             return
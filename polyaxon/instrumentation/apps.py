@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class InstrumentationConfig(AppConfig):
+    name = 'instrumentation'
+    verbose_name = 'Instrumentation'
+
+    def ready(self):
+        import instrumentation.celery_signals  # noqa
+        import instrumentation.db_signals  # noqa
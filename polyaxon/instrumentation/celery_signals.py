@@ -0,0 +1,56 @@
+import time
+
+from threading import local
+
+from celery.signals import before_task_publish, task_failure, task_postrun, task_prerun
+
+import stats
+
+PUBLISHED_AT_HEADER = 'polyaxon_published_at'
+
+_timers = local()
+
+
+def get_task_tags(task_name):
+    return ['task:{}'.format(task_name)]
+
+
+def get_published_at(request):
+    published_at = getattr(request, PUBLISHED_AT_HEADER, None)
+    if published_at is None:
+        published_at = (getattr(request, 'headers', None) or {}).get(PUBLISHED_AT_HEADER)
+    return published_at
+
+
+@before_task_publish.connect(dispatch_uid='instrumentation_task_publish')
+def task_publish_handler(sender=None, headers=None, **kwargs):
+    if headers is not None:
+        headers[PUBLISHED_AT_HEADER] = time.time()
+    stats.incr('celery.tasks.published', tags=get_task_tags(sender))
+
+
+@task_prerun.connect(dispatch_uid='instrumentation_task_prerun')
+def task_prerun_handler(task_id=None, task=None, **kwargs):
+    if not hasattr(_timers, 'starts'):
+        _timers.starts = {}
+    _timers.starts[task_id] = time.monotonic()
+
+    published_at = get_published_at(task.request) if task else None
+    if published_at:
+        lag = max(time.time() - float(published_at), 0)
+        stats.timing('celery.tasks.queue_lag', lag * 1000, tags=get_task_tags(task.name))
+
+
+@task_postrun.connect(dispatch_uid='instrumentation_task_postrun')
+def task_postrun_handler(task_id=None, task=None, state=None, **kwargs):
+    start = getattr(_timers, 'starts', {}).pop(task_id, None)
+    if start is None or task is None:
+        return
+    tags = get_task_tags(task.name) + ['state:{}'.format(state)]
+    stats.timing('celery.tasks.runtime', (time.monotonic() - start) * 1000, tags=tags)
+    stats.incr('celery.tasks.done', tags=tags)
+
+
+@task_failure.connect(dispatch_uid='instrumentation_task_failure')
+def task_failure_handler(sender=None, **kwargs):
+    stats.incr('celery.tasks.failures', tags=get_task_tags(getattr(sender, 'name', sender)))
@@ -0,0 +1,36 @@
+import time
+
+from django.db.backends.signals import connection_created
+
+import stats
+
+
+class QueryCounter(object):
+    """An execute wrapper that counts and times the ORM queries by statement type."""
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    @staticmethod
+    def get_statement(sql):
+        statement = sql.lstrip().split(None, 1)
+        return statement[0].lower() if statement else 'unknown'
+
+    def __call__(self, execute, sql, params, many, context):
+        tags = ['alias:{}'.format(self.alias), 'statement:{}'.format(self.get_statement(sql))]
+        start = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            stats.incr('db.queries', tags=tags)
+            stats.timing('db.queries.duration', (time.monotonic() - start) * 1000, tags=tags)
+
+
+def add_query_counter(connection):
+    if not any(isinstance(wrapper, QueryCounter) for wrapper in connection.execute_wrappers):
+        connection.execute_wrappers.append(QueryCounter(alias=connection.alias))
+
+
+@connection_created.connect(dispatch_uid='instrumentation_connection_created')
+def connection_created_handler(sender, connection, **kwargs):
+    add_query_counter(connection)
@@ -0,0 +1,28 @@
+import time
+
+import stats
+
+
+class ViewLatencyMiddleware(object):
+    """Records the latency and the count of the requests per view, method and status class."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    @staticmethod
+    def get_tags(request, response):
+        resolver_match = getattr(request, 'resolver_match', None)
+        view_name = resolver_match.view_name if resolver_match else 'unresolved'
+        return [
+            'view:{}'.format(view_name),
+            'method:{}'.format(request.method),
+            'status:{}xx'.format(response.status_code // 100),
+        ]
+
+    def __call__(self, request):
+        start = time.monotonic()
+        response = self.get_response(request)
+        tags = self.get_tags(request, response)
+        stats.timing('api.requests.latency', (time.monotonic() - start) * 1000, tags=tags)
+        stats.incr('api.requests', tags=tags)
+        return response
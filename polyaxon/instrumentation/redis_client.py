@@ -0,0 +1,12 @@
+import redis
+
+import stats
+
+
+class InstrumentedStrictRedis(redis.StrictRedis):
+    """A redis client that counts the executed commands."""
+
+    def execute_command(self, *args, **options):
+        command = args[0] if args else 'unknown'
+        stats.incr('redis.commands', tags=['command:{}'.format(str(command).lower())])
+        return super().execute_command(*args, **options)
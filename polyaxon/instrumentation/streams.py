@@ -0,0 +1,27 @@
+import threading
+
+import stats
+
+
+class WebsocketsGauge(object):
+    """Tracks the number of open websocket connections of the process."""
+
+    def __init__(self, key='streams.websockets'):
+        self.key = key
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def _update(self, delta):
+        with self._lock:
+            self.value = max(self.value + delta, 0)
+            value = self.value
+        stats.gauge(self.key, value)
+
+    def incr(self, amount=1):
+        self._update(amount)
+
+    def decr(self, amount=1):
+        self._update(-amount)
+
+
+websockets_gauge = WebsocketsGauge()
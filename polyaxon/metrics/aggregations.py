@@ -0,0 +1,185 @@
+import warnings
+
+from collections import namedtuple
+from typing import Dict, Iterable, List, Mapping, Sequence
+
+import numpy as np
+
+from django.db import connection
+
+import conf
+
+from db.models.experiments import ExperimentMetricChunk, ExperimentMetricSummary
+from metrics.queries import get_max_points, get_names
+from schemas.hptuning import Optimization
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+AggregationQuery = namedtuple('AggregationQuery', 'names optimization max_points')
+
+
+def parse_aggregation_query(params: Mapping) -> AggregationQuery:
+    """Parses the query params of an aggregation query, raises a `ValueError` for invalid values."""
+    optimization = params.get('optimization') or Optimization.MINIMIZE
+    if optimization not in (Optimization.MINIMIZE, Optimization.MAXIMIZE):
+        raise ValueError('`optimization` must be one of {}, {}.'.format(
+            Optimization.MINIMIZE, Optimization.MAXIMIZE))
+    return AggregationQuery(names=get_names(params),
+                            optimization=optimization,
+                            max_points=get_max_points(params))
+
+
+def get_summaries(experiment_ids: Sequence[int],
+                  names: Sequence[str] = None,
+                  optimization: str = Optimization.MINIMIZE) -> Dict[int, Dict[str, Dict]]:
+    """Returns the final, best and mean values of the experiments' metrics, computed in sql.
+
+    Experiments without metric chunks, e.g. not migrated by `migrate_metrics` yet,
+    fall back to their metric summaries, which have no mean.
+    """
+    if not experiment_ids:
+        return {}
+
+    # pylint:disable=protected-access
+    query = """
+        SELECT c.experiment_id, c.name, COUNT(*), MIN(p.value), MAX(p.value), AVG(p.value),
+               (ARRAY_AGG(p.value ORDER BY p.step DESC))[1],
+               MAX(p.step)
+        FROM {table} AS c, UNNEST(c.steps, c.{values}) AS p(step, value)
+        WHERE c.experiment_id = ANY(%s) {names_filter}
+        GROUP BY c.experiment_id, c.name
+    """.format(table=ExperimentMetricChunk._meta.db_table,
+               values=connection.ops.quote_name('values'),
+               names_filter='AND c.name = ANY(%s)' if names else '')
+    params = [list(experiment_ids)]
+    if names:
+        params.append(list(names))
+
+    maximize = Optimization.maximize(optimization)
+    summaries = {experiment_id: {} for experiment_id in experiment_ids}
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        for experiment_id, name, count, min_value, max_value, mean, final, final_step in cursor:
+            summaries[experiment_id][name] = {
+                'count': count,
+                'min': min_value,
+                'max': max_value,
+                'mean': mean,
+                'best': max_value if maximize else min_value,
+                'final': final,
+                'final_step': final_step,
+            }
+
+    missing_ids = [experiment_id for experiment_id, metrics in summaries.items() if not metrics]
+    if missing_ids:
+        fallback = ExperimentMetricSummary.objects.filter(experiment_id__in=missing_ids)
+        if names:
+            fallback = fallback.filter(name__in=names)
+        for summary in fallback:
+            summaries[summary.experiment_id][summary.name] = {
+                'count': summary.count,
+                'min': summary.min_value,
+                'max': summary.max_value,
+                'mean': None,
+                'best': summary.get_best(maximize=maximize),
+                'final': summary.last_value,
+                'final_step': summary.last_step,
+            }
+    return summaries
+
+
+def get_grid(steps: Iterable[np.ndarray], max_points: int = None) -> np.ndarray:
+    """Returns the steps at which the series are compared, at most `max_points` of them."""
+    grid = np.unique(np.concatenate(list(steps)))
+    if max_points and len(grid) > max_points:
+        grid = np.unique(np.linspace(grid[0], grid[-1], num=max_points).astype(np.int64))
+    return grid
+
+
+def get_values_at(steps: np.ndarray, values: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """Returns the last reported value at each step of the grid,
+    NaN outside of the series' steps range."""
+    positions = np.searchsorted(steps, grid, side='right') - 1
+    result = values[np.clip(positions, 0, None)]
+    return np.where((positions >= 0) & (grid <= steps[-1]), result, np.nan)
+
+
+def get_bands(series: List[np.ndarray], max_points: int = None) -> Dict[str, List]:
+    """Computes the percentile bands, at each step, of a metric across several experiments.
+
+    Each series is a 2d array of (steps, values) ordered by step.
+    """
+    series = [s for s in series if s.shape[1]]
+    if not series:
+        return dict({'steps': [], 'count': []}, **{'p{}'.format(p): [] for p in PERCENTILES})
+
+    grid = get_grid((s[0] for s in series), max_points=max_points)
+    matrix = np.vstack([get_values_at(s[0], s[1], grid) for s in series])
+    counts = np.sum(~np.isnan(matrix), axis=0)
+    with warnings.catch_warnings():
+        # Steps of the grid between the series' ranges have no values
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        percentiles = np.nanpercentile(matrix, PERCENTILES, axis=0)
+    bands = {'steps': grid.astype(np.int64).tolist(), 'count': counts.tolist()}
+    for percentile, values in zip(PERCENTILES, percentiles):
+        bands['p{}'.format(percentile)] = [None if np.isnan(v) else v for v in values.tolist()]
+    return bands
+
+
+def get_experiments_series(experiment_ids: Sequence[int],
+                           name: str,
+                           max_points: int = None) -> List[np.ndarray]:
+    """Returns the series of a metric of the experiments, downsampled in sql.
+
+    The steps range of all the series is split in at most `max_points` buckets of equal width,
+    each series keeps its first point of each bucket, at the bucket's first step,
+    so that at most `max_points` points are loaded per experiment.
+    """
+    if not experiment_ids:
+        return []
+
+    # pylint:disable=protected-access
+    query = """
+        WITH points AS (
+            SELECT c.experiment_id, p.step, p.value
+            FROM {table} AS c, UNNEST(c.steps, c.{values}) AS p(step, value)
+            WHERE c.experiment_id = ANY(%s) AND c.name = %s
+        ), buckets AS (
+            SELECT MIN(step) AS start_step,
+                   GREATEST(CEIL((MAX(step) - MIN(step) + 1)::numeric / %s), 1)::bigint AS width
+            FROM points
+        )
+        SELECT p.experiment_id,
+               b.start_step + (p.step - b.start_step) / b.width * b.width AS bucket,
+               (ARRAY_AGG(p.value ORDER BY p.step))[1]
+        FROM points AS p, buckets AS b
+        GROUP BY p.experiment_id, bucket
+    """.format(table=ExperimentMetricChunk._meta.db_table,
+               values=connection.ops.quote_name('values'))
+    max_points = max_points or conf.get('METRICS_SERIES_MAX_POINTS')
+
+    points = {}
+    with connection.cursor() as cursor:
+        cursor.execute(query, [list(experiment_ids), name, max_points])
+        for experiment_id, step, value in cursor:
+            experiment_points = points.setdefault(experiment_id, ([], []))
+            experiment_points[0].append(step)
+            experiment_points[1].append(value)
+
+    series = []
+    for steps, values in points.values():
+        data = np.array([steps, values], dtype=np.float64)
+        series.append(data[:, np.argsort(data[0], kind='mergesort')])
+    return series
+
+
+def get_group_bands(experiment_ids: Sequence[int],
+                    names: Sequence[str],
+                    max_points: int = None) -> Dict[str, Dict]:
+    if not names:
+        names = ExperimentMetricChunk.objects.filter(
+            experiment_id__in=experiment_ids).values_list(
+            'name', flat=True).order_by('name').distinct()
+    return {name: get_bands(get_experiments_series(experiment_ids, name, max_points=max_points),
+                            max_points=max_points)
+            for name in names}
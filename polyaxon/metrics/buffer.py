@@ -0,0 +1,114 @@
+import logging
+
+from typing import Dict, List, Optional
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+import conf
+import stats
+
+from db.models.experiments import Experiment, ExperimentMetric
+from db.redis.metrics_buffer import RedisMetricsBuffer
+from metrics.ingestion import ingest_metrics
+
+_logger = logging.getLogger('polyaxon.metrics')
+
+
+def buffer_metrics(experiment_id: int, metrics: List[Dict]) -> int:
+    """Appends validated metrics to the experiment's buffer, returns the buffer size.
+
+    The reception time is used for the metrics without `created_at`,
+    so that the flushed metrics keep the order in which they were received.
+    """
+    now = timezone.now()
+    metrics = [{'created_at': (metric.get('created_at') or now).isoformat(),
+                'values': metric['values'],
+                'step': metric.get('step')}
+               for metric in metrics]
+    return RedisMetricsBuffer(experiment=experiment_id).push(metrics)
+
+
+def get_step(metric: Dict) -> Optional[int]:
+    if metric.get('step') is not None:
+        return metric['step']
+    return ExperimentMetric.get_step(metric['values'])
+
+
+def deduplicate(experiment_id: int, metrics: List[Dict]) -> List[Dict]:
+    """Drops the metrics that were already reported with the same step and values.
+
+    Metrics are identified by their step and values' hash, as in the database,
+    so distinct reports of the same step are all kept,
+    and the ones already written are dropped,
+    which makes a flush interrupted before trimming the buffer safe to replay.
+    Metrics without a step are always kept.
+    """
+    keys = {}
+    for metric in metrics:
+        step = get_step(metric)
+        if step is not None:
+            keys.setdefault((step, ExperimentMetric.get_hash(metric['values'])), metric)
+
+    existing = set(ExperimentMetric.objects.filter(
+        experiment_id=experiment_id,
+        step__in={step for step, _ in keys}).values_list('step', 'hash')) if keys else set()
+
+    results = []
+    for metric in metrics:
+        step = get_step(metric)
+        if step is None:
+            results.append(metric)
+            continue
+        key = (step, ExperimentMetric.get_hash(metric['values']))
+        if keys[key] is metric and key not in existing:
+            results.append(metric)
+    return results
+
+
+def flush_experiment(experiment_id: int, batch_size: int = None) -> int:
+    """Writes the buffered metrics of an experiment to the database in batches.
+
+    The points are only removed from the buffer once written,
+    a lock prevents concurrent flushes of the same experiment.
+    Returns the number of metrics written.
+    """
+    batch_size = batch_size or conf.get('METRICS_BUFFER_FLUSH_BATCH_SIZE')
+    buffer = RedisMetricsBuffer(experiment=experiment_id)
+    if not buffer.acquire_lock(ttl=conf.get('METRICS_BUFFER_LOCK_TTL')):
+        return 0
+
+    written = 0
+    try:
+        experiment = Experiment.all.filter(id=experiment_id).first()
+        while True:
+            values = buffer.peek(batch_size)
+            if not values:
+                break
+            metrics = [{'created_at': parse_datetime(value['created_at']),
+                        'values': value['values'],
+                        'step': value.get('step')} for value in values]
+            if experiment:
+                metrics = deduplicate(experiment_id=experiment_id, metrics=metrics)
+                written += len(ingest_metrics(experiment=experiment, metrics=metrics))
+            else:
+                _logger.info('Dropping %s buffered metrics of the deleted experiment `%s`.',
+                             len(values), experiment_id)
+            buffer.trim(len(values))
+        buffer.unregister()
+    finally:
+        buffer.release_lock()
+    return written
+
+
+def get_backlog() -> int:
+    """Returns the number of buffered metrics waiting to be written."""
+    return sum(RedisMetricsBuffer.get_backlog().values())
+
+
+def flush_buffers(batch_size: int = None) -> int:
+    written = 0
+    for experiment_id in RedisMetricsBuffer.get_experiments():
+        written += flush_experiment(experiment_id=experiment_id, batch_size=batch_size)
+    stats.gauge('metrics.buffer.backlog', get_backlog())
+    return written
@@ -0,0 +1,91 @@
+import logging
+
+from typing import Tuple
+
+from django.db import connection, transaction
+
+import conf
+
+from db.etags import increment_experiment_version
+from db.models.experiments import ExperimentMetric
+from metrics.storage import migrate_experiment_metrics
+from metrics.summaries import rebuild_summaries
+
+_logger = logging.getLogger('polyaxon.metrics')
+
+
+def _set_keys(rows) -> None:
+    # pylint:disable=protected-access
+    table = ExperimentMetric._meta.db_table
+    query = """
+        UPDATE {table} AS m SET step = v.step, hash = v.hash
+        FROM (VALUES {rows}) AS v(id, step, hash)
+        WHERE m.id = v.id
+    """.format(table=table, rows=', '.join(['(%s::integer, %s::bigint, %s::varchar)'] * len(rows)))
+    params = []
+    for row in rows:
+        params += [row['id'], row['step'], row['hash']]
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+
+
+def _compact_chunk(experiment_id: int, chunk_size: int) -> Tuple[int, int]:
+    rows = list(ExperimentMetric.objects.filter(
+        experiment_id=experiment_id,
+        hash__isnull=True).order_by('id').values('id', 'step', 'values')[:chunk_size])
+    if not rows:
+        return 0, 0
+
+    for row in rows:
+        if row['step'] is None:
+            row['step'] = ExperimentMetric.get_step(row['values'])
+        row['hash'] = ExperimentMetric.get_hash(row['values'])
+
+    steps = {row['step'] for row in rows if row['step'] is not None}
+    seen = set(ExperimentMetric.objects.filter(
+        experiment_id=experiment_id,
+        step__in=steps,
+        hash__isnull=False).values_list('step', 'hash')) if steps else set()
+
+    # The first report of a step and values is kept
+    kept, duplicates = [], []
+    for row in rows:
+        key = (row['step'], row['hash'])
+        if row['step'] is not None and key in seen:
+            duplicates.append(row['id'])
+        else:
+            seen.add(key)
+            kept.append(row)
+
+    with transaction.atomic():
+        if duplicates:
+            ExperimentMetric.objects.filter(id__in=duplicates).delete()
+        if kept:
+            _set_keys(kept)
+    return len(kept), len(duplicates)
+
+
+def compact_experiment_metrics(experiment_id: int, chunk_size: int = 1000) -> Tuple[int, int]:
+    """Sets the step and hash of the experiment's historical metrics and removes the duplicates.
+
+    Metrics are processed by chunks of `chunk_size` rows, each chunk in its own transaction,
+    the chunks and the summaries of the experiment are rebuilt if duplicates were removed.
+
+    Returns the number of metrics kept and removed.
+    """
+    kept, removed = 0, 0
+    while True:
+        chunk_kept, chunk_removed = _compact_chunk(experiment_id=experiment_id,
+                                                   chunk_size=chunk_size)
+        if not chunk_kept and not chunk_removed:
+            break
+        kept += chunk_kept
+        removed += chunk_removed
+
+    if removed:
+        if conf.get('METRICS_CHUNKS_ENABLED'):
+            migrate_experiment_metrics(experiment_id=experiment_id, batch_size=chunk_size)
+        rebuild_summaries(experiment_id=experiment_id, batch_size=chunk_size)
+        increment_experiment_version(experiment_id=experiment_id)
+        _logger.info('Removed %s duplicate metrics of experiment `%s`.', removed, experiment_id)
+    return kept, removed
@@ -0,0 +1,87 @@
+from typing import Dict, List
+
+import numpy as np
+
+from metrics.storage import Point
+
+LTTB = 'lttb'
+BUCKETS = 'buckets'
+METHODS = (LTTB, BUCKETS)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Returns the indices of the points selected by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept, each bucket in between keeps the point
+    forming the largest triangle with the previous selected point and the next bucket's mean.
+    """
+    size = len(x)
+    if threshold >= size or threshold < 3:
+        return np.arange(size)
+
+    bucket_size = (size - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = size - 1
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, size)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) -
+                       (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        indices[i + 1] = a
+    return indices
+
+
+def get_buckets(size: int, max_points: int) -> np.ndarray:
+    """Returns the start index of `max_points` buckets of (almost) equal sizes."""
+    return np.unique(np.linspace(0, size, num=min(max_points, size), endpoint=False).astype(
+        np.int64))
+
+
+def format_timestamps(timestamps: np.ndarray) -> List[str]:
+    return [timestamp.isoformat() for timestamp in timestamps]
+
+
+def downsample_lttb(points: List[Point], max_points: int) -> Dict[str, List]:
+    steps = np.array([p.step for p in points], dtype=np.float64)
+    values = np.array([p.value for p in points], dtype=np.float64)
+    indices = lttb(steps, values, max_points)
+    return {
+        'steps': steps[indices].astype(np.int64).tolist(),
+        'timestamps': format_timestamps(np.array([p.timestamp for p in points])[indices]),
+        'values': values[indices].tolist(),
+    }
+
+
+def downsample_buckets(points: List[Point], max_points: int) -> Dict[str, List]:
+    """Aggregates the points in `max_points` buckets with their min, max and mean values.
+
+    Each bucket is positioned at the step and timestamp of its first point.
+    """
+    values = np.array([p.value for p in points], dtype=np.float64)
+    starts = get_buckets(len(points), max_points)
+    counts = np.diff(np.append(starts, len(points)))
+    return {
+        'steps': [points[i].step for i in starts],
+        'timestamps': format_timestamps([points[i].timestamp for i in starts]),
+        'min': np.minimum.reduceat(values, starts).tolist(),
+        'max': np.maximum.reduceat(values, starts).tolist(),
+        'mean': (np.add.reduceat(values, starts) / counts).tolist(),
+    }
+
+
+def downsample(points: List[Point], max_points: int, method: str = LTTB) -> Dict[str, List]:
+    """Downsamples a series ordered by step to at most `max_points` points."""
+    if not points:
+        if method == BUCKETS:
+            return {'steps': [], 'timestamps': [], 'min': [], 'max': [], 'mean': []}
+        return {'steps': [], 'timestamps': [], 'values': []}
+    if method == BUCKETS:
+        return downsample_buckets(points, max_points)
+    return downsample_lttb(points, max_points)
@@ -0,0 +1,121 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from redis.exceptions import RedisError
+
+from django.db import connection
+
+import conf
+
+from db.models.experiments import Experiment
+from db.redis.query_stats import RedisQueryStats
+
+_logger = logging.getLogger('polyaxon.metrics')
+
+METRIC_FIELD = 'last_metric'
+METRIC_INDEX_PREFIX = 'db_experiment_metric_'
+METRIC_KEY_PATTERN = re.compile(r'^[\w.\-]+$')
+
+
+_pending_keys = {}  # type: Dict[str, Counter]
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def flush_keys() -> None:
+    """Writes the key counts buffered by this process, failures are logged and dropped."""
+    global _last_flush  # pylint:disable=global-statement
+
+    with _pending_lock:
+        pending = dict(_pending_keys)
+        _pending_keys.clear()
+        _last_flush = time.monotonic()
+
+    for field, counts in pending.items():
+        try:
+            RedisQueryStats(field=field).record(counts)
+        except RedisError as e:
+            _logger.warning('Could not record the query stats of `%s`: %s', field, e)
+
+
+def record_keys(field: str, keys: Iterable[str]) -> None:
+    """
+    Counts the json keys used in a query.
+
+    The counts are buffered in-process and flushed to redis once per interval,
+    so queries never wait on redis and a redis failure never fails a query.
+    """
+    keys = [key for key in keys if key]
+    if not keys or not conf.get('METRICS_QUERY_STATS_ENABLED'):
+        return
+    with _pending_lock:
+        _pending_keys.setdefault(field, Counter()).update(keys)
+        should_flush = (time.monotonic() - _last_flush >=
+                        conf.get('METRICS_QUERY_STATS_FLUSH_INTERVAL'))
+    if should_flush:
+        flush_keys()
+
+
+def get_frequent_keys(count: int = None, min_count: int = 1) -> List[Tuple[str, int]]:
+    flush_keys()
+    return RedisQueryStats(field=METRIC_FIELD).get_top(count=count, min_count=min_count)
+
+
+def is_valid_key(key: str) -> bool:
+    return bool(key and METRIC_KEY_PATTERN.match(key))
+
+
+def get_index_name(key: str) -> str:
+    # Postgres truncates identifiers to 63 characters, the hash keeps the names unique
+    suffix = re.sub(r'\W', '_', key.lower())[:24]
+    digest = hashlib.md5(key.encode()).hexdigest()[:8]
+    return '{}{}_{}'.format(METRIC_INDEX_PREFIX, suffix, digest)
+
+
+def get_indexes() -> Dict[str, str]:
+    """Returns the definitions of the metric expression indexes by name."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT indexname, indexdef FROM pg_indexes '
+            'WHERE tablename = %s AND indexname LIKE %s',
+            [Experiment._meta.db_table,  # pylint:disable=protected-access
+             METRIC_INDEX_PREFIX.replace('_', '\\_') + '%'])
+        return dict(cursor.fetchall())
+
+
+def create_index(key: str, concurrently: bool = True) -> str:
+    """Creates an expression index on a `last_metric` key.
+
+    The expression is the one generated by the query manager and the ordering filter,
+    `(last_metric -> 'key')`, the project is the leading column since experiments
+    are always listed by project.
+
+    `concurrently` does not lock the table but cannot run in a transaction.
+    """
+    if not is_valid_key(key):
+        raise ValueError('Metric key `{}` is not valid.'.format(key))
+    name = get_index_name(key)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'CREATE INDEX {concurrently} IF NOT EXISTS {name} '
+            'ON {table} (project_id, ({field} -> %s))'.format(
+                concurrently='CONCURRENTLY' if concurrently else '',
+                name=name,
+                table=Experiment._meta.db_table,  # pylint:disable=protected-access
+                field=METRIC_FIELD),
+            [key])
+    return name
+
+
+def drop_index(key: str, concurrently: bool = True) -> str:
+    name = get_index_name(key)
+    with connection.cursor() as cursor:
+        cursor.execute('DROP INDEX {} IF EXISTS {}'.format(
+            'CONCURRENTLY' if concurrently else '', name))
+    return name
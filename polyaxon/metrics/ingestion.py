@@ -0,0 +1,136 @@
+import json
+
+from typing import Dict, Iterable, List, Optional
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+import auditor
+import conf
+
+from db.etags import increment_experiment_version
+from db.models.experiments import Experiment, ExperimentMetric
+from event_manager.events.experiment import EXPERIMENT_NEW_METRIC
+from metrics.storage import store as chunk_store
+from metrics.summaries import update_summaries
+
+
+def merge_values(metrics: Iterable[Dict]) -> Dict:
+    """Merges the values of the metrics in chronological order, the latest value of a key wins."""
+    merged = {}
+    for metric in sorted(metrics, key=lambda m: m['created_at']):
+        merged.update(metric['values'] or {})
+    return merged
+
+
+def update_last_metric(experiment_id: int, values: Dict) -> Optional[Dict]:
+    """Merges the values into the experiment's last metric in a single statement.
+
+    The merge happens in the database (jsonb `||`), so that concurrent reporters
+    do not overwrite each other's keys with a stale read.
+    """
+    if not values:
+        return None
+    table = Experiment._meta.db_table  # pylint:disable=protected-access
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'UPDATE {} SET last_metric = COALESCE(last_metric, \'{{}}\'::jsonb) || %s::jsonb '
+            'WHERE id = %s RETURNING last_metric'.format(table),
+            [json.dumps(values), experiment_id])
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    # The experiment row is updated without its signals, the new metrics must change its etags
+    increment_experiment_version(experiment_id=experiment_id)
+    last_metric = row[0]
+    return json.loads(last_metric) if isinstance(last_metric, str) else last_metric
+
+
+def insert_metrics(experiment_id: int,
+                   metrics: List[Dict],
+                   batch_size: int) -> List[ExperimentMetric]:
+    """Inserts the metrics in batches and skips the ones already stored.
+
+    A metric is skipped if a metric with the same step and values' hash exists
+    (`ON CONFLICT DO NOTHING`), metrics without a step are always inserted.
+    Returns the inserted metrics.
+    """
+    # pylint:disable=protected-access
+    table = ExperimentMetric._meta.db_table
+    inserted = []
+    for i in range(0, len(metrics), batch_size):
+        batch = metrics[i:i + batch_size]
+        query = """
+            INSERT INTO {table} (experiment_id, created_at, {values}, step, hash)
+            VALUES {rows}
+            ON CONFLICT (experiment_id, step, hash) DO NOTHING
+            RETURNING id, step, hash
+        """.format(table=table,
+                   values=connection.ops.quote_name('values'),
+                   rows=', '.join(['(%s, %s, %s::jsonb, %s, %s)'] * len(batch)))
+        params = []
+        for metric in batch:
+            params += [experiment_id, metric['created_at'], json.dumps(metric['values']),
+                       metric['step'], metric['hash']]
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+
+        # The returned rows follow the order of the values, without the skipped ones
+        rows = iter(rows)
+        row = next(rows, None)
+        for metric in batch:
+            if row is None:
+                break
+            if (metric['step'], metric['hash']) == (row[1], row[2]):
+                inserted.append(ExperimentMetric(id=row[0], experiment_id=experiment_id, **metric))
+                row = next(rows, None)
+    return inserted
+
+
+def ingest_metrics(experiment: Experiment,
+                   metrics: List[Dict],
+                   batch_size: int = None) -> List[ExperimentMetric]:
+    """Creates the metrics of an experiment in bulk.
+
+    The rows are inserted in batches (no per row signals), retried reports of a step
+    are skipped, and only the new metrics are appended to the chunks.
+    The experiment's summaries and last metric are updated once for the whole batch,
+    and one event is recorded for the batch.
+
+    Each metric is a dict with `values` and an optional `created_at` and `step`,
+    the step defaults to the `step` value.
+    """
+    if not metrics:
+        return []
+
+    now = timezone.now()
+    metrics = [{
+        'created_at': metric.get('created_at') or now,
+        'values': metric['values'],
+        'step': (metric['step'] if metric.get('step') is not None
+                 else ExperimentMetric.get_step(metric['values'])),
+        'hash': ExperimentMetric.get_hash(metric['values']),
+    } for metric in metrics]
+    batch_size = batch_size or conf.get('METRICS_BULK_BATCH_SIZE')
+    with transaction.atomic():
+        instances = insert_metrics(experiment_id=experiment.id,
+                                   metrics=metrics,
+                                   batch_size=batch_size)
+        metrics = [{'created_at': instance.created_at,
+                    'values': instance.values,
+                    'step': instance.step} for instance in instances]
+        if not metrics:
+            return []
+        if conf.get('METRICS_CHUNKS_ENABLED'):
+            chunk_store.append(experiment_id=experiment.id, metrics=metrics)
+        update_summaries(experiment_id=experiment.id, metrics=metrics)
+        last_metric = update_last_metric(experiment_id=experiment.id,
+                                         values=merge_values(metrics))
+    if last_metric is not None:
+        experiment.last_metric = last_metric
+
+    auditor.record(event_type=EXPERIMENT_NEW_METRIC,
+                   instance=experiment,
+                   metrics_count=len(instances))
+    return instances
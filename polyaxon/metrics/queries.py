@@ -0,0 +1,121 @@
+import hashlib
+
+from collections import namedtuple
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+from hestia.datetime_typing import AwareDT
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+import conf
+
+from db.redis.metrics_cache import RedisMetricsCache
+from metrics.downsampling import LTTB, METHODS, downsample
+from metrics.storage import store
+
+SeriesQuery = namedtuple(
+    'SeriesQuery',
+    'names max_points method start_step end_step start_at end_at')
+
+
+def _get_int(params: Mapping, key: str) -> Optional[int]:
+    value = params.get(key)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError('`{}` must be an integer, received `{}`.'.format(key, value))
+
+
+def _get_datetime(params: Mapping, key: str) -> Optional[AwareDT]:
+    value = params.get(key)
+    if value in (None, ''):
+        return None
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError('`{}` must be a datetime, received `{}`.'.format(key, value))
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, timezone.utc)
+    return parsed
+
+
+def get_names(params: Mapping) -> Tuple[str, ...]:
+    names = params.get('names') or ''
+    return tuple(sorted({name.strip() for name in names.split(',') if name.strip()}))
+
+
+def get_max_points(params: Mapping) -> int:
+    max_points = _get_int(params, 'max_points') or conf.get('METRICS_SERIES_DEFAULT_POINTS')
+    if max_points < 3:
+        raise ValueError('`max_points` must be at least 3.')
+    return min(max_points, conf.get('METRICS_SERIES_MAX_POINTS'))
+
+
+def parse_series_query(params: Mapping) -> SeriesQuery:
+    """Parses the query params of a series query, raises a `ValueError` for invalid values."""
+    method = params.get('method') or LTTB
+    if method not in METHODS:
+        raise ValueError('`method` must be one of {}.'.format(', '.join(METHODS)))
+
+    return SeriesQuery(names=get_names(params),
+                       max_points=get_max_points(params),
+                       method=method,
+                       start_step=_get_int(params, 'start_step'),
+                       end_step=_get_int(params, 'end_step'),
+                       start_at=_get_datetime(params, 'start_at'),
+                       end_at=_get_datetime(params, 'end_at'))
+
+
+def get_resolution(query: SeriesQuery, version: str) -> str:
+    """A cache key for the query, it changes when new points are written."""
+    key = '{}|{}'.format(version, '|'.join(str(v) for v in query))
+    return hashlib.md5(key.encode()).hexdigest()  # noqa
+
+
+def get_series_by_experiment(experiment_ids: Sequence[int],
+                             query: SeriesQuery) -> Dict[int, Dict[str, Dict]]:
+    """Returns the downsampled series of the experiments, by experiment and metric name.
+
+    Results are cached per experiment and query resolution,
+    the cache entries are invalidated by new points through the series version;
+    the series of the experiments missing from the cache are read in a single query.
+    """
+    versions = store.get_versions(experiment_ids)
+    caches = {}
+    series = {}
+    for experiment_id in experiment_ids:
+        cache = RedisMetricsCache(experiment=experiment_id)
+        resolution = get_resolution(query, version=versions[experiment_id])
+        series[experiment_id] = cache.get(resolution)
+        if series[experiment_id] is None:
+            caches[experiment_id] = (cache, resolution)
+    if not caches:
+        return series
+
+    points = store.read_experiments(experiment_ids=list(caches.keys()),
+                                    names=query.names,
+                                    start_step=query.start_step,
+                                    end_step=query.end_step,
+                                    start_at=query.start_at,
+                                    end_at=query.end_at)
+    names = {} if query.names else store.get_names_by_experiment(list(caches.keys()))
+    for experiment_id, (cache, resolution) in caches.items():
+        experiment_points = points[experiment_id]
+        series[experiment_id] = {
+            name: downsample(experiment_points.get(name, []),
+                             max_points=query.max_points,
+                             method=query.method)
+            for name in query.names or names[experiment_id]
+        }
+        cache.set(resolution, series[experiment_id], ttl=conf.get('METRICS_SERIES_CACHE_TTL'))
+    return series
+
+
+def get_series(experiment_id: int, query: SeriesQuery) -> Dict[str, Dict]:
+    """Returns the downsampled series of the experiment, by metric name."""
+    return get_series_by_experiment([experiment_id], query)[experiment_id]
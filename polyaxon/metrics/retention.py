@@ -0,0 +1,160 @@
+import logging
+
+from collections import namedtuple
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from django.db.models import F
+from django.utils import timezone
+
+import conf
+import stats
+
+from db.etags import increment_experiment_version
+from db.models.experiments import Experiment, ExperimentMetric, ExperimentMetricCompaction
+from db.models.projects import MetricRetentionPolicy, Project
+from metrics.storage import STEP_KEY, is_number, migrate_experiment_metrics
+from metrics.summaries import rebuild_summaries
+
+_logger = logging.getLogger('polyaxon.metrics')
+
+RetentionPolicy = namedtuple('RetentionPolicy', 'full_resolution_days keep_every')
+
+
+def get_default_policy() -> Optional[RetentionPolicy]:
+    """Returns the global policy, metrics are kept at full resolution if no days are set."""
+    days = conf.get('METRICS_RETENTION_DAYS')
+    if not days:
+        return None
+    return RetentionPolicy(full_resolution_days=days,
+                           keep_every=conf.get('METRICS_RETENTION_KEEP_EVERY'))
+
+
+def get_project_policies() -> Dict[int, Optional[RetentionPolicy]]:
+    """Returns the projects' overrides, a disabled override maps to None."""
+    return {
+        policy.project_id: RetentionPolicy(full_resolution_days=policy.full_resolution_days,
+                                           keep_every=policy.keep_every)
+        if policy.is_enabled else None
+        for policy in MetricRetentionPolicy.objects.all()
+    }
+
+
+def get_kept_ids(rows: List[Dict], keep_every: int) -> Set[int]:
+    """Returns the ids of the rows kept when thinning the rows ordered by id.
+
+    Rows are split in windows of `keep_every` rows, the first row of each window is kept
+    with the rows holding the min and the max of each metric in the window.
+    """
+    kept = set()
+    for start in range(0, len(rows), keep_every):
+        window = rows[start:start + keep_every]
+        kept.add(window[0]['id'])
+        minimums = {}
+        maximums = {}
+        for row in window:
+            for name, value in (row['values'] or {}).items():
+                if name == STEP_KEY or not is_number(value):
+                    continue
+                if name not in minimums or value < minimums[name][0]:
+                    minimums[name] = (value, row['id'])
+                if name not in maximums or value > maximums[name][0]:
+                    maximums[name] = (value, row['id'])
+        kept |= {row_id for _, row_id in minimums.values()}
+        kept |= {row_id for _, row_id in maximums.values()}
+    return kept
+
+
+def apply_experiment_retention(experiment_id: int,
+                               policy: RetentionPolicy,
+                               now: datetime = None,
+                               chunk_size: int = None) -> int:
+    """Thins the experiment's metrics older than the policy's full resolution days.
+
+    Rows are read by chunks of whole windows and deleted by primary key,
+    each chunk is a short statement so no long lock is held on the metrics table.
+    Metrics already compacted by a previous run are skipped.
+
+    Returns the number of removed metrics.
+    """
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=policy.full_resolution_days)
+    keep_every = max(policy.keep_every, 1)
+    chunk_size = chunk_size or conf.get('METRICS_RETENTION_CHUNK_SIZE')
+    chunk_size = max(chunk_size // keep_every, 1) * keep_every
+
+    compaction = ExperimentMetricCompaction.objects.filter(experiment_id=experiment_id).first()
+    if compaction and compaction.compacted_until >= cutoff:
+        return 0
+
+    queryset = ExperimentMetric.objects.filter(experiment_id=experiment_id, created_at__lt=cutoff)
+    if compaction:
+        queryset = queryset.filter(created_at__gte=compaction.compacted_until)
+
+    last_id = 0
+    processed = 0
+    removed = 0
+    while True:
+        rows = list(queryset.filter(id__gt=last_id).order_by('id').values(
+            'id', 'values')[:chunk_size])
+        if not rows:
+            break
+        last_id = rows[-1]['id']
+        processed += len(rows)
+        kept = get_kept_ids(rows=rows, keep_every=keep_every)
+        ids = [row['id'] for row in rows if row['id'] not in kept]
+        if ids:
+            ExperimentMetric.objects.filter(id__in=ids).delete()
+            removed += len(ids)
+            stats.incr('metrics.retention.removed', len(ids))
+        _logger.info('Compacting the metrics of experiment `%s`: %s processed, %s removed.',
+                     experiment_id, processed, removed)
+
+    if not processed:
+        return 0
+
+    if removed:
+        if conf.get('METRICS_CHUNKS_ENABLED'):
+            migrate_experiment_metrics(experiment_id=experiment_id, batch_size=chunk_size)
+        rebuild_summaries(experiment_id=experiment_id, batch_size=chunk_size)
+        increment_experiment_version(experiment_id=experiment_id)
+
+    if compaction:
+        ExperimentMetricCompaction.objects.filter(id=compaction.id).update(
+            compacted_until=cutoff, removed=F('removed') + removed)
+    else:
+        ExperimentMetricCompaction.objects.create(experiment_id=experiment_id,
+                                                  compacted_until=cutoff,
+                                                  removed=removed)
+    return removed
+
+
+def apply_retention_policies(chunk_size: int = None) -> int:
+    """Compacts the metrics of all experiments, archived included, following their policy.
+
+    Projects without an override follow the global policy.
+
+    Returns the number of removed metrics.
+    """
+    default_policy = get_default_policy()
+    project_policies = get_project_policies()
+    if default_policy:
+        project_ids = Project.all.order_by('id').values_list('id', flat=True)
+    else:
+        project_ids = sorted(project_policies.keys())
+
+    now = timezone.now()
+    removed = 0
+    for project_id in project_ids:
+        policy = project_policies.get(project_id, default_policy)
+        if not policy:
+            continue
+        experiment_ids = Experiment.all.filter(project_id=project_id).order_by(
+            'id').values_list('id', flat=True)
+        for experiment_id in experiment_ids:
+            removed += apply_experiment_retention(experiment_id=experiment_id,
+                                                  policy=policy,
+                                                  now=now,
+                                                  chunk_size=chunk_size)
+    _logger.info('Metric retention policies applied, %s metrics removed.', removed)
+    return removed
@@ -0,0 +1,268 @@
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from hestia.datetime_typing import AwareDT
+
+from django.db import connection, transaction
+from django.db.models import Count, Max, Sum
+
+import conf
+
+from db.models.experiments import Experiment, ExperimentMetric, ExperimentMetricChunk
+
+Point = namedtuple('Point', 'step timestamp value')
+
+# The reported value used as the step of the other values of a report
+STEP_KEY = 'step'
+
+
+def is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def get_series(metrics: Iterable[Dict]) -> Dict[str, List[Point]]:
+    """Splits metric reports into a series of points by metric name.
+
+    The step of a report is its `step`, or its `step` value,
+    points without a reported step get `None`, the step is resolved on append.
+    """
+    series = {}
+    for metric in sorted(metrics, key=lambda m: m['created_at']):
+        values = metric['values'] or {}
+        step = metric.get(STEP_KEY)
+        if step is None:
+            step = values.get(STEP_KEY)
+        step = int(step) if is_number(step) else None
+        for name, value in values.items():
+            if name == STEP_KEY or not is_number(value):
+                continue
+            series.setdefault(name, []).append(Point(step, metric['created_at'], float(value)))
+    return series
+
+
+class MetricChunkStore(object):
+    """Stores the metrics of experiments as chunks of points by metric name.
+
+    Writes append to the last chunk of a series until it holds `chunk_size` points,
+    and then create new chunks; reads only load the chunks overlapping the requested steps.
+    """
+
+    def __init__(self, chunk_size: int = None) -> None:
+        self._chunk_size = chunk_size
+
+    @property
+    def chunk_size(self) -> int:
+        return self._chunk_size or conf.get('METRICS_CHUNK_SIZE')
+
+    @staticmethod
+    def _get_last_chunk(experiment_id: int, name: str) -> Optional[ExperimentMetricChunk]:
+        return ExperimentMetricChunk.objects.select_for_update().filter(
+            experiment_id=experiment_id,
+            name=name).only('id', 'count', 'end_step').order_by('-id').first()
+
+    @staticmethod
+    def _lock_experiment(experiment_id: int) -> None:
+        # The last chunk lock does not cover the creation of the first chunks of a series,
+        # the experiment lock serializes the concurrent writers of its series
+        list(Experiment.all.select_for_update().filter(
+            id=experiment_id).values_list('id', flat=True))
+
+    @staticmethod
+    def _extend_chunk(chunk_id: int, points: List[Point]) -> None:
+        # pylint:disable=protected-access
+        table = ExperimentMetricChunk._meta.db_table
+        steps, timestamps, values = (connection.ops.quote_name(c)
+                                     for c in ('steps', 'timestamps', 'values'))
+        query = """
+            UPDATE {table} SET
+                {steps} = {steps} || %s::bigint[],
+                {timestamps} = {timestamps} || %s::timestamptz[],
+                {values} = {values} || %s::double precision[],
+                count = count + %s,
+                start_step = LEAST(start_step, %s),
+                end_step = GREATEST(end_step, %s),
+                start_at = LEAST(start_at, %s),
+                end_at = GREATEST(end_at, %s)
+            WHERE id = %s
+        """.format(table=table, steps=steps, timestamps=timestamps, values=values)
+        with connection.cursor() as cursor:
+            cursor.execute(query, [
+                [p.step for p in points],
+                [p.timestamp for p in points],
+                [p.value for p in points],
+                len(points),
+                min(p.step for p in points),
+                max(p.step for p in points),
+                min(p.timestamp for p in points),
+                max(p.timestamp for p in points),
+                chunk_id,
+            ])
+
+    @staticmethod
+    def _build_chunk(experiment_id: int, name: str, points: List[Point]) -> ExperimentMetricChunk:
+        return ExperimentMetricChunk(
+            experiment_id=experiment_id,
+            name=name,
+            start_step=min(p.step for p in points),
+            end_step=max(p.step for p in points),
+            start_at=min(p.timestamp for p in points),
+            end_at=max(p.timestamp for p in points),
+            count=len(points),
+            steps=[p.step for p in points],
+            timestamps=[p.timestamp for p in points],
+            values=[p.value for p in points])
+
+    def _append_series(self, experiment_id: int, name: str, points: List[Point]) -> int:
+        last_chunk = self._get_last_chunk(experiment_id=experiment_id, name=name)
+        next_step = last_chunk.end_step + 1 if last_chunk else 0
+        resolved = []
+        for point in points:
+            step = next_step if point.step is None else point.step
+            next_step = max(next_step, step + 1)
+            resolved.append(point._replace(step=step))
+
+        if last_chunk and last_chunk.count < self.chunk_size:
+            free = self.chunk_size - last_chunk.count
+            self._extend_chunk(chunk_id=last_chunk.id, points=resolved[:free])
+            resolved = resolved[free:]
+
+        ExperimentMetricChunk.objects.bulk_create([
+            self._build_chunk(experiment_id=experiment_id,
+                              name=name,
+                              points=resolved[i:i + self.chunk_size])
+            for i in range(0, len(resolved), self.chunk_size)
+        ])
+        return len(points)
+
+    def append(self, experiment_id: int, metrics: Iterable[Dict]) -> int:
+        """Appends metric reports (dicts of `created_at` and `values`) to the experiment's series.
+
+        Returns the number of points written.
+        """
+        written = 0
+        series = get_series(metrics)
+        if not series:
+            return 0
+        with transaction.atomic():
+            self._lock_experiment(experiment_id=experiment_id)
+            for name, points in sorted(series.items()):
+                written += self._append_series(experiment_id=experiment_id,
+                                               name=name,
+                                               points=points)
+        return written
+
+    @staticmethod
+    def get_names_by_experiment(experiment_ids: Sequence[int]) -> Dict[int, List[str]]:
+        names = {experiment_id: [] for experiment_id in experiment_ids}
+        rows = ExperimentMetricChunk.objects.filter(
+            experiment_id__in=experiment_ids).values_list('experiment_id', 'name').order_by(
+            'experiment_id', 'name').distinct()
+        for experiment_id, name in rows:
+            names[experiment_id].append(name)
+        return names
+
+    def get_names(self, experiment_id: int) -> List[str]:
+        return self.get_names_by_experiment(experiment_ids=[experiment_id])[experiment_id]
+
+    @staticmethod
+    def read_experiments(experiment_ids: Sequence[int],
+                         names: Sequence[str] = None,
+                         start_step: int = None,
+                         end_step: int = None,
+                         start_at: AwareDT = None,
+                         end_at: AwareDT = None) -> Dict[int, Dict[str, List[Point]]]:
+        """Returns the points of the experiments' series within the steps/time window (inclusive),
+        by experiment and metric name, ordered by step, in a single query."""
+        chunks = ExperimentMetricChunk.objects.filter(experiment_id__in=experiment_ids)
+        if names:
+            chunks = chunks.filter(name__in=names)
+        if start_step is not None:
+            chunks = chunks.filter(end_step__gte=start_step)
+        if end_step is not None:
+            chunks = chunks.filter(start_step__lte=end_step)
+        if start_at is not None:
+            chunks = chunks.filter(end_at__gte=start_at)
+        if end_at is not None:
+            chunks = chunks.filter(start_at__lte=end_at)
+
+        series = {experiment_id: {} for experiment_id in experiment_ids}
+        rows = chunks.values_list('experiment_id', 'name', 'steps', 'timestamps', 'values')
+        for experiment_id, name, steps, timestamps, values in rows:
+            points = series[experiment_id].setdefault(name, [])
+            for step, timestamp, value in zip(steps, timestamps, values):
+                if start_step is not None and step < start_step:
+                    continue
+                if end_step is not None and step > end_step:
+                    continue
+                if start_at is not None and timestamp < start_at:
+                    continue
+                if end_at is not None and timestamp > end_at:
+                    continue
+                points.append(Point(step, timestamp, value))
+        # Chunks are mostly sorted already
+        for experiment_series in series.values():
+            for points in experiment_series.values():
+                points.sort(key=lambda p: p.step)
+        return series
+
+    def read(self,
+             experiment_id: int,
+             name: str,
+             start_step: int = None,
+             end_step: int = None,
+             start_at: AwareDT = None,
+             end_at: AwareDT = None) -> List[Point]:
+        """Returns the points of a series within the steps/time window (inclusive),
+        ordered by step."""
+        series = self.read_experiments(experiment_ids=[experiment_id],
+                                       names=[name],
+                                       start_step=start_step,
+                                       end_step=end_step,
+                                       start_at=start_at,
+                                       end_at=end_at)
+        return series[experiment_id].get(name, [])
+
+    @staticmethod
+    def get_versions(experiment_ids: Sequence[int]) -> Dict[int, str]:
+        """Returns, by experiment, a value that changes whenever points are written
+        to the experiment's series."""
+        versions = {experiment_id: '0' for experiment_id in experiment_ids}
+        rows = ExperimentMetricChunk.objects.filter(
+            experiment_id__in=experiment_ids).values('experiment_id').annotate(
+            count=Count('id'), points=Sum('count'), end_at=Max('end_at')).order_by()
+        for row in rows:
+            versions[row['experiment_id']] = '{}.{}.{}'.format(
+                row['count'], row['points'], int(row['end_at'].timestamp() * 1000000))
+        return versions
+
+    def get_version(self, experiment_id: int) -> str:
+        """Returns a value that changes whenever points are written to the experiment's series."""
+        return self.get_versions(experiment_ids=[experiment_id])[experiment_id]
+
+    @staticmethod
+    def delete(experiment_id: int) -> None:
+        ExperimentMetricChunk.objects.filter(experiment_id=experiment_id).delete()
+
+
+store = MetricChunkStore()
+
+
+def migrate_experiment_metrics(experiment_id: int, batch_size: int = 1000) -> int:
+    """Rebuilds the metric chunks of an experiment from its metric rows.
+
+    The existing chunks of the experiment are replaced, so the migration can be re-run.
+    """
+    rows = ExperimentMetric.objects.filter(experiment_id=experiment_id).order_by(
+        'created_at', 'id').values('created_at', 'values', 'step')
+    written = 0
+    with transaction.atomic():
+        store.delete(experiment_id=experiment_id)
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                written += store.append(experiment_id=experiment_id, metrics=batch)
+                batch = []
+        if batch:
+            written += store.append(experiment_id=experiment_id, metrics=batch)
+    return written
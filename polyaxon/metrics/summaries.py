@@ -0,0 +1,112 @@
+from collections import namedtuple
+from typing import Dict, Iterable, List
+
+from django.db import connection, transaction
+
+from db.models.experiments import ExperimentMetric, ExperimentMetricSummary
+from metrics.storage import Point, get_series
+
+Summary = namedtuple(
+    'Summary',
+    'name count min_value min_step max_value max_step last_value last_step last_at')
+
+SUMMARY_COLUMNS = ('experiment_id',) + Summary._fields
+
+
+def summarize(name: str, points: List[Point]) -> Summary:
+    """Summarizes a series of points with resolved steps, in chronological order."""
+    min_point = min(points, key=lambda p: p.value)
+    max_point = max(points, key=lambda p: p.value)
+    last_point = points[-1]
+    return Summary(name=name,
+                   count=len(points),
+                   min_value=min_point.value,
+                   min_step=min_point.step,
+                   max_value=max_point.value,
+                   max_step=max_point.step,
+                   last_value=last_point.value,
+                   last_step=last_point.step,
+                   last_at=last_point.timestamp)
+
+
+def _resolve_steps(points: List[Point], next_step: int) -> List[Point]:
+    resolved = []
+    for point in points:
+        step = next_step if point.step is None else point.step
+        next_step = max(next_step, step + 1)
+        resolved.append(point._replace(step=step))
+    return resolved
+
+
+def _get_last_steps(experiment_id: int, names: Iterable[str]) -> Dict[str, int]:
+    return dict(ExperimentMetricSummary.objects.select_for_update().filter(
+        experiment_id=experiment_id,
+        name__in=names).values_list('name', 'last_step'))
+
+
+def _merge_summaries(experiment_id: int, summaries: List[Summary]) -> None:
+    # pylint:disable=protected-access
+    table = ExperimentMetricSummary._meta.db_table
+    query = """
+        INSERT INTO {table} AS s ({columns}) VALUES {values}
+        ON CONFLICT (experiment_id, name) DO UPDATE SET
+            count = s.count + EXCLUDED.count,
+            min_step = CASE WHEN EXCLUDED.min_value < s.min_value
+                THEN EXCLUDED.min_step ELSE s.min_step END,
+            min_value = LEAST(s.min_value, EXCLUDED.min_value),
+            max_step = CASE WHEN EXCLUDED.max_value > s.max_value
+                THEN EXCLUDED.max_step ELSE s.max_step END,
+            max_value = GREATEST(s.max_value, EXCLUDED.max_value),
+            last_step = CASE WHEN EXCLUDED.last_at >= s.last_at
+                THEN EXCLUDED.last_step ELSE s.last_step END,
+            last_value = CASE WHEN EXCLUDED.last_at >= s.last_at
+                THEN EXCLUDED.last_value ELSE s.last_value END,
+            last_at = GREATEST(s.last_at, EXCLUDED.last_at)
+    """.format(table=table,
+               columns=', '.join(SUMMARY_COLUMNS),
+               values=', '.join(['({})'.format(', '.join(['%s'] * len(SUMMARY_COLUMNS)))] *
+                                len(summaries)))
+    params = []
+    for summary in summaries:
+        params += [experiment_id] + list(summary)
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+
+
+def update_summaries(experiment_id: int, metrics: Iterable[Dict]) -> int:
+    """Merges metric reports (dicts of `created_at` and `values`) into the experiment's summaries.
+
+    Points without a reported step follow the last step of their series,
+    as in the chunked storage. Returns the number of summaries updated.
+    """
+    series = get_series(metrics)
+    if not series:
+        return 0
+
+    with transaction.atomic():
+        last_steps = _get_last_steps(experiment_id=experiment_id, names=series.keys())
+        summaries = [
+            summarize(name=name,
+                      points=_resolve_steps(points, next_step=last_steps[name] + 1
+                                            if name in last_steps else 0))
+            for name, points in sorted(series.items())
+        ]
+        _merge_summaries(experiment_id=experiment_id, summaries=summaries)
+    return len(summaries)
+
+
+def rebuild_summaries(experiment_id: int, batch_size: int = 1000) -> int:
+    """Rebuilds the summaries of an experiment from its metric rows."""
+    with transaction.atomic():
+        ExperimentMetricSummary.objects.filter(experiment_id=experiment_id).delete()
+        metrics = ExperimentMetric.objects.filter(experiment_id=experiment_id).values(
+            'created_at', 'values', 'step').order_by('created_at', 'id').iterator(
+            chunk_size=batch_size)
+        batch = []
+        for metric in metrics:
+            batch.append(metric)
+            if len(batch) >= batch_size:
+                update_summaries(experiment_id=experiment_id, metrics=batch)
+                batch = []
+        update_summaries(experiment_id=experiment_id, metrics=batch)
+    return ExperimentMetricSummary.objects.filter(experiment_id=experiment_id).count()
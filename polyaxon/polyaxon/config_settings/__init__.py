@@ -7,12 +7,19 @@ from .celery_settings import *
 from .context_processors import *
 from .core import *
 from .email import *
+from .etags import *
+from .exports import *
 from .integrations import *
 from .logging import *
+from .lookups import *
+from .metrics import *
 from .oauth import *
 from .ownership import *
+from .query import *
 from .redis_settings import *
 from .secrets import *
+from .stats import *
+from .statuses import *
 from .tracker import *
 from .versions import *
 
@@ -45,6 +45,12 @@ CELERY_HARD_TIME_LIMIT_DELAY = config.get_int('POLYAXON_CELERY_HARD_TIME_LIMIT_D
 HEALTH_CHECK_WORKER_TIMEOUT = config.get_int('POLYAXON_HEALTH_CHECK_WORKER_TIMEOUT',
                                              is_optional=True,
                                              default=4)
+HEALTH_CHECK_TIMEOUT = config.get_int('POLYAXON_HEALTH_CHECK_TIMEOUT',
+                                      is_optional=True,
+                                      default=5)
+HEALTH_CHECK_CACHE_TTL = config.get_int('POLYAXON_HEALTH_CHECK_CACHE_TTL',
+                                        is_optional=True,
+                                        default=15)
 GROUP_CHUNKS = config.get_int('POLYAXON_GROUP_CHUNKS',
                               is_optional=True,
                               default=50)
@@ -72,6 +78,10 @@ class Intervals(object):
         'POLYAXON_INTERVALS_EXPERIMENTS_SYNC',
         is_optional=True,
         default=30)
+    EXPERIMENTS_RECONCILE_COUNTERS = config.get_int(
+        'POLYAXON_INTERVALS_EXPERIMENTS_RECONCILE_COUNTERS',
+        is_optional=True,
+        default=60 * 60)
     CLUSTERS_UPDATE_SYSTEM_INFO = config.get_int(
         'POLYAXON_INTERVALS_CLUSTERS_UPDATE_SYSTEM_INFO',
         is_optional=True,
@@ -97,6 +107,14 @@ class Intervals(object):
         'POLYAXON_INTERVALS_DELETE_ARCHIVED',
         is_optional=True,
         default=300)
+    METRICS_FLUSH_BUFFERS = config.get_int(
+        'POLYAXON_INTERVALS_METRICS_FLUSH_BUFFERS',
+        is_optional=True,
+        default=5)
+    METRICS_APPLY_RETENTION = config.get_int(
+        'POLYAXON_INTERVALS_METRICS_APPLY_RETENTION',
+        is_optional=True,
+        default=60 * 60 * 24)
 
     @staticmethod
     def get_schedule(interval):
@@ -142,6 +160,10 @@ class CronsCeleryTasks(object):
     CRONS_HEALTH = 'crons_health'
 
     EXPERIMENTS_SYNC_JOBS_STATUSES = 'experiments_sync_jobs_statuses'
+    EXPERIMENTS_RECONCILE_COUNTERS = 'experiments_reconcile_counters'
+
+    METRICS_FLUSH_BUFFERS = 'metrics_flush_buffers'
+    METRICS_APPLY_RETENTION = 'metrics_apply_retention'
 
     HEARTBEAT_EXPERIMENTS = 'heartbeat_experiments'
     HEARTBEAT_JOBS = 'heartbeat_jobs'
@@ -246,6 +268,7 @@ class SchedulerCeleryTasks(object):
     EXPERIMENTS_CHECK_STATUS = 'experiments_check_status'
     EXPERIMENTS_CHECK_HEARTBEAT = 'experiments_check_heartbeat'
     EXPERIMENTS_SET_METRICS = 'experiments_set_metrics'
+    EXPERIMENTS_APPEND_METRIC_CHUNKS = 'experiments_append_metric_chunks'
     EXPERIMENTS_SCHEDULE_DELETION = 'experiments_schedule_deletion'
 
     EXPERIMENTS_GROUP_CREATE = 'experiments_group_create'
@@ -441,6 +464,8 @@ CELERY_TASK_ROUTES = {
         {'queue': CeleryQueues.SCHEDULER_EXPERIMENTS},
     SchedulerCeleryTasks.EXPERIMENTS_SET_METRICS:
         {'queue': CeleryQueues.SCHEDULER_EXPERIMENTS},
+    SchedulerCeleryTasks.EXPERIMENTS_APPEND_METRIC_CHUNKS:
+        {'queue': CeleryQueues.SCHEDULER_EXPERIMENTS},
     SchedulerCeleryTasks.EXPERIMENTS_SCHEDULE_DELETION:
         {'queue': CeleryQueues.SCHEDULER_EXPERIMENTS},
 
@@ -534,6 +559,12 @@ CELERY_TASK_ROUTES = {
     # Crons
     CronsCeleryTasks.EXPERIMENTS_SYNC_JOBS_STATUSES:
         {'queue': CeleryQueues.CRONS_EXPERIMENTS},
+    CronsCeleryTasks.EXPERIMENTS_RECONCILE_COUNTERS:
+        {'queue': CeleryQueues.CRONS_EXPERIMENTS},
+    CronsCeleryTasks.METRICS_FLUSH_BUFFERS:
+        {'queue': CeleryQueues.CRONS_EXPERIMENTS},
+    CronsCeleryTasks.METRICS_APPLY_RETENTION:
+        {'queue': CeleryQueues.CRONS_EXPERIMENTS},
 
     CronsCeleryTasks.HEARTBEAT_EXPERIMENTS:
         {'queue': CeleryQueues.CRONS_HEARTBEAT},
@@ -665,6 +696,27 @@ CELERY_BEAT_SCHEDULE = {
             'expires': Intervals.get_expires(Intervals.EXPERIMENTS_SYNC),
         },
     },
+    CronsCeleryTasks.EXPERIMENTS_RECONCILE_COUNTERS + '_beat': {
+        'task': CronsCeleryTasks.EXPERIMENTS_RECONCILE_COUNTERS,
+        'schedule': Intervals.get_schedule(Intervals.EXPERIMENTS_RECONCILE_COUNTERS),
+        'options': {
+            'expires': Intervals.get_expires(Intervals.EXPERIMENTS_RECONCILE_COUNTERS),
+        },
+    },
+    CronsCeleryTasks.METRICS_FLUSH_BUFFERS + '_beat': {
+        'task': CronsCeleryTasks.METRICS_FLUSH_BUFFERS,
+        'schedule': Intervals.get_schedule(Intervals.METRICS_FLUSH_BUFFERS),
+        'options': {
+            'expires': Intervals.get_expires(Intervals.METRICS_FLUSH_BUFFERS),
+        },
+    },
+    CronsCeleryTasks.METRICS_APPLY_RETENTION + '_beat': {
+        'task': CronsCeleryTasks.METRICS_APPLY_RETENTION,
+        'schedule': Intervals.get_schedule(Intervals.METRICS_APPLY_RETENTION),
+        'options': {
+            'expires': Intervals.get_expires(Intervals.METRICS_APPLY_RETENTION),
+        },
+    },
     CronsCeleryTasks.HEARTBEAT_EXPERIMENTS + '_beat': {
         'task': CronsCeleryTasks.HEARTBEAT_EXPERIMENTS,
         'schedule': Intervals.get_schedule(Intervals.HEARTBEAT_CHECK),
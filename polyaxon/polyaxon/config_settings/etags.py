@@ -0,0 +1,6 @@
+from polyaxon.config_manager import config
+
+# The version counters of the experiments and groups expire after this ttl without changes
+ETAGS_VERSIONS_TTL = config.get_int('POLYAXON_ETAGS_VERSIONS_TTL',
+                                    is_optional=True,
+                                    default=60 * 60 * 24 * 7)
@@ -0,0 +1,9 @@
+from polyaxon.config_manager import config
+
+# The number of rows fetched by query from the server side cursor of a streaming export
+EXPORTS_CHUNK_SIZE = config.get_int('POLYAXON_EXPORTS_CHUNK_SIZE',
+                                    is_optional=True,
+                                    default=2000)
+EXPORTS_COMPRESSION_LEVEL = config.get_int('POLYAXON_EXPORTS_COMPRESSION_LEVEL',
+                                           is_optional=True,
+                                           default=6)
@@ -0,0 +1,14 @@
+from polyaxon.config_manager import config
+
+# The number of tokens, users and projects kept in memory by each process, 0 disables it
+LOOKUPS_CACHE_SIZE = config.get_int('POLYAXON_LOOKUPS_CACHE_SIZE',
+                                    is_optional=True,
+                                    default=1024)
+# The local entries are not invalidated by the changes made in other processes,
+# the ttl bounds how long they can be stale
+LOOKUPS_CACHE_LOCAL_TTL = config.get_int('POLYAXON_LOOKUPS_CACHE_LOCAL_TTL',
+                                         is_optional=True,
+                                         default=10)
+LOOKUPS_CACHE_TTL = config.get_int('POLYAXON_LOOKUPS_CACHE_TTL',
+                                   is_optional=True,
+                                   default=60 * 5)
@@ -0,0 +1,57 @@
+from polyaxon.config_manager import config
+
+# The number of metric rows inserted by query during a bulk ingestion
+METRICS_BULK_BATCH_SIZE = config.get_int('POLYAXON_METRICS_BULK_BATCH_SIZE',
+                                         is_optional=True,
+                                         default=1000)
+# Metric series are also written to chunks of this number of points
+METRICS_CHUNKS_ENABLED = config.get_boolean('POLYAXON_METRICS_CHUNKS_ENABLED',
+                                            is_optional=True,
+                                            default=True)
+# Single reported metrics are appended to the chunks by a task once committed,
+# the bulk ingestions append their batch in the same transaction
+METRICS_CHUNKS_DEFERRED = config.get_boolean('POLYAXON_METRICS_CHUNKS_DEFERRED',
+                                             is_optional=True,
+                                             default=True)
+METRICS_CHUNK_SIZE = config.get_int('POLYAXON_METRICS_CHUNK_SIZE',
+                                    is_optional=True,
+                                    default=1000)
+# Downsampled series queries
+METRICS_SERIES_DEFAULT_POINTS = config.get_int('POLYAXON_METRICS_SERIES_DEFAULT_POINTS',
+                                               is_optional=True,
+                                               default=1000)
+METRICS_SERIES_MAX_POINTS = config.get_int('POLYAXON_METRICS_SERIES_MAX_POINTS',
+                                           is_optional=True,
+                                           default=10000)
+METRICS_SERIES_CACHE_TTL = config.get_int('POLYAXON_METRICS_SERIES_CACHE_TTL',
+                                          is_optional=True,
+                                          default=60 * 10)
+# Count the metric keys used to filter and to sort experiments, to choose the indexes to create
+METRICS_QUERY_STATS_ENABLED = config.get_boolean('POLYAXON_METRICS_QUERY_STATS_ENABLED',
+                                                 is_optional=True,
+                                                 default=True)
+# The key counts are buffered in-process and written to redis at most once per interval (seconds)
+METRICS_QUERY_STATS_FLUSH_INTERVAL = config.get_int('POLYAXON_METRICS_QUERY_STATS_FLUSH_INTERVAL',
+                                                    is_optional=True,
+                                                    default=30)
+# Reported metrics are appended to a redis buffer and written in bulk by a periodic flusher
+METRICS_BUFFER_ENABLED = config.get_boolean('POLYAXON_METRICS_BUFFER_ENABLED',
+                                            is_optional=True,
+                                            default=False)
+METRICS_BUFFER_FLUSH_BATCH_SIZE = config.get_int('POLYAXON_METRICS_BUFFER_FLUSH_BATCH_SIZE',
+                                                 is_optional=True,
+                                                 default=5000)
+METRICS_BUFFER_LOCK_TTL = config.get_int('POLYAXON_METRICS_BUFFER_LOCK_TTL',
+                                         is_optional=True,
+                                         default=60 * 5)
+# Metrics older than the retention days are thinned, 0 keeps all metrics at full resolution,
+# projects can override the policy
+METRICS_RETENTION_DAYS = config.get_int('POLYAXON_METRICS_RETENTION_DAYS',
+                                        is_optional=True,
+                                        default=0)
+METRICS_RETENTION_KEEP_EVERY = config.get_int('POLYAXON_METRICS_RETENTION_KEEP_EVERY',
+                                              is_optional=True,
+                                              default=10)
+METRICS_RETENTION_CHUNK_SIZE = config.get_int('POLYAXON_METRICS_RETENTION_CHUNK_SIZE',
+                                              is_optional=True,
+                                              default=1000)
@@ -0,0 +1,6 @@
+from polyaxon.config_manager import config
+
+# The number of compiled query plans kept in memory by each process, 0 disables the cache
+QUERY_PLAN_CACHE_SIZE = config.get_int('POLYAXON_QUERY_PLAN_CACHE_SIZE',
+                                       is_optional=True,
+                                       default=256)
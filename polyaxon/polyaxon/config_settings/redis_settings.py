@@ -18,3 +18,9 @@ class RedisPools(object):
         config.get_string('POLYAXON_HEARTBEAT_URL'))
     GROUP_CHECKS = redis.ConnectionPool.from_url(
         config.get_string('POLYAXON_GROUP_CHECKS_URL'))
+    METRICS = redis.ConnectionPool.from_url(
+        config.get_string('POLYAXON_REDIS_METRICS_URL'))
+    LOOKUPS = redis.ConnectionPool.from_url(
+        config.get_string('POLYAXON_REDIS_LOOKUPS_URL'))
+    ETAGS = redis.ConnectionPool.from_url(
+        config.get_string('POLYAXON_REDIS_ETAGS_URL'))
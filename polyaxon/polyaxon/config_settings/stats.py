@@ -3,8 +3,26 @@ from polyaxon.config_manager import config
 STATS_BACKEND_NOOP = 'noop'
 STATS_BACKEND_DATADOG = 'datadog'
 STATS_BACKEND_STATSD = 'statsd'
+STATS_BACKEND_MEMORY = 'memory'
+STATS_BACKEND_PROMETHEUS = 'prometheus'
 STATS_BACKEND = config.get_string(
     'POLYAXON_STATS_BACKEND',
     is_optional=True,
     default=STATS_BACKEND_NOOP,
-    options=(STATS_BACKEND_NOOP, STATS_BACKEND_DATADOG, STATS_BACKEND_STATSD))
+    options=(STATS_BACKEND_NOOP,
+             STATS_BACKEND_DATADOG,
+             STATS_BACKEND_STATSD,
+             STATS_BACKEND_MEMORY,
+             STATS_BACKEND_PROMETHEUS))
+DEFAULT_STATS_PREFIX = config.get_string('POLYAXON_STATS_DEFAULT_PREFIX',
+                                         is_optional=True,
+                                         default='polyaxon')
+# The addresses allowed to scrape the `/_metrics` endpoint without credentials
+STATS_SCRAPER_ALLOWED_IPS = config.get_list('POLYAXON_STATS_SCRAPER_ALLOWED_IPS',
+                                            is_optional=True,
+                                            default=[])
+# Each process publishes its stats snapshot to redis at most once per interval (seconds),
+# the `/_metrics` endpoint exposes the stats of all the processes, e.g. the celery workers
+STATS_PUBLISH_INTERVAL = config.get_int('POLYAXON_STATS_PUBLISH_INTERVAL',
+                                        is_optional=True,
+                                        default=15)
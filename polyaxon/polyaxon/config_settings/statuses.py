@@ -3,3 +3,7 @@ from polyaxon.config_manager import config
 TTL_WATCH_STATUSES = config.get_int('POLYAXON_TTL_WATCH_STATUSES',
                                     is_optional=True,
                                     default=60 * 20)
+# Defer parents recomputation and status events until the transaction commits
+STATUSES_DEFERRED_RECOMPUTE = config.get_boolean('POLYAXON_STATUSES_DEFERRED_RECOMPUTE',
+                                                 is_optional=True,
+                                                 default=True)
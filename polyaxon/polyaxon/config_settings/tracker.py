@@ -7,3 +7,12 @@ TRACKER_BACKEND = config.get_string(
     is_optional=True,
     default=TRACKER_BACKEND_NOOP,
     options=(TRACKER_BACKEND_NOOP, TRACKER_BACKEND_PUBLISHER))
+TRACKER_BATCH_SIZE = config.get_int('POLYAXON_TRACKER_BATCH_SIZE',
+                                    is_optional=True,
+                                    default=50)
+TRACKER_BATCH_FLUSH_INTERVAL = config.get_int('POLYAXON_TRACKER_BATCH_FLUSH_INTERVAL',
+                                              is_optional=True,
+                                              default=30)
+TRACKER_CACHE_TTL = config.get_int('POLYAXON_TRACKER_CACHE_TTL',
+                                   is_optional=True,
+                                   default=60 * 10)
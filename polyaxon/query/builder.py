@@ -266,3 +266,30 @@ class ArrayCondition(EqualityCondition):
     @classmethod
     def _nin_operator(cls, name: str, params: Any) -> Any:
         return ~cls._in_operator(name, params)
+
+
+class JSONValueCondition(ValueCondition):
+    """A value condition on the keys of a json field, e.g. `declarations__rate`.
+
+    The values are matched by containment (`@>`), instead of key lookups,
+    so that a GIN index on the json field can be used.
+    """
+
+    @staticmethod
+    def _get_containment(name: str, params: Any) -> Q:
+        field, *keys = name.split('__')
+        for key in reversed(keys):
+            params = {key: params}
+        return Q(**{'{}__contains'.format(field): params})
+
+    @classmethod
+    def _eq_operator(cls, name: str, params: Any) -> Any:
+        return cls._get_containment(name, params)
+
+    @classmethod
+    def _in_operator(cls, name: str, params: Any) -> Any:
+        assert isinstance(params, (list, tuple))
+        condition = Q()
+        for value in params:
+            condition |= cls._get_containment(name, value)
+        return condition
@@ -0,0 +1,115 @@
+import threading
+
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Dict, Tuple, Union
+
+from django.db.models import Q
+
+from query.builder import BaseCondition, BaseOperatorCondition, CallbackCondition
+
+QueryFilter = Union[Q, Callable[[Any], Any]]
+
+
+class QueryPlan(namedtuple('QueryPlan', 'manager query_spec parsed_query filters')):
+    """A compiled query, the parsed operations of each key and the filters they build.
+
+    Filters are either `Q` objects or callbacks taking the queryset,
+    the plan does not depend on the request so it can be shared and bound to many querysets.
+    """
+
+    @property
+    def keys(self) -> Tuple[str, ...]:
+        return tuple(key for key, _ in self.parsed_query)
+
+    def apply(self, queryset: Any) -> Any:
+        for query_filter in self.filters:
+            if isinstance(query_filter, Q):
+                queryset = queryset.filter(query_filter)
+            else:
+                queryset = query_filter(queryset)
+        return queryset
+
+
+def compile_condition(cond: BaseCondition, name: str, params: Any) -> QueryFilter:
+    if isinstance(cond, CallbackCondition):
+        # Callback conditions are shared by the manager, the negation is read now
+        callback, negation = cond.callback, cond.negation
+        return lambda queryset: callback(queryset, params, negation)
+    if isinstance(cond, BaseOperatorCondition):
+        return cond.operator(name=name, params=params)
+    return lambda queryset: cond.apply(queryset=queryset, name=name, params=params)
+
+
+def compile_query(manager: Any, query_spec: str) -> QueryPlan:
+    tokenized_query = manager.tokenize(query_spec=query_spec)
+    parsed_query = manager.parse(tokenized_query=tokenized_query)
+    filters = []
+    for key, cond_specs in manager.build(parsed_query=parsed_query).items():
+        name = manager.proxy_field(key)
+        for cond_spec in cond_specs:
+            filters.append(compile_condition(cond_spec.cond, name, cond_spec.params))
+    return QueryPlan(
+        manager=manager.NAME,
+        query_spec=query_spec,
+        parsed_query=tuple((key, tuple(ops)) for key, ops in parsed_query.items()),
+        filters=tuple(filters))
+
+
+class QueryPlanCache(object):
+    """A bounded LRU of the compiled plans by manager and query string.
+
+    Invalid queries are not cached, the error is raised on each compilation.
+    """
+
+    def __init__(self, maxsize: int = None) -> None:
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._plans = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        if self._maxsize is not None:
+            return self._maxsize
+
+        import conf
+
+        return conf.get('QUERY_PLAN_CACHE_SIZE')
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+    def get_plan(self, manager: Any, query_spec: str) -> QueryPlan:
+        key = (manager.NAME, query_spec)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return plan
+            self.misses += 1
+
+        plan = compile_query(manager=manager, query_spec=query_spec)
+        maxsize = self.maxsize
+        if maxsize <= 0:
+            return plan
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > maxsize:
+                self._plans.popitem(last=False)
+        return plan
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'size': len(self._plans), 'hits': self.hits, 'misses': self.misses}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+query_plans = QueryPlanCache()
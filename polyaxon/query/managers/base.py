@@ -1,6 +1,7 @@
 from typing import Any, Dict, Iterable
 
 from query.builder import QueryCondSpec
+from query.compiler import QueryPlan, query_plans
 from query.exceptions import QueryError
 from query.parser import parse_field, tokenize_query
 
@@ -58,12 +59,15 @@ class BaseQueryManager(object):
         return built_query
 
     @classmethod
-    def apply(cls, query_spec: str, queryset: Any) -> Any:
-        built_query = cls.handle_query(query_spec=query_spec)
-        for key, cond_specs in built_query.items():
-            key = cls.proxy_field(key)
-            for cond_spec in cond_specs:
-                queryset = cond_spec.cond.apply(
-                    queryset=queryset, name=key, params=cond_spec.params)
+    def compile(cls, query_spec: str) -> QueryPlan:
+        return query_plans.get_plan(manager=cls, query_spec=query_spec)
+
+    @classmethod
+    def record(cls, keys: Iterable[str]) -> None:
+        """Called with the keys of each applied query."""
 
-        return queryset
+    @classmethod
+    def apply(cls, query_spec: str, queryset: Any) -> Any:
+        plan = cls.compile(query_spec=query_spec)
+        cls.record(keys=plan.keys)
+        return plan.apply(queryset=queryset)
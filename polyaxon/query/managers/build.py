@@ -6,7 +6,7 @@ from query.parser import parse_datetime_operation, parse_value_operation
 class BuildQueryManager(BaseQueryManager):
     NAME = 'build'
     FIELDS_PROXY = {
-        'status': 'status__status',
+        'status': 'status_name',
         'commit': 'code_reference__commit',
     }
     PARSERS_BY_FIELD = {
@@ -8,10 +8,16 @@ from query.builder import (
     CallbackCondition,
     ComparisonCondition,
     DateTimeCondition,
+    JSONValueCondition,
     ValueCondition
 )
 from query.managers.base import BaseQueryManager
-from query.parser import parse_datetime_operation, parse_scalar_operation, parse_value_operation
+from query.parser import (
+    parse_datetime_operation,
+    parse_field,
+    parse_scalar_operation,
+    parse_value_operation
+)
 
 
 def _indepenent_condition(queryset: Any, params: Union[str, Iterable], negation: bool) -> Any:
@@ -25,7 +31,7 @@ class ExperimentQueryManager(BaseQueryManager):
     NAME = 'experiment'
     FIELDS_PROXY = {
         'metric': 'last_metric',
-        'status': 'status__status',
+        'status': 'status_name',
         'group': 'experiment_group',
         'build': 'build_job',
         'commit': 'code_reference__commit',
@@ -40,6 +46,7 @@ class ExperimentQueryManager(BaseQueryManager):
         'finished_at': parse_datetime_operation,
         # Name
         'name': parse_value_operation,
+        'unique_name': parse_value_operation,
         # User
         'user': parse_value_operation,
         # Status
@@ -71,6 +78,7 @@ class ExperimentQueryManager(BaseQueryManager):
         'finished_at': DateTimeCondition,
         # Name
         'name': ValueCondition,
+        'unique_name': ValueCondition,
         # User
         'user': ValueCondition,
         # Status
@@ -84,7 +92,7 @@ class ExperimentQueryManager(BaseQueryManager):
         # Commit
         'commit': ValueCondition,
         # Declarations
-        'declarations': ValueCondition,
+        'declarations': JSONValueCondition,
         # Tags
         'tags': ArrayCondition,
         # Metrics
@@ -92,3 +100,12 @@ class ExperimentQueryManager(BaseQueryManager):
         # Independent
         'independent': CallbackCondition(_indepenent_condition),
     }
+
+    @classmethod
+    def record(cls, keys: Iterable[str]) -> None:
+        # Counts the filtered metrics to choose the metric indexes to create
+        from metrics.indexes import record_keys
+
+        keys = [parse_field(key) for key in keys]
+        record_keys(field=cls.FIELDS_PROXY['metric'],
+                    keys=[suffix for field, suffix in keys if field == 'metric'])
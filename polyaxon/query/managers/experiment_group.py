@@ -39,7 +39,7 @@ def _search_algorithm_condition(queryset: Any, params: Any, negation: bool) -> A
 class ExperimentGroupQueryManager(BaseQueryManager):
     NAME = 'experiment_group'
     FIELDS_PROXY = {
-        'status': 'status__status',
+        'status': 'status_name',
         'concurrency': 'hptuning__concurrency'
     }
     PARSERS_BY_FIELD = {
@@ -52,6 +52,7 @@ class ExperimentGroupQueryManager(BaseQueryManager):
         'finished_at': parse_datetime_operation,
         # Name
         'name': parse_value_operation,
+        'unique_name': parse_value_operation,
         # User
         'user': parse_value_operation,
         # Status
@@ -74,6 +75,7 @@ class ExperimentGroupQueryManager(BaseQueryManager):
         'finished_at': DateTimeCondition,
         # Name
         'name': ValueCondition,
+        'unique_name': ValueCondition,
         # User
         'user': ValueCondition,
         # Status
@@ -6,7 +6,7 @@ from query.parser import parse_datetime_operation, parse_value_operation
 class JobQueryManager(BaseQueryManager):
     NAME = 'job'
     FIELDS_PROXY = {
-        'status': 'status__status',
+        'status': 'status_name',
         'build': 'build_job',
         'commit': 'code_reference__commit',
     }
@@ -20,6 +20,7 @@ class JobQueryManager(BaseQueryManager):
         'finished_at': parse_datetime_operation,
         # Name
         'name': parse_value_operation,
+        'unique_name': parse_value_operation,
         # User
         'user': parse_value_operation,
         # Status
@@ -43,6 +44,7 @@ class JobQueryManager(BaseQueryManager):
         'finished_at': DateTimeCondition,
         # Name
         'name': ValueCondition,
+        'unique_name': ValueCondition,
         # User
         'user': ValueCondition,
         # Status
@@ -9,8 +9,11 @@ import stores
 from api.experiments.serializers import ExperimentMetricSerializer
 from constants.experiments import ExperimentLifeCycle
 from db.getters.experiments import get_valid_experiment
+from db.models.experiments import ExperimentMetric
 from db.redis.heartbeat import RedisHeartBeat
 from logs_handlers import collectors
+from metrics.ingestion import ingest_metrics
+from metrics.storage import store as chunk_store
 from polyaxon.celery_api import celery_app
 from polyaxon.settings import Intervals, SchedulerCeleryTasks
 from scheduler import dockerizer_scheduler, experiment_scheduler
@@ -124,16 +127,24 @@ def experiments_set_metrics(experiment_id, data):
     if not experiment:
         return
 
-    kwargs = {}
-    if isinstance(data, list):
-        kwargs['many'] = True
-    serializer = ExperimentMetricSerializer(data=data, **kwargs)
+    if not isinstance(data, list):
+        data = [data]
+    serializer = ExperimentMetricSerializer(data=data, many=True)
     try:
         serializer.is_valid(raise_exception=True)
     except ValidationError:
         _logger.error('Could not create metrics, a validation error was raised.')
+        return
+
+    ingest_metrics(experiment=experiment, metrics=serializer.validated_data)
+
 
-    serializer.save(experiment=experiment)
+@celery_app.task(name=SchedulerCeleryTasks.EXPERIMENTS_APPEND_METRIC_CHUNKS, ignore_result=True)
+def experiments_append_metric_chunks(experiment_id, metric_ids):
+    metrics = ExperimentMetric.objects.filter(
+        experiment_id=experiment_id,
+        id__in=metric_ids).order_by('created_at', 'id').values('created_at', 'values', 'step')
+    chunk_store.append(experiment_id=experiment_id, metrics=list(metrics))
 
 
 @celery_app.task(name=SchedulerCeleryTasks.EXPERIMENTS_START, ignore_result=True)
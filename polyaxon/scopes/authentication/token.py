@@ -6,7 +6,9 @@ from rest_framework.exceptions import AuthenticationFailed
 
 from django.http import HttpRequest
 
+from db.lookups import get_token
 from db.models.tokens import Token
+from db.models.users import User
 from scopes.authentication.base import PolyaxonAuthentication
 
 
@@ -46,8 +48,8 @@ class TokenAuthentication(PolyaxonAuthentication):
     def authenticate_credentials(self,  # pylint:disable=arguments-differ
                                  key: str) -> Optional[Tuple['User', 'Token']]:
         try:
-            token = Token.objects.select_related('user').get(key=key)
-        except Token.DoesNotExist:
+            token = get_token(key)
+        except (Token.DoesNotExist, User.DoesNotExist):
             raise AuthenticationFailed('Invalid token.')
 
         if token.is_expired:
@@ -0,0 +1,22 @@
+from rest_framework import permissions
+
+from django.http import HttpRequest
+from django.views import View
+
+import conf
+
+from scopes.authentication.internal import is_authenticated_internal_user
+from scopes.permissions.base import PolyaxonPermission
+
+
+class IsStatsScraper(PolyaxonPermission):
+    """Custom permission to only allow internal clients, superusers,
+    and the addresses of the `STATS_SCRAPER_ALLOWED_IPS` setting, e.g. a prometheus server."""
+
+    def has_permission(self, request: HttpRequest, view: View) -> bool:
+        user = request.user
+        if user and not user.is_anonymous and (
+                is_authenticated_internal_user(user) or user.is_superuser):
+            return True
+        return (request.method in permissions.SAFE_METHODS and
+                request.META.get('REMOTE_ADDR') in conf.get('STATS_SCRAPER_ALLOWED_IPS'))
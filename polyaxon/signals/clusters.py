@@ -0,0 +1,20 @@
+from hestia.signal_decorators import ignore_raw
+
+from django.core.signals import setting_changed
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from db.models.clusters import Cluster
+from tracker.cache import cluster_cache
+
+
+@receiver(post_save, sender=Cluster, dispatch_uid="cluster_invalidate_cache")
+@ignore_raw
+def cluster_invalidate_cache(sender, **kwargs):
+    cluster_cache.invalidate_ref_id()
+
+
+@receiver(setting_changed, dispatch_uid="tracker_settings_invalidate_cache")
+def tracker_settings_invalidate_cache(sender, setting, **kwargs):
+    if setting.startswith('TRACKER_'):
+        cluster_cache.invalidate_configuration()
@@ -5,6 +5,7 @@ from django.dispatch import receiver
 
 import auditor
 
+from db.counters import add_experiments_count
 from db.models.build_jobs import BuildJob
 from db.models.cloning_strategies import CloningStrategy
 from db.models.experiment_groups import ExperimentGroup
@@ -115,6 +116,12 @@ def experiment_post_delete(sender, **kwargs):
     instance = kwargs['instance']
     auditor.record(event_type=EXPERIMENT_DELETED, instance=instance)
     remove_bookmarks(object_id=instance.id, content_type='experiment')
+    # Archived experiments are not counted anymore
+    if not instance.deleted:
+        add_experiments_count(project_id=instance.project_id,
+                              experiment_group_id=instance.experiment_group_id,
+                              status=instance.status_name,
+                              value=-1)
 
 
 @receiver(pre_delete, sender=Job, dispatch_uid="job_pre_delete")
@@ -0,0 +1,68 @@
+from hestia.signal_decorators import ignore_raw
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from constants import content_types
+from db.etags import increment_experiment_group_version, increment_experiment_version
+from db.models.bookmarks import Bookmark
+from db.models.experiment_groups import ExperimentGroup, ExperimentGroupIteration
+from db.models.experiment_jobs import ExperimentJob
+from db.models.experiments import Experiment
+from db.models.tensorboards import TensorboardJob
+
+
+@receiver(post_save, sender=Experiment, dispatch_uid="experiment_etag_post_save")
+@receiver(post_delete, sender=Experiment, dispatch_uid="experiment_etag_post_delete")
+@ignore_raw
+def experiment_etag_increment(sender, **kwargs):
+    instance = kwargs['instance']
+    increment_experiment_version(experiment_id=instance.id,
+                                 experiment_group_id=instance.experiment_group_id)
+
+
+@receiver(post_save, sender=ExperimentJob, dispatch_uid="experiment_job_etag_post_save")
+@receiver(post_delete, sender=ExperimentJob, dispatch_uid="experiment_job_etag_post_delete")
+@ignore_raw
+def experiment_job_etag_increment(sender, **kwargs):
+    increment_experiment_version(experiment_id=kwargs['instance'].experiment_id)
+
+
+@receiver(post_save, sender=ExperimentGroup, dispatch_uid="experiment_group_etag_post_save")
+@receiver(post_delete, sender=ExperimentGroup, dispatch_uid="experiment_group_etag_post_delete")
+@ignore_raw
+def experiment_group_etag_increment(sender, **kwargs):
+    increment_experiment_group_version(experiment_group_id=kwargs['instance'].id)
+
+
+@receiver(post_save,
+          sender=ExperimentGroupIteration,
+          dispatch_uid="experiment_group_iteration_etag_post_save")
+@ignore_raw
+def experiment_group_iteration_etag_increment(sender, **kwargs):
+    increment_experiment_group_version(experiment_group_id=kwargs['instance'].experiment_group_id)
+
+
+@receiver(post_save, sender=TensorboardJob, dispatch_uid="tensorboard_job_etag_post_save")
+@receiver(post_delete, sender=TensorboardJob, dispatch_uid="tensorboard_job_etag_post_delete")
+@ignore_raw
+def tensorboard_job_etag_increment(sender, **kwargs):
+    instance = kwargs['instance']
+    # The experiments and groups show if they have a running tensorboard
+    if instance.experiment_id:
+        increment_experiment_version(experiment_id=instance.experiment_id)
+    if instance.experiment_group_id:
+        increment_experiment_group_version(experiment_group_id=instance.experiment_group_id)
+
+
+@receiver(post_save, sender=Bookmark, dispatch_uid="bookmark_etag_post_save")
+@receiver(post_delete, sender=Bookmark, dispatch_uid="bookmark_etag_post_delete")
+@ignore_raw
+def bookmark_etag_increment(sender, **kwargs):
+    instance = kwargs['instance']
+    model = ContentType.objects.get_for_id(instance.content_type_id).model
+    if model == content_types.EXPERIMENT:
+        increment_experiment_version(experiment_id=instance.object_id)
+    elif model == content_types.EXPERIMENT_GROUP:
+        increment_experiment_group_version(experiment_group_id=instance.object_id)
@@ -39,5 +39,6 @@ def experiment_group_pre_save(sender, **kwargs):
 @ignore_raw
 def new_experiment_group(sender, **kwargs):
     instance = kwargs['instance']
+    instance.set_unique_name()
     instance.set_status(ExperimentGroupLifeCycle.CREATED)
     # TODO: Clean outputs and logs
@@ -2,10 +2,12 @@ import logging
 
 from hestia.signal_decorators import ignore_raw, ignore_updates, ignore_updates_pre
 
+from django.db import transaction
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 
 import auditor
+import conf
 
 from constants.experiments import ExperimentLifeCycle
 from constants.jobs import JobLifeCycle
@@ -13,6 +15,11 @@ from db.models.experiment_jobs import ExperimentJob
 from db.models.experiments import Experiment, ExperimentMetric
 from event_manager.events.experiment import EXPERIMENT_NEW_METRIC
 from libs.repos.utils import assign_code_reference
+from metrics.ingestion import update_last_metric
+from metrics.storage import store as chunk_store
+from metrics.summaries import update_summaries
+from polyaxon.celery_api import celery_app
+from polyaxon.settings import SchedulerCeleryTasks
 from signals.outputs import set_outputs, set_outputs_refs
 from signals.persistence import set_persistence
 from signals.tags import set_tags
@@ -43,6 +50,7 @@ def experiment_pre_save(sender, **kwargs):
 @ignore_raw
 def experiment_post_save(sender, **kwargs):
     instance = kwargs['instance']
+    instance.set_unique_name()
     instance.set_status(ExperimentLifeCycle.CREATED)
     if instance.is_independent:
         # TODO: Clean outputs and logs
@@ -63,14 +71,23 @@ def experiment_job_post_save(sender, **kwargs):
 def experiment_metric_post_save(sender, **kwargs):
     instance = kwargs['instance']
     experiment = instance.experiment
+    metrics = [{'created_at': instance.created_at,
+                'values': instance.values,
+                'step': instance.step}]
+
+    if conf.get('METRICS_CHUNKS_ENABLED') and conf.get('METRICS_CHUNKS_DEFERRED'):
+        # Keep the chunks' lock and update out of the request of a single report
+        transaction.on_commit(lambda: celery_app.send_task(
+            SchedulerCeleryTasks.EXPERIMENTS_APPEND_METRIC_CHUNKS,
+            kwargs={'experiment_id': experiment.id, 'metric_ids': [instance.id]}))
+    elif conf.get('METRICS_CHUNKS_ENABLED'):
+        chunk_store.append(experiment_id=experiment.id, metrics=metrics)
+    update_summaries(experiment_id=experiment.id, metrics=metrics)
 
     # update experiment last_metric
-    def update_metric(last_metrics, metrics):
-        last_metrics.update(metrics)
-        return last_metrics
-
-    experiment.last_metric = update_metric(last_metrics=experiment.last_metric,
-                                           metrics=instance.values)
-    experiment.save(update_fields=['last_metric'])
+    last_metric = update_last_metric(experiment_id=experiment.id, values=instance.values)
+    if last_metric is not None:
+        experiment.last_metric = last_metric
     auditor.record(event_type=EXPERIMENT_NEW_METRIC,
-                   instance=experiment)
+                   instance=experiment,
+                   metrics_count=1)
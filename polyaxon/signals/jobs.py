@@ -45,5 +45,6 @@ def job_pre_save(sender, **kwargs):
 @ignore_raw
 def job_post_save(sender, **kwargs):
     instance = kwargs['instance']
+    instance.set_unique_name()
     instance.set_status(status=JobLifeCycle.CREATED)
     # TODO: Clean outputs and logs
@@ -0,0 +1,75 @@
+from typing import Hashable
+
+from hestia.signal_decorators import ignore_raw
+
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from db.lookups import LookupCache, project_cache, token_cache, user_cache
+from db.models.owner import Owner
+from db.models.projects import Project
+from db.models.tokens import Token
+from db.models.users import User
+
+
+def _invalidate(cache: LookupCache, key: Hashable) -> None:
+    """Invalidates the cached entry, and again on commit inside a transaction.
+
+    A lookup between the first invalidation and the commit still reads the previous row,
+    it must not stay cached once the change is committed.
+    """
+    cache.invalidate(key)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: cache.invalidate(key))
+
+
+@receiver(pre_save, sender=Token, dispatch_uid="token_lookup_pre_save")
+@ignore_raw
+def token_lookup_pre_save(sender, **kwargs):
+    instance = kwargs['instance']
+    if not instance.pk:
+        return
+    # The key changes when the token is refreshed, the previous key must not be valid anymore
+    key = Token.objects.filter(pk=instance.pk).values_list('key', flat=True).first()
+    if key and key != instance.key:
+        _invalidate(token_cache, key)
+
+
+@receiver(post_save, sender=Token, dispatch_uid="token_lookup_post_save")
+@receiver(post_delete, sender=Token, dispatch_uid="token_lookup_post_delete")
+@ignore_raw
+def token_lookup_invalidate(sender, **kwargs):
+    _invalidate(token_cache, kwargs['instance'].key)
+
+
+@receiver(post_save, sender=User, dispatch_uid="user_lookup_post_save")
+@receiver(post_delete, sender=User, dispatch_uid="user_lookup_post_delete")
+@ignore_raw
+def user_lookup_invalidate(sender, **kwargs):
+    _invalidate(user_cache, kwargs['instance'].id)
+
+
+@receiver(pre_save, sender=Project, dispatch_uid="project_lookup_pre_save")
+@ignore_raw
+def project_lookup_pre_save(sender, **kwargs):
+    instance = kwargs['instance']
+    if not instance.pk:
+        return
+    # A renamed project must not be found by its previous name
+    previous = Project.all.filter(pk=instance.pk).values_list('owner__name', 'name').first()
+    if previous and previous != (instance.owner.name, instance.name):
+        _invalidate(project_cache, previous)
+
+
+@receiver(post_save, sender=Project, dispatch_uid="project_lookup_post_save")
+@receiver(post_delete, sender=Project, dispatch_uid="project_lookup_post_delete")
+@ignore_raw
+def project_lookup_invalidate(sender, **kwargs):
+    instance = kwargs['instance']
+    try:
+        owner_name = instance.owner.name
+    except Owner.DoesNotExist:
+        # Deleted with its owner, the cached entries expire with the ttl
+        return
+    _invalidate(project_cache, (owner_name, instance.name))
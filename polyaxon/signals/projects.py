@@ -7,6 +7,7 @@ from django.dispatch import receiver
 import auditor
 import ownership
 
+from db.backfills import update_project_unique_names
 from db.models.projects import Project
 from db.models.repos import Repo
 from event_manager.events.project import PROJECT_DELETED
@@ -34,6 +35,28 @@ def project_post_save(sender, **kwargs):
     delete_project_repos(instance.unique_name)
 
 
+@receiver(pre_save, sender=Project, dispatch_uid="project_rename_pre_save")
+@ignore_raw
+def project_rename_pre_save(sender, **kwargs):
+    instance = kwargs['instance']
+    update_fields = kwargs.get('update_fields')
+    instance.is_renamed = False
+    if not instance.pk or (update_fields and 'name' not in update_fields):
+        return
+    name = Project.all.filter(id=instance.pk).values_list('name', flat=True).first()
+    instance.is_renamed = name is not None and name != instance.name
+
+
+@receiver(post_save, sender=Project, dispatch_uid="project_rename_post_save")
+@ignore_raw
+def project_rename_post_save(sender, **kwargs):
+    instance = kwargs['instance']
+    if getattr(instance, 'is_renamed', False):
+        # Keep the denormalized unique names of the experiments, groups and jobs in sync
+        update_project_unique_names(project_id=instance.id)
+        instance.is_renamed = False
+
+
 @receiver(post_delete, sender=Project, dispatch_uid="project_deleted")
 @ignore_raw
 def project_post_deleted(sender, **kwargs):
@@ -0,0 +1,105 @@
+import copy
+
+from threading import local
+from typing import Any, Callable, Dict, Iterable
+
+from django.db import transaction
+
+import auditor
+import conf
+
+from constants.experiments import ExperimentLifeCycle
+from db.models.experiments import Experiment
+from polyaxon.celery_api import celery_app
+from polyaxon.settings import HPCeleryTasks, SchedulerCeleryTasks
+
+
+class RecomputeBatch(object):
+    """The parents already scheduled by the commit hooks of one transaction."""
+
+    def __init__(self):
+        self.experiment_ids = set()
+        self.experiment_group_ids = set()
+
+    def record(self, event_type: str, instance: Any, kwargs: Dict) -> None:
+        # pylint:disable=no-self-use
+        auditor.record(event_type=event_type, instance=instance, **kwargs)
+
+    def schedule_experiments(self, experiment_ids: Iterable[int]) -> None:
+        # Each parent is recomputed once, whatever the number of children changes
+        experiment_ids = set(experiment_ids) - self.experiment_ids
+        if not experiment_ids:
+            return
+        self.experiment_ids |= experiment_ids
+        # The status of a done experiment is not recomputed, as in the non deferred handler
+        experiment_ids = Experiment.all.filter(id__in=experiment_ids).exclude(
+            status_name__in=ExperimentLifeCycle.DONE_STATUS).values_list('id', flat=True)
+        for experiment_id in experiment_ids:
+            celery_app.send_task(
+                SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUS,
+                kwargs={'experiment_id': experiment_id},
+                countdown=1)
+
+    def schedule_experiment_groups(self, experiment_group_ids: Iterable[int]) -> None:
+        experiment_group_ids = set(experiment_group_ids) - self.experiment_group_ids
+        self.experiment_group_ids |= experiment_group_ids
+        for experiment_group_id in experiment_group_ids:
+            celery_app.send_task(
+                HPCeleryTasks.HP_START,
+                kwargs={'experiment_group_id': experiment_group_id},
+                countdown=1)
+
+
+class RecomputeScheduler(local):
+    """Defers the parents status recomputation and the status events to the transaction commit.
+
+    Each change registers its own commit hook, the hooks of a rolled back savepoint
+    or transaction are dropped with it, and the hooks of a commit share one batch
+    to schedule each parent once.
+
+    When the deferred mode is disabled, or outside of a transaction,
+    events are recorded and recomputations are scheduled immediately.
+    """
+
+    def __init__(self):  # pylint:disable=super-init-not-called
+        self._batch = None
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return conf.get('STATUSES_DEFERRED_RECOMPUTE')
+
+    def _get_batch(self) -> RecomputeBatch:
+        if self._batch is None:
+            self._batch = RecomputeBatch()
+        return self._batch
+
+    def _collect(self, func: Callable, *args) -> None:
+        if not transaction.get_connection().in_atomic_block:
+            func(RecomputeBatch(), *args)
+            return
+        # The hooks of the previous commit already ran, this change belongs to a new transaction
+        self._batch = None
+        transaction.on_commit(lambda: func(self._get_batch(), *args))
+
+    def record(self, event_type: str, instance: Any, **kwargs) -> None:
+        if not self.is_enabled():
+            auditor.record(event_type=event_type, instance=instance, **kwargs)
+            return
+        # The event is built at commit, the copy keeps the instance's state at this transition
+        self._collect(RecomputeBatch.record, event_type, copy.copy(instance), kwargs)
+
+    def schedule_experiment(self, experiment_id: int) -> None:
+        if not self.is_enabled():
+            return
+        self._collect(RecomputeBatch.schedule_experiments, [experiment_id])
+
+    def schedule_experiment_group(self, experiment_group_id: int) -> None:
+        if not self.is_enabled():
+            return
+        self._collect(RecomputeBatch.schedule_experiment_groups, [experiment_group_id])
+
+    def reset(self) -> None:
+        self._batch = None
+
+
+recompute_scheduler = RecomputeScheduler()
@@ -2,15 +2,15 @@ import logging
 
 from hestia.signal_decorators import ignore_raw, ignore_updates
 
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.utils.timezone import now
 
-import auditor
-
 from constants.experiment_groups import ExperimentGroupLifeCycle
 from constants.experiments import ExperimentLifeCycle
 from constants.jobs import JobLifeCycle
+from db.counters import lock_experiment_status, update_status_counters
 from db.models.build_jobs import BuildJobStatus
 from db.models.experiment_groups import ExperimentGroupStatus
 from db.models.experiment_jobs import ExperimentJobStatus
@@ -61,6 +61,7 @@ from event_manager.events.tensorboard import (
     TENSORBOARD_STOPPED,
     TENSORBOARD_SUCCEEDED
 )
+from signals.recompute import recompute_scheduler
 from signals.run_time import (
     set_finished_at,
     set_job_finished_at,
@@ -80,33 +81,34 @@ def build_job_status_post_save(sender, **kwargs):
     previous_status = job.last_status
 
     # Update job last_status
-    job.status = instance
+    job.set_last_status(instance)
     set_job_started_at(instance=job, status=instance.status)
     set_job_finished_at(instance=job, status=instance.status)
-    job.save(update_fields=['status', 'started_at', 'finished_at'])
-    auditor.record(event_type=BUILD_JOB_NEW_STATUS,
-                   instance=job,
-                   previous_status=previous_status)
+    job.save(update_fields=['status', 'status_name', 'status_at',
+                            'started_at', 'finished_at'])
+    recompute_scheduler.record(event_type=BUILD_JOB_NEW_STATUS,
+                               instance=job,
+                               previous_status=previous_status)
     if instance.status == JobLifeCycle.CREATED:
-        auditor.record(event_type=BUILD_JOB_CREATED, instance=job)
+        recompute_scheduler.record(event_type=BUILD_JOB_CREATED, instance=job)
     elif instance.status == JobLifeCycle.STOPPED:
-        auditor.record(event_type=BUILD_JOB_STOPPED,
-                       instance=job,
-                       previous_status=previous_status)
+        recompute_scheduler.record(event_type=BUILD_JOB_STOPPED,
+                                   instance=job,
+                                   previous_status=previous_status)
     elif instance.status == JobLifeCycle.FAILED:
-        auditor.record(event_type=BUILD_JOB_FAILED,
-                       instance=job,
-                       previous_status=previous_status)
+        recompute_scheduler.record(event_type=BUILD_JOB_FAILED,
+                                   instance=job,
+                                   previous_status=previous_status)
     elif instance.status == JobLifeCycle.SUCCEEDED:
-        auditor.record(event_type=BUILD_JOB_SUCCEEDED,
-                       instance=job,
-                       previous_status=previous_status)
+        recompute_scheduler.record(event_type=BUILD_JOB_SUCCEEDED,
+                                   instance=job,
+                                   previous_status=previous_status)
 
     # handle done status
     if JobLifeCycle.is_done(instance.status):
-        auditor.record(event_type=BUILD_JOB_DONE,
-                       instance=job,
-                       previous_status=previous_status)
+        recompute_scheduler.record(event_type=BUILD_JOB_DONE,
+                                   instance=job,
+                                   previous_status=previous_status)
 
 
 @receiver(post_save, sender=JobStatus, dispatch_uid="job_status_post_save")
@@ -117,32 +119,32 @@ def job_status_post_save(sender, **kwargs):
     job = instance.job
     previous_status = job.last_status
     # Update job last_status
-    job.status = instance
+    job.set_last_status(instance)
     set_job_started_at(instance=job, status=instance.status)
     set_job_finished_at(instance=job, status=instance.status)
-    job.save(update_fields=['status'])
-    auditor.record(event_type=JOB_NEW_STATUS,
-                   instance=job,
-                   previous_status=previous_status)
+    job.save(update_fields=['status', 'status_name', 'status_at'])
+    recompute_scheduler.record(event_type=JOB_NEW_STATUS,
+                               instance=job,
+                               previous_status=previous_status)
 
     if instance.status == JobLifeCycle.CREATED:
-        auditor.record(event_type=JOB_CREATED, instance=job)
+        recompute_scheduler.record(event_type=JOB_CREATED, instance=job)
     elif instance.status == JobLifeCycle.STOPPED:
-        auditor.record(event_type=JOB_STOPPED,
-                       instance=job,
-                       previous_status=previous_status)
+        recompute_scheduler.record(event_type=JOB_STOPPED,
+                                   instance=job,
+                                   previous_status=previous_status)
     elif instance.status == JobLifeCycle.FAILED:
-        auditor.record(event_type=JOB_FAILED,
-                       instance=job,
-                       previous_status=previous_status)
+        recompute_scheduler.record(event_type=JOB_FAILED,
+                                   instance=job,
+                                   previous_status=previous_status)
     elif instance.status == JobLifeCycle.SUCCEEDED:
-        auditor.record(event_type=JOB_SUCCEEDED,
-                       instance=job,
-                       previous_status=previous_status)
+        recompute_scheduler.record(event_type=JOB_SUCCEEDED,
+                                   instance=job,
+                                   previous_status=previous_status)
     if JobLifeCycle.is_done(instance.status):
-        auditor.record(event_type=JOB_DONE,
-                       instance=job,
-                       previous_status=previous_status)
+        recompute_scheduler.record(event_type=JOB_DONE,
+                                   instance=job,
+                                   previous_status=previous_status)
 
 
 @receiver(post_save, sender=NotebookJobStatus, dispatch_uid="notebook_job_status_post_save")
@@ -153,29 +155,30 @@ def notebook_job_status_post_save(sender, **kwargs):
     job = instance.job
     previous_status = job.last_status
     # Update job last_status
-    job.status = instance
+    job.set_last_status(instance)
     set_job_started_at(instance=job, status=instance.status)
     set_job_finished_at(instance=job, status=instance.status)
-    job.save(update_fields=['status', 'started_at', 'finished_at'])
-    auditor.record(event_type=NOTEBOOK_NEW_STATUS,
-                   instance=job,
-                   previous_status=previous_status,
-                   target='project')
+    job.save(update_fields=['status', 'status_name', 'status_at',
+                            'started_at', 'finished_at'])
+    recompute_scheduler.record(event_type=NOTEBOOK_NEW_STATUS,
+                               instance=job,
+                               previous_status=previous_status,
+                               target='project')
     if instance.status == JobLifeCycle.STOPPED:
-        auditor.record(event_type=NOTEBOOK_STOPPED,
-                       instance=job,
-                       previous_status=previous_status,
-                       target='project')
+        recompute_scheduler.record(event_type=NOTEBOOK_STOPPED,
+                                   instance=job,
+                                   previous_status=previous_status,
+                                   target='project')
     elif instance.status == JobLifeCycle.FAILED:
-        auditor.record(event_type=NOTEBOOK_FAILED,
-                       instance=job,
-                       previous_status=previous_status,
-                       target='project')
+        recompute_scheduler.record(event_type=NOTEBOOK_FAILED,
+                                   instance=job,
+                                   previous_status=previous_status,
+                                   target='project')
     elif instance.status == JobLifeCycle.STOPPED:
-        auditor.record(event_type=NOTEBOOK_SUCCEEDED,
-                       instance=job,
-                       previous_status=previous_status,
-                       target='project')
+        recompute_scheduler.record(event_type=NOTEBOOK_SUCCEEDED,
+                                   instance=job,
+                                   previous_status=previous_status,
+                                   target='project')
 
 
 @receiver(post_save, sender=TensorboardJobStatus, dispatch_uid="tensorboard_job_status_post_save")
@@ -186,29 +189,30 @@ def tensorboard_job_status_post_save(sender, **kwargs):
     job = instance.job
     previous_status = job.last_status
     # Update job last_status
-    job.status = instance
+    job.set_last_status(instance)
     set_job_started_at(instance=job, status=instance.status)
     set_job_finished_at(instance=job, status=instance.status)
-    job.save(update_fields=['status', 'started_at', 'finished_at'])
-    auditor.record(event_type=TENSORBOARD_NEW_STATUS,
-                   instance=job,
-                   previous_status=previous_status,
-                   target='project')
+    job.save(update_fields=['status', 'status_name', 'status_at',
+                            'started_at', 'finished_at'])
+    recompute_scheduler.record(event_type=TENSORBOARD_NEW_STATUS,
+                               instance=job,
+                               previous_status=previous_status,
+                               target='project')
     if instance.status == JobLifeCycle.STOPPED:
-        auditor.record(event_type=TENSORBOARD_STOPPED,
-                       instance=job,
-                       previous_status=previous_status,
-                       target='project')
+        recompute_scheduler.record(event_type=TENSORBOARD_STOPPED,
+                                   instance=job,
+                                   previous_status=previous_status,
+                                   target='project')
     elif instance.status == JobLifeCycle.FAILED:
-        auditor.record(event_type=TENSORBOARD_FAILED,
-                       instance=job,
-                       previous_status=previous_status,
-                       target='project')
+        recompute_scheduler.record(event_type=TENSORBOARD_FAILED,
+                                   instance=job,
+                                   previous_status=previous_status,
+                                   target='project')
     elif instance.status == JobLifeCycle.STOPPED:
-        auditor.record(event_type=TENSORBOARD_SUCCEEDED,
-                       instance=job,
-                       previous_status=previous_status,
-                       target='project')
+        recompute_scheduler.record(event_type=TENSORBOARD_SUCCEEDED,
+                                   instance=job,
+                                   previous_status=previous_status,
+                                   target='project')
 
 
 @receiver(post_save, sender=ExperimentGroupStatus, dispatch_uid="experiment_group_status_post_save")
@@ -220,7 +224,7 @@ def experiment_group_status_post_save(sender, **kwargs):
     previous_status = experiment_group.last_status
 
     # update experiment last_status
-    experiment_group.status = instance
+    experiment_group.set_last_status(instance)
     if instance.status == ExperimentGroupLifeCycle.RUNNING:
         experiment_group.started_at = now()
 
@@ -230,22 +234,23 @@ def experiment_group_status_post_save(sender, **kwargs):
     set_finished_at(instance=experiment_group,
                     status=instance.status,
                     is_done=ExperimentGroupLifeCycle.is_done)
-    experiment_group.save(update_fields=['status', 'started_at', 'finished_at'])
-    auditor.record(event_type=EXPERIMENT_GROUP_NEW_STATUS,
-                   instance=experiment_group,
-                   previous_status=previous_status)
+    experiment_group.save(update_fields=['status', 'status_name', 'status_at',
+                                         'started_at', 'finished_at'])
+    recompute_scheduler.record(event_type=EXPERIMENT_GROUP_NEW_STATUS,
+                               instance=experiment_group,
+                               previous_status=previous_status)
 
     if instance.status == ExperimentGroupLifeCycle.CREATED:
-        auditor.record(event_type=EXPERIMENT_GROUP_CREATED, instance=experiment_group)
+        recompute_scheduler.record(event_type=EXPERIMENT_GROUP_CREATED, instance=experiment_group)
     elif instance.status == ExperimentGroupLifeCycle.STOPPED:
-        auditor.record(event_type=EXPERIMENT_GROUP_STOPPED,
-                       instance=experiment_group,
-                       previous_status=previous_status)
+        recompute_scheduler.record(event_type=EXPERIMENT_GROUP_STOPPED,
+                                   instance=experiment_group,
+                                   previous_status=previous_status)
 
     if ExperimentGroupLifeCycle.is_done(instance.status):
-        auditor.record(event_type=EXPERIMENT_GROUP_DONE,
-                       instance=experiment_group,
-                       previous_status=previous_status)
+        recompute_scheduler.record(event_type=EXPERIMENT_GROUP_DONE,
+                                   instance=experiment_group,
+                                   previous_status=previous_status)
 
 
 @receiver(post_save, sender=ExperimentJobStatus, dispatch_uid="experiment_job_status_post_save")
@@ -255,10 +260,11 @@ def experiment_job_status_post_save(sender, **kwargs):
     instance = kwargs['instance']
     job = instance.job
 
-    job.status = instance
+    job.set_last_status(instance)
     set_job_started_at(instance=job, status=instance.status)
     set_job_finished_at(instance=job, status=instance.status)
-    job.save(update_fields=['status', 'started_at', 'finished_at'])
+    job.save(update_fields=['status', 'status_name', 'status_at',
+                            'started_at', 'finished_at'])
 
     # check if the new status is done to remove the containers from the monitors
     if job.is_done:
@@ -267,7 +273,8 @@ def experiment_job_status_post_save(sender, **kwargs):
         RedisJobContainers.remove_job(job.uuid.hex)
 
     # Check if we need to change the experiment status
-    auditor.record(event_type=EXPERIMENT_JOB_NEW_STATUS, instance=job)
+    recompute_scheduler.record(event_type=EXPERIMENT_JOB_NEW_STATUS, instance=job)
+    recompute_scheduler.schedule_experiment(job.experiment_id)
 
 
 @receiver(post_save, sender=ExperimentStatus, dispatch_uid="experiment_status_post_save")
@@ -279,7 +286,7 @@ def experiment_status_post_save(sender, **kwargs):
     previous_status = experiment.last_status
 
     # update experiment last_status
-    experiment.status = instance
+    experiment.set_last_status(instance)
     set_started_at(instance=experiment,
                    status=instance.status,
                    starting_statuses=[ExperimentLifeCycle.STARTING, ExperimentLifeCycle.RUNNING],
@@ -287,31 +294,40 @@ def experiment_status_post_save(sender, **kwargs):
     set_finished_at(instance=experiment,
                     status=instance.status,
                     is_done=ExperimentLifeCycle.is_done)
-    experiment.save(update_fields=['status', 'started_at', 'finished_at'])
-    auditor.record(event_type=EXPERIMENT_NEW_STATUS,
-                   instance=experiment,
-                   previous_status=previous_status)
+    with transaction.atomic():
+        # The counters move from the stored status, the experiment instance can be stale
+        stored_status, stored_deleted = lock_experiment_status(experiment.id)
+        experiment.save(update_fields=['status', 'status_name', 'status_at',
+                                       'started_at', 'finished_at'])
+        update_status_counters(experiment=experiment,
+                               previous_status=stored_status,
+                               deleted=stored_deleted)
+    recompute_scheduler.record(event_type=EXPERIMENT_NEW_STATUS,
+                               instance=experiment,
+                               previous_status=previous_status)
 
     if instance.status == ExperimentLifeCycle.CREATED:
-        auditor.record(event_type=EXPERIMENT_CREATED, instance=experiment)
+        recompute_scheduler.record(event_type=EXPERIMENT_CREATED, instance=experiment)
     elif instance.status == ExperimentLifeCycle.SUCCEEDED:
         # update all workers with succeeded status, since we will trigger a stop mechanism
         for job in experiment.jobs.all():
             if not job.is_done:
                 job.set_status(JobLifeCycle.SUCCEEDED, message='Master is done.')
-        auditor.record(event_type=EXPERIMENT_SUCCEEDED,
-                       instance=experiment,
-                       previous_status=previous_status)
+        recompute_scheduler.record(event_type=EXPERIMENT_SUCCEEDED,
+                                   instance=experiment,
+                                   previous_status=previous_status)
     elif instance.status == ExperimentLifeCycle.FAILED:
-        auditor.record(event_type=EXPERIMENT_FAILED,
-                       instance=experiment,
-                       previous_status=previous_status)
+        recompute_scheduler.record(event_type=EXPERIMENT_FAILED,
+                                   instance=experiment,
+                                   previous_status=previous_status)
     elif instance.status == ExperimentLifeCycle.STOPPED:
-        auditor.record(event_type=EXPERIMENT_STOPPED,
-                       instance=experiment,
-                       previous_status=previous_status)
+        recompute_scheduler.record(event_type=EXPERIMENT_STOPPED,
+                                   instance=experiment,
+                                   previous_status=previous_status)
 
     if ExperimentLifeCycle.is_done(instance.status):
-        auditor.record(event_type=EXPERIMENT_DONE,
-                       instance=experiment,
-                       previous_status=previous_status)
+        recompute_scheduler.record(event_type=EXPERIMENT_DONE,
+                                   instance=experiment,
+                                   previous_status=previous_status)
+        if experiment.experiment_group_id:
+            recompute_scheduler.schedule_experiment_group(experiment.experiment_group_id)
@@ -12,6 +12,10 @@ def get_stats_backend():
         return 'stats.datadog.DatadogStatsBackend'
     if settings.STATS_BACKEND == settings.STATS_BACKEND_STATSD:
         return 'stats.statsd.StatsdStatsBackend'
+    if settings.STATS_BACKEND == settings.STATS_BACKEND_MEMORY:
+        return 'stats.memory.InMemoryStatsBackend'
+    if settings.STATS_BACKEND == settings.STATS_BACKEND_PROMETHEUS:
+        return 'stats.prometheus.PrometheusStatsBackend'
     return ''
 
 
@@ -28,8 +28,20 @@ class DatadogStatsBackend(BaseStatsBackend):
         instance.start()
         return instance
 
-    def _incr(self, key, amount=1, sample_rate=1, **kwargs):
-        tags = kwargs.get('tags', [])
+    def _get_tags(self, **kwargs):
+        tags = list(kwargs.get('tags', []))
         if self.tags:
             tags += self.tags
+        return tags
+
+    def _incr(self, key, amount=1, sample_rate=1, **kwargs):
+        tags = self._get_tags(**kwargs)
         self.stats.increment(key, amount, sample_rate=sample_rate, tags=tags, host=self.host)
+
+    def _timing(self, key, value, sample_rate=1, **kwargs):
+        tags = self._get_tags(**kwargs)
+        self.stats.timing(key, value, sample_rate=sample_rate, tags=tags, host=self.host)
+
+    def _gauge(self, key, value, sample_rate=1, **kwargs):
+        tags = self._get_tags(**kwargs)
+        self.stats.gauge(key, value, sample_rate=sample_rate, tags=tags, host=self.host)
@@ -0,0 +1,92 @@
+import threading
+
+from collections import namedtuple
+from typing import Dict, Iterable, Optional, Tuple
+
+from stats.base import BaseStatsBackend
+
+TimingSummary = namedtuple('TimingSummary', 'count sum max')
+
+
+class StatsStore(object):
+    """A process wide store of counters, gauges and timings summaries.
+
+    Keys are tuples of (name, tags), tags being a sorted tuple of `key:value` strings.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}  # type: Dict[Tuple, float]
+        self.gauges = {}  # type: Dict[Tuple, float]
+        self.timings = {}  # type: Dict[Tuple, TimingSummary]
+
+    @staticmethod
+    def get_key(name: str, tags: Optional[Iterable[str]] = None) -> Tuple:
+        return name, tuple(sorted(tags or []))
+
+    def incr(self, name: str, amount: float, tags: Optional[Iterable[str]] = None) -> None:
+        key = self.get_key(name, tags)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def gauge(self, name: str, value: float, tags: Optional[Iterable[str]] = None) -> None:
+        key = self.get_key(name, tags)
+        with self._lock:
+            self.gauges[key] = value
+
+    def timing(self, name: str, value: float, tags: Optional[Iterable[str]] = None) -> None:
+        key = self.get_key(name, tags)
+        with self._lock:
+            summary = self.timings.get(key, TimingSummary(count=0, sum=0, max=0))
+            self.timings[key] = TimingSummary(count=summary.count + 1,
+                                              sum=summary.sum + value,
+                                              max=max(summary.max, value))
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                'counters': dict(self.counters),
+                'gauges': dict(self.gauges),
+                'timings': dict(self.timings),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self.counters = {}
+            self.gauges = {}
+            self.timings = {}
+
+
+store = StatsStore()
+
+
+class InMemoryStatsBackend(BaseStatsBackend):
+    """Keeps all the stats in memory, used for tests and as the source of the prometheus exporter.
+
+    The values are shared by all threads of the process.
+    """
+
+    def __init__(self, prefix=None, stats_store=None):
+        self.store = stats_store or store
+        super().__init__(prefix=prefix)
+
+    def _incr(self, key, amount=1, sample_rate=1, **kwargs):
+        self.store.incr(key, amount, tags=kwargs.get('tags'))
+
+    def _timing(self, key, value, sample_rate=1, **kwargs):
+        self.store.timing(key, value, tags=kwargs.get('tags'))
+
+    def _gauge(self, key, value, sample_rate=1, **kwargs):
+        self.store.gauge(key, value, tags=kwargs.get('tags'))
+
+    def get_counter(self, key, tags=None):
+        return self.store.counters.get(self.store.get_key(self._get_key(key), tags), 0)
+
+    def get_gauge(self, key, tags=None):
+        return self.store.gauges.get(self.store.get_key(self._get_key(key), tags))
+
+    def get_timing(self, key, tags=None):
+        return self.store.timings.get(self.store.get_key(self._get_key(key), tags))
+
+    def clear(self):
+        self.store.clear()
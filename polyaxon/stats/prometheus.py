@@ -0,0 +1,164 @@
+import json
+import logging
+import os
+import re
+import socket
+import threading
+import time
+
+from typing import Dict, Iterable, List, Tuple
+
+from redis.exceptions import RedisError
+
+import conf
+
+from stats.memory import InMemoryStatsBackend, TimingSummary
+
+_logger = logging.getLogger('polyaxon.stats')
+
+_INVALID_CHARS = re.compile(r'[^a-zA-Z0-9_:]')
+
+
+def get_metric_name(name: str) -> str:
+    name = _INVALID_CHARS.sub('_', name)
+    if name[0].isdigit():
+        name = '_{}'.format(name)
+    return name
+
+
+def get_labels(tags: Tuple[str, ...], **extra) -> str:
+    labels = []
+    for tag in tags:
+        key, _, value = tag.partition(':')
+        labels.append((get_metric_name(key), value))
+    labels += sorted(extra.items())
+    if not labels:
+        return ''
+    values = ','.join('{}="{}"'.format(
+        key, str(value).replace('\\', '\\\\').replace('"', '\\"')) for key, value in labels)
+    return '{{{}}}'.format(values)
+
+
+def render(snapshot: Dict[str, Dict]) -> str:
+    """Renders a stats snapshot in the prometheus text exposition format."""
+    lines = []
+
+    def add_family(values, metric_type, suffixes):
+        names = {}
+        for (name, tags), value in sorted(values.items()):
+            names.setdefault(get_metric_name(name), []).append((tags, value))
+        for name, samples in names.items():
+            lines.append('# TYPE {} {}'.format(name, metric_type))
+            for tags, value in samples:
+                for suffix, get_value in suffixes:
+                    lines.append('{}{}{} {}'.format(
+                        name, suffix, get_labels(tags), get_value(value)))
+
+    add_family(snapshot['counters'], 'counter', [('', lambda v: v)])
+    add_family(snapshot['gauges'], 'gauge', [('', lambda v: v)])
+    # Timings are in milliseconds, exported as summaries without quantiles
+    add_family(snapshot['timings'], 'summary', [('_count', lambda v: v.count),
+                                                ('_sum', lambda v: v.sum)])
+    return '\n'.join(lines) + '\n'
+
+
+def dumps_snapshot(snapshot: Dict[str, Dict]) -> str:
+    return json.dumps({
+        'published_at': time.time(),
+        'counters': [[name, tags, value] for (name, tags), value in snapshot['counters'].items()],
+        'gauges': [[name, tags, value] for (name, tags), value in snapshot['gauges'].items()],
+        'timings': [[name, tags, list(value)]
+                    for (name, tags), value in snapshot['timings'].items()],
+    })
+
+
+def loads_snapshot(value: str) -> Dict:
+    data = json.loads(value)
+    return {
+        'published_at': data['published_at'],
+        'counters': {(name, tuple(tags)): value for name, tags, value in data['counters']},
+        'gauges': {(name, tuple(tags)): value for name, tags, value in data['gauges']},
+        'timings': {(name, tuple(tags)): TimingSummary(*value)
+                    for name, tags, value in data['timings']},
+    }
+
+
+def merge_snapshots(snapshots: Iterable[Dict]) -> Dict[str, Dict]:
+    """Sums the counters and the timings of the processes, the latest published gauges win."""
+    merged = {'counters': {}, 'gauges': {}, 'timings': {}}
+    for snapshot in sorted(snapshots, key=lambda s: s['published_at']):
+        for key, value in snapshot['counters'].items():
+            merged['counters'][key] = merged['counters'].get(key, 0) + value
+        merged['gauges'].update(snapshot['gauges'])
+        for key, value in snapshot['timings'].items():
+            summary = merged['timings'].get(key, TimingSummary(count=0, sum=0, max=0))
+            merged['timings'][key] = TimingSummary(count=summary.count + value.count,
+                                                   sum=summary.sum + value.sum,
+                                                   max=max(summary.max, value.max))
+    return merged
+
+
+def get_process_id() -> str:
+    # Read on each publish, the workers are forked after the import
+    return '{}:{}'.format(socket.gethostname(), os.getpid())
+
+
+_publish_lock = threading.Lock()
+_last_publish = 0.
+
+
+class PrometheusStatsBackend(InMemoryStatsBackend):
+    """Aggregates the stats in memory to expose them to a prometheus scraper.
+
+    The registry is per process, each process publishes its snapshot to redis
+    every `STATS_PUBLISH_INTERVAL` seconds, and the scraped endpoint renders the sum of
+    the snapshots of all the live processes, so the celery workers' stats are exposed as well.
+    Counters drop when a process restarts, which prometheus handles as a counter reset.
+    """
+
+    def _incr(self, key, amount=1, sample_rate=1, **kwargs):
+        super()._incr(key, amount=amount, sample_rate=sample_rate, **kwargs)
+        self.publish_if_due()
+
+    def _timing(self, key, value, sample_rate=1, **kwargs):
+        super()._timing(key, value, sample_rate=sample_rate, **kwargs)
+        self.publish_if_due()
+
+    def _gauge(self, key, value, sample_rate=1, **kwargs):
+        super()._gauge(key, value, sample_rate=sample_rate, **kwargs)
+        self.publish_if_due()
+
+    def publish_if_due(self) -> None:
+        global _last_publish  # pylint:disable=global-statement
+
+        now = time.monotonic()
+        with _publish_lock:
+            if now - _last_publish < conf.get('STATS_PUBLISH_INTERVAL'):
+                return
+            # Set before publishing, the redis client records stats as well
+            _last_publish = now
+        self.publish()
+
+    def publish(self) -> None:
+        from db.redis.stats_snapshots import RedisStatsSnapshots
+
+        try:
+            RedisStatsSnapshots(process=get_process_id()).set(
+                dumps_snapshot(self.store.snapshot()),
+                ttl=max(conf.get('STATS_PUBLISH_INTERVAL') * 4, 60))
+        except RedisError as e:
+            _logger.warning('Could not publish the stats snapshot: %s', e)
+
+    def get_snapshots(self) -> List[Dict]:
+        from db.redis.stats_snapshots import RedisStatsSnapshots
+
+        self.publish()
+        try:
+            return [loads_snapshot(value) for value in RedisStatsSnapshots.get_all()]
+        except RedisError as e:
+            _logger.warning('Could not read the stats snapshots, '
+                            'only the current process stats are rendered: %s', e)
+            return [dict(self.store.snapshot(), published_at=time.time())]
+
+    def render(self) -> str:
+        return render(merge_snapshots(self.get_snapshots()))
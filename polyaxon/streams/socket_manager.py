@@ -1,11 +1,17 @@
+from instrumentation.streams import websockets_gauge
+
+
 class SocketManager(object):
     def __init__(self):
         self.ws = set()
 
     def add_socket(self, ws):
+        if ws not in self.ws:
+            websockets_gauge.incr()
         self.ws.add(ws)
 
     def remove_sockets(self, disconnected_ws):
         if not isinstance(disconnected_ws, set):
             disconnected_ws = {disconnected_ws, }
+        websockets_gauge.decr(len(self.ws & disconnected_ws))
         self.ws -= disconnected_ws
@@ -0,0 +1,100 @@
+import threading
+import time
+
+from collections import namedtuple
+from typing import Optional
+from uuid import UUID
+
+TrackerConfiguration = namedtuple(
+    'TrackerConfiguration',
+    'backend batch_size flush_interval')
+
+
+class ClusterCache(object):
+    """A process wide cache for the cluster identity and the tracker configuration.
+
+    Values are loaded lazily on first access and kept until they are invalidated
+    (cluster saved or settings changed) or until the ttl expires,
+    the ttl is a safety net for updates happening in other processes.
+    """
+
+    def __init__(self, ttl: int = None):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._ref_id = None
+        self._ref_id_loaded_at = None
+        self._configuration = None
+        self._configuration_loaded_at = None
+
+    @property
+    def ttl(self) -> int:
+        if self._ttl is not None:
+            return self._ttl
+
+        import conf
+
+        return conf.get('TRACKER_CACHE_TTL')
+
+    def _is_fresh(self, loaded_at: Optional[float]) -> bool:
+        return loaded_at is not None and time.monotonic() - loaded_at < self.ttl
+
+    @staticmethod
+    def _load_ref_id() -> Optional[UUID]:
+        from django.db import InterfaceError, OperationalError, ProgrammingError
+
+        from db.models.clusters import Cluster
+
+        try:
+            return Cluster.load().uuid
+        except (Cluster.DoesNotExist, InterfaceError, ProgrammingError, OperationalError):
+            return None
+
+    @staticmethod
+    def _load_configuration() -> TrackerConfiguration:
+        import conf
+
+        return TrackerConfiguration(
+            backend=conf.get('TRACKER_BACKEND'),
+            batch_size=conf.get('TRACKER_BATCH_SIZE'),
+            flush_interval=conf.get('TRACKER_BATCH_FLUSH_INTERVAL'))
+
+    def get_ref_id(self) -> Optional[UUID]:
+        if self._is_fresh(self._ref_id_loaded_at):
+            return self._ref_id
+
+        with self._lock:
+            if self._is_fresh(self._ref_id_loaded_at):
+                return self._ref_id
+            ref_id = self._load_ref_id()
+            # We do not cache misses, the cluster might not be created yet.
+            if ref_id:
+                self._ref_id = ref_id
+                self._ref_id_loaded_at = time.monotonic()
+            return ref_id
+
+    def get_configuration(self) -> TrackerConfiguration:
+        if self._is_fresh(self._configuration_loaded_at):
+            return self._configuration
+
+        with self._lock:
+            if not self._is_fresh(self._configuration_loaded_at):
+                self._configuration = self._load_configuration()
+                self._configuration_loaded_at = time.monotonic()
+            return self._configuration
+
+    def invalidate_ref_id(self) -> None:
+        with self._lock:
+            self._ref_id = None
+            self._ref_id_loaded_at = None
+
+    def invalidate_configuration(self) -> None:
+        with self._lock:
+            self._configuration = None
+            self._configuration_loaded_at = None
+
+    def invalidate(self) -> None:
+        self.invalidate_ref_id()
+        self.invalidate_configuration()
+
+
+cluster_cache = ClusterCache()
@@ -1,24 +1,50 @@
+import atexit
+
 import analytics
 
+from tracker.cache import cluster_cache
 from tracker.service import TrackerService
+from tracker.sinks import BatchTrackerSink
 
 
 class PublishTrackerService(TrackerService):
-    def __init__(self, key=''):
+    def __init__(self, key='', sink=None):
         self.analytics = analytics
         self.analytics.write_key = key
+        self.sink = sink
+
+    def get_sink(self):
+        configuration = cluster_cache.get_configuration()
+        return BatchTrackerSink(client=self.analytics,
+                                batch_size=configuration.batch_size,
+                                flush_interval=configuration.flush_interval)
+
+    def get_or_create_sink(self):
+        # Events can be recorded before the setup, e.g. by a process without the tracker app
+        if not self.sink:
+            self.sink = self.get_sink()
+        return self.sink
+
+    def flush(self):
+        if self.sink:
+            self.sink.flush()
 
     def record_event(self, event):
-        if not event.ref_id:
+        ref_id = event.ref_id or cluster_cache.get_ref_id()
+        if not ref_id:
             return
 
+        ref_id = ref_id.hex
+        sink = self.get_or_create_sink()
         if event.event_type == 'cluster.created':
-            self.analytics.identify(
-                event.ref_id.hex,
-                event.serialize(dumps=False),
-            )
-        self.analytics.track(
-            event.ref_id.hex,
+            sink.identify(ref_id, event.serialize(dumps=False))
+        sink.track(
+            ref_id,
             event.event_type,
             event.serialize(dumps=False, include_actor_name=False),
         )
+
+    def setup(self):
+        super().setup()
+        self.get_or_create_sink()
+        atexit.register(self.flush)
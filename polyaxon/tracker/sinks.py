@@ -0,0 +1,105 @@
+import threading
+import time
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+IDENTIFY = 'identify'
+TRACK = 'track'
+
+
+class BaseTrackerSink(object):
+    """A sink receives the analytics calls of the tracker and decides when to send them."""
+
+    def identify(self, user_id: str, traits: Dict) -> None:
+        raise NotImplementedError  # noqa
+
+    def track(self, user_id: str, event_type: str, properties: Dict) -> None:
+        raise NotImplementedError  # noqa
+
+    def flush(self) -> None:
+        pass
+
+
+class BatchTrackerSink(BaseTrackerSink):
+    """Buffers analytics calls and sends them in groups.
+
+    The buffer is sent when it reaches `batch_size` calls,
+    or on the first call after `flush_interval` seconds since the last send.
+    Batches are sent by a background thread, the caller never waits on the client,
+    `flush` sends the remaining calls and waits for the pending batches.
+    """
+
+    def __init__(self, client, batch_size: int = 50, flush_interval: int = 30):
+        self.client = client
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._buffer = []  # type: List[Tuple]
+        self._last_flush = time.monotonic()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def _should_flush(self) -> bool:
+        return (len(self._buffer) >= self.batch_size or
+                time.monotonic() - self._last_flush >= self.flush_interval)
+
+    def _add(self, call: Tuple) -> None:
+        with self._lock:
+            self._buffer.append(call)
+            if not self._should_flush():
+                return
+            calls = self._drain()
+        self._submit(calls)
+
+    def _drain(self) -> List[Tuple]:
+        calls, self._buffer = self._buffer, []
+        self._last_flush = time.monotonic()
+        return calls
+
+    def _submit(self, calls: List[Tuple]) -> Optional[Future]:
+        try:
+            return self._executor.submit(self._send, calls)
+        except RuntimeError:
+            # The executor is shut down before the atexit handlers run (python 3.9+),
+            # the pending batches are already sent, the last one is sent synchronously
+            self._send(calls)
+            return None
+
+    def _send(self, calls: List[Tuple]) -> None:
+        for call in calls:
+            if call[0] == IDENTIFY:
+                self.client.identify(*call[1:])
+            else:
+                self.client.track(*call[1:])
+        if calls and hasattr(self.client, 'flush'):
+            self.client.flush()
+
+    def identify(self, user_id: str, traits: Dict) -> None:
+        self._add((IDENTIFY, user_id, traits))
+
+    def track(self, user_id: str, event_type: str, properties: Dict) -> None:
+        self._add((TRACK, user_id, event_type, properties))
+
+    def flush(self) -> None:
+        with self._lock:
+            calls = self._drain()
+        # The worker sends the batches in order, this one is sent after the pending ones
+        future = self._submit(calls)
+        if future:
+            future.result()
+
+
+class NoOpTrackerSink(BaseTrackerSink):
+    """A local stand-in that keeps the calls in memory and never sends them, used offline."""
+
+    def __init__(self):
+        self.calls = []  # type: List[Tuple]
+
+    def identify(self, user_id: str, traits: Dict) -> None:
+        self.calls.append((IDENTIFY, user_id, traits))
+
+    def track(self, user_id: str, event_type: str, properties: Dict) -> None:
+        self.calls.append((TRACK, user_id, event_type, properties))
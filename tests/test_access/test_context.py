@@ -0,0 +1,99 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from django.contrib.auth.models import AnonymousUser
+
+from access.context import AccessContext, get_access_context
+from api.endpoint.project import ProjectResourcePermission
+from db.models.experiments import Experiment
+from db.models.projects import Project
+from factories.factory_experiments import ExperimentFactory
+from factories.factory_projects import ProjectFactory
+from factories.factory_users import UserFactory
+from scopes.access import DEFAULT_ACCESS, OWNER_ACCESS, SUPERUSER_ACCESS, UNAUTHENTICATED_ACCESS
+from tests.utils import BaseTest
+
+
+@pytest.mark.access_mark
+class TestAccessContext(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory()
+        self.public_project = ProjectFactory(user=self.user, is_public=True)
+        self.private_project = ProjectFactory(user=self.user, is_public=False)
+        self.other_public_project = ProjectFactory(is_public=True)
+        self.other_private_project = ProjectFactory(is_public=False)
+
+    def test_get_access(self):
+        owner = self.public_project.owner
+        assert AccessContext(user=self.user).get_access(owner) == OWNER_ACCESS
+        assert AccessContext(user=UserFactory()).get_access(owner) == DEFAULT_ACCESS
+        assert AccessContext(user=UserFactory(is_staff=True)).get_access(owner) == SUPERUSER_ACCESS
+        assert AccessContext(user=AnonymousUser()).get_access(owner) == UNAUTHENTICATED_ACCESS
+        inactive_user = UserFactory()
+        inactive_user.is_active = False
+        assert AccessContext(user=inactive_user).get_access(owner) == UNAUTHENTICATED_ACCESS
+
+    def test_is_owner_does_not_load_the_owner(self):
+        context = AccessContext(user=self.user)
+        context.is_owner(self.public_project.owner)
+        with self.assertNumQueries(0):
+            assert context.is_owner(self.public_project.owner) is True
+            assert context.is_owner(self.other_public_project.owner) is False
+
+    def test_has_project_permission(self):
+        context = AccessContext(user=UserFactory())
+        assert context.has_project_permission(self.public_project, 'GET') is True
+        assert context.has_project_permission(self.public_project, 'POST') is False
+        assert context.has_project_permission(self.private_project, 'GET') is False
+
+        context = AccessContext(user=self.user)
+        assert context.has_project_permission(self.private_project, 'GET') is True
+        assert context.has_project_permission(self.private_project, 'DELETE') is True
+
+    def test_has_project_permission_is_memoized(self):
+        context = AccessContext(user=self.user)
+        project = Project.objects.get(id=self.private_project.id)
+        context.has_project_permission(project, 'GET')
+        with self.assertNumQueries(0):
+            for _ in range(10):
+                assert context.has_project_permission(project, 'HEAD') is True
+                assert context.has_project_permission(project, 'PUT') is True
+
+    def test_filter_queryset_by_access(self):
+        queryset = Project.objects.order_by('id')
+        assert list(AccessContext(user=self.user).filter_queryset_by_access(queryset)) == [
+            self.public_project, self.private_project, self.other_public_project]
+        assert list(AccessContext(user=UserFactory()).filter_queryset_by_access(queryset)) == [
+            self.public_project, self.other_public_project]
+        assert AccessContext(
+            user=UserFactory(is_superuser=True)).filter_queryset_by_access(queryset).count() == 4
+        assert AccessContext(
+            user=AnonymousUser()).filter_queryset_by_access(queryset).count() == 0
+
+    def test_filter_queryset_by_access_with_project_field(self):
+        experiment1 = ExperimentFactory(project=self.private_project)
+        experiment2 = ExperimentFactory(project=self.other_public_project)
+        ExperimentFactory(project=self.other_private_project)
+        queryset = AccessContext(user=self.user).filter_queryset_by_access(
+            Experiment.objects.order_by('id'), project_field='project')
+        assert list(queryset) == [experiment1, experiment2]
+
+    def test_get_access_context(self):
+        request = MagicMock(user=self.user, spec=['user'])
+        context = get_access_context(request)
+        assert get_access_context(request) is context
+        request.user = UserFactory()
+        assert get_access_context(request) is not context
+
+    def test_resource_permission_uses_the_context_project(self):
+        experiment = ExperimentFactory(project=self.private_project)
+        request = MagicMock(user=self.user, method='GET', spec=['user', 'method'])
+        get_access_context(request).add_project(self.private_project)
+        experiment = Experiment.objects.get(id=experiment.id)
+        permission = ProjectResourcePermission()
+        permission.has_object_permission(request, None, experiment)
+        with self.assertNumQueries(0):
+            assert permission.has_object_permission(request, None, experiment) is True
+        assert request.access == OWNER_ACCESS
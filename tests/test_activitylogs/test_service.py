@@ -5,10 +5,14 @@ import pytest
 
 import activitylogs
 
+from django.core.management import call_command
+
 from db.models.activitylogs import ActivityLog
 from event_manager.events.experiment import EXPERIMENT_DELETED_TRIGGERED
+from event_manager.events.project import PROJECT_DELETED_TRIGGERED
 from event_manager.events.user import USER_ACTIVATED
 from factories.factory_experiments import ExperimentFactory
+from factories.factory_projects import ProjectFactory
 from factories.factory_users import UserFactory
 from tests.utils import BaseTest
 
@@ -46,3 +50,29 @@ class ActivityLogsTest(BaseTest):
         assert activity.event_type == EXPERIMENT_DELETED_TRIGGERED
         assert activity.content_object == self.experiment
         assert activity.actor == self.admin
+
+    def record_project_activities(self):
+        project = ProjectFactory()
+        for event_type, instance in ((USER_ACTIVATED, self.user),
+                                     (EXPERIMENT_DELETED_TRIGGERED, self.experiment),
+                                     (PROJECT_DELETED_TRIGGERED, project)):
+            activitylogs.record(ref_id=uuid.uuid4(),
+                                event_type=event_type,
+                                instance=instance,
+                                actor_id=self.admin.id,
+                                actor_name=self.admin.username)
+        return project
+
+    def test_record_sets_project_id(self):
+        project = self.record_project_activities()
+        assert list(ActivityLog.objects.order_by('id').values_list('project_id', flat=True)) == [
+            None, self.experiment.project_id, project.id]
+
+    def test_backfill_command(self):
+        project = self.record_project_activities()
+        ActivityLog.objects.update(project_id=None)
+
+        call_command('backfill_activity_logs', chunk_size=1)
+
+        assert list(ActivityLog.objects.order_by('id').values_list('project_id', flat=True)) == [
+            None, self.experiment.project_id, project.id]
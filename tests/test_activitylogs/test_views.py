@@ -105,6 +105,24 @@ class TestActivityLogsListViewV1(BaseViewTest):
         assert len(data) == 1
         assert data == self.serializer_class(self.filtered_queryset[limit:], many=True).data  # noqa
 
+    def test_cursor_pagination(self):
+        limit = self.num_objects - 1
+        resp = self.auth_client.get("{}?cursor=&limit={}".format(self.url, limit))
+        assert resp.status_code == status.HTTP_200_OK
+
+        next_page = resp.data.get('next')
+        assert next_page is not None
+        assert resp.data['count'] is None
+        filtered_queryset = self.filtered_queryset.order_by('-created_at', '-id')
+        data = resp.data['results']
+        assert data == self.serializer_class(filtered_queryset[:limit], many=True).data
+
+        resp = self.auth_client.get(next_page)
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['next'] is None
+        data = resp.data['results']
+        assert data == self.serializer_class(filtered_queryset[limit:], many=True).data
+
 
 @pytest.mark.activitylogs_mark
 class TestHistoryLogsListViewV1(TestActivityLogsListViewV1):
@@ -178,6 +196,30 @@ class TestProjectActivityLogsListViewV1(TestActivityLogsListViewV1):
                                                     self.project.user.username,
                                                     self.project.name)
 
+    def set_queryset(self):
+        super().set_queryset()
+        # Activities of other projects
+        activitylogs.record(ref_id=uuid.uuid4(),
+                            event_type=EXPERIMENT_DELETED_TRIGGERED,
+                            instance=ExperimentFactory(),
+                            actor_id=self.user.id,
+                            actor_name=self.user.username)
+        activitylogs.record(ref_id=uuid.uuid4(),
+                            event_type=PROJECT_DELETED_TRIGGERED,
+                            instance=ProjectFactory(),
+                            actor_id=self.user.id,
+                            actor_name=self.user.username)
+        self.queryset = self.queryset.filter(project_id=self.project.id)
+        self.filtered_queryset = self.filtered_queryset.filter(project_id=self.project.id)
+
+    def test_get_logs_not_backfilled(self):
+        ids = list(self.filtered_queryset.values_list('id', flat=True))
+        ActivityLog.objects.update(project_id=None)
+        resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['count'] == len(ids)
+        assert [d['id'] for d in resp.data['results']] == ids
+
     def test_get_non_existing_project(self):
         resp = self.auth_client.get('/{}/activitylogs/foo/bar/')
         assert resp.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,76 @@
+import gzip
+import json
+import os
+
+from datetime import datetime
+
+from django.test import RequestFactory, TestCase
+
+from api.utils.export import (
+    CSV,
+    NDJSON,
+    get_export_format,
+    get_export_response,
+    iter_csv,
+    iter_gzip,
+    iter_ndjson
+)
+
+
+class TestExport(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+
+    @staticmethod
+    def get_rows(count):
+        for i in range(count):
+            yield {'id': i, 'values': {'loss': i / 10}, 'created_at': datetime(2019, 3, 8)}
+
+    def test_get_export_format(self):
+        assert get_export_format({}) == NDJSON
+        assert get_export_format({'output': 'csv'}) == CSV
+        with self.assertRaises(ValueError):
+            get_export_format({'output': 'xml'})
+
+    def test_iter_ndjson(self):
+        lines = b''.join(iter_ndjson(self.get_rows(3))).decode().splitlines()
+        assert len(lines) == 3
+        assert json.loads(lines[1])['values'] == {'loss': 0.1}
+
+    def test_iter_csv(self):
+        lines = b''.join(iter_csv(self.get_rows(2), fields=['id', 'created_at', 'values',
+                                                            'foo'])).decode().splitlines()
+        assert lines == ['id,created_at,values,foo',
+                         '0,2019-03-08T00:00:00,"{""loss"": 0.0}",',
+                         '1,2019-03-08T00:00:00,"{""loss"": 0.1}",']
+
+    def test_iter_gzip_is_incremental(self):
+        content = [os.urandom(1024) for _ in range(1024)]
+        chunks = list(iter_gzip(iter(content), level=1))
+        # The compressor writes its output while consuming the input
+        assert len(chunks) > 10
+        assert gzip.decompress(b''.join(chunks)) == b''.join(content)
+
+    def test_get_export_response(self):
+        request = self.factory.get('/')
+        response = get_export_response(request=request,
+                                       rows=self.get_rows(3),
+                                       export_format=CSV,
+                                       fields=['id'],
+                                       filename='metrics')
+        assert response.streaming
+        assert response['Content-Type'] == 'text/csv'
+        assert response['Content-Disposition'] == 'attachment; filename=metrics.csv'
+        assert not response.has_header('Content-Encoding')
+        assert b''.join(response.streaming_content) == b'id\r\n0\r\n1\r\n2\r\n'
+
+        request = self.factory.get('/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        response = get_export_response(request=request,
+                                       rows=self.get_rows(3),
+                                       export_format=NDJSON,
+                                       fields=[],
+                                       filename='metrics')
+        assert response['Content-Encoding'] == 'gzip'
+        content = gzip.decompress(b''.join(response.streaming_content)).decode()
+        assert len(content.splitlines()) == 3
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+
+from django.db.models import Q
+from django.test import RequestFactory, TestCase
+
+from api.paginator import KeysetPagination
+from db.models.experiments import Experiment
+
+
+class TestKeysetPagination(TestCase):
+    def setUp(self):
+        self.paginator = KeysetPagination()
+
+    def test_get_ordering(self):
+        get_ordering = self.paginator.get_ordering
+        assert get_ordering(Experiment.objects.order_by('-updated_at')) == ['-updated_at', '-id']
+        assert get_ordering(Experiment.objects.order_by('created_at', '-updated_at')) == [
+            'created_at', '-updated_at', 'id']
+        assert get_ordering(Experiment.objects.order_by('name', '-pk', 'created_at')) == [
+            'name', '-id']
+        assert get_ordering(Experiment.objects.order_by()) == ['-id']
+
+    def test_get_position_filter(self):
+        queryset = Experiment.objects.all()
+        self.paginator.ordering = ['-updated_at', '-id']
+        assert self.paginator.get_position_filter(queryset, ['2019-01-01', 10]) == (
+            Q(updated_at__lt='2019-01-01') | (Q(updated_at='2019-01-01') & Q(id__lt=10)))
+
+        # Nulls are last in ascending order and first in descending order
+        self.paginator.ordering = ['started_at', 'id']
+        assert self.paginator.get_position_filter(queryset, ['2019-01-01', 10]) == (
+            (Q(started_at__gt='2019-01-01') | Q(started_at__isnull=True)) |
+            (Q(started_at='2019-01-01') & Q(id__gt=10)))
+        assert self.paginator.get_position_filter(queryset, [None, 10]) == (
+            Q(started_at__isnull=True) & Q(id__gt=10))
+
+        self.paginator.ordering = ['-started_at', '-id']
+        assert self.paginator.get_position_filter(queryset, [None, 10]) == (
+            Q(started_at__isnull=False) | (Q(started_at__isnull=True) & Q(id__lt=10)))
+
+    def test_cursor(self):
+        self.paginator.ordering = ['-updated_at', 'loss', '-id']
+        position = [datetime(2019, 1, 1, 10, 0, 0, 123456), 0.1, 10]
+        cursor = self.paginator.encode_cursor(position)
+        request = Request(RequestFactory().get('/', {'cursor': cursor}))
+        assert self.paginator.decode_cursor(request) == [
+            '2019-01-01T10:00:00.123456', 0.1, 10]
+
+        request = Request(RequestFactory().get('/', {'cursor': ''}))
+        assert self.paginator.decode_cursor(request) is None
+
+        for cursor in ['foo', self.paginator.encode_cursor([1, 2])]:
+            request = Request(RequestFactory().get('/', {'cursor': cursor}))
+            with self.assertRaises(NotFound):
+                self.paginator.decode_cursor(request)
@@ -0,0 +1,91 @@
+import pytest
+
+from rest_framework import status
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.utils.views.bookmarks_mixin import annotate_bookmarked
+from constants.urls import API_V1
+from db.models.bookmarks import Bookmark
+from db.models.experiments import Experiment
+from db.models.jobs import Job
+from db.models.projects import Project
+from factories.factory_projects import ProjectFactory
+from factories.factory_users import UserFactory
+from factories.fixtures import job_spec_parsed_content
+from tests.utils import BaseTest, BaseViewTest
+
+
+@pytest.mark.bookmarks_mark
+class TestAnnotateBookmarked(BaseTest):
+    def test_annotate_bookmarked(self):
+        user = UserFactory()
+        projects = [ProjectFactory() for _ in range(3)]
+        Bookmark.objects.create(user=user, content_object=projects[0])
+        Bookmark.objects.create(user=user, content_object=projects[1], enabled=False)
+        Bookmark.objects.create(user=UserFactory(), content_object=projects[2])
+
+        queryset = annotate_bookmarked(queryset=Project.objects.order_by('id'),
+                                       user=user,
+                                       model_name='project')
+        with self.assertNumQueries(1):
+            assert [p.bookmarked for p in queryset] == [True, False, False]
+
+
+@pytest.mark.bookmarks_mark
+class TestBookmarkedListViews(BaseViewTest):
+    HAS_AUTH = True
+    num_objects = 1000
+
+    def setUp(self):
+        super().setUp()
+        self.project = ProjectFactory(user=self.auth_client.user)
+
+    def get_url(self, entity):
+        return '/{}/{}/{}/{}/'.format(API_V1,
+                                      self.project.user.username,
+                                      self.project.name,
+                                      entity)
+
+    def bookmark(self, objects):
+        content_type = ContentType.objects.get_for_model(objects[0])
+        Bookmark.objects.bulk_create([
+            Bookmark(user=self.auth_client.user, content_type=content_type, object_id=obj.id)
+            for obj in objects])
+
+    def get_list(self, url, limit):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.auth_client.get('{}?limit={}'.format(url, limit))
+        assert resp.status_code == status.HTTP_200_OK
+        assert len(resp.data['results']) == limit
+        bookmarks_queries = [q for q in queries.captured_queries if 'db_bookmark' in q['sql']]
+        # The bookmarks are part of the list query
+        assert len(bookmarks_queries) == 1
+        return resp.data['results'], len(queries.captured_queries)
+
+    def test_experiments_list(self):
+        Experiment.objects.bulk_create([
+            Experiment(project=self.project, user=self.project.user, name='exp{}'.format(i))
+            for i in range(self.num_objects)])
+        experiments = list(Experiment.objects.filter(project=self.project))
+        self.bookmark(experiments[::2])
+        url = self.get_url('experiments')
+
+        _, num_queries = self.get_list(url, limit=10)
+        results, num_queries_1000 = self.get_list(url, limit=self.num_objects)
+        assert num_queries_1000 == num_queries
+        assert len([1 for obj in results if obj['bookmarked'] is True]) == self.num_objects / 2
+
+    def test_jobs_list(self):
+        Job.objects.bulk_create([
+            Job(project=self.project,
+                user=self.project.user,
+                config=job_spec_parsed_content.parsed_data)
+            for _ in range(self.num_objects)])
+        jobs = list(Job.objects.filter(project=self.project))
+        self.bookmark(jobs[::4])
+
+        results, _ = self.get_list(self.get_url('jobs'), limit=self.num_objects)
+        assert len([1 for obj in results if obj['bookmarked'] is True]) == self.num_objects / 4
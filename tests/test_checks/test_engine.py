@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+
+from checks.base import Check
+from checks.engine import HealthCheckEngine
+from checks.results import Result
+from tests.utils import BaseTest
+
+
+class FastCheck(Check):
+    NAME = 'FAST'
+    calls = 0
+
+    @classmethod
+    def run(cls):
+        cls.calls += 1
+        return {cls.NAME: Result()}
+
+
+class SlowCheck(Check):
+    NAME = 'SLOW'
+    TIMEOUT = 0.1
+
+    @classmethod
+    def run(cls):
+        time.sleep(1)
+        return {cls.NAME: Result()}
+
+
+class HangingCheck(Check):
+    NAME = 'HANGING'
+    TIMEOUT = 0.1
+    calls = 0
+    release = threading.Event()
+
+    @classmethod
+    def run(cls):
+        cls.calls += 1
+        cls.release.wait()
+        return {cls.NAME: Result()}
+
+
+class FailingCheck(Check):
+    NAME = 'FAILING'
+
+    @classmethod
+    def run(cls):
+        raise ValueError('Boom')
+
+
+@pytest.mark.checks_mark
+class TestHealthCheckEngine(BaseTest):
+    def setUp(self):
+        super().setUp()
+        FastCheck.calls = 0
+        HangingCheck.calls = 0
+        HangingCheck.release.clear()
+
+    def test_runs_checks_concurrently_with_timeouts(self):
+        engine = HealthCheckEngine(checks=[SlowCheck, FastCheck, FailingCheck], timeout=2, ttl=0)
+        start = time.monotonic()
+        results = engine.run()
+        assert time.monotonic() - start < 1
+
+        assert results['FAST'].is_healthy is True
+        assert results['SLOW'].is_error is True
+        assert 'timed out' in results['SLOW'].message
+        assert results['FAILING'].is_error is True
+
+    def test_results_are_cached_for_ttl(self):
+        engine = HealthCheckEngine(checks=[FastCheck], timeout=1, ttl=60)
+        engine.run()
+        engine.run()
+        assert FastCheck.calls == 1
+
+        engine.run(force=True)
+        assert FastCheck.calls == 2
+
+        engine = HealthCheckEngine(checks=[FastCheck], timeout=1, ttl=0)
+        engine.run()
+        engine.run()
+        assert FastCheck.calls == 4
+
+    def test_latency_histories(self):
+        engine = HealthCheckEngine(checks=[FastCheck, FailingCheck], timeout=1, ttl=0,
+                                   history_size=2)
+        for _ in range(3):
+            engine.run()
+
+        latencies = engine.get_latencies()
+        assert set(latencies.keys()) == {'FAST', 'FAILING'}
+        assert len(latencies['FAST']) == 2
+        assert engine.get_latencies('FAST') == {'FAST': latencies['FAST']}
+
+    def test_concurrent_callers_share_one_run(self):
+        engine = HealthCheckEngine(checks=[FastCheck, SlowCheck], timeout=1, ttl=60)
+        threads = [threading.Thread(target=engine.run) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert FastCheck.calls == 1
+
+    def test_hung_checks_are_not_restarted(self):
+        engine = HealthCheckEngine(checks=[HangingCheck, FastCheck], timeout=1, ttl=0)
+        try:
+            for _ in range(3):
+                results = engine.run()
+                assert results['HANGING'].is_error is True
+                assert results['FAST'].is_healthy is True
+            assert HangingCheck.calls == 1
+        finally:
+            HangingCheck.release.set()
+
+        # Once the check returns it is run again
+        time.sleep(0.1)
+        assert engine.run()['HANGING'].is_healthy is True
+        assert HangingCheck.calls == 2
@@ -0,0 +1,164 @@
+from unittest.mock import patch
+
+import pytest
+
+from redis import RedisError
+from rest_framework import status
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from constants import content_types
+from constants.experiments import ExperimentLifeCycle
+from constants.urls import API_V1
+from db.etags import get_version, increment_version
+from db.models.bookmarks import Bookmark
+from db.redis.etags import RedisEtagVersions
+from factories.factory_experiment_groups import ExperimentGroupFactory
+from factories.factory_experiments import (
+    ExperimentFactory,
+    ExperimentJobFactory,
+    ExperimentStatusFactory
+)
+from factories.factory_projects import ProjectFactory
+from metrics.ingestion import ingest_metrics
+from tests.utils import BaseTest, BaseViewTest
+
+
+@pytest.mark.etags_mark
+class TestEtagVersions(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.group = ExperimentGroupFactory()
+        self.experiment = ExperimentFactory(project=self.group.project,
+                                            experiment_group=self.group)
+
+    def get_experiment_version(self):
+        return get_version(entity=content_types.EXPERIMENT, entity_id=self.experiment.id)
+
+    def get_group_version(self):
+        return get_version(entity=content_types.EXPERIMENT_GROUP, entity_id=self.group.id)
+
+    def test_versions_are_seeded(self):
+        entity_id = self.experiment.id
+        RedisEtagVersions.connection().delete(RedisEtagVersions(entity='test',
+                                                                entity_id=entity_id).key)
+        version = get_version(entity='test', entity_id=entity_id)
+        assert version > 1
+        assert get_version(entity='test', entity_id=entity_id) == version
+        increment_version(entity='test', entity_id=entity_id)
+        assert get_version(entity='test', entity_id=entity_id) > version
+
+    def test_redis_errors(self):
+        with patch.object(RedisEtagVersions, 'get_version', side_effect=RedisError):
+            assert self.get_experiment_version() is None
+        with patch.object(RedisEtagVersions, 'increment', side_effect=RedisError):
+            increment_version(entity=content_types.EXPERIMENT, entity_id=self.experiment.id)
+
+    def test_experiment_changes(self):
+        version = self.get_experiment_version()
+        group_version = self.get_group_version()
+        self.experiment.description = 'new description'
+        self.experiment.save()
+        assert self.get_experiment_version() > version
+        assert self.get_group_version() > group_version
+
+        version = self.get_experiment_version()
+        ExperimentJobFactory(experiment=self.experiment)
+        assert self.get_experiment_version() > version
+
+    def test_group_changes(self):
+        group_version = self.get_group_version()
+        self.group.description = 'new description'
+        self.group.save()
+        assert self.get_group_version() > group_version
+
+    def test_new_metrics(self):
+        version = self.get_experiment_version()
+        ingest_metrics(experiment=self.experiment, metrics=[{'values': {'loss': 0.1}}])
+        assert self.get_experiment_version() > version
+
+    def test_bookmarks(self):
+        version = self.get_experiment_version()
+        bookmark = Bookmark.objects.create(user=self.experiment.user,
+                                           content_object=self.experiment)
+        assert self.get_experiment_version() > version
+
+        version = self.get_experiment_version()
+        bookmark.delete()
+        assert self.get_experiment_version() > version
+
+
+@pytest.mark.etags_mark
+class TestEtagViews(BaseViewTest):
+    HAS_AUTH = True
+
+    def setUp(self):
+        super().setUp()
+        self.project = ProjectFactory(user=self.auth_client.user)
+        self.experiment = ExperimentFactory(project=self.project)
+        self.url = '/{}/{}/{}/experiments/{}/'.format(API_V1,
+                                                      self.project.user.username,
+                                                      self.project.name,
+                                                      self.experiment.id)
+
+    def get(self, url, etag=None):
+        with CaptureQueriesContext(connection) as queries:
+            if etag:
+                resp = self.auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+            else:
+                resp = self.auth_client.get(url)
+        return resp, len(queries.captured_queries)
+
+    def test_experiment_detail(self):
+        resp, num_queries = self.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+        etag = resp['ETag']
+
+        resp, num_queries_304 = self.get(self.url, etag=etag)
+        assert resp.status_code == status.HTTP_304_NOT_MODIFIED
+        assert resp['ETag'] == etag
+        assert not resp.content
+        assert num_queries_304 < num_queries
+
+        # Other etags
+        resp, _ = self.get(self.url, etag='"foo"')
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp['ETag'] == etag
+
+        ExperimentStatusFactory(experiment=self.experiment, status=ExperimentLifeCycle.RUNNING)
+        resp, _ = self.get(self.url, etag=etag)
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp['ETag'] != etag
+
+    def test_statuses_and_metrics(self):
+        for url in ['{}statuses/'.format(self.url), '{}metrics/'.format(self.url)]:
+            resp, _ = self.get(url)
+            assert resp.status_code == status.HTTP_200_OK
+            etag = resp['ETag']
+            assert self.get(url, etag=etag)[0].status_code == status.HTTP_304_NOT_MODIFIED
+
+            ingest_metrics(experiment=self.experiment, metrics=[{'values': {'loss': 0.1}}])
+            assert self.get(url, etag=etag)[0].status_code == status.HTTP_200_OK
+
+    def test_etags_depend_on_the_path(self):
+        etag = self.get(self.url)[0]['ETag']
+        assert self.get('{}statuses/'.format(self.url))[0]['ETag'] != etag
+
+    def test_no_etag_without_redis(self):
+        with patch.object(RedisEtagVersions, 'get_version', side_effect=RedisError):
+            resp, _ = self.get(self.url, etag='*')
+        assert resp.status_code == status.HTTP_200_OK
+        assert not resp.has_header('ETag')
+
+    def test_group_detail(self):
+        group = ExperimentGroupFactory(project=self.project)
+        url = '/{}/{}/{}/groups/{}/'.format(API_V1,
+                                            self.project.user.username,
+                                            self.project.name,
+                                            group.id)
+        etag = self.get(url)[0]['ETag']
+        assert self.get(url, etag=etag)[0].status_code == status.HTTP_304_NOT_MODIFIED
+
+        ExperimentFactory(project=self.project, experiment_group=group)
+        assert self.get(url, etag=etag)[0].status_code == status.HTTP_200_OK
@@ -189,6 +189,36 @@ class TestExperimentGroupModel(BaseTest):
 
         assert experiment_group.should_stop_early() is True
 
+    @patch('scheduler.tasks.experiment_groups.experiments_group_create.apply_async')
+    def test_experiments_without_summaries_use_the_last_metric(self, _):
+        experiment_group = ExperimentGroupFactory(
+            content=None,
+            hptuning={
+                'concurrency': 2,
+                'random_search': {'n_experiments': 10},
+                'early_stopping': [
+                    {'metric': 'precision',
+                     'value': 0.9,
+                     'optimization': 'maximize'}
+                ],
+                'matrix': {'lr': {'values': [1, 2, 3]}}
+            })
+        # Experiments that reported their metrics before the summaries were maintained
+        experiment1 = ExperimentFactory(experiment_group=experiment_group,
+                                        last_metric={'precision': 0.8})
+        experiment2 = ExperimentFactory(experiment_group=experiment_group,
+                                        last_metric={'precision': 0.7})
+        assert experiment1.metric_summaries.count() == 0
+        assert dict(experiment_group.get_experiments_metrics(metric='precision')) == {
+            experiment1.id: 0.8, experiment2.id: 0.7}
+        assert experiment_group.should_stop_early() is False
+
+        # The summaries take precedence once they exist
+        ExperimentMetric.objects.create(experiment=experiment2, values={'precision': 0.95})
+        assert dict(experiment_group.get_experiments_metrics(metric='precision')) == {
+            experiment1.id: 0.8, experiment2.id: 0.95}
+        assert experiment_group.should_stop_early() is True
+
     @patch('scheduler.tasks.experiment_groups.experiments_group_create.apply_async')
     def test_get_ordered_experiments_by_metric(self, _):
         experiment_group = ExperimentGroupFactory()
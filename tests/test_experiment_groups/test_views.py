@@ -12,6 +12,7 @@ from api.experiment_groups.serializers import (
     ExperimentGroupStatusSerializer
 )
 from api.experiments.serializers import ExperimentMetricSerializer
+from api.paginator import SmallLimitOffsetPagination
 from constants.experiment_groups import ExperimentGroupLifeCycle
 from constants.experiments import ExperimentLifeCycle
 from constants.jobs import JobLifeCycle
@@ -958,3 +959,109 @@ class TestExperimentGroupMetricListViewV1(BaseViewTest):
         data = resp.data['results']
         assert len(data) == 1
         assert data == self.serializer_class(self.group_queryset[limit:], many=True).data
+
+
+@pytest.mark.experiment_groups_mark
+class TestExperimentGroupMetricSeriesViewV1(BaseViewTest):
+    HAS_AUTH = True
+
+    def setUp(self):
+        super().setUp()
+        project = ProjectFactory(user=self.auth_client.user)
+        self.group = ExperimentGroupFactory(project=project)
+        self.experiment1 = ExperimentFactory(project=project, experiment_group=self.group)
+        self.experiment2 = ExperimentFactory(project=project, experiment_group=self.group)
+        self.experiment3 = ExperimentFactory(project=project)
+        for experiment in [self.experiment1, self.experiment2, self.experiment3]:
+            for i in range(20):
+                ExperimentMetricFactory(experiment=experiment,
+                                        values={'step': i, 'loss': 1. / (i + 1)})
+        self.url = '/{}/{}/{}/groups/{}/metrics/series/'.format(API_V1,
+                                                                project.user.username,
+                                                                project.name,
+                                                                self.group.id)
+
+    def test_get(self):
+        resp = self.auth_client.get(self.url + '?names=loss&max_points=5')
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['count'] == 2
+        results = resp.data['results']
+        assert [r['id'] for r in results] == [self.experiment1.id, self.experiment2.id]
+        assert len(results[0]['series']['loss']['steps']) == 5
+
+    def test_pagination(self):
+        resp = self.auth_client.get(self.url + '?limit=1')
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['next'] is not None
+        assert [r['id'] for r in resp.data['results']] == [self.experiment1.id]
+
+        resp = self.auth_client.get(resp.data['next'])
+        assert [r['id'] for r in resp.data['results']] == [self.experiment2.id]
+
+    def test_pagination_is_bounded(self):
+        with patch.object(SmallLimitOffsetPagination, 'max_limit', 1):
+            resp = self.auth_client.get(self.url + '?limit=300000')
+        assert resp.status_code == status.HTTP_200_OK
+        assert [r['id'] for r in resp.data['results']] == [self.experiment1.id]
+
+    def test_get_invalid_params(self):
+        resp = self.auth_client.get(self.url + '?max_points=1')
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.experiment_groups_mark
+class TestExperimentGroupMetricAggregationViewV1(BaseViewTest):
+    HAS_AUTH = True
+
+    def setUp(self):
+        super().setUp()
+        project = ProjectFactory(user=self.auth_client.user)
+        self.group = ExperimentGroupFactory(project=project)
+        self.experiment1 = ExperimentFactory(project=project, experiment_group=self.group)
+        self.experiment2 = ExperimentFactory(project=project, experiment_group=self.group)
+        self.experiment3 = ExperimentFactory(project=project)
+        for index, experiment in enumerate([self.experiment1,
+                                            self.experiment2,
+                                            self.experiment3]):
+            for i in range(5):
+                ExperimentMetricFactory(experiment=experiment,
+                                        values={'step': i, 'loss': (index + 1) * (5 - i)})
+        self.url = '/{}/{}/{}/groups/{}/metrics/aggregate/'.format(API_V1,
+                                                                   project.user.username,
+                                                                   project.name,
+                                                                   self.group.id)
+
+    def test_get(self):
+        resp = self.auth_client.get(self.url + '?names=loss')
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['count'] == 2
+        results = resp.data['results']
+        assert [r['id'] for r in results] == [self.experiment1.id, self.experiment2.id]
+        assert results[0]['metrics']['loss']['final'] == 1
+        assert results[0]['metrics']['loss']['best'] == 1
+        assert results[1]['metrics']['loss']['mean'] == 6
+
+        assert 'bands' not in resp.data
+
+        resp = self.auth_client.get(self.url + '?names=loss&optimization=maximize&bands=true')
+        assert resp.data['results'][1]['metrics']['loss']['best'] == 10
+
+        bands = resp.data['bands']['loss']
+        assert bands['steps'] == [0, 1, 2, 3, 4]
+        assert bands['count'] == [2, 2, 2, 2, 2]
+        assert bands['p50'] == [7.5, 6., 4.5, 3., 1.5]
+
+    def test_pagination(self):
+        resp = self.auth_client.get(self.url + '?limit=1&bands=true')
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['next'] is not None
+        assert [r['id'] for r in resp.data['results']] == [self.experiment1.id]
+        # Bands are computed across the group
+        assert resp.data['bands']['loss']['count'] == [2, 2, 2, 2, 2]
+
+    def test_get_invalid_params(self):
+        resp = self.auth_client.get(self.url + '?optimization=foo')
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+        resp = self.auth_client.get(self.url + '?bands=foo')
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,116 @@
+from unittest.mock import patch
+
+import pytest
+
+from django.db import connection
+from django.test import override_settings
+
+from constants.experiments import ExperimentLifeCycle
+from constants.jobs import JobLifeCycle
+from db.models.experiments import ExperimentStatus
+from event_manager.events.experiment import EXPERIMENT_DONE
+from event_manager.events.experiment_job import EXPERIMENT_JOB_NEW_STATUS
+from factories.factory_experiment_groups import ExperimentGroupFactory
+from factories.factory_experiments import ExperimentFactory, ExperimentJobFactory
+from polyaxon.settings import HPCeleryTasks, SchedulerCeleryTasks
+from signals.recompute import RecomputeScheduler, recompute_scheduler
+from tests.utils import BaseTest
+
+
+def run_on_commit():
+    callbacks = [func for _, func in connection.run_on_commit]
+    connection.run_on_commit = []
+    for func in callbacks:
+        func()
+
+
+@pytest.mark.experiments_mark
+class TestRecomputeScheduler(BaseTest):
+    RUN_STATUSES_RECOMPUTE_ON_COLLECT = False
+
+    def setUp(self):
+        super().setUp()
+        self.experiment = ExperimentFactory()
+        self.jobs = [ExperimentJobFactory(experiment=self.experiment) for _ in range(3)]
+        run_on_commit()
+        recompute_scheduler.reset()
+
+    @patch('signals.recompute.celery_app.send_task')
+    @patch('signals.recompute.auditor.record')
+    def test_jobs_statuses_recompute_experiment_once_on_commit(self, auditor_record, send_task):
+        for job in self.jobs:
+            job.set_status(JobLifeCycle.RUNNING)
+
+        assert auditor_record.call_count == 0
+        assert send_task.call_count == 0
+
+        run_on_commit()
+
+        event_types = [call[1]['event_type'] for call in auditor_record.call_args_list]
+        assert event_types.count(EXPERIMENT_JOB_NEW_STATUS) == 3
+        assert send_task.call_count == 1
+        assert send_task.call_args[0][0] == SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUS
+        assert send_task.call_args[1]['kwargs'] == {'experiment_id': self.experiment.id}
+
+    @patch('signals.recompute.celery_app.send_task')
+    @patch('signals.recompute.auditor.record')
+    def test_done_experiments_recompute_group_once(self, auditor_record, send_task):
+        group = ExperimentGroupFactory()
+        experiments = [ExperimentFactory(experiment_group=group) for _ in range(2)]
+        run_on_commit()
+        auditor_record.reset_mock()
+        send_task.reset_mock()
+
+        for experiment in experiments:
+            experiment.set_status(ExperimentLifeCycle.FAILED)
+        run_on_commit()
+
+        event_types = [call[1]['event_type'] for call in auditor_record.call_args_list]
+        assert event_types.count(EXPERIMENT_DONE) == 2
+        assert send_task.call_count == 1
+        assert send_task.call_args[0][0] == HPCeleryTasks.HP_START
+        assert send_task.call_args[1]['kwargs'] == {'experiment_group_id': group.id}
+
+    @patch('signals.recompute.celery_app.send_task')
+    @patch('signals.recompute.auditor.record')
+    def test_rolled_back_batch_is_replaced(self, auditor_record, send_task):
+        scheduler = RecomputeScheduler()
+        scheduler.schedule_experiment(self.experiment.id)
+        # Simulate a rollback dropping the pending callbacks
+        connection.run_on_commit = []
+        scheduler.schedule_experiment(self.experiment.id + 1)
+        run_on_commit()
+
+        assert send_task.call_count == 1
+        assert send_task.call_args[1]['kwargs'] == {'experiment_id': self.experiment.id + 1}
+
+    @patch('signals.recompute.celery_app.send_task')
+    @patch('signals.recompute.auditor.record')
+    def test_done_experiments_are_not_recomputed(self, auditor_record, send_task):
+        self.jobs[0].set_status(JobLifeCycle.RUNNING)
+        ExperimentStatus.objects.create(experiment=self.experiment,
+                                        status=ExperimentLifeCycle.FAILED)
+        run_on_commit()
+
+        assert SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUS not in [
+            call[0][0] for call in send_task.call_args_list]
+
+    @patch('signals.recompute.celery_app.send_task')
+    @patch('signals.recompute.auditor.record')
+    def test_events_keep_the_state_of_each_transition(self, auditor_record, send_task):
+        self.jobs[0].set_status(JobLifeCycle.SCHEDULED)
+        self.jobs[0].set_status(JobLifeCycle.RUNNING)
+        run_on_commit()
+
+        statuses = [call[1]['instance'].status_name for call in auditor_record.call_args_list
+                    if call[1]['event_type'] == EXPERIMENT_JOB_NEW_STATUS]
+        assert statuses == [JobLifeCycle.SCHEDULED, JobLifeCycle.RUNNING]
+
+    @override_settings(STATUSES_DEFERRED_RECOMPUTE=False)
+    @patch('signals.recompute.celery_app.send_task')
+    @patch('signals.recompute.auditor.record')
+    def test_disabled_records_immediately(self, auditor_record, send_task):
+        self.jobs[0].set_status(JobLifeCycle.RUNNING)
+
+        assert auditor_record.call_count == 1
+        assert send_task.call_count == 0
@@ -1,10 +1,17 @@
+import logging
+import time
+import tracemalloc
+
 from unittest.mock import patch
 
 import pytest
 
+from django.db.models import CharField, Value
+
 from api.experiments import queries
 from api.experiments.serializers import (
     BookmarkedExperimentSerializer,
+    BookmarkedExperimentValuesSerializer,
     ExperimentChartViewSerializer,
     ExperimentDeclarationsSerializer,
     ExperimentDetailSerializer,
@@ -12,19 +19,26 @@ from api.experiments.serializers import (
     ExperimentJobSerializer,
     ExperimentLastMetricSerializer,
     ExperimentSerializer,
-    ExperimentStatusSerializer
+    ExperimentStatusSerializer,
+    ExperimentValuesSerializer
 )
 from constants.experiments import ExperimentLifeCycle
+from db.backfills import backfill_unique_names
 from db.models.experiment_jobs import ExperimentJob
 from db.models.experiments import Experiment, ExperimentChartView, ExperimentStatus
+from factories.factory_build_jobs import BuildJobFactory
+from factories.factory_experiment_groups import ExperimentGroupFactory
 from factories.factory_experiments import (
     ExperimentChartViewFactory,
     ExperimentFactory,
     ExperimentJobFactory,
     ExperimentStatusFactory
 )
+from factories.factory_projects import ProjectFactory
 from schemas.specifications import ExperimentSpecification
-from tests.utils import BaseTest
+from tests.utils import BaseTest, benchmark
+
+_logger = logging.getLogger('polyaxon.tests.experiments')
 
 
 @pytest.mark.experiments_mark
@@ -218,6 +232,86 @@ class TestBookmarkedExperimentSerializer(TestExperimentSerializer):
             assert getattr(self.obj1, k) == v
 
 
+@pytest.mark.experiments_mark
+class TestExperimentValuesSerializer(BaseTest):
+    DISABLE_RUNNER = True
+    DISABLE_EXECUTOR = True
+
+    def setUp(self):
+        super().setUp()
+        self.project = ProjectFactory()
+        with patch('scheduler.tasks.experiment_groups.'
+                   'experiments_group_create.apply_async'):
+            group = ExperimentGroupFactory(project=self.project)
+        build_job = BuildJobFactory(project=self.project)
+        self.obj1 = ExperimentFactory(project=self.project, tags=['foo'])
+        self.obj2 = ExperimentFactory(project=self.project,
+                                      experiment_group=group,
+                                      build_job=build_job,
+                                      last_metric={'loss': 0.1})
+        ExperimentFactory(project=self.project,
+                          original_experiment=self.obj2,
+                          declarations={'lr': 0.1})
+        ExperimentFactory(project=self.project, original_experiment=self.obj1)
+        self.queryset = queries.experiments.filter(project=self.project).order_by('id')
+
+    def test_serialize_like_the_model_serializer(self):
+        rows = queries.get_experiments_values(self.queryset)
+        assert all(isinstance(row, dict) for row in rows)
+        assert ExperimentValuesSerializer(rows, many=True).data == ExperimentSerializer(
+            self.queryset, many=True).data
+
+        data = BookmarkedExperimentValuesSerializer(rows, many=True,
+                                                    context={'bookmarks': [self.obj1.id]}).data
+        assert data == BookmarkedExperimentSerializer(self.queryset, many=True,
+                                                      context={'bookmarks': [self.obj1.id]}).data
+        assert [d['bookmarked'] for d in data] == [True, False, False, False]
+
+    def test_values_keep_the_filters_annotations(self):
+        queryset = self.queryset.annotate(foo=Value('bar', CharField()))
+        rows = list(queries.get_experiments_values(queryset))
+        assert rows[0]['foo'] == 'bar'
+
+    @benchmark
+    def test_benchmark_list_50k_experiments(self):
+        count = 50000
+        sample = 5000
+        Experiment.objects.bulk_create([
+            Experiment(project=self.project,
+                       user=self.project.user,
+                       name='exp{}'.format(i),
+                       tags=['tag{}'.format(i % 10)],
+                       declarations={'lr': i / count, 'optimizer': 'sgd'},
+                       last_metric={'loss': 1. / (i + 1), 'accuracy': i / count})
+            for i in range(count)], batch_size=5000)
+        backfill_unique_names(Experiment)
+        queryset = queries.experiments.filter(project=self.project).order_by('-updated_at')
+
+        def serialize_values(size):
+            rows = queries.get_experiments_values(queryset)[:size]
+            return ExperimentValuesSerializer(rows, many=True).data
+
+        def serialize_instances(size):
+            return ExperimentSerializer(queryset[:size], many=True).data
+
+        def measure(serialize, size):
+            start = time.monotonic()
+            assert len(serialize(size)) == size
+            rows_per_second = size / (time.monotonic() - start)
+            tracemalloc.start()
+            serialize(size)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return rows_per_second, peak
+
+        values_speed, values_peak = measure(serialize_values, count)
+        _logger.info('Values list: %.0f rows/s, %.1f MB peak for %s experiments',
+                     values_speed, values_peak / 2 ** 20, count)
+        instances_speed, instances_peak = measure(serialize_instances, sample)
+        _logger.info('Instances list: %.0f rows/s, %.1f MB peak for %s experiments',
+                     instances_speed, instances_peak / 2 ** 20, sample)
+
+
 @pytest.mark.experiments_mark
 class TestExperimentDetailSerializer(BaseTest):
     serializer_class = ExperimentDetailSerializer
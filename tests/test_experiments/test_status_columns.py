@@ -0,0 +1,69 @@
+import pytest
+
+from django.core.management import call_command
+
+from constants.experiment_groups import ExperimentGroupLifeCycle
+from constants.experiments import ExperimentLifeCycle
+from constants.jobs import JobLifeCycle
+from db.models.experiment_groups import ExperimentGroup
+from db.models.experiments import Experiment
+from db.models.jobs import Job
+from factories.factory_experiment_groups import ExperimentGroupFactory
+from factories.factory_experiments import ExperimentFactory
+from factories.factory_jobs import JobFactory
+from query.managers.experiment import ExperimentQueryManager
+from tests.utils import BaseTest
+
+
+@pytest.mark.experiments_mark
+class TestLastStatusColumns(BaseTest):
+    def test_new_status_sets_columns(self):
+        experiment = ExperimentFactory()
+        experiment.set_status(ExperimentLifeCycle.SCHEDULED)
+        experiment.refresh_from_db()
+        assert experiment.status_name == ExperimentLifeCycle.SCHEDULED
+        assert experiment.status_at == experiment.status.created_at
+        assert experiment.last_status == ExperimentLifeCycle.SCHEDULED
+
+        job = JobFactory()
+        job.set_status(JobLifeCycle.SCHEDULED)
+        job.refresh_from_db()
+        assert job.status_name == JobLifeCycle.SCHEDULED
+        assert job.status_at == job.status.created_at
+
+        group = ExperimentGroupFactory()
+        group.set_status(ExperimentGroupLifeCycle.RUNNING)
+        group.refresh_from_db()
+        assert group.status_name == ExperimentGroupLifeCycle.RUNNING
+
+    def test_query_manager_filters_on_column(self):
+        experiment1 = ExperimentFactory()
+        experiment1.set_status(ExperimentLifeCycle.SCHEDULED)
+        experiment2 = ExperimentFactory()
+        experiment2.set_status(ExperimentLifeCycle.FAILED)
+
+        queryset = ExperimentQueryManager.apply(query_spec='status:scheduled|running',
+                                                queryset=Experiment.objects)
+        assert 'JOIN' not in str(queryset.query)
+        assert list(queryset) == [experiment1]
+
+    def test_backfill_command(self):
+        experiment = ExperimentFactory()
+        experiment.set_status(ExperimentLifeCycle.SCHEDULED)
+        job = JobFactory()
+        job.set_status(JobLifeCycle.SCHEDULED)
+        group = ExperimentGroupFactory()
+        group.set_status(ExperimentGroupLifeCycle.RUNNING)
+        Experiment.objects.update(status_name=None, status_at=None)
+        Job.objects.update(status_name=None, status_at=None)
+        ExperimentGroup.objects.update(status_name=None, status_at=None)
+
+        call_command('backfill_statuses', chunk_size=1)
+
+        experiment.refresh_from_db()
+        assert experiment.status_name == ExperimentLifeCycle.SCHEDULED
+        assert experiment.status_at == experiment.status.created_at
+        job.refresh_from_db()
+        assert job.status_name == JobLifeCycle.SCHEDULED
+        group.refresh_from_db()
+        assert group.status_name == ExperimentGroupLifeCycle.RUNNING
@@ -0,0 +1,138 @@
+from unittest.mock import patch
+
+import pytest
+
+from api.experiment_groups.serializers import ExperimentGroupDetailSerializer
+from api.projects.serializers import ProjectDetailSerializer
+from constants.experiments import ExperimentLifeCycle
+from crons.tasks.experiments_statuses import experiments_reconcile_counters
+from db.counters import get_experiments_counts, reconcile_experiments_counters
+from db.models.experiment_groups import GroupTypes
+from db.models.experiments import Experiment, ExperimentStatusCounter
+from factories.factory_experiment_groups import ExperimentGroupFactory
+from factories.factory_experiments import ExperimentFactory
+from factories.factory_projects import ProjectFactory
+from tests.utils import BaseTest
+
+
+@pytest.mark.experiments_mark
+class TestExperimentStatusCounters(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.project = ProjectFactory()
+        with patch('scheduler.tasks.experiment_groups.experiments_group_create.apply_async'):
+            self.group = ExperimentGroupFactory(project=self.project)
+        self.experiments = [ExperimentFactory(project=self.project, experiment_group=self.group)
+                            for _ in range(2)]
+        self.independent_experiment = ExperimentFactory(project=self.project)
+
+    def test_new_experiments_are_counted(self):
+        assert get_experiments_counts(project_id=self.project.id) == {
+            ExperimentLifeCycle.CREATED: 3}
+        assert get_experiments_counts(project_id=self.project.id,
+                                      experiment_group_id=self.group.id) == {
+            ExperimentLifeCycle.CREATED: 2}
+        assert get_experiments_counts(project_id=self.project.id, independent=True) == {
+            ExperimentLifeCycle.CREATED: 1}
+
+    def test_new_status_moves_the_counters(self):
+        self.experiments[0].set_status(ExperimentLifeCycle.SCHEDULED)
+        self.experiments[0].set_status(ExperimentLifeCycle.RUNNING)
+        assert get_experiments_counts(project_id=self.project.id,
+                                      experiment_group_id=self.group.id) == {
+            ExperimentLifeCycle.CREATED: 1,
+            ExperimentLifeCycle.RUNNING: 1}
+        assert self.group.count_experiments(statuses=ExperimentLifeCycle.RUNNING_STATUS) == 1
+        assert self.group.n_experiments_to_start == self.group.concurrency - 1
+
+    def test_stale_instance_moves_the_stored_status(self):
+        stale = Experiment.objects.get(id=self.experiments[0].id)
+        self.experiments[0].set_status(ExperimentLifeCycle.SCHEDULED)
+        stale.set_status(ExperimentLifeCycle.FAILED)
+        assert get_experiments_counts(project_id=self.project.id,
+                                      experiment_group_id=self.group.id) == {
+            ExperimentLifeCycle.CREATED: 1,
+            ExperimentLifeCycle.FAILED: 1}
+
+    def test_counters_are_updated_in_the_order_of_their_status(self):
+        with patch('db.counters.add_experiments_count') as mock_add:
+            self.experiments[0].set_status(ExperimentLifeCycle.SCHEDULED)
+            self.experiments[0].set_status(ExperimentLifeCycle.FAILED)
+        # The rows are locked in the same order whatever the direction of the move
+        assert [(call[1]['status'], call[1]['value']) for call in mock_add.call_args_list] == [
+            (ExperimentLifeCycle.CREATED, -1),
+            (ExperimentLifeCycle.SCHEDULED, 1),
+            (ExperimentLifeCycle.FAILED, 1),
+            (ExperimentLifeCycle.SCHEDULED, -1)]
+
+    def test_archive_and_restore(self):
+        self.experiments[0].archive()
+        assert get_experiments_counts(project_id=self.project.id,
+                                      experiment_group_id=self.group.id) == {
+            ExperimentLifeCycle.CREATED: 1}
+        # Archiving twice does not change the counters
+        self.experiments[0].archive()
+        assert self.group.count_experiments() == 1
+
+        self.experiments[0].unarchive()
+        assert self.group.count_experiments() == 2
+
+    def test_archive_group_and_project(self):
+        self.group.archive()
+        assert get_experiments_counts(project_id=self.project.id) == {
+            ExperimentLifeCycle.CREATED: 1}
+        self.group.unarchive()
+        assert get_experiments_counts(project_id=self.project.id) == {
+            ExperimentLifeCycle.CREATED: 3}
+
+        self.project.archive()
+        assert get_experiments_counts(project_id=self.project.id) == {}
+        self.project.unarchive()
+        assert get_experiments_counts(project_id=self.project.id) == {
+            ExperimentLifeCycle.CREATED: 3}
+
+    def test_delete(self):
+        self.independent_experiment.delete()
+        assert get_experiments_counts(project_id=self.project.id, independent=True) == {}
+        assert get_experiments_counts(project_id=self.project.id) == {
+            ExperimentLifeCycle.CREATED: 2}
+
+    def test_reconcile_fixes_the_drift(self):
+        ExperimentStatusCounter.objects.filter(experiment_group=self.group).update(count=5)
+        ExperimentStatusCounter.objects.create(project=self.project,
+                                               status=ExperimentLifeCycle.RUNNING,
+                                               count=2)
+        assert reconcile_experiments_counters(project_id=self.project.id) == 5
+        assert get_experiments_counts(project_id=self.project.id) == {
+            ExperimentLifeCycle.CREATED: 3}
+        assert reconcile_experiments_counters(project_id=self.project.id) == 0
+
+    def test_reconcile_task(self):
+        ExperimentStatusCounter.objects.all().delete()
+        with patch('db.counters.stats.incr') as mock_incr:
+            experiments_reconcile_counters()
+        assert mock_incr.call_args[0] == ('experiments.counters.drift', 3)
+        assert get_experiments_counts(project_id=self.project.id) == {
+            ExperimentLifeCycle.CREATED: 3}
+
+    def test_selection_counts_its_experiments(self):
+        selection = ExperimentGroupFactory(project=self.project,
+                                           group_type=GroupTypes.SELECTION,
+                                           content=None)
+        selection.selection_experiments.set(self.experiments[:1])
+        assert selection.get_experiments_counts() is None
+        assert selection.count_experiments() == 1
+        assert selection.count_experiments(statuses=[ExperimentLifeCycle.CREATED]) == 1
+
+    def test_serializers(self):
+        self.experiments[0].set_status(ExperimentLifeCycle.SCHEDULED)
+        self.experiments[1].set_status(ExperimentLifeCycle.FAILED)
+        data = ExperimentGroupDetailSerializer(self.group).data
+        assert data['num_experiments'] == 2
+        assert data['num_scheduled_experiments'] == 1
+        assert data['num_failed_experiments'] == 1
+        assert data['num_pending_experiments'] == 0
+
+        data = ProjectDetailSerializer(self.project).data
+        assert data['num_experiments'] == 3
+        assert data['num_independent_experiments'] == 1
@@ -0,0 +1,103 @@
+import pytest
+
+from api.experiments import queries
+from api.experiments.serializers import ExperimentSerializer, ExperimentValuesSerializer
+
+from django.core.management import call_command
+
+from db.models.experiment_groups import ExperimentGroup
+from db.models.experiments import Experiment
+from db.models.jobs import Job
+from factories.factory_experiment_groups import ExperimentGroupFactory
+from factories.factory_experiments import ExperimentFactory
+from factories.factory_jobs import JobFactory
+from factories.factory_projects import ProjectFactory
+from query.managers.experiment import ExperimentQueryManager
+from tests.utils import BaseTest
+
+
+@pytest.mark.experiments_mark
+class TestUniqueNameColumns(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.project = ProjectFactory()
+        self.group = ExperimentGroupFactory(project=self.project)
+        self.experiment = ExperimentFactory(project=self.project)
+        self.group_experiment = ExperimentFactory(project=self.project,
+                                                  experiment_group=self.group)
+        self.job = JobFactory(project=self.project)
+
+    def assert_unique_names(self, project_name):
+        self.group.refresh_from_db()
+        assert self.group.unique_name == '{}.{}'.format(project_name, self.group.id)
+        self.experiment.refresh_from_db()
+        assert self.experiment.unique_name == '{}.{}'.format(project_name, self.experiment.id)
+        self.group_experiment.refresh_from_db()
+        assert self.group_experiment.unique_name == '{}.{}.{}'.format(
+            project_name, self.group.id, self.group_experiment.id)
+        self.job.refresh_from_db()
+        assert self.job.unique_name == '{}.jobs.{}'.format(project_name, self.job.id)
+
+    def test_create_sets_columns(self):
+        assert self.experiment.unique_name == self.experiment.get_unique_name()
+        assert self.group_experiment.unique_name == self.group_experiment.get_unique_name()
+        assert self.group.unique_name == self.group.get_unique_name()
+        assert self.job.unique_name == self.job.get_unique_name()
+        self.assert_unique_names(self.project.unique_name)
+
+    def test_project_rename_updates_columns(self):
+        self.project.description = 'new description'
+        with self.assertNumQueries(2):
+            self.project.save()
+
+        self.project.name = 'renamed'
+        self.project.save()
+        self.assert_unique_names('{}.renamed'.format(self.project.user.username))
+
+        other_experiment = ExperimentFactory()
+        other_unique_name = other_experiment.unique_name
+        other_experiment.refresh_from_db()
+        assert other_experiment.unique_name == other_unique_name
+
+    def test_query_manager_filters_on_column(self):
+        queryset = ExperimentQueryManager.apply(
+            query_spec='unique_name:{}'.format(self.group_experiment.unique_name),
+            queryset=Experiment.objects)
+        assert 'JOIN' not in str(queryset.query)
+        assert list(queryset) == [self.group_experiment]
+
+    def test_backfill_command(self):
+        Experiment.objects.update(unique_name=None)
+        ExperimentGroup.objects.update(unique_name=None)
+        Job.objects.update(unique_name=None)
+
+        call_command('backfill_unique_names', chunk_size=1)
+
+        for model in (Experiment, ExperimentGroup, Job):
+            assert not model.objects.filter(unique_name__isnull=True).exists()
+        self.assert_unique_names(self.project.unique_name)
+
+    def test_empty_columns_fall_back_to_the_computed_names(self):
+        clone = ExperimentFactory(project=self.project, original_experiment=self.group_experiment)
+        Experiment.objects.update(unique_name=None)
+        ExperimentGroup.objects.update(unique_name=None)
+        Job.objects.update(unique_name=None)
+
+        self.assert_unique_names(self.project.unique_name)
+        bulk_experiment = Experiment.objects.bulk_create([
+            Experiment(project=self.project, user=self.project.user)])[0]
+        assert bulk_experiment.unique_name == bulk_experiment.get_unique_name()
+
+        queryset = queries.experiments.filter(project=self.project).order_by('id')
+        rows = queries.get_experiments_values(queryset)
+        data = ExperimentValuesSerializer(rows, many=True).data
+        assert data == ExperimentSerializer(queryset, many=True).data
+        assert data[1]['unique_name'] == self.group_experiment.get_unique_name()
+        assert data[1]['experiment_group'] == self.group.get_unique_name()
+        assert data[2]['original'] == self.group_experiment.get_unique_name()
+        assert data[2]['unique_name'] == clone.get_unique_name()
+
+        # The next save stores the name
+        self.experiment.save()
+        assert Experiment.objects.filter(id=self.experiment.id,
+                                         unique_name=self.experiment.get_unique_name()).exists()
@@ -1,4 +1,6 @@
 # pylint:disable=too-many-lines
+import gzip
+import json
 import os
 import time
 
@@ -10,6 +12,9 @@ import pytest
 from hestia.internal_services import InternalServices
 from rest_framework import status
 
+from django.contrib.postgres.fields.jsonb import KeyTransform
+from django.utils import timezone
+
 import conf
 import stores
 
@@ -45,6 +50,7 @@ from db.models.repos import CodeReference
 from db.redis.ephemeral_tokens import RedisEphemeralTokens
 from db.redis.group_check import GroupChecks
 from db.redis.heartbeat import RedisHeartBeat
+from db.redis.metrics_buffer import RedisMetricsBuffer
 from db.redis.tll import RedisTTL
 from factories.factory_code_reference import CodeReferenceFactory
 from factories.factory_experiment_groups import ExperimentGroupFactory
@@ -62,6 +68,7 @@ from factories.fixtures import (
     exec_experiment_outputs_refs_parsed_content,
     exec_experiment_spec_parsed_content
 )
+from metrics.buffer import flush_buffers
 from schemas.specifications import ExperimentSpecification
 from tests.utils import BaseFilesViewTest, BaseViewTest, EphemeralClient
 
@@ -230,6 +237,52 @@ class TestProjectExperimentListViewV1(BaseViewTest):
         assert len(data) == 1
         assert data == self.serializer_class(queryset[limit:], many=True).data
 
+    def get_cursor_pages(self, url):
+        results = []
+        while url:
+            resp = self.auth_client.get(url)
+            assert resp.status_code == status.HTTP_200_OK
+            assert len(resp.data['results']) <= 1
+            results += resp.data['results']
+            url = resp.data['next']
+        return results
+
+    def test_get_cursor_pagination(self):
+        resp = self.auth_client.get(self.url + '?cursor=&limit=2&count=true')
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['count'] == len(self.objects)
+        assert resp.data['next'] is not None
+        assert resp.data['results'] == self.serializer_class(
+            self.queryset.order_by('-updated_at', '-id')[:2], many=True).data
+
+        resp = self.auth_client.get(self.url + '?cursor=')
+        assert resp.data['count'] is None
+        assert resp.data['next'] is None
+
+        data = self.get_cursor_pages(self.url + '?cursor=&limit=1')
+        assert data == self.serializer_class(self.queryset.order_by('-updated_at', '-id'),
+                                             many=True).data
+
+        # Ties and nulls, e.g. experiments not started and without metrics
+        self.model_class.objects.filter(id=self.objects[0].id).update(
+            started_at=timezone.now(), last_metric={'loss': 0.5})
+        self.model_class.objects.filter(id=self.objects[1].id).update(last_metric={'loss': 0.1})
+        for sort in ['started_at', '-started_at', 'created_at,-updated_at']:
+            data = self.get_cursor_pages(self.url + '?cursor=&limit=1&sort={}'.format(sort))
+            tie_breaker = '-id' if sort[0] == '-' else 'id'
+            assert data == self.serializer_class(
+                self.queryset.order_by(*sort.split(','), tie_breaker), many=True).data
+
+        for sort in ['metric.loss', '-metric.loss']:
+            data = self.get_cursor_pages(self.url + '?cursor=&limit=1&sort={}'.format(sort))
+            loss = KeyTransform('loss', 'last_metric')
+            order = loss.desc() if sort[0] == '-' else loss.asc()
+            queryset = self.queryset.order_by(order, '-id' if sort[0] == '-' else 'id')
+            assert [obj['id'] for obj in data] == [obj.id for obj in queryset]
+
+        resp = self.auth_client.get(self.url + '?cursor=foo')
+        assert resp.status_code == status.HTTP_404_NOT_FOUND
+
     @pytest.mark.filterwarnings('ignore::RuntimeWarning')
     def test_get_filter(self):
         # Wrong filter raises
@@ -1459,6 +1512,23 @@ class TestExperimentMetricListViewV1(BaseViewTest):
         assert resp.status_code == status.HTTP_201_CREATED
         assert mock_fct.call_count == 1
 
+    def test_create_retried(self):
+        data = {'values': {'precision': 0.9, 'step': 10}}
+        resp = self.auth_client.post(self.url, data)
+        assert resp.status_code == status.HTTP_201_CREATED
+        assert resp.data['step'] == 10
+
+        # A retry of the same report returns the stored metric
+        retry = self.auth_client.post(self.url, data)
+        assert retry.status_code == status.HTTP_201_CREATED
+        assert retry.data['id'] == resp.data['id']
+        assert self.model_class.objects.count() == self.num_objects + 1
+
+        data = {'values': {'precision': 0.95, 'step': 10}}
+        resp = self.auth_client.post(self.url, data)
+        assert resp.status_code == status.HTTP_201_CREATED
+        assert self.model_class.objects.count() == self.num_objects + 2
+
     def test_create_internal(self):
         data = {}
         resp = self.internal_client.post(self.url, data)
@@ -1472,6 +1542,156 @@ class TestExperimentMetricListViewV1(BaseViewTest):
         assert last_object.experiment == self.experiment
         assert last_object.values == data['values']
 
+    def test_create_buffered(self):
+        RedisMetricsBuffer(experiment=self.experiment.id).clear()
+        with self.settings(METRICS_BUFFER_ENABLED=True):
+            resp = self.auth_client.post(self.url, {})
+            assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+            resp = self.auth_client.post(self.url, {'values': {'precision': 0.9, 'step': 1}})
+            assert resp.status_code == status.HTTP_201_CREATED
+            assert resp['X-Metrics-Backlog'] == '1'
+
+            resp = self.auth_client.post(self.url, [{'values': {'precision': 0.95, 'step': 2}},
+                                                    {'values': {'precision': 0.99, 'step': 3}}])
+            assert resp.status_code == status.HTTP_201_CREATED
+            assert resp['X-Metrics-Backlog'] == '3'
+
+        # Metrics are only written by the flusher
+        assert self.model_class.objects.count() == self.num_objects
+        assert flush_buffers() == 3
+        assert self.model_class.objects.count() == self.num_objects + 3
+        assert self.model_class.objects.last().values == {'precision': 0.99, 'step': 3}
+
+
+@pytest.mark.experiments_mark
+class TestExperimentMetricSeriesViewV1(BaseViewTest):
+    HAS_AUTH = True
+
+    def setUp(self):
+        super().setUp()
+        project = ProjectFactory(user=self.auth_client.user)
+        self.experiment = ExperimentFactory(project=project)
+        self.url = '/{}/{}/{}/experiments/{}/metrics/series/'.format(API_V1,
+                                                                     project.user.username,
+                                                                     project.name,
+                                                                     self.experiment.id)
+        for i in range(50):
+            ExperimentMetricFactory(experiment=self.experiment,
+                                    values={'step': i, 'loss': 1. / (i + 1), 'accuracy': i / 50})
+
+    def test_get(self):
+        resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+        assert set(resp.data.keys()) == {'loss', 'accuracy'}
+        assert resp.data['loss']['steps'] == list(range(50))
+
+        resp = self.auth_client.get(self.url + '?names=loss&max_points=10&end_step=19')
+        assert resp.status_code == status.HTTP_200_OK
+        assert set(resp.data.keys()) == {'loss'}
+        assert len(resp.data['loss']['steps']) == 10
+        assert resp.data['loss']['steps'][0] == 0
+        assert resp.data['loss']['steps'][-1] == 19
+
+        resp = self.auth_client.get(self.url + '?names=accuracy&max_points=5&method=buckets')
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['accuracy']['steps'] == [0, 10, 20, 30, 40]
+        assert resp.data['accuracy']['min'][1] == 10 / 50
+        assert resp.data['accuracy']['max'][1] == 19 / 50
+
+    def test_get_is_cached_until_new_points(self):
+        url = self.url + '?names=loss&max_points=10'
+        resp = self.auth_client.get(url)
+        assert resp.status_code == status.HTTP_200_OK
+
+        with patch('metrics.queries.downsample') as downsample:
+            resp = self.auth_client.get(url)
+        assert resp.status_code == status.HTTP_200_OK
+        assert downsample.call_count == 0
+
+        ExperimentMetricFactory(experiment=self.experiment, values={'step': 50, 'loss': 0.01})
+        resp = self.auth_client.get(url)
+        assert resp.data['loss']['steps'][-1] == 50
+
+    def test_get_invalid_params(self):
+        resp = self.auth_client.get(self.url + '?max_points=foo')
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+        resp = self.auth_client.get(self.url + '?method=foo')
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.experiments_mark
+class TestExperimentMetricExportViewV1(BaseViewTest):
+    HAS_AUTH = True
+
+    def setUp(self):
+        super().setUp()
+        project = ProjectFactory(user=self.auth_client.user)
+        self.experiment = ExperimentFactory(project=project)
+        self.url = '/{}/{}/{}/experiments/{}/metrics/export/'.format(API_V1,
+                                                                     project.user.username,
+                                                                     project.name,
+                                                                     self.experiment.id)
+        for i in range(20):
+            ExperimentMetricFactory(experiment=self.experiment, values={'step': i, 'loss': i})
+        ExperimentMetricFactory(experiment=self.experiment, values={'accuracy': 0.9})
+
+    def test_get_ndjson(self):
+        with patch('auditor.record') as auditor_record:
+            resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp['Content-Type'] == 'application/x-ndjson'
+        assert auditor_record.call_count == 1
+        rows = [json.loads(line) for line in
+                b''.join(resp.streaming_content).decode().splitlines()]
+        assert len(rows) == 21
+        assert rows[0]['values'] == {'step': 0, 'loss': 0}
+        assert rows[-1]['values'] == {'accuracy': 0.9}
+
+    def test_get_csv_gzipped(self):
+        resp = self.auth_client.get(self.url + '?output=csv', HTTP_ACCEPT_ENCODING='gzip')
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp['Content-Encoding'] == 'gzip'
+        lines = gzip.decompress(b''.join(resp.streaming_content)).decode().splitlines()
+        assert len(lines) == 22
+        assert lines[0] == 'id,created_at,accuracy,loss,step'
+        assert lines[-1].endswith(',0.9,,')
+
+    def test_get_invalid_output(self):
+        resp = self.auth_client.get(self.url + '?output=xml')
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.experiments_mark
+class TestProjectExperimentExportViewV1(BaseViewTest):
+    HAS_AUTH = True
+
+    def setUp(self):
+        super().setUp()
+        self.project = ProjectFactory(user=self.auth_client.user)
+        self.url = '/{}/{}/{}/experiments/export/'.format(API_V1,
+                                                          self.project.user.username,
+                                                          self.project.name)
+        for i in range(5):
+            ExperimentFactory(project=self.project,
+                              declarations={'lr': i, 'optimizer': 'sgd' if i % 2 else 'adam'})
+        # Experiments of other projects are not exported
+        ExperimentFactory()
+
+    def test_get(self):
+        resp = self.auth_client.get(self.url + '?sort=created_at')
+        assert resp.status_code == status.HTTP_200_OK
+        rows = [json.loads(line) for line in
+                b''.join(resp.streaming_content).decode().splitlines()]
+        assert [row['declarations']['lr'] for row in rows] == [0, 1, 2, 3, 4]
+
+        resp = self.auth_client.get(self.url + '?output=csv&query=declarations.optimizer:sgd')
+        assert resp.status_code == status.HTTP_200_OK
+        lines = b''.join(resp.streaming_content).decode().splitlines()
+        assert len(lines) == 3
+        assert lines[0].startswith('id,name,user__username,')
+
 
 @pytest.mark.experiments_mark
 class TestExperimentStatusDetailViewV1(BaseViewTest):
@@ -0,0 +1,148 @@
+import time
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from instrumentation import celery_signals
+from instrumentation.db_signals import QueryCounter, add_query_counter
+from instrumentation.middleware import ViewLatencyMiddleware
+from instrumentation.redis_client import InstrumentedStrictRedis
+from instrumentation.streams import WebsocketsGauge
+from stats.memory import InMemoryStatsBackend, StatsStore
+from streams.socket_manager import SocketManager
+from tests.utils import BaseTest
+
+
+class InstrumentationTest(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.backend = InMemoryStatsBackend(prefix='', stats_store=StatsStore())
+        patchers = [
+            patch('stats.incr', self.backend.incr),
+            patch('stats.timing', self.backend.timing),
+            patch('stats.gauge', self.backend.gauge),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+@pytest.mark.instrumentation_mark
+class TestViewLatencyMiddleware(InstrumentationTest):
+    def test_records_latency_by_view_method_and_status(self):
+        request = RequestFactory().get('/api/v1/projects')
+        request.resolver_match = MagicMock(view_name='v1:projects:project_list')
+        middleware = ViewLatencyMiddleware(lambda r: HttpResponse(status=201))
+
+        response = middleware(request)
+
+        assert response.status_code == 201
+        tags = ['view:v1:projects:project_list', 'method:GET', 'status:2xx']
+        assert self.backend.get_counter('api.requests', tags=tags) == 1
+        assert self.backend.get_timing('api.requests.latency', tags=tags).count == 1
+
+    def test_unresolved_requests(self):
+        request = RequestFactory().post('/foo')
+        middleware = ViewLatencyMiddleware(lambda r: HttpResponse(status=404))
+
+        middleware(request)
+
+        tags = ['view:unresolved', 'method:POST', 'status:4xx']
+        assert self.backend.get_counter('api.requests', tags=tags) == 1
+
+
+@pytest.mark.instrumentation_mark
+class TestCelerySignals(InstrumentationTest):
+    def test_task_lifecycle(self):
+        headers = {}
+        celery_signals.task_publish_handler(sender='foo', headers=headers)
+        assert celery_signals.PUBLISHED_AT_HEADER in headers
+        assert self.backend.get_counter('celery.tasks.published', tags=['task:foo']) == 1
+
+        task = MagicMock()
+        task.name = 'foo'
+        task.request = MagicMock(spec=[], headers={
+            celery_signals.PUBLISHED_AT_HEADER: time.time() - 1})
+        celery_signals.task_prerun_handler(task_id='1', task=task)
+        lag = self.backend.get_timing('celery.tasks.queue_lag', tags=['task:foo'])
+        assert lag.count == 1
+        assert lag.sum >= 1000
+
+        celery_signals.task_postrun_handler(task_id='1', task=task, state='SUCCESS')
+        tags = ['task:foo', 'state:SUCCESS']
+        assert self.backend.get_timing('celery.tasks.runtime', tags=tags).count == 1
+        assert self.backend.get_counter('celery.tasks.done', tags=tags) == 1
+
+        # Unknown task ids are ignored
+        celery_signals.task_postrun_handler(task_id='2', task=task, state='SUCCESS')
+        assert self.backend.get_counter('celery.tasks.done', tags=tags) == 1
+
+    def test_task_failure(self):
+        task = MagicMock()
+        task.name = 'foo'
+        celery_signals.task_failure_handler(sender=task)
+
+        assert self.backend.get_counter('celery.tasks.failures', tags=['task:foo']) == 1
+
+
+@pytest.mark.instrumentation_mark
+class TestQueryCounter(InstrumentationTest):
+    def test_get_statement(self):
+        assert QueryCounter.get_statement('  SELECT 1') == 'select'
+        assert QueryCounter.get_statement('') == 'unknown'
+
+    def test_counts_queries(self):
+        add_query_counter(connection)
+        add_query_counter(connection)
+        assert len([w for w in connection.execute_wrappers if isinstance(w, QueryCounter)]) == 1
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+
+        tags = ['alias:default', 'statement:select']
+        assert self.backend.get_counter('db.queries', tags=tags) == 1
+        assert self.backend.get_timing('db.queries.duration', tags=tags).count == 1
+
+
+@pytest.mark.instrumentation_mark
+class TestInstrumentedRedis(InstrumentationTest):
+    def test_counts_commands(self):
+        with patch('redis.StrictRedis.execute_command') as execute_command:
+            client = InstrumentedStrictRedis()
+            client.get('foo')
+            client.set('foo', 1)
+            client.get('foo')
+
+        assert execute_command.call_count == 3
+        assert self.backend.get_counter('redis.commands', tags=['command:get']) == 2
+        assert self.backend.get_counter('redis.commands', tags=['command:set']) == 1
+
+
+@pytest.mark.instrumentation_mark
+class TestWebsocketsGauge(InstrumentationTest):
+    def test_gauge(self):
+        gauge = WebsocketsGauge()
+        gauge.incr()
+        gauge.incr()
+        gauge.decr()
+        assert self.backend.get_gauge('streams.websockets') == 1
+        gauge.decr(3)
+        assert self.backend.get_gauge('streams.websockets') == 0
+
+    def test_socket_manager(self):
+        gauge = WebsocketsGauge()
+        with patch('streams.socket_manager.websockets_gauge', gauge):
+            manager = SocketManager()
+            manager.add_socket('ws1')
+            manager.add_socket('ws1')
+            manager.add_socket('ws2')
+            assert gauge.value == 2
+            manager.remove_sockets({'ws1', 'ws3'})
+            assert gauge.value == 1
+            manager.remove_sockets('ws2')
+            assert gauge.value == 0
@@ -0,0 +1,138 @@
+from unittest.mock import patch
+
+import pytest
+
+from redis.exceptions import RedisError
+from rest_framework import status
+
+from db.redis.stats_snapshots import RedisStatsSnapshots
+from stats.memory import InMemoryStatsBackend, StatsStore
+from stats.prometheus import (
+    PrometheusStatsBackend,
+    dumps_snapshot,
+    get_labels,
+    get_metric_name
+)
+from tests.utils import BaseTest, BaseViewTest
+
+
+@pytest.mark.instrumentation_mark
+class TestInMemoryStatsBackend(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.backend = InMemoryStatsBackend(prefix='polyaxon', stats_store=StatsStore())
+
+    def test_incr(self):
+        self.backend.incr('api.requests', tags=['method:GET'])
+        self.backend.incr('api.requests', amount=2, tags=['method:GET'])
+        self.backend.incr('api.requests', tags=['method:POST'])
+
+        assert self.backend.get_counter('api.requests', tags=['method:GET']) == 3
+        assert self.backend.get_counter('api.requests', tags=['method:POST']) == 1
+        assert self.backend.get_counter('api.requests') == 0
+        assert ('polyaxon.api.requests', ('method:GET',)) in self.backend.store.counters
+
+    def test_gauge(self):
+        self.backend.gauge('streams.websockets', 3)
+        self.backend.gauge('streams.websockets', 2)
+
+        assert self.backend.get_gauge('streams.websockets') == 2
+
+    def test_timing(self):
+        self.backend.timing('celery.tasks.runtime', 10)
+        self.backend.timing('celery.tasks.runtime', 30)
+
+        summary = self.backend.get_timing('celery.tasks.runtime')
+        assert summary.count == 2
+        assert summary.sum == 40
+        assert summary.max == 30
+
+    def test_clear(self):
+        self.backend.incr('api.requests')
+        self.backend.clear()
+
+        assert self.backend.get_counter('api.requests') == 0
+
+
+@pytest.mark.instrumentation_mark
+class TestPrometheusStatsBackend(BaseTest):
+    def setUp(self):
+        super().setUp()
+        RedisStatsSnapshots.clear_all()
+        self.backend = PrometheusStatsBackend(prefix='polyaxon', stats_store=StatsStore())
+
+    def test_get_metric_name(self):
+        assert get_metric_name('polyaxon.api.requests') == 'polyaxon_api_requests'
+        assert get_metric_name('1.requests') == '_1_requests'
+
+    def test_get_labels(self):
+        assert get_labels(()) == ''
+        assert get_labels(('method:GET', 'view:v1:projects')) == '{method="GET",view="v1:projects"}'
+        assert get_labels(('name:a"b',)) == '{name="a\\"b"}'
+
+    def test_render(self):
+        self.backend.incr('api.requests', tags=['method:GET'])
+        self.backend.gauge('streams.websockets', 4)
+        self.backend.timing('api.requests.latency', 12.5, tags=['method:GET'])
+        self.backend.timing('api.requests.latency', 7.5, tags=['method:GET'])
+
+        lines = self.backend.render().splitlines()
+        assert '# TYPE polyaxon_api_requests counter' in lines
+        assert 'polyaxon_api_requests{method="GET"} 1' in lines
+        assert '# TYPE polyaxon_streams_websockets gauge' in lines
+        assert 'polyaxon_streams_websockets 4' in lines
+        assert '# TYPE polyaxon_api_requests_latency summary' in lines
+        assert 'polyaxon_api_requests_latency_count{method="GET"} 2' in lines
+        assert 'polyaxon_api_requests_latency_sum{method="GET"} 20.0' in lines
+
+    def test_render_the_stats_of_all_processes(self):
+        worker = StatsStore()
+        worker.incr('polyaxon.api.requests', 2, tags=['method:GET'])
+        worker.gauge('polyaxon.streams.websockets', 1)
+        worker.timing('polyaxon.api.requests.latency', 30, tags=['method:GET'])
+        RedisStatsSnapshots(process='worker:1').set(dumps_snapshot(worker.snapshot()), ttl=60)
+
+        self.backend.incr('api.requests', tags=['method:GET'])
+        self.backend.gauge('streams.websockets', 4)
+        self.backend.timing('api.requests.latency', 10, tags=['method:GET'])
+
+        lines = self.backend.render().splitlines()
+        assert 'polyaxon_api_requests{method="GET"} 3' in lines
+        # The latest published gauge wins
+        assert 'polyaxon_streams_websockets 4' in lines
+        assert 'polyaxon_api_requests_latency_count{method="GET"} 2' in lines
+        assert 'polyaxon_api_requests_latency_sum{method="GET"} 40' in lines
+
+    def test_render_without_redis(self):
+        self.backend.incr('api.requests')
+        with patch.object(RedisStatsSnapshots, 'get_all', side_effect=RedisError):
+            lines = self.backend.render().splitlines()
+        assert 'polyaxon_api_requests 1' in lines
+
+
+@pytest.mark.instrumentation_mark
+class TestMetricsView(BaseViewTest):
+    HAS_AUTH = True
+    HAS_INTERNAL = True
+
+    def setUp(self):
+        super().setUp()
+        self.url = '/_metrics'
+        RedisStatsSnapshots.clear_all()
+        backend = PrometheusStatsBackend(prefix='polyaxon', stats_store=StatsStore())
+        backend.incr('api.requests')
+        patcher = patch('stats.backend', backend)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_internal_clients_can_scrape(self):
+        resp = self.internal_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+        assert 'polyaxon_api_requests 1' in resp.content.decode()
+
+    def test_users_cannot_scrape(self):
+        assert self.auth_client.get(self.url).status_code == status.HTTP_403_FORBIDDEN
+
+    def test_allowed_addresses_can_scrape(self):
+        with self.settings(STATS_SCRAPER_ALLOWED_IPS=['127.0.0.1']):
+            assert self.client.get(self.url).status_code == status.HTTP_200_OK
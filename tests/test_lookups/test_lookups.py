@@ -0,0 +1,195 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from redis import RedisError
+
+from django.http import Http404
+
+from api.endpoint.project import ProjectResourceListEndpoint
+from db.lookups import LookupCache, get_project, get_token, project_cache, token_cache, user_cache
+from db.models.projects import Project
+from db.models.tokens import Token
+from db.models.users import User
+from db.redis.lookups import RedisLookups
+from factories.factory_projects import ProjectFactory
+from factories.factory_users import UserFactory
+from scopes.authentication.token import TokenAuthentication
+from tests.utils import BaseTest
+
+
+@pytest.mark.lookups_mark
+class TestLookupCache(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.project = ProjectFactory()
+        self.loader = MagicMock(side_effect=lambda project_id: Project.objects.get(id=project_id))
+        self.cache = LookupCache(name='test', loader=self.loader, maxsize=2, local_ttl=60, ttl=60)
+
+    def test_get_loads_once(self):
+        project1 = self.cache.get(self.project.id)
+        project2 = self.cache.get(self.project.id)
+        assert project1 == project2 == self.project
+        # Each lookup returns a copy
+        assert project1 is not project2
+        assert self.loader.call_count == 1
+        assert self.cache.get_stats() == {
+            'size': 1, 'local_hits': 1, 'redis_hits': 0, 'misses': 1, 'hit_rate': 0.5}
+
+    def test_get_from_redis(self):
+        self.cache.get(self.project.id)
+        # Another process with the same cache
+        cache = LookupCache(name='test', loader=self.loader, local_ttl=60, ttl=60)
+        with self.assertNumQueries(0):
+            assert cache.get(self.project.id) == self.project
+        assert cache.get_stats()['redis_hits'] == 1
+        assert self.loader.call_count == 1
+
+    def test_local_entries_expire(self):
+        cache = LookupCache(name='test', loader=self.loader, local_ttl=0, ttl=60)
+        cache.get(self.project.id)
+        cache.get(self.project.id)
+        assert cache.get_stats()['local_hits'] == 0
+        assert cache.get_stats()['redis_hits'] == 1
+
+    def test_misses_are_not_cached(self):
+        with self.assertRaises(Project.DoesNotExist):
+            self.cache.get(-1)
+        with self.assertRaises(Project.DoesNotExist):
+            self.cache.get(-1)
+        assert self.loader.call_count == 2
+
+    def test_lru_eviction(self):
+        projects = [ProjectFactory() for _ in range(3)]
+        for project in projects:
+            self.cache.get(project.id)
+        assert len(self.cache._entries) == 2  # pylint:disable=protected-access
+        assert list(self.cache._entries) == [  # pylint:disable=protected-access
+            str(projects[1].id), str(projects[2].id)]
+
+    def test_maxsize_0_disables_local_entries(self):
+        cache = LookupCache(name='test', loader=self.loader, maxsize=0, local_ttl=60, ttl=60)
+        cache.get(self.project.id)
+        cache.get(self.project.id)
+        assert cache.get_stats()['size'] == 0
+        assert cache.get_stats()['redis_hits'] == 1
+
+    def test_invalidate(self):
+        self.cache.get(self.project.id)
+        self.cache.invalidate(self.project.id)
+        assert RedisLookups(name='test').get(str(self.project.id)) is None
+        self.cache.get(self.project.id)
+        assert self.loader.call_count == 2
+
+    def test_redis_errors_fall_back_to_the_loader(self):
+        with patch.object(RedisLookups, 'get', side_effect=RedisError), \
+                patch.object(RedisLookups, 'set', side_effect=RedisError):
+            assert self.cache.get(self.project.id) == self.project
+        assert self.loader.call_count == 1
+
+    def test_records_hits(self):
+        with patch('db.lookups.stats.incr') as mock_incr:
+            self.cache.get(self.project.id)
+            self.cache.get(self.project.id)
+        assert [call[1]['tags'] for call in mock_incr.call_args_list] == [
+            ['cache:test', 'tier:db'], ['cache:test', 'tier:local']]
+
+
+@pytest.mark.lookups_mark
+class TestLookupCacheInvalidation(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory()
+        self.token = Token.objects.get(user=self.user)
+        self.project = ProjectFactory(user=self.user)
+
+    def test_authentication_uses_the_cache(self):
+        authentication = TokenAuthentication()
+        authentication.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(0):
+            user, token = authentication.authenticate_credentials(self.token.key)
+        assert user == self.user
+        assert token == self.token
+
+    def test_token_refresh(self):
+        key = self.token.key
+        get_token(key)
+        self.token.refresh()
+        with self.assertRaises(Token.DoesNotExist):
+            get_token(key)
+        assert get_token(self.token.key) == self.token
+
+    def test_token_delete(self):
+        get_token(self.token.key)
+        self.token.delete()
+        with self.assertRaises(Token.DoesNotExist):
+            get_token(self.token.key)
+
+    def test_user_update(self):
+        assert get_token(self.token.key).user.is_active is True
+        self.user.is_active = False
+        self.user.save()
+        assert get_token(self.token.key).user.is_active is False
+
+    def test_user_delete(self):
+        get_token(self.token.key)
+        user_id = self.user.id
+        self.user.delete()
+        with self.assertRaises(Token.DoesNotExist):
+            get_token(self.token.key)
+        with self.assertRaises(User.DoesNotExist):
+            user_cache.get(user_id)
+
+    def test_project_update(self):
+        owner_name = self.project.owner.name
+        assert get_project(owner_name, self.project.name).is_public is True
+        self.project.is_public = False
+        self.project.save()
+        assert get_project(owner_name, self.project.name).is_public is False
+
+    def test_project_rename(self):
+        owner_name = self.project.owner.name
+        name = self.project.name
+        get_project(owner_name, name)
+        self.project.name = 'renamed'
+        self.project.save()
+        with self.assertRaises(Project.DoesNotExist):
+            get_project(owner_name, name)
+        assert get_project(owner_name, 'renamed') == self.project
+
+    def test_invalidated_again_on_commit(self):
+        owner_name = self.project.owner.name
+        key = project_cache.get_key((owner_name, self.project.name))
+        with patch('signals.lookups.transaction') as mock_transaction:
+            self.project.is_public = False
+            self.project.save()
+        assert mock_transaction.on_commit.call_count == 1
+
+        # A concurrent lookup before the commit caches the entry again
+        get_project(owner_name, self.project.name)
+        assert RedisLookups(name='project').get(key) is not None
+        mock_transaction.on_commit.call_args[0][0]()
+        assert RedisLookups(name='project').get(key) is None
+
+    def test_project_archive(self):
+        get_project(self.project.owner.name, self.project.name)
+        self.project.archive()
+        with self.assertRaises(Project.DoesNotExist):
+            get_project(self.project.owner.name, self.project.name)
+
+    def test_project_resource_endpoint(self):
+        endpoint = ProjectResourceListEndpoint()
+        endpoint.owner_name = self.project.owner.name
+        endpoint.project_name = self.project.name
+        endpoint._initialize_context()  # pylint:disable=protected-access
+        assert endpoint.project == self.project
+        assert endpoint.owner == self.project.owner
+        assert project_cache.get_stats()['misses'] == 1
+
+        endpoint.project_name = 'foo'
+        with self.assertRaises(Http404):
+            endpoint._initialize_context()  # pylint:disable=protected-access
+
+    def test_caches_are_cleared_between_tests(self):
+        assert token_cache.get_stats()['size'] == 0
+        assert project_cache.get_stats()['size'] == 0
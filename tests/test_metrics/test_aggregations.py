@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from factories.factory_experiments import ExperimentFactory, ExperimentMetricFactory
+from metrics.aggregations import (
+    get_bands,
+    get_experiments_series,
+    get_group_bands,
+    get_summaries,
+    get_values_at,
+    parse_aggregation_query
+)
+from metrics.storage import store
+from tests.utils import BaseTest
+
+
+@pytest.mark.metrics_mark
+class TestMetricAggregations(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.experiment1 = ExperimentFactory()
+        self.experiment2 = ExperimentFactory()
+        for i in range(4):
+            ExperimentMetricFactory(experiment=self.experiment1,
+                                    values={'step': i, 'loss': 4 - i, 'accuracy': i / 4})
+        for i in range(3):
+            ExperimentMetricFactory(experiment=self.experiment2,
+                                    values={'step': i * 2, 'loss': 10 * (i + 1)})
+
+    def test_parse_aggregation_query(self):
+        query = parse_aggregation_query({'names': 'loss'})
+        assert query.names == ('loss',)
+        assert query.optimization == 'minimize'
+
+        with self.assertRaises(ValueError):
+            parse_aggregation_query({'optimization': 'foo'})
+
+    def test_get_summaries(self):
+        summaries = get_summaries([self.experiment1.id, self.experiment2.id])
+        assert set(summaries[self.experiment1.id].keys()) == {'loss', 'accuracy'}
+        loss = summaries[self.experiment1.id]['loss']
+        assert loss == {'count': 4, 'min': 1, 'max': 4, 'mean': 2.5, 'best': 1,
+                        'final': 1, 'final_step': 3}
+        loss = summaries[self.experiment2.id]['loss']
+        assert loss['final'] == 30
+        assert loss['final_step'] == 4
+
+        summaries = get_summaries([self.experiment2.id], names=['accuracy'],
+                                  optimization='maximize')
+        assert summaries == {self.experiment2.id: {}}
+        summaries = get_summaries([self.experiment1.id], names=['accuracy'],
+                                  optimization='maximize')
+        assert summaries[self.experiment1.id]['accuracy']['best'] == 0.75
+        assert get_summaries([]) == {}
+
+    def test_get_summaries_without_chunks(self):
+        # The metrics of the experiment are not migrated to chunks
+        store.delete(self.experiment2.id)
+        summaries = get_summaries([self.experiment1.id, self.experiment2.id], names=['loss'])
+        assert summaries[self.experiment1.id]['loss']['mean'] == 2.5
+        assert summaries[self.experiment2.id]['loss'] == {
+            'count': 3, 'min': 10, 'max': 30, 'mean': None, 'best': 10,
+            'final': 30, 'final_step': 4}
+
+    def test_get_values_at(self):
+        values = get_values_at(np.array([1., 3.]), np.array([10., 30.]),
+                               np.array([0., 1., 2., 3., 4.]))
+        assert np.isnan(values[0])
+        assert values[1:4].tolist() == [10., 10., 30.]
+        assert np.isnan(values[4])
+
+    def test_get_bands(self):
+        bands = get_bands([np.array([[0., 1.], [1., 2.]]), np.array([[0., 1., 2.], [3., 4., 5.]])])
+        assert bands['steps'] == [0, 1, 2]
+        assert bands['count'] == [2, 2, 1]
+        assert bands['p50'] == [2., 3., 5.]
+        assert get_bands([])['steps'] == []
+
+    def test_get_group_bands(self):
+        bands = get_group_bands([self.experiment1.id, self.experiment2.id], names=None)
+        assert set(bands.keys()) == {'loss', 'accuracy'}
+        assert bands['loss']['steps'] == [0, 1, 2, 3, 4]
+        # The value of the last step is carried until the next one
+        assert bands['loss']['count'] == [2, 2, 2, 2, 1]
+        assert bands['loss']['p50'] == [7., 6.5, 11., 10.5, 30.]
+
+        bands = get_group_bands([self.experiment1.id, self.experiment2.id],
+                                names=['loss'],
+                                max_points=3)
+        assert bands['loss']['steps'] == [0, 2, 4]
+        # Each series keeps its first point of each bucket of 2 steps
+        assert bands['loss']['count'] == [2, 2, 1]
+        assert bands['loss']['p50'] == [7., 11., 30.]
+
+    def test_get_experiments_series_is_downsampled(self):
+        series = get_experiments_series([self.experiment1.id, self.experiment2.id],
+                                        name='loss',
+                                        max_points=2)
+        assert sorted(s.shape[1] for s in series) == [2, 2]
+        assert get_experiments_series([], name='loss') == []
@@ -0,0 +1,116 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+
+from django.utils import timezone
+
+from db.models.experiments import ExperimentMetric
+from db.redis.metrics_buffer import RedisMetricsBuffer
+from factories.factory_experiments import ExperimentFactory
+from metrics.buffer import buffer_metrics, deduplicate, flush_buffers, flush_experiment, get_backlog
+from metrics.ingestion import ingest_metrics
+from tests.utils import BaseTest
+
+
+@pytest.mark.metrics_mark
+class TestMetricsBuffer(BaseTest):
+    def setUp(self):
+        super().setUp()
+        for experiment_id in RedisMetricsBuffer.get_experiments():
+            RedisMetricsBuffer(experiment=experiment_id).clear()
+        self.experiment = ExperimentFactory()
+        self.buffer = RedisMetricsBuffer(experiment=self.experiment.id)
+        self.now = timezone.now() - timedelta(minutes=1)
+
+    def get_metrics(self, start, end):
+        return [{'created_at': self.now + timedelta(seconds=i), 'values': {'loss': i, 'step': i}}
+                for i in range(start, end)]
+
+    def test_buffer_metrics(self):
+        assert buffer_metrics(self.experiment.id, self.get_metrics(0, 3)) == 3
+        assert buffer_metrics(self.experiment.id, [{'values': {'loss': 1}}]) == 4
+        assert RedisMetricsBuffer.get_experiments() == [self.experiment.id]
+        assert get_backlog() == 4
+        assert self.buffer.peek(2)[1]['values'] == {'loss': 1, 'step': 1}
+        assert ExperimentMetric.objects.count() == 0
+
+    def test_deduplicate(self):
+        ExperimentMetric.objects.create(experiment=self.experiment, values={'loss': 1, 'step': 1})
+        metrics = self.get_metrics(0, 3) + [{'created_at': self.now, 'values': {'loss': 0.5}},
+                                            {'created_at': self.now, 'values': {'step': 2}},
+                                            {'created_at': self.now, 'values': {'step': 2}},
+                                            {'created_at': self.now, 'values': {'step': 1}}]
+        results = deduplicate(self.experiment.id, metrics)
+        # Only the identical reports of a step are dropped,
+        # the other reports of steps 1 and 2 are kept
+        assert [m['values'] for m in results] == [{'loss': 0, 'step': 0},
+                                                  {'loss': 2, 'step': 2},
+                                                  {'loss': 0.5},
+                                                  {'step': 2},
+                                                  {'step': 1}]
+
+    def test_flush_experiment_in_batches(self):
+        buffer_metrics(self.experiment.id, self.get_metrics(0, 10))
+        with patch('auditor.record') as auditor_record:
+            assert flush_experiment(self.experiment.id, batch_size=4) == 10
+        # One ingestion by batch
+        assert auditor_record.call_count == 3
+        assert ExperimentMetric.objects.filter(experiment=self.experiment).count() == 10
+        assert self.buffer.size() == 0
+        assert RedisMetricsBuffer.get_experiments() == []
+        self.experiment.refresh_from_db()
+        assert self.experiment.last_metric == {'loss': 9, 'step': 9}
+
+    def test_flush_is_idempotent(self):
+        buffer_metrics(self.experiment.id, self.get_metrics(0, 5))
+        # A flush interrupted after the write and before the trim
+        with patch.object(RedisMetricsBuffer, 'trim', side_effect=ConnectionError):
+            with self.assertRaises(ConnectionError):
+                flush_experiment(self.experiment.id)
+        assert ExperimentMetric.objects.count() == 5
+        assert self.buffer.size() == 5
+
+        # The lock is released and the replay does not duplicate the steps
+        buffer_metrics(self.experiment.id, self.get_metrics(5, 7))
+        assert flush_experiment(self.experiment.id) == 2
+        assert ExperimentMetric.objects.count() == 7
+        assert self.buffer.size() == 0
+
+    def test_flush_stores_the_same_metrics_as_the_direct_ingestion(self):
+        metrics = [{'created_at': self.now, 'values': {'loss': 0.5, 'step': 1}},
+                   {'created_at': self.now, 'values': {'accuracy': 0.8, 'step': 1}},
+                   # A retried report
+                   {'created_at': self.now, 'values': {'loss': 0.5, 'step': 1}},
+                   {'created_at': self.now, 'values': {'loss': 0.4}}]
+        experiment = ExperimentFactory()
+        ingest_metrics(experiment=experiment, metrics=metrics)
+
+        buffer_metrics(self.experiment.id, metrics)
+        assert flush_experiment(self.experiment.id) == 3
+
+        def get_values(instance):
+            return list(instance.metrics.order_by('id').values_list('step', 'values'))
+
+        assert get_values(self.experiment) == get_values(experiment)
+
+    def test_flush_is_locked(self):
+        buffer_metrics(self.experiment.id, self.get_metrics(0, 2))
+        assert self.buffer.acquire_lock(ttl=10) is True
+        assert flush_experiment(self.experiment.id) == 0
+        self.buffer.release_lock()
+        assert flush_experiment(self.experiment.id) == 2
+
+    def test_flush_buffers(self):
+        experiment = ExperimentFactory()
+        buffer_metrics(self.experiment.id, self.get_metrics(0, 2))
+        buffer_metrics(experiment.id, self.get_metrics(0, 3))
+        # The metrics of deleted experiments are dropped
+        deleted = ExperimentFactory()
+        buffer_metrics(deleted.id, self.get_metrics(0, 3))
+        deleted.delete()
+
+        with patch('stats.gauge') as gauge:
+            assert flush_buffers() == 5
+        gauge.assert_called_with('metrics.buffer.backlog', 0)
+        assert get_backlog() == 0
@@ -0,0 +1,59 @@
+import pytest
+
+from django.core.management import call_command
+
+from db.models.experiments import ExperimentMetric
+from factories.factory_experiments import ExperimentFactory
+from metrics.compaction import compact_experiment_metrics
+from metrics.summaries import rebuild_summaries
+from tests.utils import BaseTest
+
+
+@pytest.mark.metrics_mark
+class TestMetricsCompaction(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.experiment = ExperimentFactory()
+
+    def create_historical_metrics(self, experiment, values):
+        # Metrics reported before the deduplication have neither a step nor a hash
+        ExperimentMetric.objects.bulk_create([
+            ExperimentMetric(experiment=experiment, values=value) for value in values])
+
+    def test_compact_experiment_metrics(self):
+        values = [{'loss': 0.1, 'step': 1},
+                  {'loss': 0.1, 'step': 1},
+                  {'loss': 0.2, 'step': 2},
+                  {'loss': 0.1, 'step': 1},
+                  {'loss': 0.3, 'step': 2},
+                  {'accuracy': 0.9},
+                  {'accuracy': 0.9}]
+        self.create_historical_metrics(self.experiment, values)
+        ExperimentMetric.objects.create(experiment=self.experiment, values={'loss': 0.2, 'step': 2})
+        rebuild_summaries(experiment_id=self.experiment.id)
+        assert self.experiment.metric_summaries.get(name='loss').count == 6
+
+        kept, removed = compact_experiment_metrics(experiment_id=self.experiment.id,
+                                                   chunk_size=2)
+        assert (kept, removed) == (4, 3)
+
+        metrics = self.experiment.metrics.order_by('id')
+        assert [metric.step for metric in metrics] == [1, 2, None, None, 2]
+        assert not metrics.filter(hash__isnull=True).exists()
+        assert self.experiment.metric_summaries.get(name='loss').count == 3
+
+        # Compaction is idempotent
+        assert compact_experiment_metrics(experiment_id=self.experiment.id) == (0, 0)
+
+    def test_compact_metrics_command(self):
+        experiment = ExperimentFactory()
+        self.create_historical_metrics(self.experiment, [{'loss': 0.1, 'step': 1}] * 2)
+        self.create_historical_metrics(experiment, [{'loss': 0.1, 'step': 1}] * 3)
+
+        call_command('compact_metrics', experiments=[experiment.id], chunk_size=1)
+        assert self.experiment.metrics.count() == 2
+        assert experiment.metrics.count() == 1
+
+        call_command('compact_metrics')
+        assert self.experiment.metrics.count() == 1
+        assert not ExperimentMetric.objects.filter(hash__isnull=True).exists()
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from django.utils import timezone
+
+from metrics.downsampling import BUCKETS, LTTB, downsample, get_buckets, lttb
+from metrics.queries import get_resolution, parse_series_query
+from metrics.storage import Point
+from tests.utils import BaseTest
+
+
+@pytest.mark.metrics_mark
+class TestDownsampling(BaseTest):
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        self.points = [Point(i, now + timedelta(seconds=i), float(np.sin(i / 10.)))
+                       for i in range(1000)]
+
+    def test_lttb(self):
+        x = np.arange(10, dtype=np.float64)
+        y = np.array([0, 0, 0, 10, 0, 0, 0, 0, -10, 0], dtype=np.float64)
+        assert lttb(x, y, 20).tolist() == list(range(10))
+        assert lttb(x, y, 2).tolist() == list(range(10))
+
+        indices = lttb(x, y, 4)
+        assert indices.tolist() == [0, 3, 8, 9]
+
+    def test_get_buckets(self):
+        assert get_buckets(10, 5).tolist() == [0, 2, 4, 6, 8]
+        assert get_buckets(3, 5).tolist() == [0, 1, 2]
+
+    def test_downsample_lttb(self):
+        series = downsample(self.points, max_points=100, method=LTTB)
+        assert len(series['steps']) == 100
+        assert series['steps'][0] == 0
+        assert series['steps'][-1] == 999
+        assert series['steps'] == sorted(series['steps'])
+        assert series['values'][0] == self.points[0].value
+        assert series['timestamps'][-1] == self.points[-1].timestamp.isoformat()
+
+    def test_downsample_buckets(self):
+        series = downsample(self.points, max_points=100, method=BUCKETS)
+        assert len(series['steps']) == 100
+        assert series['steps'][:3] == [0, 10, 20]
+        values = [p.value for p in self.points[:10]]
+        assert series['min'][0] == min(values)
+        assert series['max'][0] == max(values)
+        assert series['mean'][0] == pytest.approx(sum(values) / 10)
+        assert max(series['max']) == max(p.value for p in self.points)
+
+    def test_downsample_empty(self):
+        assert downsample([], max_points=10) == {'steps': [], 'timestamps': [], 'values': []}
+        assert downsample([], max_points=10, method=BUCKETS)['mean'] == []
+
+    def test_parse_series_query(self):
+        query = parse_series_query({})
+        assert query.names == ()
+        assert query.method == LTTB
+        assert query.max_points == 1000
+
+        query = parse_series_query({'names': 'loss, accuracy,loss',
+                                    'max_points': '100000',
+                                    'method': BUCKETS,
+                                    'start_step': '10',
+                                    'start_at': '2019-01-01T10:00:00'})
+        assert query.names == ('accuracy', 'loss')
+        assert query.max_points == 10000
+        assert query.start_step == 10
+        assert query.end_step is None
+        assert query.start_at.tzinfo is not None
+
+        for params in [{'max_points': 'foo'},
+                       {'max_points': 2},
+                       {'method': 'foo'},
+                       {'end_step': '1.5'},
+                       {'end_at': 'foo'}]:
+            with self.assertRaises(ValueError):
+                parse_series_query(params)
+
+    def test_get_resolution(self):
+        query = parse_series_query({'names': 'loss'})
+        assert get_resolution(query, '1') == get_resolution(query, '1')
+        assert get_resolution(query, '1') != get_resolution(query, '2')
+        assert get_resolution(query, '1') != get_resolution(
+            parse_series_query({'names': 'loss', 'max_points': 10}), '1')
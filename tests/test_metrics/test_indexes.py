@@ -0,0 +1,127 @@
+from unittest.mock import patch
+
+import pytest
+
+from redis.exceptions import RedisError
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from db.models.experiments import Experiment
+from db.redis.query_stats import RedisQueryStats
+from factories.factory_experiments import ExperimentFactory
+from factories.factory_projects import ProjectFactory
+from metrics.indexes import (
+    METRIC_FIELD,
+    create_index,
+    flush_keys,
+    get_frequent_keys,
+    get_index_name,
+    get_indexes,
+    is_valid_key
+)
+from query.managers.experiment import ExperimentQueryManager
+from tests.utils import BaseTest
+
+
+@pytest.mark.metrics_mark
+class TestMetricIndexes(BaseTest):
+    def setUp(self):
+        super().setUp()
+        flush_keys()
+        RedisQueryStats(field=METRIC_FIELD).clear()
+        self.project = ProjectFactory()
+        for i in range(10):
+            ExperimentFactory(project=self.project,
+                              last_metric={'loss': i / 10, 'accuracy': 1 - i / 10},
+                              declarations={'rate': i % 3, 'optimizer': 'sgd'})
+
+    @staticmethod
+    def explain(queryset):
+        # Forces the planner to use an index if there is a usable one
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    def test_index_name(self):
+        assert is_valid_key('loss') is True
+        assert is_valid_key('val.loss-1') is True
+        assert is_valid_key('loss); drop table') is False
+        name = get_index_name('a_very_long_metric_name_used_for_validation_loss')
+        assert len(name) < 63
+        assert name != get_index_name('a_very_long_metric_name_used_for_validation_accuracy')
+
+    def test_query_stats(self):
+        ExperimentQueryManager.apply(query_spec='metric.loss:<0.5, metric.accuracy:>0.1',
+                                     queryset=Experiment.objects.all())
+        ExperimentQueryManager.apply(query_spec='metric.loss:<0.2, status:running',
+                                     queryset=Experiment.objects.all())
+        assert get_frequent_keys() == [('loss', 2), ('accuracy', 1)]
+        assert get_frequent_keys(count=1) == [('loss', 2)]
+        assert get_frequent_keys(min_count=2) == [('loss', 2)]
+
+    def test_query_stats_are_buffered(self):
+        with patch.object(RedisQueryStats, 'record') as mock_record:
+            for _ in range(3):
+                ExperimentQueryManager.apply(query_spec='metric.loss:<0.5',
+                                             queryset=Experiment.objects.all())
+        assert mock_record.call_count == 0
+
+        with self.settings(METRICS_QUERY_STATS_FLUSH_INTERVAL=0):
+            ExperimentQueryManager.apply(query_spec='metric.loss:<0.5',
+                                         queryset=Experiment.objects.all())
+        assert get_frequent_keys() == [('loss', 4)]
+
+    def test_query_stats_redis_errors_are_ignored(self):
+        with self.settings(METRICS_QUERY_STATS_FLUSH_INTERVAL=0):
+            with patch.object(RedisQueryStats, 'record', side_effect=RedisError):
+                queryset = ExperimentQueryManager.apply(query_spec='metric.loss:<0.5',
+                                                        queryset=Experiment.objects.all())
+        assert queryset.count() == 5
+        assert get_frequent_keys() == []
+
+    def test_query_stats_disabled(self):
+        with self.settings(METRICS_QUERY_STATS_ENABLED=False):
+            ExperimentQueryManager.apply(query_spec='metric.loss:<0.5',
+                                         queryset=Experiment.objects.all())
+        assert get_frequent_keys() == []
+
+    def test_metric_index_is_used(self):
+        queryset = ExperimentQueryManager.apply(
+            query_spec='metric.loss:<0.5',
+            queryset=Experiment.objects.filter(project=self.project))
+        assert queryset.count() == 5
+
+        name = create_index(key='loss', concurrently=False)
+        assert name in get_indexes()
+        assert name in self.explain(queryset)
+        assert queryset.count() == 5
+
+    def test_declarations_index_is_used(self):
+        queryset = ExperimentQueryManager.apply(
+            query_spec='declarations.optimizer:sgd',
+            queryset=Experiment.objects.all())
+        assert queryset.count() == 10
+        assert 'db_experiment_declarations_gin' in self.explain(queryset)
+
+        queryset = ExperimentQueryManager.apply(
+            query_spec='declarations.optimizer:adam|sgd',
+            queryset=Experiment.objects.all())
+        assert queryset.count() == 10
+        assert 'db_experiment_declarations_gin' in self.explain(queryset)
+
+    def test_create_metric_indexes_command(self):
+        stats = RedisQueryStats(field=METRIC_FIELD)
+        stats.record({'loss': 2, 'accuracy': 1})
+
+        call_command('create_metric_indexes', min_count=2, dry_run=True)
+        assert get_indexes() == {}
+
+        call_command('create_metric_indexes', min_count=2, concurrently=False)
+        assert set(get_indexes().keys()) == {get_index_name('loss')}
+
+        call_command('create_metric_indexes', keys=['accuracy'], concurrently=False)
+        assert set(get_indexes().keys()) == {get_index_name('loss'), get_index_name('accuracy')}
+
+        with self.assertRaises(CommandError):
+            call_command('create_metric_indexes', keys=['loss)'], concurrently=False)
@@ -0,0 +1,124 @@
+import logging
+import time
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from db.models.experiments import Experiment
+from event_manager.events.experiment import EXPERIMENT_NEW_METRIC
+from factories.factory_experiments import ExperimentFactory
+from metrics.ingestion import ingest_metrics, merge_values, update_last_metric
+from tests.utils import BaseTest
+
+_logger = logging.getLogger('polyaxon.tests.metrics')
+
+
+@pytest.mark.metrics_mark
+class TestMetricsIngestion(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.experiment = ExperimentFactory()
+
+    def test_merge_values(self):
+        now = timezone.now()
+        metrics = [
+            {'created_at': now, 'values': {'loss': 0.1, 'step': 2}},
+            {'created_at': now - timedelta(seconds=1), 'values': {'loss': 0.2, 'accuracy': 0.5}},
+        ]
+        assert merge_values(metrics) == {'loss': 0.1, 'step': 2, 'accuracy': 0.5}
+
+    def test_update_last_metric_merges_in_database(self):
+        Experiment.objects.filter(id=self.experiment.id).update(last_metric={'loss': 0.3})
+        # A stale in memory value does not matter, the merge is done in sql
+        self.experiment.last_metric = {}
+
+        last_metric = update_last_metric(self.experiment.id, {'accuracy': 0.8})
+        assert last_metric == {'loss': 0.3, 'accuracy': 0.8}
+
+        Experiment.objects.filter(id=self.experiment.id).update(last_metric=None)
+        assert update_last_metric(self.experiment.id, {'loss': 0.1}) == {'loss': 0.1}
+        assert update_last_metric(self.experiment.id, {}) is None
+        assert update_last_metric(-1, {'loss': 0.1}) is None
+
+    def test_ingest_metrics(self):
+        now = timezone.now()
+        metrics = [{'created_at': now + timedelta(seconds=i), 'values': {'loss': i, 'step': i}}
+                   for i in range(10)]
+        metrics.append({'values': {'accuracy': 0.9}})
+
+        with patch('auditor.record') as auditor_record:
+            instances = ingest_metrics(experiment=self.experiment, metrics=metrics)
+
+        assert len(instances) == 11
+        assert self.experiment.metrics.count() == 11
+        assert auditor_record.call_count == 1
+        assert auditor_record.call_args[1]['event_type'] == EXPERIMENT_NEW_METRIC
+        assert auditor_record.call_args[1]['metrics_count'] == 11
+
+        expected = {'loss': 9, 'step': 9, 'accuracy': 0.9}
+        assert self.experiment.last_metric == expected
+        self.experiment.refresh_from_db()
+        assert self.experiment.last_metric == expected
+
+    def test_ingest_no_metrics(self):
+        with patch('auditor.record') as auditor_record:
+            assert ingest_metrics(experiment=self.experiment, metrics=[]) == []
+        assert auditor_record.call_count == 0
+
+    def test_ingest_retried_metrics(self):
+        metrics = [{'values': {'loss': 1. / (i + 1), 'step': i}} for i in range(5)]
+        assert len(ingest_metrics(experiment=self.experiment, metrics=metrics)) == 5
+
+        # A retry of the same steps and values is skipped, a new step or new values are not
+        metrics += [{'values': {'loss': 0.1, 'step': 5}}, {'values': {'loss': 0.2, 'step': 4}}]
+        instances = ingest_metrics(experiment=self.experiment, metrics=metrics)
+        assert [(instance.step, instance.values['loss']) for instance in instances] == [
+            (5, 0.1), (4, 0.2)]
+        assert self.experiment.metrics.count() == 7
+        assert self.experiment.metric_summaries.get(name='loss').count == 7
+
+        with patch('auditor.record') as auditor_record:
+            assert ingest_metrics(experiment=self.experiment, metrics=metrics) == []
+        assert auditor_record.call_count == 0
+
+    def test_ingest_metrics_without_step_are_not_deduplicated(self):
+        metrics = [{'values': {'accuracy': 0.9}}]
+        ingest_metrics(experiment=self.experiment, metrics=metrics)
+        ingest_metrics(experiment=self.experiment, metrics=metrics)
+        assert self.experiment.metrics.filter(step__isnull=True).count() == 2
+
+    def test_ingest_metrics_explicit_step(self):
+        instances = ingest_metrics(experiment=self.experiment,
+                                   metrics=[{'step': 3, 'values': {'loss': 0.1}}])
+        assert instances[0].step == 3
+        assert self.experiment.metrics.get().step == 3
+
+    def test_benchmark_ingest_10k_steps(self):
+        steps = 10000
+        batch_size = 1000
+        now = timezone.now()
+        metrics = [{'created_at': now + timedelta(milliseconds=i),
+                    'values': {'loss': 1. / (i + 1), 'step': i}} for i in range(steps)]
+
+        start = time.monotonic()
+        with CaptureQueriesContext(connection) as queries:
+            ingest_metrics(experiment=self.experiment, metrics=metrics, batch_size=batch_size)
+        duration = time.monotonic() - start
+        _logger.info('Ingested %s steps in %.3fs with %s queries',
+                     steps, duration, len(queries))
+
+        assert self.experiment.metrics.count() == steps
+        # One insert by batch, one last metric update, the chunks and summaries writes
+        # and the savepoints
+        assert len(queries) <= steps / batch_size + 15
+        assert self.experiment.last_metric['step'] == steps - 1
+        assert self.experiment.metric_chunks.count() == steps / 1000
+        summary = self.experiment.metric_summaries.get(name='loss')
+        assert summary.count == steps
+        assert summary.last_step == steps - 1
@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+import pytest
+
+from django.utils import timezone
+
+from db.models.experiments import ExperimentMetric, ExperimentMetricCompaction
+from db.models.projects import MetricRetentionPolicy
+from factories.factory_experiments import ExperimentFactory
+from metrics.retention import (
+    RetentionPolicy,
+    apply_experiment_retention,
+    apply_retention_policies,
+    get_kept_ids
+)
+from tests.utils import BaseTest
+
+
+@pytest.mark.metrics_mark
+class TestMetricsRetention(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.experiment = ExperimentFactory()
+        self.now = timezone.now()
+
+    def create_metrics(self, experiment, days, count):
+        created_at = self.now - timedelta(days=days)
+        ExperimentMetric.objects.bulk_create([
+            ExperimentMetric(experiment=experiment,
+                             created_at=created_at + timedelta(seconds=i),
+                             step=i,
+                             values={'loss': 1. / (i + 1), 'step': i})
+            for i in range(count)])
+
+    def test_get_kept_ids(self):
+        losses = [5, 1, 3, 9, 4, 2, 2, 2, 2, 2, 7]
+        rows = [{'id': i, 'values': {'loss': loss, 'step': i}} for i, loss in enumerate(losses)]
+        assert get_kept_ids(rows, keep_every=5) == {0, 1, 3, 5, 10}
+        assert get_kept_ids(rows, keep_every=1) == set(range(len(losses)))
+
+        rows = [{'id': 1, 'values': {'loss': 1, 'tag': 'a'}},
+                {'id': 2, 'values': {'accuracy': 0.5, 'loss': 2}},
+                {'id': 3, 'values': {'accuracy': 0.9, 'loss': 1.5}}]
+        assert get_kept_ids(rows, keep_every=3) == {1, 2, 3}
+
+    def test_apply_experiment_retention(self):
+        self.create_metrics(self.experiment, days=40, count=100)
+        ExperimentMetric.objects.create(experiment=self.experiment, values={'loss': 0.001})
+        policy = RetentionPolicy(full_resolution_days=30, keep_every=10)
+
+        removed = apply_experiment_retention(experiment_id=self.experiment.id,
+                                             policy=policy,
+                                             now=self.now,
+                                             chunk_size=25)
+        # The first point of each window is kept, it is also the max, and the window's min
+        assert removed == 80
+        assert self.experiment.metrics.count() == 21
+        steps = list(self.experiment.metrics.filter(step__isnull=False).values_list(
+            'step', flat=True))
+        assert steps == [step for i in range(0, 100, 10) for step in (i, i + 9)]
+
+        compaction = ExperimentMetricCompaction.objects.get(experiment=self.experiment)
+        assert compaction.removed == 80
+        assert compaction.compacted_until == self.now - timedelta(days=30)
+        assert self.experiment.metric_chunks.get(name='loss').count == 21
+        summary = self.experiment.metric_summaries.get(name='loss')
+        assert summary.count == 21
+        assert summary.last_value == 0.001
+
+        # Compacted metrics are not thinned a second time
+        assert apply_experiment_retention(experiment_id=self.experiment.id,
+                                          policy=policy,
+                                          now=self.now + timedelta(days=1)) == 0
+        assert self.experiment.metrics.count() == 21
+
+    def test_apply_retention_policies(self):
+        experiment = ExperimentFactory()
+        archived = ExperimentFactory(project=experiment.project)
+        archived.archive()
+        for value in [self.experiment, experiment, archived]:
+            self.create_metrics(value, days=10, count=20)
+            self.create_metrics(value, days=1, count=20)
+
+        with self.settings(METRICS_RETENTION_DAYS=0, METRICS_CHUNKS_ENABLED=False):
+            assert apply_retention_policies() == 0
+
+        with self.settings(METRICS_RETENTION_DAYS=5,
+                           METRICS_RETENTION_KEEP_EVERY=10,
+                           METRICS_CHUNKS_ENABLED=False):
+            MetricRetentionPolicy.objects.create(project=experiment.project, is_enabled=False)
+            assert apply_retention_policies() == 16
+            assert self.experiment.metrics.count() == 24
+            assert experiment.metrics.count() == 40
+
+            MetricRetentionPolicy.objects.filter(project=experiment.project).update(
+                is_enabled=True, full_resolution_days=0, keep_every=20)
+            assert apply_retention_policies() == 2 * 36
+            assert experiment.metrics.count() == 4
+            assert archived.metrics.count() == 4
@@ -0,0 +1,158 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from db.models.experiments import ExperimentMetric, ExperimentMetricChunk
+from factories.factory_experiments import ExperimentFactory
+from metrics.storage import MetricChunkStore, Point, get_series, migrate_experiment_metrics
+from tests.utils import BaseTest
+
+
+@pytest.mark.metrics_mark
+class TestMetricChunkStore(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.experiment = ExperimentFactory()
+        self.store = MetricChunkStore(chunk_size=4)
+        self.now = timezone.now()
+
+    def get_metrics(self, start, end, with_step=True):
+        metrics = []
+        for i in range(start, end):
+            values = {'loss': 1. / (i + 1), 'accuracy': i / 10, 'tag': 'foo', 'done': False}
+            if with_step:
+                values['step'] = i
+            metrics.append({'created_at': self.now + timedelta(seconds=i), 'values': values})
+        return metrics
+
+    def test_get_series(self):
+        series = get_series(self.get_metrics(0, 2))
+        assert set(series.keys()) == {'loss', 'accuracy'}
+        assert series['accuracy'] == [Point(0, self.now, 0.),
+                                      Point(1, self.now + timedelta(seconds=1), 0.1)]
+
+    def test_append_and_read(self):
+        assert self.store.append(self.experiment.id, self.get_metrics(0, 6)) == 12
+        # 6 points by series in chunks of 4
+        assert ExperimentMetricChunk.objects.filter(experiment=self.experiment).count() == 4
+
+        # The last chunks are filled first
+        self.store.append(self.experiment.id, self.get_metrics(6, 9))
+        chunks = ExperimentMetricChunk.objects.filter(experiment=self.experiment, name='loss')
+        assert [(c.start_step, c.end_step, c.count) for c in chunks] == [(0, 3, 4),
+                                                                         (4, 7, 4),
+                                                                         (8, 8, 1)]
+
+        assert self.store.get_names(self.experiment.id) == ['accuracy', 'loss']
+        points = self.store.read(self.experiment.id, 'accuracy')
+        assert [p.step for p in points] == list(range(9))
+        assert [p.value for p in points] == [i / 10 for i in range(9)]
+        assert points[3].timestamp == self.now + timedelta(seconds=3)
+
+        points = self.store.read(self.experiment.id, 'loss', start_step=3, end_step=5)
+        assert [p.step for p in points] == [3, 4, 5]
+        assert self.store.read(self.experiment.id, 'loss', start_step=20) == []
+        assert self.store.read(self.experiment.id, 'foo') == []
+
+    def test_append_locks_the_experiment(self):
+        # The first chunks of a series have no last chunk to lock
+        with CaptureQueriesContext(connection) as queries:
+            self.store.append(self.experiment.id, self.get_metrics(0, 2))
+        locks = [q['sql'] for q in queries.captured_queries if 'FOR UPDATE' in q['sql']]
+        assert '"db_experiment"' in locks[0]
+
+        with CaptureQueriesContext(connection) as queries:
+            assert self.store.append(self.experiment.id, []) == 0
+        assert queries.captured_queries == []
+
+    def test_read_experiments(self):
+        experiment = ExperimentFactory()
+        self.store.append(self.experiment.id, self.get_metrics(0, 6))
+        self.store.append(experiment.id, self.get_metrics(2, 4))
+
+        with self.assertNumQueries(1):
+            series = self.store.read_experiments([self.experiment.id, experiment.id],
+                                                 names=['loss'],
+                                                 start_step=3)
+        assert set(series[self.experiment.id].keys()) == {'loss'}
+        assert [p.step for p in series[self.experiment.id]['loss']] == [3, 4, 5]
+        assert [p.step for p in series[experiment.id]['loss']] == [3]
+
+        assert self.store.get_names_by_experiment([self.experiment.id, experiment.id]) == {
+            self.experiment.id: ['accuracy', 'loss'],
+            experiment.id: ['accuracy', 'loss'],
+        }
+        versions = self.store.get_versions([self.experiment.id, experiment.id])
+        assert versions[self.experiment.id] == self.store.get_version(self.experiment.id)
+        assert versions[experiment.id] != versions[self.experiment.id]
+        experiment = ExperimentFactory()
+        assert self.store.get_versions([experiment.id]) == {experiment.id: '0'}
+
+    def test_append_without_steps(self):
+        self.store.append(self.experiment.id, self.get_metrics(0, 3, with_step=False))
+        self.store.append(self.experiment.id, self.get_metrics(3, 5, with_step=False))
+
+        points = self.store.read(self.experiment.id, 'loss')
+        assert [p.step for p in points] == [0, 1, 2, 3, 4]
+
+    def test_delete(self):
+        self.store.append(self.experiment.id, self.get_metrics(0, 3))
+        self.store.delete(self.experiment.id)
+        assert self.store.get_names(self.experiment.id) == []
+
+    def test_metrics_are_written_to_chunks(self):
+        ExperimentMetric.objects.create(experiment=self.experiment, values={'loss': 0.1})
+        ExperimentMetric.objects.create(experiment=self.experiment, values={'loss': 0.2})
+
+        points = self.store.read(self.experiment.id, 'loss')
+        assert [(p.step, p.value) for p in points] == [(0, 0.1), (1, 0.2)]
+
+    def test_single_metrics_are_appended_after_commit(self):
+        with self.settings(METRICS_CHUNKS_DEFERRED=True):
+            with patch('signals.experiments.transaction.on_commit') as mock_on_commit:
+                ExperimentMetric.objects.create(experiment=self.experiment, values={'loss': 0.1})
+        assert self.store.get_names(self.experiment.id) == []
+        assert mock_on_commit.call_count == 1
+
+        # Run the commit callback, the task appends the metric to the chunks
+        mock_on_commit.call_args[0][0]()
+        points = self.store.read(self.experiment.id, 'loss')
+        assert [(p.step, p.value) for p in points] == [(0, 0.1)]
+
+    def test_migrate_experiment_metrics(self):
+        with self.settings(METRICS_CHUNKS_ENABLED=False):
+            for i in range(5):
+                ExperimentMetric.objects.create(experiment=self.experiment,
+                                                created_at=self.now + timedelta(seconds=i),
+                                                values={'loss': i, 'step': i * 10})
+        assert self.store.get_names(self.experiment.id) == []
+
+        assert migrate_experiment_metrics(self.experiment.id, batch_size=2) == 5
+        points = self.store.read(self.experiment.id, 'loss')
+        assert [(p.step, p.value) for p in points] == [(i * 10, i) for i in range(5)]
+
+        # Migrating again rebuilds the chunks
+        assert migrate_experiment_metrics(self.experiment.id) == 5
+        assert len(self.store.read(self.experiment.id, 'loss')) == 5
+
+    def test_migrate_metrics_command(self):
+        experiment = ExperimentFactory()
+        with self.settings(METRICS_CHUNKS_ENABLED=False):
+            ExperimentMetric.objects.create(experiment=self.experiment, values={'loss': 0.1})
+            ExperimentMetric.objects.create(experiment=experiment, values={'loss': 0.1})
+        self.store.append(experiment.id, [{'created_at': self.now, 'values': {'loss': 0.3}}])
+
+        call_command('migrate_metrics')
+
+        assert len(self.store.read(self.experiment.id, 'loss')) == 1
+        # Already migrated experiments are skipped
+        assert [p.value for p in self.store.read(experiment.id, 'loss')] == [0.3]
+
+        call_command('migrate_metrics', experiments=[experiment.id])
+        assert [p.value for p in self.store.read(experiment.id, 'loss')] == [0.1]
@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+import pytest
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from db.models.experiments import ExperimentMetric, ExperimentMetricSummary
+from factories.factory_experiments import ExperimentFactory
+from metrics.ingestion import ingest_metrics
+from metrics.storage import Point
+from metrics.summaries import rebuild_summaries, summarize, update_summaries
+from tests.utils import BaseTest
+
+
+@pytest.mark.metrics_mark
+class TestMetricSummaries(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.experiment = ExperimentFactory()
+        self.now = timezone.now() - timedelta(minutes=1)
+
+    def get_metrics(self, values, start=0, with_step=True):
+        metrics = []
+        for i, value in enumerate(values, start):
+            metric_values = {'loss': value, 'tag': 'foo'}
+            if with_step:
+                metric_values['step'] = i
+            metrics.append({'created_at': self.now + timedelta(seconds=i),
+                            'values': metric_values})
+        return metrics
+
+    def get_summary(self, name='loss'):
+        return ExperimentMetricSummary.objects.get(experiment=self.experiment, name=name)
+
+    def test_summarize(self):
+        points = [Point(0, self.now, 0.5),
+                  Point(1, self.now, 0.2),
+                  Point(2, self.now, 0.9),
+                  Point(3, self.now, 0.4)]
+        summary = summarize('loss', points)
+        assert summary.count == 4
+        assert (summary.min_value, summary.min_step) == (0.2, 1)
+        assert (summary.max_value, summary.max_step) == (0.9, 2)
+        assert (summary.last_value, summary.last_step) == (0.4, 3)
+
+    def test_update_summaries_incrementally(self):
+        assert update_summaries(self.experiment.id, []) == 0
+        assert update_summaries(self.experiment.id, self.get_metrics([0.5, 0.2, 0.9])) == 1
+        summary = self.get_summary()
+        assert summary.count == 3
+        assert (summary.min_value, summary.min_step) == (0.2, 1)
+        assert (summary.max_value, summary.max_step) == (0.9, 2)
+        assert (summary.last_value, summary.last_step) == (0.9, 2)
+        assert summary.get_best(maximize=False) == 0.2
+        assert summary.get_best_step(maximize=True) == 2
+
+        update_summaries(self.experiment.id, self.get_metrics([0.1, 0.3], start=3))
+        summary = self.get_summary()
+        assert summary.count == 5
+        assert (summary.min_value, summary.min_step) == (0.1, 3)
+        assert (summary.max_value, summary.max_step) == (0.9, 2)
+        assert (summary.last_value, summary.last_step) == (0.3, 4)
+
+        # A late report does not replace the last value
+        late = self.get_metrics([1.5], start=-10)
+        update_summaries(self.experiment.id, late)
+        summary = self.get_summary()
+        assert summary.count == 6
+        assert (summary.max_value, summary.max_step) == (1.5, -10)
+        assert (summary.last_value, summary.last_step) == (0.3, 4)
+
+    def test_update_summaries_without_steps(self):
+        update_summaries(self.experiment.id, self.get_metrics([0.5, 0.2], with_step=False))
+        update_summaries(self.experiment.id, self.get_metrics([0.4], start=2, with_step=False))
+        summary = self.get_summary()
+        assert summary.count == 3
+        assert summary.min_step == 1
+        assert summary.last_step == 2
+
+    def test_summaries_are_updated_on_ingestion(self):
+        ingest_metrics(experiment=self.experiment, metrics=self.get_metrics([0.5, 0.2, 0.9]))
+        ExperimentMetric.objects.create(experiment=self.experiment,
+                                        values={'loss': 0.05, 'accuracy': 0.8})
+        assert self.experiment.metric_summaries.count() == 2
+        summary = self.get_summary()
+        assert summary.count == 4
+        assert (summary.min_value, summary.min_step) == (0.05, 3)
+        assert summary.last_value == 0.05
+        assert self.get_summary('accuracy').last_value == 0.8
+
+    def test_rebuild_summaries(self):
+        ingest_metrics(experiment=self.experiment, metrics=self.get_metrics([0.5, 0.2, 0.9, 0.4]))
+        expected = self.get_summary()
+        ExperimentMetricSummary.objects.all().delete()
+
+        assert rebuild_summaries(self.experiment.id, batch_size=3) == 1
+        summary = self.get_summary()
+        for field in ('count', 'min_value', 'min_step', 'max_value', 'max_step',
+                      'last_value', 'last_step', 'last_at'):
+            assert getattr(summary, field) == getattr(expected, field)
+
+        ExperimentMetricSummary.objects.all().delete()
+        call_command('build_metric_summaries')
+        assert self.get_summary().count == 4
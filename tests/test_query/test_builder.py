@@ -13,7 +13,13 @@ from factories.factory_experiments import (
     ExperimentMetricFactory,
     ExperimentStatusFactory
 )
-from query.builder import ComparisonCondition, DateTimeCondition, EqualityCondition, ValueCondition
+from query.builder import (
+    ComparisonCondition,
+    DateTimeCondition,
+    EqualityCondition,
+    JSONValueCondition,
+    ValueCondition
+)
 from query.exceptions import QueryConditionException
 from tests.utils import BaseTest
 
@@ -508,3 +514,51 @@ class TestValueCondition(BaseTest):
                                   name='declarations__loss',
                                   params=['lll', 'ppp', 'foo', 'bar', 'moo'])
         assert queryset.count() == 0
+
+
+@pytest.mark.query_mark
+class TestJSONValueCondition(BaseTest):
+    def test_json_value_operators(self):
+        op = JSONValueCondition._eq_operator('field__key', 'v1')
+        assert op == Q(field__contains={'key': 'v1'})
+        op = JSONValueCondition._neq_operator('field__key__sub', 'v1')
+        assert op == ~Q(field__contains={'key': {'sub': 'v1'}})
+        op = JSONValueCondition._in_operator('field__key', ['v1', 'v2'])
+        assert op == Q(field__contains={'key': 'v1'}) | Q(field__contains={'key': 'v2'})
+        op = JSONValueCondition._nin_operator('field__key', ['v1', 'v2'])
+        assert op == ~(Q(field__contains={'key': 'v1'}) | Q(field__contains={'key': 'v2'}))
+
+    def test_json_value_apply(self):
+        ExperimentFactory(declarations={'rate': 1, 'loss': 'foo'})
+        ExperimentFactory(declarations={'rate': -1, 'loss': 'bar'})
+        ExperimentFactory(declarations={'rate': 11.1, 'loss': 'moo'})
+
+        eq_cond = JSONValueCondition(op='eq')
+        neq_cond = JSONValueCondition(op='eq', negation=True)
+        in_cond = JSONValueCondition(op='in')
+        nin_cond = JSONValueCondition(op='in', negation=True)
+
+        queryset = eq_cond.apply(queryset=Experiment.objects,
+                                 name='declarations__loss',
+                                 params='foo')
+        assert queryset.count() == 1
+
+        queryset = eq_cond.apply(queryset=Experiment.objects,
+                                 name='declarations__rate',
+                                 params=-1)
+        assert queryset.count() == 1
+
+        queryset = neq_cond.apply(queryset=Experiment.objects,
+                                  name='declarations__loss',
+                                  params='foo')
+        assert queryset.count() == 2
+
+        queryset = in_cond.apply(queryset=Experiment.objects,
+                                 name='declarations__loss',
+                                 params=['foo', 'bar', 'lll'])
+        assert queryset.count() == 2
+
+        queryset = nin_cond.apply(queryset=Experiment.objects,
+                                  name='declarations__rate',
+                                  params=[1, 11.1])
+        assert queryset.count() == 1
@@ -0,0 +1,129 @@
+import logging
+import time
+
+import pytest
+
+from django.db.models import Q
+
+from db.models.experiment_groups import ExperimentGroup
+from db.models.experiments import Experiment
+from query.compiler import QueryPlan, QueryPlanCache, compile_query
+from query.exceptions import QueryError
+from query.managers.build import BuildQueryManager
+from query.managers.experiment import ExperimentQueryManager
+from query.managers.experiment_group import ExperimentGroupQueryManager
+from query.managers.job import JobQueryManager
+from query.parser import QueryOpSpec
+from tests.utils import BaseTest, benchmark
+
+_logger = logging.getLogger('polyaxon.tests.query')
+
+# The queries of the query tests
+CORPUS = [
+    (ExperimentQueryManager,
+     'updated_at:<=2020-10-10, started_at:>2010-10-10, started_at:~2016-10-01'),
+    (ExperimentQueryManager, 'metric.loss:<=0.8, status:starting|running'),
+    (ExperimentQueryManager, 'finished_at:2012-12-12..2042-12-12'),
+    (ExperimentQueryManager, 'tags:~tag1|tag2,tags:tag3'),
+    (ExperimentQueryManager, 'declarations.rate:1|-1, independent:true'),
+    (ExperimentGroupQueryManager, 'status:~running, search_algorithm:grid|random'),
+    (JobQueryManager, 'name:foo, started_at:2012-12-12..2042-12-12'),
+    (BuildQueryManager, 'status:~failed|stopped, created_at:>=2018-01-01'),
+]
+
+
+@pytest.mark.query_mark
+class TestQueryCompiler(BaseTest):
+    def test_compile_query(self):
+        plan = compile_query(manager=ExperimentQueryManager,
+                             query_spec='metric.loss:<=0.8, status:~starting|running')
+        assert isinstance(plan, QueryPlan)
+        assert plan.manager == 'experiment'
+        assert plan.keys == ('metric.loss', 'status')
+        assert plan.parsed_query == (
+            ('metric.loss', (QueryOpSpec('<=', False, params=0.8),)),
+            ('status', (QueryOpSpec('|', True, params=['starting', 'running']),)),
+        )
+        assert plan.filters == (Q(last_metric__loss__lte=0.8),
+                                ~Q(status_name__in=['starting', 'running']))
+
+    def test_plan_apply(self):
+        for manager, query_spec in CORPUS:
+            if manager == ExperimentQueryManager:
+                queryset = Experiment.objects
+            elif manager == ExperimentGroupQueryManager:
+                queryset = ExperimentGroup.objects
+            else:
+                continue
+            # The plan builds the same query as applying the conditions one by one
+            expected = queryset
+            for key, cond_specs in manager.handle_query(query_spec).items():
+                for cond_spec in cond_specs:
+                    expected = cond_spec.cond.apply(
+                        queryset=expected, name=manager.proxy_field(key), params=cond_spec.params)
+            plan = compile_query(manager=manager, query_spec=query_spec)
+            assert str(plan.apply(queryset).query) == str(expected.query)
+
+    def test_callback_negation_is_bound_to_the_plan(self):
+        # Both plans share the manager's callback condition
+        plan = compile_query(manager=ExperimentGroupQueryManager,
+                             query_spec='search_algorithm:grid')
+        negated = compile_query(manager=ExperimentGroupQueryManager,
+                                query_spec='search_algorithm:~grid')
+        assert str(plan.apply(ExperimentGroup.objects).query) == str(
+            ExperimentGroup.objects.filter(hptuning__has_key='grid_search').query)
+        assert str(negated.apply(ExperimentGroup.objects).query) == str(
+            ExperimentGroup.objects.filter(~Q(hptuning__has_key='grid_search')).query)
+
+    def test_plan_cache(self):
+        cache = QueryPlanCache(maxsize=2)
+        plan = cache.get_plan(manager=ExperimentQueryManager, query_spec='status:running')
+        assert cache.get_plan(manager=ExperimentQueryManager, query_spec='status:running') is plan
+        # Plans are keyed by manager
+        assert cache.get_plan(manager=JobQueryManager, query_spec='status:running') is not plan
+        assert cache.get_stats() == {'size': 2, 'hits': 1, 'misses': 2}
+
+        # The least recently used plan is evicted
+        cache.get_plan(manager=ExperimentQueryManager, query_spec='status:running')
+        cache.get_plan(manager=ExperimentQueryManager, query_spec='status:failed')
+        assert len(cache) == 2
+        assert cache.get_plan(manager=ExperimentQueryManager, query_spec='status:running') is plan
+        cache.get_plan(manager=JobQueryManager, query_spec='status:running')
+        assert cache.get_stats() == {'size': 2, 'hits': 3, 'misses': 4}
+
+        # Invalid queries are not cached
+        for _ in range(2):
+            with self.assertRaises(QueryError):
+                cache.get_plan(manager=ExperimentQueryManager, query_spec='foobar:1')
+        assert len(cache) == 2
+
+        cache.clear()
+        assert cache.get_stats() == {'size': 0, 'hits': 0, 'misses': 0}
+
+        cache = QueryPlanCache(maxsize=0)
+        cache.get_plan(manager=ExperimentQueryManager, query_spec='status:running')
+        assert len(cache) == 0
+
+    @benchmark
+    def test_benchmark_plan_cache(self):
+        iterations = 200
+        cache = QueryPlanCache(maxsize=len(CORPUS))
+
+        start = time.monotonic()
+        for _ in range(iterations):
+            for manager, query_spec in CORPUS:
+                compile_query(manager=manager, query_spec=query_spec)
+        compile_duration = time.monotonic() - start
+
+        start = time.monotonic()
+        for _ in range(iterations):
+            for manager, query_spec in CORPUS:
+                cache.get_plan(manager=manager, query_spec=query_spec)
+        cache_duration = time.monotonic() - start
+        _logger.info('Compiled %s queries in %.3fs, %.3fs with the plan cache',
+                     iterations * len(CORPUS), compile_duration, cache_duration)
+
+        assert cache.get_stats() == {'size': len(CORPUS),
+                                     'hits': (iterations - 1) * len(CORPUS),
+                                     'misses': len(CORPUS)}
+        assert cache_duration < compile_duration
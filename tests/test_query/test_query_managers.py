@@ -177,10 +177,10 @@ class TestQueryManager(BaseTest):
             str(Experiment.objects.filter(
                 last_metric__loss__lte=0.8
             ).filter(
-                status__status__in=['starting', 'running']
+                status_name__in=['starting', 'running']
             ).query),
             str(Experiment.objects.filter(
-                status__status__in=['starting', 'running']
+                status_name__in=['starting', 'running']
             ).filter(
                 last_metric__loss__lte=0.8
             ).query)
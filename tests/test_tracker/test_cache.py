@@ -0,0 +1,63 @@
+from unittest.mock import patch
+
+import pytest
+
+from django.conf import settings
+from django.test import override_settings
+
+from db.models.clusters import Cluster
+from tests.utils import BaseTest
+from tracker.cache import ClusterCache, cluster_cache
+
+
+@pytest.mark.tracker_mark
+class ClusterCacheTest(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.cluster = Cluster.load()
+        self.cache = ClusterCache(ttl=60)
+
+    def test_get_ref_id_loads_cluster_once(self):
+        with patch.object(Cluster, 'load', return_value=self.cluster) as mock_load:
+            assert self.cache.get_ref_id() == self.cluster.uuid
+            assert self.cache.get_ref_id() == self.cluster.uuid
+        assert mock_load.call_count == 1
+
+    def test_get_ref_id_does_not_cache_misses(self):
+        with patch.object(Cluster, 'load', side_effect=Cluster.DoesNotExist) as mock_load:
+            assert self.cache.get_ref_id() is None
+            assert self.cache.get_ref_id() is None
+        assert mock_load.call_count == 2
+
+    def test_get_ref_id_expires_with_ttl(self):
+        cache = ClusterCache(ttl=0)
+        with patch.object(Cluster, 'load', return_value=self.cluster) as mock_load:
+            cache.get_ref_id()
+            cache.get_ref_id()
+        assert mock_load.call_count == 2
+
+    def test_invalidate_ref_id(self):
+        with patch.object(Cluster, 'load', return_value=self.cluster) as mock_load:
+            self.cache.get_ref_id()
+            self.cache.invalidate_ref_id()
+            self.cache.get_ref_id()
+        assert mock_load.call_count == 2
+
+    def test_cluster_save_invalidates_process_cache(self):
+        cluster_cache.get_ref_id()
+        with patch.object(cluster_cache, 'invalidate_ref_id') as mock_invalidate:
+            self.cluster.save()
+        assert mock_invalidate.call_count == 1
+
+    def test_get_configuration(self):
+        configuration = self.cache.get_configuration()
+        assert configuration.backend == settings.TRACKER_BACKEND
+        assert configuration.batch_size == settings.TRACKER_BATCH_SIZE
+        assert configuration.flush_interval == settings.TRACKER_BATCH_FLUSH_INTERVAL
+        assert self.cache.get_configuration() is configuration
+
+    def test_settings_change_invalidates_configuration(self):
+        cluster_cache.get_configuration()
+        with override_settings(TRACKER_BATCH_SIZE=3):
+            assert cluster_cache.get_configuration().batch_size == 3
+        assert cluster_cache.get_configuration().batch_size == settings.TRACKER_BATCH_SIZE
@@ -10,6 +10,7 @@ from event_manager.events.user import USER_ACTIVATED
 from factories.factory_users import UserFactory
 from tests.utils import BaseTest
 from tracker.publish_tracker import PublishTrackerService
+from tracker.sinks import TRACK, NoOpTrackerSink
 
 
 @pytest.mark.tracker_mark
@@ -30,6 +31,7 @@ class PublishTrackerTest(BaseTest):
                                       actor_id=self.admin.id,
                                       actor_name=self.admin.username,
                                       ref_id=uuid.uuid4())
+                self.publisher.flush()
 
         assert mock_identify.call_count == 0
         assert mock_track.call_count == 1
@@ -58,6 +60,28 @@ class PublishTrackerTest(BaseTest):
                                       cpu=0,
                                       memory=0,
                                       gpu=0)
+                self.publisher.flush()
 
         assert mock_identify.call_count == 1
         assert mock_track.call_count == 1
+
+    def test_record_uses_cluster_ref_id_and_offline_sink(self):
+        publisher = PublishTrackerService(sink=NoOpTrackerSink())
+        publisher.setup()
+        publisher.record(event_type=USER_ACTIVATED,
+                         instance=self.user,
+                         actor_id=self.admin.id,
+                         actor_name=self.admin.username)
+
+        assert len(publisher.sink.calls) == 1
+        assert publisher.sink.calls[0][:3] == (TRACK, self.cluster.uuid.hex, USER_ACTIVATED)
+
+    def test_record_before_setup(self):
+        publisher = PublishTrackerService()
+        assert publisher.sink is None
+        with patch.object(PublishTrackerService, 'get_sink', return_value=NoOpTrackerSink()):
+            publisher.record(event_type=USER_ACTIVATED,
+                             instance=self.user,
+                             actor_id=self.admin.id,
+                             actor_name=self.admin.username)
+        assert len(publisher.sink.calls) == 1
@@ -0,0 +1,81 @@
+import threading
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from tests.utils import BaseTest
+from tracker.sinks import IDENTIFY, TRACK, BatchTrackerSink, NoOpTrackerSink
+
+
+@pytest.mark.tracker_mark
+class BatchTrackerSinkTest(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.client = MagicMock()
+
+    def test_sends_when_batch_is_full(self):
+        sink = BatchTrackerSink(client=self.client, batch_size=3, flush_interval=3600)
+        sink.identify('ref', {'foo': 'bar'})
+        sink.track('ref', 'event1', {})
+        assert self.client.identify.call_count == 0
+        assert self.client.track.call_count == 0
+        assert len(sink) == 2
+
+        sink.track('ref', 'event2', {})
+        assert len(sink) == 0
+        # Wait for the batch sent in the background
+        sink.flush()
+        assert self.client.identify.call_count == 1
+        assert self.client.track.call_count == 2
+        assert self.client.flush.call_count == 1
+
+    def test_sends_when_interval_elapsed(self):
+        sink = BatchTrackerSink(client=self.client, batch_size=100, flush_interval=0)
+        sink.track('ref', 'event1', {})
+        assert len(sink) == 0
+        sink.flush()
+        assert self.client.track.call_count == 1
+        assert self.client.flush.call_count == 1
+
+    def test_sends_in_the_background(self):
+        sent = threading.Event()
+        self.client.flush.side_effect = sent.wait
+        sink = BatchTrackerSink(client=self.client, batch_size=1, flush_interval=3600)
+        # The client's flush blocks until `sent` is set, the caller does not wait for it
+        sink.track('ref', 'event1', {})
+        assert not sent.is_set()
+        sent.set()
+        sink.flush()
+        assert self.client.track.call_count == 1
+
+    def test_flush(self):
+        sink = BatchTrackerSink(client=self.client, batch_size=100, flush_interval=3600)
+        sink.flush()
+        assert self.client.flush.call_count == 0
+
+        sink.track('ref', 'event1', {})
+        sink.track('ref', 'event2', {})
+        sink.flush()
+        assert self.client.track.call_count == 2
+        assert self.client.flush.call_count == 1
+
+    def test_flush_after_the_executor_shutdown(self):
+        sink = BatchTrackerSink(client=self.client, batch_size=100, flush_interval=3600)
+        sink.track('ref', 'event1', {})
+        # At exit the executor is shut down before the atexit handlers run
+        sink._executor.shutdown()  # pylint:disable=protected-access
+        sink.flush()
+        assert self.client.track.call_count == 1
+        assert self.client.flush.call_count == 1
+
+
+@pytest.mark.tracker_mark
+class NoOpTrackerSinkTest(BaseTest):
+    def test_keeps_calls_locally(self):
+        sink = NoOpTrackerSink()
+        sink.identify('ref', {'foo': 'bar'})
+        sink.track('ref', 'event1', {'a': 1})
+        sink.flush()
+        assert sink.calls == [(IDENTIFY, 'ref', {'foo': 'bar'}),
+                              (TRACK, 'ref', 'event1', {'a': 1})]
@@ -5,6 +5,7 @@ import tempfile
 import uuid
 
 from collections import Mapping
+from unittest import skipUnless
 from urllib.parse import urlparse
 
 import redis
@@ -17,6 +18,7 @@ from rest_framework import status
 
 from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
 from django.test import Client, TestCase
 from django.test.client import FakePayload
 
@@ -27,6 +29,7 @@ import executor
 import notifier
 import tracker
 
+from db.lookups import project_cache, token_cache, user_cache
 from db.models.tokens import Token
 from factories.factory_users import UserFactory
 from polyaxon.settings import RedisPools
@@ -37,6 +40,10 @@ from polyaxon.settings import RedisPools
 _valid_tokens = dict()
 CONTENT_TYPE_APPLICATION_JSON = 'application/json'
 
+# Benchmarks are slow and machine dependent, they only run with POLYAXON_RUN_BENCHMARKS=true
+benchmark = skipUnless(os.environ.get('POLYAXON_RUN_BENCHMARKS', '').lower() in ('1', 'true'),
+                       'Set POLYAXON_RUN_BENCHMARKS to run the benchmarks')
+
 
 class BaseClient(Client):
     """Base client class."""
@@ -214,6 +221,7 @@ class BaseTest(TestCase):
     DISABLE_RUNNER = True
     DISABLE_EXECUTOR = True
     DISABLE_AUDITOR = True
+    RUN_STATUSES_RECOMPUTE_ON_COLLECT = True
 
     def setUp(self):
         # Force tasks autodiscover
@@ -240,9 +248,14 @@ class BaseTest(TestCase):
         settings.LOGS_ARCHIVE_ROOT = tempfile.mkdtemp()
         # Flush cache
         cache.clear()
+        for lookup_cache in (token_cache, user_cache, project_cache):
+            lookup_cache.clear()
         # Mock celery default sent task
         self.mock_send_task()
 
+        if self.RUN_STATUSES_RECOMPUTE_ON_COLLECT:
+            self.run_statuses_recompute_on_collect()
+
         if self.DISABLE_RUNNER:
             self.disable_experiment_groups_runner()
             self.disable_experiments_runner()
@@ -274,6 +287,14 @@ class BaseTest(TestCase):
 
         current_app.send_task = send_task
 
+    def run_statuses_recompute_on_collect(self):
+        # The test transaction is never committed,
+        # the deferred status events and recomputations run when they are collected
+        patcher = patch('signals.recompute.transaction', wraps=transaction)
+        mock_transaction = patcher.start()
+        mock_transaction.on_commit.side_effect = lambda func: func()
+        self.addCleanup(patcher.stop)
+
     def disable_experiment_groups_runner(self):
         patcher = patch('scheduler.tasks.experiment_groups.experiments_group_create.apply_async')
         patcher.start()